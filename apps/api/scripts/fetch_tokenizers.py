@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tokenizer Vocab Download Script for Code Weaver Pro
+
+Downloads the BPE vocab files used for token counting into TOKENIZER_DIR
+(default: apps/api/tokenizers/) and verifies their checksums. Run once per
+install or image build; the API itself never downloads them.
+
+Usage:
+    python scripts/fetch_tokenizers.py
+    python scripts/fetch_tokenizers.py --force  # Re-download existing files
+"""
+
+import hashlib
+import sys
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm.tokenizer import BPE_VOCAB_SOURCES, tokenizer_dir  # noqa: E402
+
+
+def fetch(encoding: str, url: str, sha256: str, directory: Path, force: bool) -> bool:
+    """Download one vocab file; returns True when it is present and valid."""
+    target = directory / f"{encoding}.tiktoken"
+    if target.exists() and not force:
+        print(f"  ✅ {encoding}: already present")
+        return True
+
+    print(f"  ⬇️  {encoding}: downloading {url}")
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            data = response.read()
+    except OSError as e:
+        print(f"  ❌ {encoding}: download failed ({e})")
+        return False
+
+    digest = hashlib.sha256(data).hexdigest()
+    if digest != sha256:
+        print(f"  ❌ {encoding}: checksum mismatch ({digest})")
+        return False
+
+    tmp = target.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(target)
+    print(f"  ✅ {encoding}: saved to {target}")
+    return True
+
+
+if __name__ == "__main__":
+    directory = tokenizer_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    print(f"Fetching tokenizer vocab files into {directory}")
+
+    force = "--force" in sys.argv
+    ok = all(
+        [fetch(name, url, sha256, directory, force) for name, (url, sha256) in BPE_VOCAB_SOURCES.items()]
+    )
+    sys.exit(0 if ok else 1)
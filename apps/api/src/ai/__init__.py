@@ -30,6 +30,9 @@ if TYPE_CHECKING:
         generate_project,
         analyze_code,
         plan_task,
+        IncrementalJSONParser,
+        PartialResult,
+        StreamValidationError,
     )
     from .code_parser import (
         CodeParser,
@@ -69,6 +72,10 @@ if TYPE_CHECKING:
         generate_code,
         generate_choice,
         validate_code as validate_generated_code,
+        RegexFSM,
+        TokenFSM,
+        ConstrainedDecoder,
+        schema_to_regex,
     )
     from .code_validation import (
         CodeValidationPipeline,
@@ -94,6 +101,10 @@ if TYPE_CHECKING:
         ExecutionStatus,
         MultiFileExecutor,
         TestRunner,
+        SandboxPool,
+        SubprocessSandbox,
+        DockerSandbox,
+        DependencyCache,
         get_executor,
         get_test_runner,
         execute_code,
@@ -105,6 +116,7 @@ if TYPE_CHECKING:
         PromptOptimizer,
         PromptTemplate,
         OptimizationResult,
+        EvaluationBudget,
         ExampleStore,
         SelfImprovingAgent,
         get_optimizer,
@@ -132,7 +144,8 @@ def __getattr__(name: str):
     if name in (
         "StructuredOutputClient", "ProjectStructure", "CodeFile", "TaskPlan",
         "AnalysisResult", "CodeReview", "get_structured_client", "generate_project",
-        "analyze_code", "plan_task"
+        "analyze_code", "plan_task", "IncrementalJSONParser", "PartialResult",
+        "StreamValidationError"
     ):
         from . import structured_output
         return getattr(structured_output, name)
@@ -156,7 +169,8 @@ def __getattr__(name: str):
     if name in (
         "ConstrainedGenerator", "GenerationResult", "GenerationConfig",
         "OutputFormat", "ConstraintValidator", "get_generator", "generate_json",
-        "generate_code", "generate_choice", "validate_generated_code"
+        "generate_code", "generate_choice", "validate_generated_code",
+        "RegexFSM", "TokenFSM", "ConstrainedDecoder", "schema_to_regex"
     ):
         from . import constrained_generation
         if name == "validate_generated_code":
@@ -176,14 +190,15 @@ def __getattr__(name: str):
 
     if name in (
         "CodeExecutor", "ExecutionResult", "ExecutionConfig", "ExecutionStatus",
-        "MultiFileExecutor", "TestRunner", "get_executor", "get_test_runner",
+        "MultiFileExecutor", "TestRunner", "SandboxPool", "SubprocessSandbox",
+        "DockerSandbox", "DependencyCache", "get_executor", "get_test_runner",
         "execute_code", "execute_python", "execute_javascript", "run_tests"
     ):
         from . import code_executor
         return getattr(code_executor, name)
 
     if name in (
-        "PromptOptimizer", "PromptTemplate", "OptimizationResult", "ExampleStore",
+        "PromptOptimizer", "PromptTemplate", "OptimizationResult", "EvaluationBudget", "ExampleStore",
         "SelfImprovingAgent", "get_optimizer", "create_code_prompt", "create_fix_prompt",
         "record_success", "record_failure"
     ):
@@ -213,6 +228,9 @@ __all__ = [
     "generate_project",
     "analyze_code",
     "plan_task",
+    "IncrementalJSONParser",
+    "PartialResult",
+    "StreamValidationError",
 
     # Code Parser
     "CodeParser",
@@ -252,6 +270,10 @@ __all__ = [
     "generate_code",
     "generate_choice",
     "validate_generated_code",
+    "RegexFSM",
+    "TokenFSM",
+    "ConstrainedDecoder",
+    "schema_to_regex",
 
     # Code Validation
     "CodeValidationPipeline",
@@ -277,6 +299,10 @@ __all__ = [
     "ExecutionStatus",
     "MultiFileExecutor",
     "TestRunner",
+    "SandboxPool",
+    "SubprocessSandbox",
+    "DockerSandbox",
+    "DependencyCache",
     "get_executor",
     "get_test_runner",
     "execute_code",
@@ -288,6 +314,7 @@ __all__ = [
     "PromptOptimizer",
     "PromptTemplate",
     "OptimizationResult",
+    "EvaluationBudget",
     "ExampleStore",
     "SelfImprovingAgent",
     "get_optimizer",
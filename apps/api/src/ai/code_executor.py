@@ -12,21 +12,34 @@ Features:
 - Output capture (stdout, stderr, return values)
 - Error feedback for iterative fixing
 - File system isolation
+- Warm sandbox pool (pre-started containers or rlimited subprocesses)
+- Content-addressed dependency cache mounted read-only into sandboxes
 """
 
-from typing import Optional, List, Dict, Any, Union, Callable, Awaitable
-from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Union, Callable, Awaitable, Tuple, AsyncIterator
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from contextlib import asynccontextmanager
 from enum import Enum
 from pathlib import Path
 import subprocess
 import tempfile
 import asyncio
 import shutil
+import signal
 import json
 import os
 import logging
 import time
 import hashlib
+import sys
+import uuid
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -118,6 +131,7 @@ class ExecutionConfig:
     working_dir: Optional[str] = None
     environment: Dict[str, str] = field(default_factory=dict)
     install_dependencies: bool = True
+    dependency_layer: Optional[str] = None  # Host path of a DependencyCache layer
 
 
 class CodeExecutor:
@@ -170,11 +184,21 @@ class CodeExecutor:
         Language.BASH: ".sh",
     }
 
-    def __init__(self, use_docker: bool = True):
+    def __init__(
+        self,
+        use_docker: bool = True,
+        use_pool: bool = False,
+        pool: Optional["SandboxPool"] = None
+    ):
         self.use_docker = use_docker and self._check_docker()
         if not self.use_docker:
             logger.warning("Docker not available, using local execution (less safe)")
 
+        # Warm sandboxes avoid a container start per execution
+        if pool is None and use_pool:
+            pool = SandboxPool(backend="docker" if self.use_docker else "subprocess")
+        self.pool = pool
+
     def _check_docker(self) -> bool:
         """Check if Docker is available"""
         try:
@@ -210,7 +234,9 @@ class CodeExecutor:
         start_time = time.time()
 
         try:
-            if self.use_docker:
+            if self.pool is not None:
+                result = await self._execute_pooled(code, language, config, files)
+            elif self.use_docker:
                 result = await self._execute_docker(code, language, config, files)
             else:
                 result = await self._execute_local(code, language, config, files)
@@ -364,29 +390,68 @@ class CodeExecutor:
         if not config.allow_file_write:
             cmd.extend(["--read-only", "--tmpfs=/tmp"])
 
+        # Cached dependencies, mounted read-only
+        environment = dict(config.environment)
+        if config.dependency_layer:
+            layer = Path(config.dependency_layer)
+            cmd.extend(["-v", f"{layer.parent}:{DependencyCache.MOUNT_POINT}:ro"])
+            environment.update(DependencyCache.environment(
+                language, f"{DependencyCache.MOUNT_POINT}/{layer.name}"
+            ))
+
         # Add environment variables
-        for key, value in config.environment.items():
+        for key, value in environment.items():
             cmd.extend(["-e", f"{key}={value}"])
 
         # Add image
         cmd.append(self.DOCKER_IMAGES[language])
 
         # Add execution command based on language
+        cmd.extend(self._run_command(language))
+
+        return cmd
+
+    @staticmethod
+    def _run_command(language: Language) -> List[str]:
+        """Command that runs main.<ext> from inside the sandbox work dir"""
         if language == Language.PYTHON:
-            cmd.extend(["python", "main.py"])
+            return ["python", "main.py"]
         elif language == Language.JAVASCRIPT:
-            cmd.extend(["node", "main.js"])
+            return ["node", "main.js"]
         elif language == Language.TYPESCRIPT:
             # Install ts-node if needed, then run
-            cmd.extend(["sh", "-c", "npx -y ts-node main.ts"])
+            return ["sh", "-c", "npx -y ts-node main.ts"]
         elif language == Language.GO:
-            cmd.extend(["go", "run", "main.go"])
+            return ["go", "run", "main.go"]
         elif language == Language.RUST:
-            cmd.extend(["sh", "-c", "rustc main.rs -o main && ./main"])
+            return ["sh", "-c", "rustc main.rs -o main && ./main"]
         elif language == Language.BASH:
-            cmd.extend(["sh", "main.sh"])
+            return ["sh", "main.sh"]
+        raise ValueError(f"Unsupported language: {language}")
 
-        return cmd
+    async def _execute_pooled(
+        self,
+        code: str,
+        language: Language,
+        config: ExecutionConfig,
+        files: Optional[Dict[str, str]]
+    ) -> ExecutionResult:
+        """Execute code in a warm sandbox borrowed from the pool"""
+        ext = self.EXTENSIONS[language]
+
+        async with self.pool.sandbox(language, config) as sandbox:
+            sandbox.write_files({**(files or {}), f"main{ext}": code})
+            run = await sandbox.run(self._run_command(language), config)
+
+        if run.violation == "timeout":
+            raise asyncio.TimeoutError()
+
+        result = self._parse_result(run.exit_code, run.stdout, run.stderr, language)
+        if run.violation:
+            result.status = ExecutionStatus.RESOURCE_LIMIT
+            result.error_type = result.error_type or "ResourceLimitError"
+            result.error_message = result.error_message or f"Sandbox policy violation: {run.violation}"
+        return result
 
     async def _execute_local(
         self,
@@ -415,12 +480,20 @@ class CodeExecutor:
             # Build command based on language
             cmd = self._build_local_command(language, main_file)
 
+            env = None
+            if config.dependency_layer:
+                env = {
+                    **os.environ,
+                    **DependencyCache.environment(language, config.dependency_layer)
+                }
+
             try:
                 proc = await asyncio.create_subprocess_exec(
                     *cmd,
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.PIPE,
-                    cwd=tmpdir
+                    cwd=tmpdir,
+                    env=env
                 )
 
                 stdout, stderr = await asyncio.wait_for(
@@ -539,6 +612,735 @@ class CodeExecutor:
         return error_info
 
 
+# ===========================================
+# Warm Sandbox Pool
+# ===========================================
+
+@dataclass
+class SandboxRun:
+    """Raw outcome of one command run inside a sandbox"""
+    exit_code: int
+    stdout: str
+    stderr: str
+    violation: Optional[str] = None  # "timeout", "resource_limit", "output_limit"
+
+
+class Sandbox(ABC):
+    """
+    One reusable, isolated execution environment.
+
+    A sandbox owns a host work dir that code is written into. It is started
+    once, runs many executions (reset in between), and is discarded by the
+    pool after max_uses runs or after any policy violation.
+    """
+
+    def __init__(self, language: Language, config: ExecutionConfig):
+        self.language = language
+        self.memory_mb = config.max_memory_mb
+        self.allow_network = config.allow_network
+        self.allow_file_write = config.allow_file_write
+        self.deps_root = str(Path(config.dependency_layer).parent) if config.dependency_layer else None
+        self.sandbox_id = uuid.uuid4().hex[:12]
+        self.workdir = Path(tempfile.mkdtemp(prefix=f"cw-sandbox-{self.sandbox_id}-"))
+        self.uses = 0
+        self.last_violation: Optional[str] = None
+
+    @abstractmethod
+    async def start(self):
+        """Bring the sandbox up"""
+
+    @abstractmethod
+    async def run(self, command: List[str], config: ExecutionConfig) -> SandboxRun:
+        """Run a command in the work dir"""
+
+    def write_files(self, files: Dict[str, str]):
+        """Write files into the work dir, refusing paths that escape it"""
+        root = self.workdir.resolve()
+        for filename, content in files.items():
+            target = (root / filename).resolve()
+            if root not in target.parents:
+                raise ValueError(f"File path escapes sandbox: {filename}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content)
+
+    async def reset(self):
+        """Remove everything written by the previous execution"""
+        for child in self.workdir.iterdir():
+            if child.is_dir() and not child.is_symlink():
+                shutil.rmtree(child, ignore_errors=True)
+            else:
+                child.unlink(missing_ok=True)
+        self.last_violation = None
+
+    async def stop(self):
+        """Tear the sandbox down"""
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def _check_output(self, run: SandboxRun, config: ExecutionConfig) -> SandboxRun:
+        """Truncate oversized output and flag it as a violation"""
+        if len(run.stdout) > config.max_output_size or len(run.stderr) > config.max_output_size:
+            run.stdout = run.stdout[:config.max_output_size]
+            run.stderr = run.stderr[:config.max_output_size]
+            run.violation = run.violation or "output_limit"
+        return run
+
+
+class SubprocessSandbox(Sandbox):
+    """
+    Sandbox backed by plain subprocesses.
+
+    Each run gets rlimits (CPU time, file size, address space for Python/Bash),
+    its own process group, an unshared network namespace when network access is
+    disabled and `unshare` works, and an unprivileged user when one is
+    configured (the work dir is handed over to that user, and the process
+    gets its primary group only). Weaker isolation than Docker, but needs
+    nothing installed and keeps the pool logic testable.
+    """
+
+    MAX_FILE_SIZE_MB = 64
+    _unshare_available: Optional[bool] = None
+
+    def __init__(self, language: Language, config: ExecutionConfig, user: Optional[str] = None):
+        super().__init__(language, config)
+        self.user = user
+        self._ids: Optional[Tuple[int, int]] = None  # (uid, gid) when dropping privileges
+
+    async def start(self):
+        if SubprocessSandbox._unshare_available is None:
+            SubprocessSandbox._unshare_available = await self._probe_unshare()
+        if self.user and os.geteuid() == 0:
+            self._ids = self._resolve_user(self.user)
+            os.chown(self.workdir, *self._ids)
+
+    @staticmethod
+    def _resolve_user(user: Union[str, int]) -> Tuple[int, int]:
+        import pwd  # POSIX only, like the privilege drop itself
+
+        entry = pwd.getpwuid(user) if isinstance(user, int) else pwd.getpwnam(user)
+        return entry.pw_uid, entry.pw_gid
+
+    def write_files(self, files: Dict[str, str]):
+        super().write_files(files)
+        if self._ids:
+            # Written by the API user; the sandbox user must be able to read and modify them
+            for dirpath, dirnames, filenames in os.walk(self.workdir):
+                for name in dirnames + filenames:
+                    os.chown(os.path.join(dirpath, name), *self._ids, follow_symlinks=False)
+
+    @staticmethod
+    async def _probe_unshare() -> bool:
+        if not shutil.which("unshare"):
+            return False
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "unshare", "-rn", "true",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            return await asyncio.wait_for(proc.wait(), timeout=5) == 0
+        except Exception:
+            return False
+
+    def _limits(self, config: ExecutionConfig) -> Optional[Callable[[], None]]:
+        if not RESOURCE_AVAILABLE:
+            return None
+
+        cpu_seconds = config.timeout_seconds + 1
+        file_bytes = self.MAX_FILE_SIZE_MB * 1024 * 1024
+        # Node/Go reserve far more virtual memory than they use; cap only simple runtimes
+        memory_bytes = (
+            config.max_memory_mb * 1024 * 1024
+            if self.language in (Language.PYTHON, Language.BASH) else None
+        )
+
+        def apply():
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+            resource.setrlimit(resource.RLIMIT_FSIZE, (file_bytes, file_bytes))
+            resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+            if memory_bytes:
+                resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+        return apply
+
+    async def run(self, command: List[str], config: ExecutionConfig) -> SandboxRun:
+        self.uses += 1
+        if not self.allow_network and SubprocessSandbox._unshare_available:
+            command = ["unshare", "-rn", *command]
+
+        env = {
+            "PATH": os.environ.get("PATH", ""),
+            "HOME": str(self.workdir),
+            "LANG": "C.UTF-8",
+            **config.environment
+        }
+        if config.dependency_layer:
+            env.update(DependencyCache.environment(self.language, config.dependency_layer))
+        kwargs: Dict[str, Any] = {}
+        if self._ids:
+            uid, gid = self._ids
+            kwargs.update(user=uid, group=gid, extra_groups=[])
+
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.workdir,
+            env=env,
+            preexec_fn=self._limits(config),
+            start_new_session=True,
+            **kwargs
+        )
+
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(),
+                timeout=config.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self._kill_group(proc)
+            await proc.wait()
+            self.last_violation = "timeout"
+            return SandboxRun(exit_code=-1, stdout="", stderr="", violation="timeout")
+
+        # Leftover background children would leak into the next run
+        self._kill_group(proc)
+
+        run = SandboxRun(
+            exit_code=proc.returncode or 0,
+            stdout=stdout.decode('utf-8', errors='replace'),
+            stderr=stderr.decode('utf-8', errors='replace')
+        )
+        if proc.returncode in (-signal.SIGKILL, -signal.SIGXCPU, -signal.SIGXFSZ) or "MemoryError" in run.stderr:
+            run.violation = "resource_limit"
+        run = self._check_output(run, config)
+        self.last_violation = run.violation
+        return run
+
+    @staticmethod
+    def _kill_group(proc: asyncio.subprocess.Process):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class DockerSandbox(Sandbox):
+    """
+    Sandbox backed by a long-lived, resource-limited Docker container.
+
+    The container is started once (`sleep`-style idle process, work dir
+    mounted at /app) and code is run in it with `docker exec`, which avoids
+    paying container startup for every execution.
+    """
+
+    PIDS_LIMIT = 256
+
+    async def start(self):
+        cmd = [
+            "docker", "run", "-d", "--rm",
+            "--name", self.container_name,
+            f"--memory={self.memory_mb}m",
+            "--cpus=1",
+            f"--pids-limit={self.PIDS_LIMIT}",
+            "-v", f"{self.workdir}:/app",
+            "-w", "/app",
+        ]
+        if not self.allow_network:
+            cmd.append("--network=none")
+        if not self.allow_file_write:
+            cmd.extend(["--read-only", "--tmpfs=/tmp"])
+        if self.deps_root:
+            cmd.extend(["-v", f"{self.deps_root}:{DependencyCache.MOUNT_POINT}:ro"])
+        cmd.extend([CodeExecutor.DOCKER_IMAGES[self.language], "tail", "-f", "/dev/null"])
+
+        exit_code, _, stderr = await self._docker(cmd, timeout=120)
+        if exit_code != 0:
+            raise RuntimeError(f"Failed to start sandbox container: {stderr.strip()}")
+
+    @property
+    def container_name(self) -> str:
+        return f"cw-sandbox-{self.sandbox_id}"
+
+    async def run(self, command: List[str], config: ExecutionConfig) -> SandboxRun:
+        self.uses += 1
+        environment = dict(config.environment)
+        if config.dependency_layer:
+            environment.update(DependencyCache.environment(
+                self.language,
+                f"{DependencyCache.MOUNT_POINT}/{Path(config.dependency_layer).name}"
+            ))
+
+        cmd = ["docker", "exec", "-w", "/app"]
+        for key, value in environment.items():
+            cmd.extend(["-e", f"{key}={value}"])
+        cmd.extend([self.container_name, *command])
+
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(),
+                timeout=config.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            # The exec'd process may still be running in the container;
+            # the violation makes the pool discard the whole container.
+            proc.kill()
+            await proc.wait()
+            self.last_violation = "timeout"
+            return SandboxRun(exit_code=-1, stdout="", stderr="", violation="timeout")
+
+        run = SandboxRun(
+            exit_code=proc.returncode or 0,
+            stdout=stdout.decode('utf-8', errors='replace'),
+            stderr=stderr.decode('utf-8', errors='replace')
+        )
+        if proc.returncode == 137:  # SIGKILL, usually the OOM killer
+            run.violation = "resource_limit"
+        run = self._check_output(run, config)
+        self.last_violation = run.violation
+        return run
+
+    async def reset(self):
+        # Files created in the container are owned by its user; remove them from inside
+        await self._docker(
+            ["docker", "exec", self.container_name, "sh", "-c",
+             "rm -rf /app/* /app/.[!.]* /tmp/* 2>/dev/null; true"],
+            timeout=30
+        )
+        await super().reset()
+
+    async def stop(self):
+        await self._docker(["docker", "rm", "-f", self.container_name], timeout=30)
+        await super().stop()
+
+    @staticmethod
+    async def _docker(cmd: List[str], timeout: int) -> Tuple[int, str, str]:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            return -1, "", "docker command timed out"
+        return proc.returncode or 0, stdout.decode(errors='replace'), stderr.decode(errors='replace')
+
+
+class SandboxPool:
+    """
+    Pool of warm sandboxes shared by CodeExecutor, MultiFileExecutor and TestRunner.
+
+    Sandboxes are pooled per (language, memory limit, network, file-write,
+    dependency cache root) since those are fixed when a container starts. A sandbox is reset
+    between uses and recycled after `max_uses` executions or on any policy
+    violation (timeout, resource limit, output flood).
+
+    Example:
+        pool = SandboxPool(backend="docker", max_size=4)
+        await pool.warm(Language.PYTHON, count=2)
+        executor = CodeExecutor(pool=pool)
+        ...
+        await pool.close()
+    """
+
+    BACKENDS = {
+        "docker": DockerSandbox,
+        "subprocess": SubprocessSandbox,
+    }
+
+    def __init__(
+        self,
+        backend: str = "docker",
+        max_size: int = 4,
+        max_uses: int = 50,
+        sandbox_user: Optional[str] = None
+    ):
+        """
+        Args:
+            backend: "docker" or "subprocess"
+            max_size: Maximum live sandboxes per pool key
+            max_uses: Executions before a sandbox is recycled
+            sandbox_user: Unprivileged user for the subprocess backend
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown sandbox backend: {backend}")
+        self.backend = backend
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.sandbox_user = sandbox_user
+        self._idle: Dict[Tuple, List[Sandbox]] = {}
+        self._slots: Dict[Tuple, asyncio.Semaphore] = {}
+        self._stats = {"created": 0, "reused": 0, "recycled": 0, "violations": 0}
+
+    @staticmethod
+    def _key(language: Language, config: ExecutionConfig) -> Tuple:
+        deps_root = str(Path(config.dependency_layer).parent) if config.dependency_layer else None
+        return (language, config.max_memory_mb, config.allow_network, config.allow_file_write, deps_root)
+
+    def _slot(self, key: Tuple) -> asyncio.Semaphore:
+        if key not in self._slots:
+            self._slots[key] = asyncio.Semaphore(self.max_size)
+        return self._slots[key]
+
+    async def _create(self, language: Language, config: ExecutionConfig) -> Sandbox:
+        sandbox_cls = self.BACKENDS[self.backend]
+        if sandbox_cls is SubprocessSandbox:
+            sandbox = SubprocessSandbox(language, config, user=self.sandbox_user)
+        else:
+            sandbox = sandbox_cls(language, config)
+        try:
+            await sandbox.start()
+        except Exception:
+            await sandbox.stop()
+            raise
+        self._stats["created"] += 1
+        return sandbox
+
+    async def warm(
+        self,
+        language: Language,
+        config: Optional[ExecutionConfig] = None,
+        count: int = 1
+    ) -> int:
+        """Pre-start sandboxes so the first executions don't pay startup cost"""
+        config = config or ExecutionConfig()
+        key = self._key(language, config)
+        idle = self._idle.setdefault(key, [])
+        started = 0
+        while len(idle) < min(count, self.max_size):
+            idle.append(await self._create(language, config))
+            started += 1
+        return started
+
+    @asynccontextmanager
+    async def sandbox(self, language: Language, config: ExecutionConfig) -> AsyncIterator[Sandbox]:
+        """Borrow a sandbox; it is reset or recycled when the block exits"""
+        key = self._key(language, config)
+        slot = self._slot(key)
+        await slot.acquire()
+        sandbox: Optional[Sandbox] = None
+        try:
+            idle = self._idle.setdefault(key, [])
+            if idle:
+                sandbox = idle.pop()
+                self._stats["reused"] += 1
+            else:
+                sandbox = await self._create(language, config)
+            yield sandbox
+        except BaseException:
+            if sandbox is not None and sandbox.last_violation is None:
+                sandbox.last_violation = "error"
+            raise
+        finally:
+            try:
+                if sandbox is not None:
+                    await self._release(key, sandbox)
+            finally:
+                slot.release()
+
+    async def _release(self, key: Tuple, sandbox: Sandbox):
+        if sandbox.last_violation:
+            self._stats["violations"] += 1
+        if sandbox.last_violation or sandbox.uses >= self.max_uses:
+            self._stats["recycled"] += 1
+            await sandbox.stop()
+            return
+        try:
+            await sandbox.reset()
+        except Exception as e:
+            logger.warning(f"Sandbox reset failed, recycling: {e}")
+            self._stats["recycled"] += 1
+            await sandbox.stop()
+            return
+        self._idle.setdefault(key, []).append(sandbox)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool counters plus current idle sandboxes"""
+        return {
+            **self._stats,
+            "backend": self.backend,
+            "idle": sum(len(v) for v in self._idle.values()),
+        }
+
+    async def close(self):
+        """Stop all idle sandboxes"""
+        idle = [s for sandboxes in self._idle.values() for s in sandboxes]
+        self._idle.clear()
+        await asyncio.gather(*(s.stop() for s in idle), return_exceptions=True)
+
+
+# ===========================================
+# Dependency Cache
+# ===========================================
+
+class DependencyCache:
+    """
+    Content-addressed cache of installed project dependencies.
+
+    A layer is keyed by a hash of the language, the sandbox image and the
+    dependency manifest (lockfile when present). It is installed once from a
+    local package mirror (a pip `--find-links` wheel directory or an npm
+    cache directory), published atomically, and then mounted read-only into
+    every sandbox that runs the same project. Repeated runs skip installation.
+
+    Manifests come from generated code, so installs normally run inside the
+    language's Docker image. Installing on the host is opt-in
+    (allow_host_install / CODE_EXECUTOR_ALLOW_HOST_INSTALL=1), requires a
+    mirror, and never runs package build scripts: pip only accepts wheels
+    and npm runs with --ignore-scripts.
+
+    Example:
+        cache = DependencyCache(mirror_dir="/srv/package-mirror", use_docker=True)
+        layer = await cache.ensure({"requirements.txt": "requests==2.31.0"}, Language.PYTHON)
+        config = ExecutionConfig(dependency_layer=str(layer))
+    """
+
+    # Where the cache root is mounted inside containers
+    MOUNT_POINT = "/deps"
+
+    # Manifests in priority order; the first one present defines the layer
+    MANIFESTS = {
+        Language.PYTHON: ("requirements.txt",),
+        Language.JAVASCRIPT: ("package-lock.json", "package.json"),
+        Language.TYPESCRIPT: ("package-lock.json", "package.json"),
+    }
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        mirror_dir: Optional[Union[str, Path]] = None,
+        use_docker: bool = False,
+        install_timeout: int = 600,
+        allow_host_install: Optional[bool] = None
+    ):
+        """
+        Args:
+            cache_dir: Root directory for layers (default: ~/.cache/code-weaver/deps)
+            mirror_dir: Local package mirror; installs are offline when set
+            use_docker: Install inside the language's Docker image instead of on the host
+            install_timeout: Seconds allowed for a single layer install
+            allow_host_install: Permit installs on the host (from the mirror, wheels
+                only) when use_docker is False (default: CODE_EXECUTOR_ALLOW_HOST_INSTALL)
+        """
+        cache_dir = cache_dir or os.getenv("CODE_EXECUTOR_DEPS_CACHE") or (
+            Path.home() / ".cache" / "code-weaver" / "deps"
+        )
+        mirror_dir = mirror_dir or os.getenv("CODE_EXECUTOR_PACKAGE_MIRROR")
+        if allow_host_install is None:
+            allow_host_install = os.getenv("CODE_EXECUTOR_ALLOW_HOST_INSTALL", "").lower() in ("1", "true", "yes")
+        self.cache_dir = Path(cache_dir)
+        self.mirror_dir = Path(mirror_dir) if mirror_dir else None
+        self.use_docker = use_docker
+        self.install_timeout = install_timeout
+        self.allow_host_install = allow_host_install
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._stats = {"hits": 0, "misses": 0, "failures": 0}
+
+    @staticmethod
+    def environment(language: Language, layer_dir: str) -> Dict[str, str]:
+        """Environment that makes a layer importable, for the path the process sees"""
+        if language == Language.PYTHON:
+            return {"PYTHONPATH": f"{layer_dir}/python"}
+        if language in (Language.JAVASCRIPT, Language.TYPESCRIPT):
+            return {"NODE_PATH": f"{layer_dir}/node_modules"}
+        return {}
+
+    def manifest_files(self, files: Dict[str, str], language: Language) -> Dict[str, str]:
+        """Dependency manifests found in a project's files"""
+        names = self.MANIFESTS.get(language, ())
+        manifests = {name: files[name] for name in names if name in files}
+        # The lockfile alone defines Node installs, but npm ci also needs package.json
+        if "package-lock.json" in manifests and "package.json" in files:
+            manifests["package.json"] = files["package.json"]
+        return manifests
+
+    def layer_key(self, files: Dict[str, str], language: Language) -> Optional[str]:
+        """Content hash identifying the layer for a project, or None if it has no dependencies"""
+        manifests = self.manifest_files(files, language)
+        primary = next((n for n in self.MANIFESTS.get(language, ()) if n in manifests), None)
+        if primary is None or not manifests[primary].strip():
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(language.value.encode())
+        if self.use_docker:
+            digest.update(CodeExecutor.DOCKER_IMAGES[language].encode())
+        else:
+            digest.update(sys.version.split()[0].encode())
+        digest.update(primary.encode())
+        digest.update(manifests[primary].encode())
+        return digest.hexdigest()[:32]
+
+    def layer_path(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    async def ensure(self, files: Dict[str, str], language: Language) -> Optional[Path]:
+        """
+        Return the layer for a project's dependencies, installing it on a miss.
+
+        Returns:
+            Layer directory, or None when the project declares no dependencies
+
+        Raises:
+            RuntimeError: If installation fails or is not permitted on this host
+        """
+        key = self.layer_key(files, language)
+        if key is None:
+            return None
+
+        layer = self.layer_path(key)
+        if (layer / "layer.json").exists():
+            self._stats["hits"] += 1
+            return layer
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another task may have built it while we waited
+            if (layer / "layer.json").exists():
+                self._stats["hits"] += 1
+                return layer
+
+            self._stats["misses"] += 1
+            if not self.use_docker and not (self.allow_host_install and self.mirror_dir):
+                self._stats["failures"] += 1
+                raise RuntimeError(
+                    "Host dependency installs need allow_host_install and a package mirror; "
+                    "use Docker installs instead"
+                )
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            staging = self.cache_dir / f".staging-{key}-{uuid.uuid4().hex[:8]}"
+            staging.mkdir()
+            try:
+                manifests = self.manifest_files(files, language)
+                for name, content in manifests.items():
+                    (staging / name).write_text(content)
+
+                await self._install(staging, language, manifests)
+
+                (staging / "layer.json").write_text(json.dumps({
+                    "key": key,
+                    "language": language.value,
+                    "manifests": sorted(manifests),
+                    "offline": self.mirror_dir is not None,
+                    "created": time.time()
+                }))
+                self._make_read_only(staging)
+                try:
+                    os.rename(staging, layer)
+                except OSError:
+                    # Published concurrently by another process
+                    if not (layer / "layer.json").exists():
+                        raise
+            except Exception:
+                self._stats["failures"] += 1
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            finally:
+                self._locks.pop(key, None)
+
+        return layer
+
+    def _install_command(
+        self,
+        language: Language,
+        layer_dir: str,
+        mirror_dir: Optional[str],
+        manifests: Dict[str, str]
+    ) -> List[str]:
+        if language == Language.PYTHON:
+            python = "python" if self.use_docker else sys.executable
+            cmd = [
+                python, "-m", "pip", "install",
+                "--disable-pip-version-check", "--no-input",
+                "--target", f"{layer_dir}/python",
+                "-r", f"{layer_dir}/requirements.txt",
+            ]
+            if mirror_dir:
+                cmd.extend(["--no-index", "--find-links", mirror_dir])
+            if not self.use_docker:
+                # Source distributions run setup.py at install time
+                cmd.append("--only-binary=:all:")
+            return cmd
+
+        if language in (Language.JAVASCRIPT, Language.TYPESCRIPT):
+            cmd = [
+                "npm", "ci" if "package-lock.json" in manifests else "install",
+                "--prefix", layer_dir,
+                "--no-audit", "--no-fund", "--ignore-scripts",
+            ]
+            if mirror_dir:
+                cmd.extend(["--offline", "--cache", mirror_dir])
+            return cmd
+
+        raise ValueError(f"Dependency caching not supported for {language.value}")
+
+    async def _install(self, staging: Path, language: Language, manifests: Dict[str, str]):
+        if self.use_docker:
+            mirror = "/mirror" if self.mirror_dir else None
+            cmd = ["docker", "run", "--rm", "-v", f"{staging}:/layer", "-w", "/layer"]
+            if self.mirror_dir:
+                cmd.extend(["-v", f"{self.mirror_dir}:/mirror:ro", "--network=none"])
+            cmd.append(CodeExecutor.DOCKER_IMAGES[language])
+            cmd.extend(self._install_command(language, "/layer", mirror, manifests))
+        else:
+            mirror = str(self.mirror_dir) if self.mirror_dir else None
+            cmd = self._install_command(language, str(staging), mirror, manifests)
+
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=staging
+        )
+        try:
+            _, stderr = await asyncio.wait_for(proc.communicate(), timeout=self.install_timeout)
+        except asyncio.TimeoutError as e:
+            proc.kill()
+            raise RuntimeError(f"Dependency install timed out after {self.install_timeout}s") from e
+
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"Dependency install failed ({proc.returncode}): "
+                f"{stderr.decode('utf-8', errors='replace')[-2000:]}"
+            )
+
+    @staticmethod
+    def _make_read_only(root: Path):
+        """Drop write permission so sandboxes can't mutate a shared layer"""
+        for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+            for name in filenames + dirnames:
+                path = os.path.join(dirpath, name)
+                if os.path.islink(path):
+                    continue
+                try:
+                    os.chmod(path, os.stat(path).st_mode & ~0o222)
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        layers = 0
+        if self.cache_dir.exists():
+            layers = sum(1 for p in self.cache_dir.iterdir() if not p.name.startswith("."))
+        return {**self._stats, "layers": layers}
+
+
+_dependency_caches: Dict[bool, DependencyCache] = {}
+
+
+def get_dependency_cache(use_docker: bool = False) -> DependencyCache:
+    """Get the shared dependency cache for Docker or host installs"""
+    if use_docker not in _dependency_caches:
+        _dependency_caches[use_docker] = DependencyCache(use_docker=use_docker)
+    return _dependency_caches[use_docker]
+
+
 class MultiFileExecutor:
     """
     Execute multi-file projects.
@@ -551,10 +1353,18 @@ class MultiFileExecutor:
             "utils.py": "def helper(): return 'Hello!'",
             "requirements.txt": "requests>=2.0.0"
         }, Language.PYTHON)
+
+    Dependencies are installed once per manifest hash into a DependencyCache
+    layer and reused by later runs of the same project.
     """
 
-    def __init__(self):
-        self.executor = CodeExecutor()
+    def __init__(
+        self,
+        executor: Optional[CodeExecutor] = None,
+        dependency_cache: Optional[DependencyCache] = None
+    ):
+        self.executor = executor or CodeExecutor()
+        self.dependency_cache = dependency_cache or get_dependency_cache(self.executor.use_docker)
 
     async def execute_project(
         self,
@@ -592,7 +1402,9 @@ class MultiFileExecutor:
 
         # Handle dependencies
         if config.install_dependencies:
-            await self._install_dependencies(files, language, config)
+            layer = await self._install_dependencies(files, language, config)
+            if layer is not None:
+                config = replace(config, dependency_layer=str(layer))
 
         return await self.executor.execute(
             main_code,
@@ -606,11 +1418,16 @@ class MultiFileExecutor:
         files: Dict[str, str],
         language: Language,
         config: ExecutionConfig
-    ):
-        """Install project dependencies"""
-        # This would handle requirements.txt, package.json, go.mod, etc.
-        # For now, we rely on Docker images having common packages
-        pass
+    ) -> Optional[Path]:
+        """Resolve the cached dependency layer for a project (installing on a miss)"""
+        if language not in DependencyCache.MANIFESTS:
+            # go.mod, Cargo.toml etc. rely on the Docker image's toolchain
+            return None
+        try:
+            return await self.dependency_cache.ensure(files, language)
+        except Exception as e:
+            logger.warning(f"Dependency install failed, running without cached deps: {e}")
+            return None
 
 
 class TestRunner:
@@ -627,15 +1444,21 @@ class TestRunner:
         )
     """
 
-    def __init__(self):
-        self.executor = CodeExecutor()
+    def __init__(
+        self,
+        executor: Optional[CodeExecutor] = None,
+        dependency_cache: Optional[DependencyCache] = None
+    ):
+        self.executor = executor or CodeExecutor()
+        self.dependency_cache = dependency_cache or get_dependency_cache(self.executor.use_docker)
 
     async def run_tests(
         self,
         code: str,
         tests: str,
         language: Language,
-        config: Optional[ExecutionConfig] = None
+        config: Optional[ExecutionConfig] = None,
+        dependencies: Optional[Dict[str, str]] = None
     ) -> ExecutionResult:
         """
         Run tests against code.
@@ -645,12 +1468,22 @@ class TestRunner:
             tests: Test code
             language: Programming language
             config: Execution configuration
+            dependencies: Dependency manifests, e.g. {"requirements.txt": "..."}
 
         Returns:
             ExecutionResult with test results
         """
         config = config or ExecutionConfig()
 
+        if dependencies and config.install_dependencies and not config.dependency_layer:
+            try:
+                layer = await self.dependency_cache.ensure(dependencies, language)
+            except Exception as e:
+                logger.warning(f"Dependency install failed, running without cached deps: {e}")
+                layer = None
+            if layer is not None:
+                config = replace(config, dependency_layer=str(layer))
+
         # Combine code and tests based on language
         combined = self._combine_code_and_tests(code, tests, language)
 
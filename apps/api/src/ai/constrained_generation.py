@@ -9,14 +9,16 @@ Features:
 - Grammar-based constraints (EBNF)
 - Regex pattern matching
 - JSON schema enforcement
+- Token-level FSM constraints for providers exposing token scores
 - Code syntax validation
 - Custom format generators
 """
 
-from typing import Optional, List, Dict, Any, Type, Union, Callable
+from typing import Optional, List, Dict, Any, Type, Union, Callable, Sequence, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from pydantic import BaseModel
+import hashlib
 import json
 import logging
 import re
@@ -167,6 +169,475 @@ REGEX_PATTERNS = {
 }
 
 
+# ===========================================
+# Token-level Constraint Engine
+# ===========================================
+
+# Token id used for end-of-sequence in TokenFSM / provider scores
+EOS_TOKEN = -1
+
+# Deepest $ref / nested schema expanded by schema_to_regex
+MAX_SCHEMA_DEPTH = 16
+
+_JSON_STRING = r'"([^"\\\x00-\x1f]|\\["\\/bfnrt])*"'
+_JSON_STRING_CHAR = r'([^"\\\x00-\x1f]|\\["\\/bfnrt])'
+_JSON_INTEGER = r"-?(0|[1-9][0-9]*)"
+_JSON_NUMBER = _JSON_INTEGER + r"(\.[0-9]+)?([eE][+-]?[0-9]+)?"
+
+
+@dataclass(frozen=True)
+class _CharSet:
+    """A set of characters as code point ranges, optionally negated"""
+    ranges: tuple
+    negated: bool = False
+
+    def matches(self, char: str) -> bool:
+        code = ord(char)
+        inside = any(lo <= code <= hi for lo, hi in self.ranges)
+        return inside != self.negated
+
+
+_CLASS_ESCAPES = {
+    "d": ((48, 57),),
+    "w": ((48, 57), (65, 90), (95, 95), (97, 122)),
+    "s": ((9, 13), (32, 32)),
+}
+_LITERAL_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v"}
+
+
+class _RegexParser:
+    """Parses the regex subset used for constraints into a small AST"""
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.pos = 0
+
+    def parse(self):
+        node = self._alternation()
+        if self.pos != len(self.pattern):
+            raise ValueError(f"Unexpected '{self.pattern[self.pos]}' at {self.pos} in {self.pattern!r}")
+        return node
+
+    def _peek(self) -> Optional[str]:
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def _next(self) -> str:
+        if self.pos >= len(self.pattern):
+            raise ValueError(f"Unexpected end of pattern {self.pattern!r}")
+        char = self.pattern[self.pos]
+        self.pos += 1
+        return char
+
+    def _alternation(self):
+        branches = [self._concatenation()]
+        while self._peek() == "|":
+            self.pos += 1
+            branches.append(self._concatenation())
+        return branches[0] if len(branches) == 1 else ("alt", branches)
+
+    def _concatenation(self):
+        items = []
+        while self._peek() not in (None, "|", ")"):
+            items.append(self._repetition())
+        return ("cat", items)
+
+    def _repetition(self):
+        node = self._atom()
+        while self._peek() in ("*", "+", "?", "{"):
+            char = self._next()
+            if char == "*":
+                node = ("rep", node, 0, None)
+            elif char == "+":
+                node = ("rep", node, 1, None)
+            elif char == "?":
+                node = ("rep", node, 0, 1)
+            else:
+                end = self.pattern.index("}", self.pos)
+                low, comma, high = self.pattern[self.pos:end].partition(",")
+                self.pos = end + 1
+                minimum = int(low or 0)
+                if not comma:
+                    maximum = minimum
+                else:
+                    maximum = int(high) if high else None
+                node = ("rep", node, minimum, maximum)
+            if self._peek() == "?":  # Lazy quantifiers match the same language
+                self.pos += 1
+        return node
+
+    def _atom(self):
+        char = self._next()
+        if char == "(":
+            if self.pattern.startswith("?:", self.pos):
+                self.pos += 2
+            node = self._alternation()
+            if self._next() != ")":
+                raise ValueError(f"Unbalanced parenthesis in {self.pattern!r}")
+            return node
+        if char == "[":
+            return ("chars", self._char_class())
+        if char == ".":
+            return ("chars", _CharSet(((10, 10),), negated=True))
+        if char == "\\":
+            return ("chars", self._escape())
+        if char in "^$":
+            # Constraints always match the whole output
+            return ("cat", [])
+        return ("chars", _CharSet(((ord(char), ord(char)),)))
+
+    def _escape(self) -> _CharSet:
+        char = self._next()
+        if char.lower() in _CLASS_ESCAPES:
+            return _CharSet(_CLASS_ESCAPES[char.lower()], negated=char.isupper())
+        return _CharSet(((ord(self._escaped_char(char)),) * 2,))
+
+    def _escaped_char(self, char: str) -> str:
+        if char in _LITERAL_ESCAPES:
+            return _LITERAL_ESCAPES[char]
+        if char == "x":
+            code = self.pattern[self.pos:self.pos + 2]
+            self.pos += 2
+            return chr(int(code, 16))
+        if char == "u":
+            code = self.pattern[self.pos:self.pos + 4]
+            self.pos += 4
+            return chr(int(code, 16))
+        if char.isalnum():
+            raise ValueError(f"Unsupported escape \\{char} in {self.pattern!r}")
+        return char
+
+    def _class_char(self) -> str:
+        char = self._next()
+        return self._escaped_char(self._next()) if char == "\\" else char
+
+    def _char_class(self) -> _CharSet:
+        negated = self._peek() == "^"
+        if negated:
+            self.pos += 1
+
+        ranges = []
+        first = True
+        while first or self._peek() != "]":
+            first = False
+            if self._peek() == "\\" and self.pattern[self.pos + 1:self.pos + 2].lower() in _CLASS_ESCAPES:
+                escape = self.pattern[self.pos + 1]
+                if escape.isupper():
+                    raise ValueError(f"Negated class escape \\{escape} inside [] is not supported")
+                self.pos += 2
+                ranges.extend(_CLASS_ESCAPES[escape])
+                continue
+            low = self._class_char()
+            if self._peek() == "-" and self.pattern[self.pos + 1:self.pos + 2] not in ("]", ""):
+                self.pos += 1
+                high = self._class_char()
+                ranges.append((ord(low), ord(high)))
+            else:
+                ranges.append((ord(low), ord(low)))
+        self.pos += 1
+        return _CharSet(tuple(ranges), negated)
+
+
+class RegexFSM:
+    """
+    Character-level automaton for a regular expression.
+
+    The pattern is compiled into a Thompson NFA; DFA states (sets of NFA
+    states) are built lazily as they are visited, so only the part of the
+    automaton a generation actually walks through is ever materialized.
+    Supports literals, escapes, character classes, groups, alternation and
+    the *, +, ?, {m,n} quantifiers. The whole output must match.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self._edges: List[List[Tuple[_CharSet, int]]] = []
+        self._epsilon: List[List[int]] = []
+        start, self._accept = self._build(_RegexParser(pattern).parse())
+
+        self._states: Dict[frozenset, int] = {}
+        self._sets: List[frozenset] = []
+        self._transitions: Dict[Tuple[int, str], Optional[int]] = {}
+        self.initial = self._state_id(self._closure({start}))
+
+    def _new_state(self) -> int:
+        self._edges.append([])
+        self._epsilon.append([])
+        return len(self._edges) - 1
+
+    def _build(self, node) -> Tuple[int, int]:
+        kind = node[0]
+        start, end = self._new_state(), self._new_state()
+
+        if kind == "chars":
+            self._edges[start].append((node[1], end))
+        elif kind == "cat":
+            current = start
+            for item in node[1]:
+                item_start, item_end = self._build(item)
+                self._epsilon[current].append(item_start)
+                current = item_end
+            self._epsilon[current].append(end)
+        elif kind == "alt":
+            for branch in node[1]:
+                branch_start, branch_end = self._build(branch)
+                self._epsilon[start].append(branch_start)
+                self._epsilon[branch_end].append(end)
+        elif kind == "rep":
+            _, child, minimum, maximum = node
+            current = start
+            for _ in range(minimum):
+                child_start, child_end = self._build(child)
+                self._epsilon[current].append(child_start)
+                current = child_end
+            if maximum is None:
+                child_start, child_end = self._build(child)
+                self._epsilon[current].extend([child_start, end])
+                self._epsilon[child_end].extend([child_start, end])
+            else:
+                for _ in range(maximum - minimum):
+                    child_start, child_end = self._build(child)
+                    self._epsilon[current].extend([child_start, end])
+                    current = child_end
+                self._epsilon[current].append(end)
+        return start, end
+
+    def _closure(self, states) -> frozenset:
+        stack = list(states)
+        seen = set(states)
+        while stack:
+            for target in self._epsilon[stack.pop()]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return frozenset(seen)
+
+    def _state_id(self, states: frozenset) -> int:
+        if states not in self._states:
+            self._states[states] = len(self._sets)
+            self._sets.append(states)
+        return self._states[states]
+
+    def next_state(self, state: int, char: str) -> Optional[int]:
+        """State after consuming char, or None if char isn't allowed"""
+        key = (state, char)
+        if key not in self._transitions:
+            targets = {
+                target
+                for nfa_state in self._sets[state]
+                for charset, target in self._edges[nfa_state]
+                if charset.matches(char)
+            }
+            self._transitions[key] = self._state_id(self._closure(targets)) if targets else None
+        return self._transitions[key]
+
+    def walk(self, state: Optional[int], text: str) -> Optional[int]:
+        """State after consuming text, or None if it leaves the language"""
+        for char in text:
+            if state is None:
+                return None
+            state = self.next_state(state, char)
+        return state
+
+    def is_final(self, state: int) -> bool:
+        return self._accept in self._sets[state]
+
+    def matches(self, text: str) -> bool:
+        state = self.walk(self.initial, text)
+        return state is not None and self.is_final(state)
+
+
+class TokenFSM:
+    """
+    A RegexFSM lifted to a model's token vocabulary.
+
+    allowed_tokens(state) lists the tokens whose characters all keep the
+    output inside the language (plus EOS_TOKEN in accepting states); it is
+    cached per state, so the vocabulary is scanned once per state visited.
+    """
+
+    def __init__(self, fsm: RegexFSM, vocabulary: Sequence[str]):
+        self.fsm = fsm
+        self.vocabulary = list(vocabulary)
+        self._allowed: Dict[int, Dict[int, int]] = {}
+
+    @property
+    def initial(self) -> int:
+        return self.fsm.initial
+
+    def _allowed_map(self, state: int) -> Dict[int, int]:
+        if state not in self._allowed:
+            allowed = {}
+            for token_id, token in enumerate(self.vocabulary):
+                if token:
+                    target = self.fsm.walk(state, token)
+                    if target is not None:
+                        allowed[token_id] = target
+            self._allowed[state] = allowed
+        return self._allowed[state]
+
+    def allowed_tokens(self, state: int) -> List[int]:
+        tokens = list(self._allowed_map(state))
+        if self.fsm.is_final(state):
+            tokens.append(EOS_TOKEN)
+        return tokens
+
+    def next_state(self, state: int, token_id: int) -> int:
+        return self._allowed_map(state)[token_id]
+
+    def is_final(self, state: int) -> bool:
+        return self.fsm.is_final(state)
+
+
+def vocabulary_key(vocabulary: Sequence[str]) -> str:
+    """Stable identifier of a vocabulary's contents"""
+    return hashlib.sha256(json.dumps(list(vocabulary)).encode("utf-8")).hexdigest()
+
+
+def drop_optional_nulls(data: Any, schema: Dict[str, Any]) -> Any:
+    """
+    Remove null values of optional properties.
+
+    Strict structured outputs send every property, null when unset; the
+    original schema usually expects optional properties to be absent instead.
+    """
+    defs = {**schema.get("definitions", {}), **schema.get("$defs", {})}
+
+    def resolve(node: Dict[str, Any]) -> Dict[str, Any]:
+        if "$ref" in node:
+            return defs.get(node["$ref"].rsplit("/", 1)[-1], {})
+        return node
+
+    def walk(value: Any, node: Dict[str, Any], depth: int) -> Any:
+        node = resolve(node)
+        if depth > 32 or not isinstance(node, dict):
+            return value
+        for option in node.get("anyOf", []) + node.get("oneOf", []):
+            option = resolve(option)
+            if (isinstance(value, dict) and "properties" in option) or (isinstance(value, list) and "items" in option):
+                node = option
+                break
+        if isinstance(value, dict) and "properties" in node:
+            required = set(node.get("required", []))
+            return {
+                key: walk(item, node["properties"].get(key, {}), depth + 1)
+                for key, item in value.items()
+                if item is not None or key in required
+            }
+        if isinstance(value, list) and isinstance(node.get("items"), dict):
+            return [walk(item, node["items"], depth + 1) for item in value]
+        return value
+
+    return walk(data, schema, 0)
+
+
+def schema_to_regex(schema: Dict[str, Any]) -> str:
+    """
+    Translate a JSON schema into a regex for compact JSON (no whitespace).
+
+    Objects emit every declared property in order, so the output is valid
+    for the schema whether or not a property is required. Supports $ref
+    ($defs / definitions), anyOf / oneOf, enum / const, nullable type lists,
+    string length bounds and additionalProperties maps.
+    """
+    definitions = {**schema.get("definitions", {}), **schema.get("$defs", {})}
+
+    def literal(value: Any) -> str:
+        return re.escape(json.dumps(value, separators=(",", ":")))
+
+    def convert(node: Dict[str, Any], depth: int) -> str:
+        if depth > MAX_SCHEMA_DEPTH:
+            raise ValueError("Schema is too deeply nested (or recursive) to compile")
+
+        if "$ref" in node:
+            name = node["$ref"].rsplit("/", 1)[-1]
+            return convert(definitions[name], depth + 1)
+        if "const" in node:
+            return literal(node["const"])
+        if "enum" in node:
+            return "(" + "|".join(literal(v) for v in node["enum"]) + ")"
+        for key in ("anyOf", "oneOf"):
+            if key in node:
+                return "(" + "|".join(convert(option, depth + 1) for option in node[key]) + ")"
+        if "allOf" in node and len(node["allOf"]) == 1:
+            return convert(node["allOf"][0], depth + 1)
+
+        node_type = node.get("type", "object" if "properties" in node else "string")
+        if isinstance(node_type, list):
+            return "(" + "|".join(convert({**node, "type": t}, depth) for t in node_type) + ")"
+
+        if node_type == "string":
+            if "minLength" in node or "maxLength" in node:
+                bounds = f"{node.get('minLength', 0)},{node.get('maxLength', '')}"
+                return f'"{_JSON_STRING_CHAR}{{{bounds}}}"'
+            return _JSON_STRING
+        if node_type == "integer":
+            return _JSON_INTEGER
+        if node_type == "number":
+            return _JSON_NUMBER
+        if node_type == "boolean":
+            return "(true|false)"
+        if node_type == "null":
+            return "null"
+        if node_type == "array":
+            item = convert(node.get("items", {}), depth + 1)
+            items = f"{item}(,{item})*"
+            return rf"\[{items}\]" if node.get("minItems", 0) > 0 else rf"\[({items})?\]"
+        if node_type == "object":
+            properties = node.get("properties", {})
+            if properties:
+                members = ",".join(
+                    literal(name) + ":" + convert(prop, depth + 1)
+                    for name, prop in properties.items()
+                )
+                return rf"\{{{members}\}}"
+            extra = node.get("additionalProperties")
+            if isinstance(extra, dict):
+                member = _JSON_STRING + ":" + convert(extra, depth + 1)
+                return rf"\{{({member}(,{member})*)?\}}"
+            return r"\{\}"
+
+        raise ValueError(f"Unsupported schema type: {node_type}")
+
+    return convert(schema, 0)
+
+
+class ConstrainedDecoder:
+    """
+    Greedy decoding where every step is restricted to tokens the FSM allows.
+
+    Works with providers that expose their vocabulary and per-step token
+    scores (LLMProvider.supports_token_constraints). Output is valid by
+    construction, so it never needs a validation retry.
+    """
+
+    def __init__(self, token_fsm: TokenFSM):
+        self.token_fsm = token_fsm
+
+    async def decode(self, provider, messages: List[Any], max_tokens: int) -> Tuple[str, bool]:
+        """
+        Returns:
+            Tuple of (generated text, whether it is a complete match)
+        """
+        state = self.token_fsm.initial
+        text = ""
+
+        for _ in range(max_tokens):
+            allowed = self.token_fsm.allowed_tokens(state)
+            if not allowed:
+                break
+
+            scores = await provider.next_token_scores(messages, text)
+            # Highest score wins; ties go to the lower token id (EOS first)
+            best = max(allowed, key=lambda t: (scores.get(t, float("-inf")), -t))
+            if best == EOS_TOKEN:
+                return text, True
+
+            text += self.token_fsm.vocabulary[best]
+            state = self.token_fsm.next_state(state, best)
+
+        return text, self.token_fsm.is_final(state)
+
+
 class ConstrainedGenerator:
     """
     Constrained LLM generation using Outlines.
@@ -193,9 +664,19 @@ class ConstrainedGenerator:
         )
     """
 
-    def __init__(self, model: str = "claude-3-5-sonnet-20241022"):
+    def __init__(self, model: str = "claude-3-5-sonnet-20241022", provider=None):
+        """
+        Args:
+            model: Model name for the Outlines path
+            provider: Optional LLMProvider used by generate_async; providers
+                with token-level access or a structured output mode get
+                constraints enforced during decoding
+        """
         self.model = model
+        self.provider = provider
         self._outlines_available = False
+        self._fsms: Dict[str, RegexFSM] = {}
+        self._token_fsms: Dict[Tuple[str, str], TokenFSM] = {}
         self._init_outlines()
 
     def _init_outlines(self):
@@ -230,6 +711,85 @@ class ConstrainedGenerator:
         else:
             return self._generate_with_validation(prompt, config, system_prompt)
 
+    def constraint_pattern(self, config: GenerationConfig) -> Optional[str]:
+        """The regex a generation must match, if it can be expressed as one"""
+        if config.regex_pattern:
+            return config.regex_pattern
+        if config.format == OutputFormat.JSON and config.schema:
+            return schema_to_regex(config.schema)
+        return None
+
+    def token_fsm(self, pattern: str, vocabulary: Sequence[str]) -> TokenFSM:
+        """Compiled token-level FSM, cached per pattern and vocabulary"""
+        if pattern not in self._fsms:
+            self._fsms[pattern] = RegexFSM(pattern)
+        key = (pattern, vocabulary_key(vocabulary))
+        if key not in self._token_fsms:
+            self._token_fsms[key] = TokenFSM(self._fsms[pattern], vocabulary)
+        return self._token_fsms[key]
+
+    async def generate_async(
+        self,
+        prompt: str,
+        config: GenerationConfig,
+        system_prompt: Optional[str] = None
+    ) -> GenerationResult:
+        """
+        Generate constrained output with self.provider, enforcing the
+        constraint while decoding where the provider allows it.
+
+        - Providers with token-level access: every step is masked by the
+          compiled FSM, so the output cannot be malformed.
+        - Providers with a structured output mode: the JSON schema is sent
+          with the request.
+        - Otherwise: prompt instructions plus post-hoc validation.
+        """
+        if self.provider is None:
+            return self.generate(prompt, config, system_prompt)
+
+        from ..llm.providers import LLMMessage
+
+        messages = []
+        if system_prompt:
+            messages.append(LLMMessage(role="system", content=system_prompt))
+        messages.append(LLMMessage(role="user", content=self._build_constrained_prompt(prompt, config)))
+
+        pattern = self.constraint_pattern(config)
+        errors: List[str] = []
+
+        if pattern and self.provider.supports_token_constraints:
+            decoder = ConstrainedDecoder(self.token_fsm(pattern, self.provider.vocabulary()))
+            content, complete = await decoder.decode(self.provider, messages, config.max_tokens)
+            if not complete:
+                errors.append(f"Reached max_tokens ({config.max_tokens}) before the output was complete")
+        elif config.schema and self.provider.supports_structured_output:
+            response = await self.provider.generate(
+                messages,
+                max_tokens=config.max_tokens,
+                temperature=config.temperature,
+                **self.provider.structured_output_kwargs(config.schema),
+            )
+            content = response.content
+            try:
+                content = json.dumps(drop_optional_nulls(json.loads(content), config.schema))
+            except (json.JSONDecodeError, TypeError):
+                pass  # Reported by validation below
+        else:
+            response = await self.provider.generate(
+                messages, max_tokens=config.max_tokens, temperature=config.temperature
+            )
+            content = response.content
+
+        is_valid, validation_errors, parsed = self._validate_output(content, config)
+        errors.extend(validation_errors)
+        return GenerationResult(
+            content=content,
+            format=config.format,
+            is_valid=is_valid and not errors,
+            validation_errors=errors,
+            parsed_content=parsed
+        )
+
     def generate_json(
         self,
         prompt: str,
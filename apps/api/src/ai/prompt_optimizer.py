@@ -10,16 +10,22 @@ Features:
 - Chain-of-thought reasoning
 - Metric-based optimization
 - Prompt versioning and A/B testing
+- Parallel, budgeted candidate evaluation with successive halving
 """
 
 from typing import Optional, List, Dict, Any, Callable, Type, TypeVar, Generic
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from abc import ABC, abstractmethod
+import asyncio
+import heapq
+import inspect
 import json
 import hashlib
 import logging
+import math
 import os
+import re
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -68,6 +74,14 @@ class OptimizationResult:
     metrics: Dict[str, float] = field(default_factory=dict)
 
 
+@dataclass
+class EvaluationBudget:
+    """Limits for parallel template evaluation"""
+    max_concurrency: int = 4  # LLM calls in flight at once
+    max_tokens: int = 100_000  # Prompt + output tokens across all calls
+    max_output_tokens: int = 1024  # Per evaluation call
+
+
 @dataclass
 class PromptTemplate:
     """A prompt template with placeholders"""
@@ -160,19 +174,123 @@ class TestGenerationSignature(Signature):
         return ["tests", "test_descriptions"]
 
 
+def _terms(text: str) -> List[str]:
+    """Lowercased word tokens for lexical retrieval"""
+    return re.findall(r"[a-z0-9_]+", text.lower())
+
+
+def _example_key(input_text: str) -> str:
+    """Hash index key for an example input"""
+    return hashlib.sha1(input_text.encode("utf-8")).hexdigest()
+
+
+class _BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring.
+
+    A search only touches the postings of the query terms, so its cost
+    does not grow with the number of unrelated examples.
+    """
+
+    k1 = 1.5
+    b = 0.75
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, int]] = {}  # term -> {doc key: term frequency}
+        self.doc_terms: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.total_length = 0
+
+    def add(self, key: str, text: str) -> None:
+        self.remove(key)
+        counts: Dict[str, int] = {}
+        for term in _terms(text):
+            counts[term] = counts.get(term, 0) + 1
+        self.doc_terms[key] = counts
+        self.doc_lengths[key] = sum(counts.values())
+        self.total_length += self.doc_lengths[key]
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[key] = tf
+
+    def remove(self, key: str) -> None:
+        counts = self.doc_terms.pop(key, None)
+        if counts is None:
+            return
+        self.total_length -= self.doc_lengths.pop(key)
+        for term in counts:
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(key, None)
+                if not docs:
+                    del self.postings[term]
+
+    def search(self, query: str) -> Dict[str, float]:
+        """BM25 score for every document sharing a term with the query"""
+        n_docs = len(self.doc_terms)
+        if not n_docs:
+            return {}
+        avg_length = self.total_length / n_docs or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(_terms(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for key, tf in docs.items():
+                length_ratio = self.doc_lengths[key] / avg_length
+                norm = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length_ratio))
+                scores[key] = scores.get(key, 0.0) + idf * norm
+        return scores
+
+    def similarity(self, key_a: str, key_b: str) -> float:
+        """Jaccard similarity of two documents' term sets"""
+        a, b = self.doc_terms.get(key_a, {}), self.doc_terms.get(key_b, {})
+        if not a or not b:
+            return 0.0
+        overlap = len(a.keys() & b.keys())
+        return overlap / (len(a) + len(b) - overlap)
+
+
 class ExampleStore:
     """
     Store and retrieve examples for few-shot learning.
-    Uses semantic similarity for example selection.
+
+    - Examples are indexed per task by a hash of their input, so adds and
+      score updates are O(1).
+    - Persistence is an append-only JSONL log, compacted when it grows to
+      twice the number of live examples.
+    - Retrieval ranks by BM25 similarity to the query combined with the
+      quality score, then picks a diverse set with maximal marginal
+      relevance.
     """
 
+    LOG_FILE = "examples.jsonl"
+    LEGACY_INDEX_FILE = "index.json"
+
+    # Weight of query relevance vs. quality score when ranking
+    RELEVANCE_WEIGHT = 0.7
+    # Trade-off between relevance and diversity in MMR (1.0 = no diversity)
+    MMR_LAMBDA = 0.7
+
     def __init__(self, persist_path: Optional[str] = None):
         self.persist_path = persist_path or os.path.join(
             os.path.expanduser("~"), ".codeweaver", "examples"
         )
-        self.examples: Dict[str, List[Example]] = {}
+        self._examples: Dict[str, Dict[str, Example]] = {}  # task -> {input hash: example}
+        self._indexes: Dict[str, _BM25Index] = {}
+        self._log_records = 0
         self._load()
 
+    @property
+    def examples(self) -> Dict[str, List[Example]]:
+        """Examples per task, in insertion order"""
+        return {task: list(examples.values()) for task, examples in self._examples.items()}
+
+    def _put(self, task: str, example: Example) -> None:
+        key = _example_key(example.input)
+        self._examples.setdefault(task, {})[key] = example
+        self._indexes.setdefault(task, _BM25Index()).add(key, example.input)
+
     def add_example(
         self,
         task: str,
@@ -181,7 +299,7 @@ class ExampleStore:
         score: float = 1.0,
         metadata: Optional[Dict] = None
     ):
-        """Add a new example"""
+        """Add a new example (replaces an existing example with the same input)"""
         example = Example(
             input=input_text,
             output=output_text,
@@ -189,11 +307,8 @@ class ExampleStore:
             metadata=metadata or {}
         )
 
-        if task not in self.examples:
-            self.examples[task] = []
-
-        self.examples[task].append(example)
-        self._save()
+        self._put(task, example)
+        self._append({"op": "add", "task": task, "example": example.to_dict()})
 
     def get_examples(
         self,
@@ -214,62 +329,236 @@ class ExampleStore:
         Returns:
             List of relevant examples
         """
-        if task not in self.examples:
+        examples = self._examples.get(task)
+        if not examples:
             return []
 
-        # Filter by score
-        candidates = [e for e in self.examples[task] if e.score >= min_score]
-
-        # Sort by score (could use semantic similarity with query)
-        candidates.sort(key=lambda e: e.score, reverse=True)
+        index = self._indexes[task]
+        matches = index.search(query) if query else {}
+        matches = {key: value for key, value in matches.items() if examples[key].score >= min_score}
+
+        if not matches:
+            # No query (or no lexical overlap): best scores first
+            candidates = [e for e in examples.values() if e.score >= min_score]
+            candidates.sort(key=lambda e: e.score, reverse=True)
+            return candidates[:n]
+
+        top_match = max(matches.values())
+        relevance = {
+            key: self.RELEVANCE_WEIGHT * value / top_match
+            + (1 - self.RELEVANCE_WEIGHT) * examples[key].score
+            for key, value in matches.items()
+        }
+        pool = heapq.nlargest(max(4 * n, 20), relevance, key=relevance.get)
+
+        # Maximal marginal relevance: relevant, but unlike what's already picked
+        selected: List[str] = []
+        while pool and len(selected) < n:
+            best = max(
+                pool,
+                key=lambda key: self.MMR_LAMBDA * relevance[key] - (1 - self.MMR_LAMBDA) * max(
+                    (index.similarity(key, chosen) for chosen in selected), default=0.0
+                ),
+            )
+            selected.append(best)
+            pool.remove(best)
 
-        return candidates[:n]
+        return [examples[key] for key in selected]
 
     def update_score(self, task: str, input_text: str, new_score: float):
         """Update the score of an example based on feedback"""
-        if task not in self.examples:
+        key = _example_key(input_text)
+        example = self._examples.get(task, {}).get(key)
+        if example is None:
             return
 
-        for example in self.examples[task]:
-            if example.input == input_text:
-                # Exponential moving average
-                example.score = 0.7 * example.score + 0.3 * new_score
-                break
+        # Exponential moving average
+        example.score = 0.7 * example.score + 0.3 * new_score
+        self._append({"op": "score", "task": task, "key": key, "score": example.score})
 
-        self._save()
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Replay one log record"""
+        if record["op"] == "add":
+            self._put(record["task"], Example(**record["example"]))
+        elif record["op"] == "score":
+            example = self._examples.get(record["task"], {}).get(record["key"])
+            if example is not None:
+                example.score = record["score"]
 
     def _load(self):
         """Load examples from disk"""
         try:
             os.makedirs(self.persist_path, exist_ok=True)
-            index_path = os.path.join(self.persist_path, "index.json")
-
-            if os.path.exists(index_path):
+            log_path = os.path.join(self.persist_path, self.LOG_FILE)
+            index_path = os.path.join(self.persist_path, self.LEGACY_INDEX_FILE)
+
+            if os.path.exists(log_path):
+                with open(log_path, 'r') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            self._apply(json.loads(line))
+                            self._log_records += 1
+                        except (ValueError, KeyError, TypeError):
+                            # A torn final write; everything before it is intact
+                            logger.warning("Skipping corrupt example log record")
+            elif os.path.exists(index_path):
+                # Migrate the old whole-file index to the log
                 with open(index_path, 'r') as f:
                     data = json.load(f)
-                    for task, examples in data.items():
-                        self.examples[task] = [
-                            Example(**e) for e in examples
-                        ]
+                for task, examples in data.items():
+                    for e in examples:
+                        self._put(task, Example(**e))
+                self._compact()
         except Exception as e:
             logger.warning(f"Could not load examples: {e}")
 
-    def _save(self):
-        """Save examples to disk"""
+    def _append(self, record: Dict[str, Any]):
+        """Append a record to the log, compacting it when mostly stale"""
         try:
             os.makedirs(self.persist_path, exist_ok=True)
-            index_path = os.path.join(self.persist_path, "index.json")
-
-            data = {
-                task: [e.to_dict() for e in examples]
-                for task, examples in self.examples.items()
-            }
+            with open(os.path.join(self.persist_path, self.LOG_FILE), 'a') as f:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._log_records += 1
 
-            with open(index_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            live = sum(len(examples) for examples in self._examples.values())
+            if self._log_records > 2 * live + 100:
+                self._compact()
         except Exception as e:
             logger.warning(f"Could not save examples: {e}")
 
+    def _compact(self):
+        """Rewrite the log with one record per live example"""
+        os.makedirs(self.persist_path, exist_ok=True)
+        log_path = os.path.join(self.persist_path, self.LOG_FILE)
+        tmp_path = log_path + ".tmp"
+
+        with open(tmp_path, 'w') as f:
+            for task, examples in self._examples.items():
+                for example in examples.values():
+                    record = {"op": "add", "task": task, "example": example.to_dict()}
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, log_path)
+        self._log_records = sum(len(examples) for examples in self._examples.values())
+
+
+class BudgetExhausted(Exception):
+    """Raised when an evaluation would exceed the token budget"""
+
+
+class ParallelTemplateEvaluator:
+    """
+    Scores templates on training samples with concurrent LLM calls.
+
+    Calls share a semaphore (max_concurrency) and a token budget. A call is
+    refused once the tokens used plus its prompt would exceed the budget, so
+    the overshoot is bounded by the outputs of calls already in flight.
+    Scores are cached per (template hash, sample hash).
+    """
+
+    def __init__(self, llm, evaluate_fn: Callable, budget: EvaluationBudget):
+        self.llm = llm
+        self.evaluate_fn = evaluate_fn
+        self.budget = budget
+        self._semaphore = asyncio.Semaphore(budget.max_concurrency)
+        self._cache: Dict[tuple, float] = {}
+        self.tokens_used = 0
+        self._tokens_reserved = 0
+        self.stats = {"llm_calls": 0, "cache_hits": 0, "refused": 0}
+
+    @property
+    def exhausted(self) -> bool:
+        """True once the budget is used up or has refused a call"""
+        return (
+            self.stats["refused"] > 0
+            or self.tokens_used + self._tokens_reserved >= self.budget.max_tokens
+        )
+
+    @staticmethod
+    def template_hash(template: PromptTemplate) -> str:
+        content = {
+            "template": template.template,
+            "variables": template.variables,
+            "examples": [(e.input, e.output) for e in template.examples],
+            "chain_of_thought": template.chain_of_thought,
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def sample_hash(sample: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(sample, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def score(self, template: PromptTemplate, sample: Dict[str, Any]) -> Optional[float]:
+        """Score one sample; None when the budget refused the call"""
+        key = (self.template_hash(template), self.sample_hash(sample))
+        if key in self._cache:
+            self.stats["cache_hits"] += 1
+            return self._cache[key]
+
+        from ..llm.providers import LLMMessage
+        from ..llm.tokenizer import count_tokens
+
+        prompt = template.render(**sample)
+        prompt_tokens = count_tokens(prompt)
+
+        async with self._semaphore:
+            if self.tokens_used + self._tokens_reserved + prompt_tokens > self.budget.max_tokens:
+                self.stats["refused"] += 1
+                return None
+            self._tokens_reserved += prompt_tokens
+            try:
+                self.stats["llm_calls"] += 1
+                response = await self.llm.generate(
+                    [LLMMessage(role="user", content=prompt)],
+                    max_tokens=self.budget.max_output_tokens,
+                )
+            finally:
+                self._tokens_reserved -= prompt_tokens
+
+        usage = response.usage or {}
+        if usage.get("input_tokens") is not None:
+            self.tokens_used += (
+                usage.get("input_tokens", 0)
+                + usage.get("cache_read_input_tokens", 0)
+                + usage.get("cache_creation_input_tokens", 0)
+                + usage.get("output_tokens", 0)
+            )
+        else:
+            self.tokens_used += prompt_tokens + count_tokens(response.content)
+
+        try:
+            value = self.evaluate_fn(prompt, response.content)
+            if inspect.isawaitable(value):
+                value = await value
+            value = float(value)
+        except Exception as e:
+            logger.debug(f"Evaluation failed: {e}")
+            value = 0.0
+
+        self._cache[key] = value
+        return value
+
+    async def evaluate(
+        self,
+        templates: List[PromptTemplate],
+        samples: List[Dict[str, Any]],
+    ) -> List[Optional[float]]:
+        """
+        Mean score of each template over the samples, all evaluated at once.
+
+        Samples refused by the budget are left out of the mean; a template
+        with no scored samples gets None.
+        """
+        scores = await asyncio.gather(*(
+            self.score(template, sample) for template in templates for sample in samples
+        ))
+        results = []
+        for i in range(len(templates)):
+            scored = [s for s in scores[i * len(samples):(i + 1) * len(samples)] if s is not None]
+            results.append(sum(scored) / len(scored) if scored else None)
+        return results
+
 
 class PromptOptimizer:
     """
@@ -319,7 +608,10 @@ class PromptOptimizer:
         train_data: List[Dict[str, str]],
         metric: OptimizationMetric = OptimizationMetric.EXECUTION_SUCCESS,
         max_iterations: int = 10,
-        target_score: float = 0.9
+        target_score: float = 0.9,
+        parallel: bool = False,
+        llm=None,
+        budget: Optional[EvaluationBudget] = None,
     ) -> OptimizationResult:
         """
         Optimize a prompt template.
@@ -331,10 +623,18 @@ class PromptOptimizer:
             metric: Optimization metric
             max_iterations: Maximum optimization iterations
             target_score: Stop when this score is achieved
+            parallel: Evaluate all strategies concurrently (see optimize_parallel)
+            llm: Provider or router for parallel mode (default: LLM router)
+            budget: Concurrency and token budget for parallel mode
 
         Returns:
             OptimizationResult with optimized prompt
         """
+        if parallel:
+            return await self.optimize_parallel(
+                template, evaluate_fn, train_data, llm=llm, budget=budget,
+                max_iterations=max_iterations, target_score=target_score,
+            )
         if self._dspy_available:
             return await self._optimize_with_dspy(
                 template, evaluate_fn, train_data, metric, max_iterations, target_score
@@ -482,6 +782,114 @@ class PromptOptimizer:
 
         return sum(scores) / len(scores) if scores else 0.0
 
+    async def optimize_parallel(
+        self,
+        template: PromptTemplate,
+        evaluate_fn: Callable,
+        train_data: List[Dict],
+        llm=None,
+        budget: Optional[EvaluationBudget] = None,
+        max_iterations: int = 10,
+        target_score: float = 0.9,
+        max_samples: int = 10,
+    ) -> OptimizationResult:
+        """
+        Optimize by racing all strategies at once under a budget.
+
+        Each generation applies every strategy to the current best template
+        and runs successive halving over the candidates: all of them are
+        scored concurrently on a few samples, the better half advances to
+        twice as many samples, until one remains or all samples are used.
+        Stops at the target score, when no candidate beats the current
+        best, or when the token budget is spent.
+        """
+        if llm is None:
+            from ..llm.router import get_llm_router
+            llm = get_llm_router()
+        budget = budget or EvaluationBudget()
+        evaluator = ParallelTemplateEvaluator(llm, evaluate_fn, budget)
+        samples = train_data[:max_samples] or [{}]
+
+        strategies = [
+            self._add_chain_of_thought,
+            self._add_examples,
+            self._add_constraints,
+            self._add_format_instructions,
+            self._simplify_prompt,
+        ]
+
+        best = template
+        best_score = (await evaluator.evaluate([template], samples))[0] or 0.0
+        scores_history = [best_score]
+        candidates_evaluated = 1
+
+        for _ in range(max_iterations):
+            if best_score >= target_score or evaluator.exhausted:
+                break
+
+            # Children of the current best, one per strategy, deduplicated
+            seen = {evaluator.template_hash(best)}
+            candidates = []
+            for strategy in strategies:
+                child = strategy(best, scores_history)
+                child_hash = evaluator.template_hash(child)
+                if child_hash not in seen:
+                    seen.add(child_hash)
+                    candidates.append(child)
+            if not candidates:
+                break
+            candidates_evaluated += len(candidates)
+
+            winner, winner_score = await self._successive_halving(candidates, samples, evaluator)
+            if winner is None or winner_score <= best_score:
+                break
+            best, best_score = winner, winner_score
+            scores_history.append(best_score)
+
+        improvement = (best_score - scores_history[0]) / max(scores_history[0], 0.01) * 100
+
+        return OptimizationResult(
+            original_prompt=template.template,
+            optimized_prompt=best.render(),
+            improvement=improvement,
+            iterations=len(scores_history),
+            best_score=best_score,
+            examples_used=len(best.examples),
+            metrics={
+                "scores_history": scores_history,
+                "candidates_evaluated": candidates_evaluated,
+                "tokens_used": evaluator.tokens_used,
+                "budget_exhausted": evaluator.exhausted,
+                **evaluator.stats,
+            }
+        )
+
+    async def _successive_halving(
+        self,
+        candidates: List[PromptTemplate],
+        samples: List[Dict],
+        evaluator: ParallelTemplateEvaluator,
+    ) -> tuple:
+        """Return (best candidate, its score), or (None, 0.0) if none could be scored"""
+        rungs = max(0, math.ceil(math.log2(len(candidates))))
+        n_samples = max(1, len(samples) >> rungs)
+        while True:
+            scores = await evaluator.evaluate(candidates, samples[:n_samples])
+            scored = sorted(
+                ((score, i) for i, score in enumerate(scores) if score is not None),
+                key=lambda pair: (-pair[0], pair[1]),
+            )
+            if not scored:
+                return None, 0.0
+            if n_samples >= len(samples) or evaluator.exhausted:
+                break
+            candidates = [candidates[i] for _, i in scored[:math.ceil(len(scored) / 2)]]
+            # A lone survivor is scored on every sample to compare with the incumbent
+            n_samples = len(samples) if len(candidates) == 1 else min(len(samples), n_samples * 2)
+
+        score, index = scored[0]
+        return candidates[index], score
+
     def _add_chain_of_thought(
         self,
         template: PromptTemplate,
@@ -529,6 +937,8 @@ Important constraints:
 - Follow best practices for the language
 - Include error handling where appropriate
 """
+        if constraints in template.template:
+            return template
         new_template = PromptTemplate(
             template=template.template + constraints,
             variables=template.variables,
@@ -550,6 +960,8 @@ Output format:
 - Do not include markdown code blocks
 - Ensure the code is complete and runnable
 """
+        if format_inst in template.template:
+            return template
         new_template = PromptTemplate(
             template=template.template + format_inst,
             variables=template.variables,
@@ -704,8 +1116,13 @@ class SelfImprovingAgent:
         if self.template is None:
             self.template = self._create_initial_template()
 
-        # Render prompt
-        prompt = self.template.render(**kwargs)
+        # Render prompt, with past successes most similar to this input as examples
+        input_text = json.dumps(kwargs)
+        template = self.template
+        examples = self.optimizer.example_store.get_examples(self.task, query=input_text, n=3)
+        if examples:
+            template = replace(template, examples=examples)
+        prompt = template.render(**kwargs)
 
         # Call LLM
         output = llm_call(prompt)
@@ -723,7 +1140,7 @@ class SelfImprovingAgent:
         # Record for learning
         self.optimizer.record_result(
             task=self.task,
-            input_text=json.dumps(kwargs),
+            input_text=input_text,
             output=output,
             success=success,
             score=score
@@ -8,12 +8,16 @@ Features:
 - Automatic retry on validation failures
 - Support for complex nested structures
 - Streaming with partial objects
+- Streaming with incremental per-field validation and early abort
 - Multiple LLM provider support
 """
 
-from typing import TypeVar, Type, Optional, List, Dict, Any, Union
-from pydantic import BaseModel, Field
+from typing import TypeVar, Type, Optional, List, Dict, Any, Union, Tuple, AsyncIterator, Callable, Generic
+from typing import get_args, get_origin
+from dataclasses import dataclass
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from enum import Enum
+import json
 import os
 import logging
 
@@ -21,6 +25,17 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar('T', bound=BaseModel)
 
+# A system prompt as plain text, or as Anthropic content blocks (which may
+# carry cache_control breakpoints)
+SystemPrompt = Union[str, List[Dict[str, Any]]]
+
+
+def _system_text(system: Optional[SystemPrompt]) -> Optional[str]:
+    """Flatten content blocks for providers that take a plain system string"""
+    if system is None or isinstance(system, str):
+        return system
+    return "\n\n".join(block.get("text", "") for block in system)
+
 
 # ===========================================
 # Output Models for Code Generation
@@ -157,6 +172,209 @@ class TaskPlan(BaseModel):
     risks: List[str] = Field(default_factory=list)
 
 
+# ===========================================
+# Incremental JSON Validation
+# ===========================================
+
+JSONPath = Tuple[Union[str, int], ...]
+
+_SCALAR_END = set(",}] \t\r\n")
+
+
+@dataclass
+class _Frame:
+    """An open object or array in IncrementalJSONParser"""
+    kind: str  # "object" or "array"
+    path: JSONPath
+    state: str = "key"  # object: key / colon / value / comma; array: value / comma
+    key: Union[str, int, None] = None
+    index: int = 0
+    value_start: int = -1
+
+
+class IncrementalJSONParser:
+    """
+    Parses a JSON object from text chunks as they arrive.
+
+    feed() returns every value that closed within the chunk, as (path, value)
+    pairs, for values up to max_depth levels below the root: path ("files",)
+    is a top-level field, ("files", 2) the third item of that list. Any text
+    before the opening brace (e.g. a ```json fence) is skipped.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self.buffer = ""
+        self.done = False
+        self.value: Any = None
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._root_start = -1
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._scalar_start = -1
+
+    def feed(self, chunk: str) -> List[Tuple[JSONPath, Any]]:
+        """Consume a chunk of text; returns the values completed by it"""
+        self.buffer += chunk
+        completed: List[Tuple[JSONPath, Any]] = []
+
+        while self._pos < len(self.buffer) and not self.done:
+            i = self._pos
+            c = self.buffer[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    frame = self._stack[-1]
+                    if frame.kind == "object" and frame.state == "key":
+                        frame.key = json.loads(self.buffer[self._string_start:i + 1])
+                        frame.state = "colon"
+                    else:
+                        self._close_value(i + 1, completed)
+                continue
+
+            if self._scalar_start >= 0:
+                if c not in _SCALAR_END:
+                    continue
+                self._close_value(i, completed)
+
+            if c in " \t\r\n":
+                continue
+
+            if not self._stack:
+                if self._root_start < 0 and c == "{":
+                    self._root_start = i
+                    self._stack.append(_Frame(kind="object", path=()))
+                continue
+
+            frame = self._stack[-1]
+            if c == ":" and frame.kind == "object":
+                frame.state = "value"
+            elif c == ",":
+                frame.state = "key" if frame.kind == "object" else "value"
+            elif c in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self.value = json.loads(self.buffer[self._root_start:i + 1])
+                    self.done = True
+                else:
+                    self._close_value(i + 1, completed)
+            elif c == '"':
+                self._in_string = True
+                self._string_start = i
+                if not (frame.kind == "object" and frame.state == "key"):
+                    self._open_value(frame, i)
+            else:
+                self._open_value(frame, i)
+                if c in "{[":
+                    kind = "object" if c == "{" else "array"
+                    self._stack.append(_Frame(
+                        kind=kind,
+                        path=frame.path + (frame.key,),
+                        state="key" if kind == "object" else "value",
+                    ))
+                else:
+                    self._scalar_start = i
+
+        return completed
+
+    @staticmethod
+    def _open_value(frame: _Frame, start: int) -> None:
+        if frame.kind == "array":
+            frame.key = frame.index
+        frame.value_start = start
+        frame.state = "comma"
+
+    def _close_value(self, end: int, completed: List[Tuple[JSONPath, Any]]) -> None:
+        self._scalar_start = -1
+        frame = self._stack[-1]
+        path = frame.path + (frame.key,)
+        if len(path) <= self.max_depth:
+            completed.append((path, json.loads(self.buffer[frame.value_start:end])))
+        if frame.kind == "array":
+            frame.index += 1
+
+
+class FieldValidator:
+    """
+    Validates individual fields of a Pydantic model as they are completed.
+
+    Top-level fields are checked against their annotation; items of list
+    fields are checked against the item type so a bad list entry is caught
+    before the rest of the list is generated. Cross-field validators only
+    run on the full model.
+    """
+
+    def __init__(self, response_model: Type[BaseModel]):
+        self.response_model = response_model
+        self._fields = {}
+        for name, info in response_model.model_fields.items():
+            self._fields[info.alias or name] = (name, info.annotation)
+        self._adapters: Dict[JSONPath, TypeAdapter] = {}
+
+    def _adapter(self, path: JSONPath) -> Optional[TypeAdapter]:
+        if path in self._adapters:
+            return self._adapters[path]
+
+        adapter = None
+        if path[0] in self._fields:
+            annotation = self._fields[path[0]][1]
+            if len(path) == 1:
+                adapter = TypeAdapter(annotation)
+            elif isinstance(path[1], int) and get_origin(annotation) in (list, List):
+                # Bare List/list has no item type
+                item_types = get_args(annotation)
+                adapter = TypeAdapter(item_types[0] if item_types else Any)
+        self._adapters[path] = adapter
+        return adapter
+
+    def field_name(self, key: str) -> str:
+        """Attribute name for a JSON key (resolves aliases)"""
+        return self._fields.get(key, (key, None))[0]
+
+    def validate(self, path: JSONPath, value: Any) -> Any:
+        """
+        Validate a completed value.
+
+        Returns:
+            The validated (coerced) value
+
+        Raises:
+            ValidationError: If the value doesn't match the schema
+        """
+        if len(path) == 1:
+            adapter = self._adapter(path)
+        elif len(path) == 2 and isinstance(path[1], int):
+            adapter = self._adapter((path[0], 0))  # All items share one adapter
+        else:
+            adapter = None
+        return adapter.validate_python(value) if adapter else value
+
+
+@dataclass
+class PartialResult(Generic[T]):
+    """A partially (or fully) generated structured response"""
+    model: T  # Built with model_construct until done; only validated fields are set
+    completed_fields: List[str]
+    attempt: int
+    done: bool = False
+
+
+class StreamValidationError(Exception):
+    """Raised when no attempt produced a response matching the model"""
+
+    def __init__(self, message: str, errors: List[str]):
+        super().__init__(message)
+        self.errors = errors
+
+
 # ===========================================
 # Structured Output Client
 # ===========================================
@@ -253,7 +471,7 @@ class StructuredOutputClient:
         self,
         response_model: Type[T],
         messages: List[Dict[str, str]],
-        system: Optional[str] = None,
+        system: Optional[SystemPrompt] = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
         **kwargs
@@ -264,7 +482,7 @@ class StructuredOutputClient:
         Args:
             response_model: Pydantic model class for the response
             messages: List of message dicts with 'role' and 'content'
-            system: Optional system prompt
+            system: Optional system prompt (text, or Anthropic content blocks)
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
 
@@ -292,7 +510,7 @@ class StructuredOutputClient:
             else:  # openai
                 full_messages = []
                 if system:
-                    full_messages.append({"role": "system", "content": system})
+                    full_messages.append({"role": "system", "content": _system_text(system)})
                 full_messages.extend(messages)
 
                 response = client.chat.completions.create(
@@ -315,7 +533,7 @@ class StructuredOutputClient:
         self,
         response_model: Type[T],
         messages: List[Dict[str, str]],
-        system: Optional[str] = None,
+        system: Optional[SystemPrompt] = None,
         **kwargs
     ):
         """
@@ -353,6 +571,128 @@ class StructuredOutputClient:
             logger.error(f"Streaming generation failed: {e}")
             raise
 
+    async def generate_validated_stream(
+        self,
+        response_model: Type[T],
+        messages: List[Dict[str, str]],
+        system: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        stream_fn: Optional[Callable[..., AsyncIterator[str]]] = None,
+        **kwargs
+    ) -> AsyncIterator[PartialResult[T]]:
+        """
+        Stream raw JSON from the LLM, validating each field as it closes.
+
+        Every time a top-level field completes and passes validation, a
+        PartialResult with the fields so far is yielded, so callers can render
+        progressively. On the first invalid field (or item of a list field)
+        the stream is abandoned and the request is retried with a corrective
+        message, instead of paying for the rest of a doomed generation.
+
+        Args:
+            response_model: Pydantic model class for the response
+            messages: List of message dicts with 'role' and 'content'
+            system: Optional system prompt
+            max_retries: Attempts before giving up (default: self.max_retries)
+            stream_fn: Async text stream taking a list of LLMMessage
+                (default: the LLM router's stream)
+
+        Yields:
+            PartialResult objects; the last one has done=True and a fully
+            validated model
+
+        Raises:
+            StreamValidationError: If every attempt failed validation
+        """
+        from ..llm.providers import LLMMessage
+
+        if stream_fn is None:
+            from ..llm.router import get_llm_router
+            stream_fn = get_llm_router().stream
+
+        validator = FieldValidator(response_model)
+        schema = json.dumps(response_model.model_json_schema())
+        instructions = (
+            f"{system or 'You are a helpful assistant that generates structured data.'}\n\n"
+            f"Respond with a single JSON object matching this JSON schema, and nothing else:\n{schema}"
+        )
+        conversation = [LLMMessage(role="system", content=instructions)]
+        conversation += [LLMMessage(role=m["role"], content=m["content"]) for m in messages]
+
+        errors: List[str] = []
+        attempts = max_retries or self.max_retries
+
+        for attempt in range(1, attempts + 1):
+            parser = IncrementalJSONParser()
+            fields: Dict[str, Any] = {}
+            error: Optional[str] = None
+
+            stream = stream_fn(conversation, **kwargs)
+            try:
+                async for chunk in stream:
+                    try:
+                        completed = parser.feed(chunk)
+                    except json.JSONDecodeError as e:
+                        error = f"Malformed JSON: {e}"
+                        break
+
+                    for path, value in completed:
+                        try:
+                            value = validator.validate(path, value)
+                        except ValidationError as e:
+                            location = ".".join(str(p) for p in path)
+                            error = f"Field '{location}' is invalid: {e.errors()[0]['msg']}"
+                            break
+                        if len(path) == 1:
+                            fields[validator.field_name(path[0])] = value
+                            yield PartialResult(
+                                model=response_model.model_construct(**fields),
+                                completed_fields=list(fields),
+                                attempt=attempt,
+                            )
+
+                    if error or parser.done:
+                        break
+            finally:
+                # Stop the underlying request instead of draining it
+                if hasattr(stream, "aclose"):
+                    await stream.aclose()
+
+            if error is None:
+                if not parser.done:
+                    error = "Response ended before the JSON object was complete"
+                else:
+                    try:
+                        model = response_model.model_validate(parser.value)
+                    except ValidationError as e:
+                        error = f"Response failed validation: {e}"
+                    else:
+                        yield PartialResult(
+                            model=model,
+                            completed_fields=list(fields),
+                            attempt=attempt,
+                            done=True,
+                        )
+                        return
+
+            errors.append(error)
+            logger.warning(f"Structured stream attempt {attempt} aborted: {error}")
+            conversation = conversation + [
+                LLMMessage(role="assistant", content=parser.buffer),
+                LLMMessage(
+                    role="user",
+                    content=(
+                        f"{error}. Start over and respond with the complete JSON object, "
+                        "making sure every field matches the schema."
+                    ),
+                ),
+            ]
+
+        raise StreamValidationError(
+            f"No valid {response_model.__name__} after {attempts} attempts",
+            errors,
+        )
+
     def _generate_mock(self, response_model: Type[T]) -> T:
         """Generate mock data for development without API keys"""
         logger.info(f"Generating mock {response_model.__name__}")
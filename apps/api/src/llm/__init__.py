@@ -8,6 +8,12 @@ from .providers import (
     OpenAIProvider,
     MockProvider,
 )
+from .tokenizer import (
+    TokenCounter,
+    ContextBudgeter,
+    get_token_counter,
+    count_tokens,
+)
 
 __all__ = [
     "LLMRouter",
@@ -16,4 +22,8 @@ __all__ = [
     "AnthropicProvider",
     "OpenAIProvider",
     "MockProvider",
+    "TokenCounter",
+    "ContextBudgeter",
+    "get_token_counter",
+    "count_tokens",
 ]
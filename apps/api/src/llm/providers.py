@@ -22,8 +22,10 @@ from abc import ABC, abstractmethod
 from typing import Optional, AsyncIterator, Dict, Any, List
 from dataclasses import dataclass
 import asyncio
+import hashlib
 import logging
 import os
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +46,7 @@ class LLMMessage:
     """Standard message format for LLM requests"""
     role: str  # "system", "user", "assistant"
     content: str
+    cacheable: bool = False  # Stable prefix: mark for provider-side prompt caching
 
 
 class LLMProvider(ABC):
@@ -78,6 +81,149 @@ class LLMProvider(ABC):
         """Check if this provider is configured and available"""
         pass
 
+    # Constrained decoding capabilities (see ai/constrained_generation.py).
+    # Token-level constraints need the vocabulary and per-step scores;
+    # structured-output modes take a JSON schema with the request. The
+    # defaults below describe a provider with neither.
+    supports_token_constraints: bool = False
+    supports_structured_output: bool = False
+
+    def vocabulary(self) -> List[str]:
+        """Token strings, indexed by token id (empty without token-level access)"""
+        return []
+
+    async def next_token_scores(self, messages: List[LLMMessage], prefix: str) -> Dict[int, float]:
+        """Scores (logits) for the next token after prefix, keyed by token id (empty without token-level access)"""
+        return {}
+
+    def structured_output_kwargs(self, schema: Dict[str, Any], name: str = "output") -> Dict[str, Any]:
+        """Request arguments that make the provider enforce a JSON schema (none without a structured output mode)"""
+        return {}
+
+
+class _NotStrict(Exception):
+    """A JSON schema that strict structured outputs cannot express"""
+
+
+def strict_json_schema(schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Rewrite a JSON schema (e.g. Pydantic's model_json_schema()) into the
+    form OpenAI strict structured outputs accept.
+
+    Every object gets additionalProperties: false and lists all of its
+    properties as required; properties that were optional become nullable.
+    Local $refs are inlined and defaults dropped.
+
+    Returns:
+        The strict schema, or None when the schema can't be expressed
+        strictly (free-form maps, recursive models)
+    """
+    defs = {**schema.get("definitions", {}), **schema.get("$defs", {})}
+
+    def nullable(node: Dict[str, Any]) -> Dict[str, Any]:
+        options = node.get("anyOf", [node])
+        if any(option.get("type") == "null" for option in options):
+            return node
+        if "anyOf" in node:
+            return {**node, "anyOf": [*node["anyOf"], {"type": "null"}]}
+        return {"anyOf": [node, {"type": "null"}]}
+
+    def convert(node: Any, seen: frozenset) -> Any:
+        if not isinstance(node, dict):
+            return node
+        if "$ref" in node:
+            name = node["$ref"].rsplit("/", 1)[-1]
+            if name not in defs or name in seen:
+                raise _NotStrict(node["$ref"])
+            siblings = {k: v for k, v in node.items() if k != "$ref"}
+            return {**convert(defs[name], seen | {name}), **convert(siblings, seen)}
+
+        out: Dict[str, Any] = {}
+        for key, value in node.items():
+            if key in ("default", "$defs", "definitions"):
+                continue
+            if key == "properties":
+                out[key] = {name: convert(prop, seen) for name, prop in value.items()}
+            elif key in ("items", "additionalProperties", "not") and isinstance(value, dict):
+                out[key] = convert(value, seen)
+            elif key in ("anyOf", "oneOf", "allOf", "prefixItems"):
+                out[key] = [convert(option, seen) for option in value]
+            else:
+                out[key] = value
+
+        if node.get("type") == "object" or "properties" in node:
+            if "properties" not in node or node.get("additionalProperties") not in (None, False):
+                raise _NotStrict("free-form object")
+            required = set(node.get("required", []))
+            out["properties"] = {
+                name: prop if name in required else nullable(prop)
+                for name, prop in out["properties"].items()
+            }
+            out["required"] = list(out["properties"])
+            out["additionalProperties"] = False
+        return out
+
+    try:
+        return convert(schema, frozenset())
+    except _NotStrict as e:
+        logger.debug(f"Schema not expressible in strict mode ({e}); sending it non-strict")
+        return None
+
+
+def _json_schema_response_format(schema: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """response_format for OpenAI-compatible structured outputs (strict when the schema allows)"""
+    strict = strict_json_schema(schema)
+    return {
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": name,
+                "schema": strict if strict is not None else schema,
+                "strict": strict is not None,
+            },
+        }
+    }
+
+
+def _anthropic_payload(messages: List[LLMMessage]) -> tuple:
+    """
+    Convert messages to Anthropic's (system, messages) format.
+
+    System messages are concatenated in order. Messages marked cacheable
+    become content blocks with an ephemeral cache_control breakpoint.
+    """
+    def block(msg: LLMMessage) -> Dict[str, Any]:
+        text = {"type": "text", "text": msg.content}
+        if msg.cacheable:
+            text["cache_control"] = {"type": "ephemeral"}
+        return text
+
+    system_messages = [m for m in messages if m.role == "system"]
+    if any(m.cacheable for m in system_messages):
+        system: Any = [block(m) for m in system_messages]
+    else:
+        system = "\n\n".join(m.content for m in system_messages)
+
+    api_messages = [
+        {"role": m.role, "content": [block(m)] if m.cacheable else m.content}
+        for m in messages
+        if m.role != "system"
+    ]
+    return system, api_messages
+
+
+def _openai_usage(usage: Any) -> Dict[str, int]:
+    """Usage dict for OpenAI-compatible responses; cached prompt tokens reported separately"""
+    if not usage:
+        return {"input_tokens": 0, "output_tokens": 0}
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+    return {
+        "input_tokens": usage.prompt_tokens - cached,
+        "output_tokens": usage.completion_tokens,
+        "cache_read_input_tokens": cached,
+    }
+
 
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude provider"""
@@ -119,17 +265,7 @@ class AnthropicProvider(LLMProvider):
         client = self._get_client()
 
         # Convert to Anthropic format
-        system_message = None
-        api_messages = []
-
-        for msg in messages:
-            if msg.role == "system":
-                system_message = msg.content
-            else:
-                api_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
+        system_message, api_messages = _anthropic_payload(messages)
 
         response = await client.messages.create(
             model=self.model,
@@ -147,6 +283,8 @@ class AnthropicProvider(LLMProvider):
             usage={
                 "input_tokens": response.usage.input_tokens,
                 "output_tokens": response.usage.output_tokens,
+                "cache_creation_input_tokens": getattr(response.usage, "cache_creation_input_tokens", 0) or 0,
+                "cache_read_input_tokens": getattr(response.usage, "cache_read_input_tokens", 0) or 0,
             },
             finish_reason=response.stop_reason,
             raw_response=response
@@ -163,17 +301,7 @@ class AnthropicProvider(LLMProvider):
         client = self._get_client()
 
         # Convert to Anthropic format
-        system_message = None
-        api_messages = []
-
-        for msg in messages:
-            if msg.role == "system":
-                system_message = msg.content
-            else:
-                api_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
+        system_message, api_messages = _anthropic_payload(messages)
 
         async with client.messages.stream(
             model=self.model,
@@ -191,6 +319,7 @@ class OpenAIProvider(LLMProvider):
     """OpenAI GPT provider"""
 
     name = "openai"
+    supports_structured_output = True
 
     def __init__(
         self,
@@ -216,6 +345,9 @@ class OpenAIProvider(LLMProvider):
         """Check if OpenAI API key is configured"""
         return bool(self.api_key)
 
+    def structured_output_kwargs(self, schema: Dict[str, Any], name: str = "output") -> Dict[str, Any]:
+        return _json_schema_response_format(schema, name)
+
     async def generate(
         self,
         messages: List[LLMMessage],
@@ -246,10 +378,7 @@ class OpenAIProvider(LLMProvider):
             content=choice.message.content,
             model=self.model,
             provider=self.name,
-            usage={
-                "input_tokens": response.usage.prompt_tokens,
-                "output_tokens": response.usage.completion_tokens,
-            },
+            usage=_openai_usage(response.usage),
             finish_reason=choice.finish_reason,
             raw_response=response
         )
@@ -288,6 +417,7 @@ class GrokProvider(LLMProvider):
     """xAI Grok provider - uses OpenAI-compatible API"""
 
     name = "grok"
+    supports_structured_output = True
 
     def __init__(
         self,
@@ -317,6 +447,9 @@ class GrokProvider(LLMProvider):
         """Check if Grok API key is configured"""
         return bool(self.api_key)
 
+    def structured_output_kwargs(self, schema: Dict[str, Any], name: str = "output") -> Dict[str, Any]:
+        return _json_schema_response_format(schema, name)
+
     async def generate(
         self,
         messages: List[LLMMessage],
@@ -347,10 +480,7 @@ class GrokProvider(LLMProvider):
             content=choice.message.content,
             model=self.model,
             provider=self.name,
-            usage={
-                "input_tokens": response.usage.prompt_tokens if response.usage else 0,
-                "output_tokens": response.usage.completion_tokens if response.usage else 0,
-            },
+            usage=_openai_usage(response.usage),
             finish_reason=choice.finish_reason,
             raw_response=response
         )
@@ -385,13 +515,103 @@ class GrokProvider(LLMProvider):
                 yield chunk.choices[0].delta.content
 
 
+# Lifetime of an ephemeral prompt cache entry (Anthropic's default)
+PROMPT_CACHE_TTL_SECONDS = 300
+
+
+# Deterministic vocabulary for MockProvider's token-level interface. Earlier
+# tokens are preferred when the mock has no better choice, so structural
+# characters come first and constrained generations terminate quickly.
+MOCK_VOCABULARY = list(dict.fromkeys(
+    ['"', "}", "]", "0", ",", ":", "{", "[", '{"', '":', '",', '"}', '":"', "},", "],"]
+    + ["true", "false", "null"]
+    + list("123456789-.+eE")
+    + ["name", "id", "type", "value", "data", "user", "email", "com", "the", " "]
+    + [chr(c) for c in range(ord("a"), ord("z") + 1)]
+    + [chr(c) for c in range(ord("A"), ord("Z") + 1)]
+    + list("_@/#()!?';=<>*&%$^~|\\\n\t")
+))
+
+
 class MockProvider(LLMProvider):
     """Mock provider for local development and testing"""
 
     name = "mock"
+    supports_token_constraints = True
 
-    def __init__(self, delay: float = 0.5):
+    def __init__(
+        self,
+        delay: float = 0.5,
+        vocabulary: Optional[List[str]] = None,
+        scripted_output: Optional[str] = None,
+    ):
+        """
+        Args:
+            delay: Simulated latency for generate / stream
+            vocabulary: Token vocabulary for constrained decoding
+            scripted_output: Text the mock "wants" to produce when decoding
+                token by token (default: its canned response)
+        """
         self.delay = delay
+        self._vocabulary = list(vocabulary or MOCK_VOCABULARY)
+        self.scripted_output = scripted_output
+        self._prompt_cache: Dict[str, float] = {}  # Cached prefix hash -> expiry
+
+    def _usage(self, messages: List[LLMMessage], output: str) -> Dict[str, int]:
+        """
+        Token usage with Anthropic-style prompt caching: the longest
+        previously seen prefix ending at a cacheable message is read from
+        cache, the rest of the prefix up to the last cacheable message is
+        written to it. Tokens are whitespace-separated words.
+        """
+        now = time.monotonic()
+        digest = hashlib.sha256()
+        total = 0
+        breakpoints = []  # (prefix hash, tokens up to and including the message)
+        for msg in messages:
+            digest.update(f"{msg.role}\0{msg.content}\0".encode())
+            total += len(msg.content.split())
+            if msg.cacheable:
+                breakpoints.append((digest.hexdigest(), total))
+
+        read = 0
+        for prefix, tokens in breakpoints:
+            if self._prompt_cache.get(prefix, 0) > now:
+                read = tokens
+        written = (breakpoints[-1][1] - read) if breakpoints else 0
+        for prefix, _ in breakpoints:
+            self._prompt_cache[prefix] = now + PROMPT_CACHE_TTL_SECONDS
+
+        return {
+            "input_tokens": total - read - written,
+            "output_tokens": len(output.split()),
+            "cache_creation_input_tokens": written,
+            "cache_read_input_tokens": read,
+        }
+
+    def vocabulary(self) -> List[str]:
+        return self._vocabulary
+
+    async def next_token_scores(self, messages: List[LLMMessage], prefix: str) -> Dict[int, float]:
+        """
+        Deterministic scores: tokens continuing the scripted output score
+        highest (longer first), then end-of-sequence once it is complete,
+        then the rest of the vocabulary in order.
+        """
+        target = self.scripted_output
+        if target is None:
+            user_message = next((m.content for m in reversed(messages) if m.role == "user"), "")
+            target = self._generate_mock_content(user_message)
+
+        size = len(self._vocabulary)
+        scores = {token_id: -token_id / size for token_id in range(size)}
+        # End of sequence (-1) ranks above the fallback tokens
+        scores[-1] = 3.0 if prefix == target else 0.5
+        if target.startswith(prefix):
+            for token_id, token in enumerate(self._vocabulary):
+                if token and target.startswith(token, len(prefix)):
+                    scores[token_id] = 1.0 + len(token)
+        return scores
 
     def is_available(self) -> bool:
         """Mock is always available"""
@@ -421,10 +641,7 @@ class MockProvider(LLMProvider):
             content=content,
             model="mock-model",
             provider=self.name,
-            usage={
-                "input_tokens": sum(len(m.content.split()) for m in messages),
-                "output_tokens": len(content.split()),
-            },
+            usage=self._usage(messages, content),
             finish_reason="stop"
         )
 
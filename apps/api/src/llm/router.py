@@ -22,6 +22,7 @@ from .providers import (
     OpenAIProvider,
     MockProvider,
 )
+from .tokenizer import ContextBudgeter
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +47,9 @@ class RouterStats:
     provider_usage: Dict[str, int] = field(default_factory=dict)
     total_input_tokens: int = 0
     total_output_tokens: int = 0
+    total_cache_read_tokens: int = 0
+    total_cache_write_tokens: int = 0
+    context_trims: int = 0
 
 
 class LLMRouter:
@@ -61,13 +65,16 @@ class LLMRouter:
         response = await router.generate(messages)
     """
 
-    def __init__(self, use_mock_fallback: bool = True):
+    def __init__(self, use_mock_fallback: bool = True, budget_context: bool = True):
         """
         Initialize the router.
 
         Args:
             use_mock_fallback: If True, adds MockProvider as last resort fallback
+            budget_context: If True, trims messages to each provider's context
+                window (minus max_tokens) before sending
         """
+        self.budget_context = budget_context
         self.providers: List[ProviderConfig] = []
         self.stats = RouterStats()
         self._lock = asyncio.Lock()
@@ -160,6 +167,7 @@ class LLMRouter:
         last_error = None
 
         for config in providers_to_try:
+            provider_messages = self._fit_context(config.provider, messages, max_tokens)
             for attempt in range(config.max_retries):
                 try:
                     logger.debug(
@@ -168,7 +176,7 @@ class LLMRouter:
 
                     response = await asyncio.wait_for(
                         config.provider.generate(
-                            messages=messages,
+                            messages=provider_messages,
                             max_tokens=max_tokens,
                             temperature=temperature,
                             **kwargs
@@ -189,6 +197,12 @@ class LLMRouter:
                             self.stats.total_output_tokens += response.usage.get(
                                 "output_tokens", 0
                             )
+                            self.stats.total_cache_read_tokens += response.usage.get(
+                                "cache_read_input_tokens", 0
+                            )
+                            self.stats.total_cache_write_tokens += response.usage.get(
+                                "cache_creation_input_tokens", 0
+                            )
 
                     logger.info(f"Generated response with {config.name}")
                     return response
@@ -246,7 +260,7 @@ class LLMRouter:
                 logger.debug(f"Streaming with provider {config.name}")
 
                 async for chunk in config.provider.stream(
-                    messages=messages,
+                    messages=self._fit_context(config.provider, messages, max_tokens),
                     max_tokens=max_tokens,
                     temperature=temperature,
                     **kwargs
@@ -263,6 +277,22 @@ class LLMRouter:
 
         raise Exception(f"All LLM providers failed for streaming. Last error: {last_error}")
 
+    def _fit_context(
+        self,
+        provider: LLMProvider,
+        messages: List[LLMMessage],
+        max_tokens: int
+    ) -> List[LLMMessage]:
+        """Trim messages to the provider model's context window, keeping max_tokens for output"""
+        if not self.budget_context:
+            return messages
+        model = getattr(provider, "model", provider.name)
+        result = ContextBudgeter(model, reserved_output_tokens=max_tokens).fit(messages)
+        if result.changed:
+            # No await between read and write, so no lock needed
+            self.stats.context_trims += 1
+        return result.messages
+
     def _get_providers_to_try(
         self,
         preferred_provider: Optional[str] = None
@@ -294,6 +324,9 @@ class LLMRouter:
             "provider_usage": self.stats.provider_usage,
             "total_input_tokens": self.stats.total_input_tokens,
             "total_output_tokens": self.stats.total_output_tokens,
+            "total_cache_read_tokens": self.stats.total_cache_read_tokens,
+            "total_cache_write_tokens": self.stats.total_cache_write_tokens,
+            "context_trims": self.stats.context_trims,
             "available_providers": self.get_available_providers(),
         }
 
@@ -0,0 +1,484 @@
+"""
+Token counting and context budgeting
+
+Counts tokens with real BPE tokenizers when their vocab files are available
+locally, so no request ever depends on a network download:
+
+- BPE: tiktoken encodings loaded from `<TOKENIZER_DIR>/<encoding>.tiktoken`
+  (default: apps/api/tokenizers/)
+- Heuristic: regex pre-tokenization, used when tiktoken or the vocab file
+  is missing
+
+Counts are cached per (tokenizer, text hash). ContextBudgeter fits a
+conversation into a model's context window, keeping room for the output.
+
+The vocab files are not checked in. Fetch them once (needs network) with:
+
+    python scripts/fetch_tokenizers.py
+
+The API logs a warning at startup while any of them are missing.
+
+Environment variables:
+- TOKENIZER_DIR: directory holding .tiktoken vocab files
+"""
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .providers import LLMMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKENIZER_DIR = Path(__file__).parent.parent.parent / "tokenizers"
+
+# Max cached token counts
+MAX_CACHED_COUNTS = 4096
+
+# Per-message framing (role markers, separators) added by chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+
+TRUNCATION_MARKER = "\n...[truncated]"
+
+# Model name prefix -> BPE encoding. Claude and Grok tokenizers are not
+# published; cl100k_base is a close stand-in for budgeting purposes.
+MODEL_ENCODINGS: Dict[str, str] = {
+    "gpt-4o": "o200k_base",
+    "o1": "o200k_base",
+    "o3": "o200k_base",
+    "gpt-4": "cl100k_base",
+    "gpt-3.5": "cl100k_base",
+    "claude": "cl100k_base",
+    "grok": "cl100k_base",
+}
+
+# Model name prefix -> context window in tokens
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "claude": 200_000,
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4": 8_192,
+    "gpt-3.5": 16_385,
+    "o1": 200_000,
+    "o3": 200_000,
+    "grok": 131_072,
+    "mock": 200_000,
+}
+DEFAULT_CONTEXT_WINDOW = 128_000
+
+# Pre-tokenization patterns for the supported encodings (from tiktoken)
+_BPE_SPECS: Dict[str, Tuple[str, Dict[str, int]]] = {
+    "cl100k_base": (
+        r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s""",
+        {"<|endoftext|>": 100257},
+    ),
+    "o200k_base": (
+        "|".join([
+            r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+            r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+            r"""\p{N}{1,3}""",
+            r""" ?[^\s\p{L}\p{N}]+[\r\n/]*""",
+            r"""\s*[\r\n]+""",
+            r"""\s+(?!\S)""",
+            r"""\s+""",
+        ]),
+        {"<|endoftext|>": 199999},
+    ),
+}
+
+
+# Encoding -> (download URL, sha256) for scripts/fetch_tokenizers.py
+BPE_VOCAB_SOURCES: Dict[str, Tuple[str, str]] = {
+    "cl100k_base": (
+        "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+        "223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7",
+    ),
+    "o200k_base": (
+        "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken",
+        "446a9538cb6c348e3516120d7c08b09f57c36495e2acfffe59a5bf8b0cfb1a2d",
+    ),
+}
+
+
+def tokenizer_dir(vocab_dir: Optional[str] = None) -> Path:
+    """Directory holding the .tiktoken vocab files"""
+    return Path(vocab_dir or os.getenv("TOKENIZER_DIR") or DEFAULT_TOKENIZER_DIR)
+
+
+def missing_vocab_files(vocab_dir: Optional[str] = None) -> List[str]:
+    """Encodings whose vocab file is not present locally"""
+    directory = tokenizer_dir(vocab_dir)
+    return [name for name in _BPE_SPECS if not (directory / f"{name}.tiktoken").exists()]
+
+
+def warn_if_vocab_missing(vocab_dir: Optional[str] = None) -> List[str]:
+    """Log a warning when token counts will fall back to the heuristic"""
+    missing = missing_vocab_files(vocab_dir)
+    if missing:
+        logger.warning(
+            f"Tokenizer vocab files missing from {tokenizer_dir(vocab_dir)}: {', '.join(missing)}. "
+            "Token counts use the heuristic; run scripts/fetch_tokenizers.py to install them."
+        )
+    return missing
+
+
+def _match_prefix(model: str, table: Dict[str, object]):
+    """Value for the longest key that prefixes the model name"""
+    model = (model or "").lower()
+    for prefix in sorted(table, key=len, reverse=True):
+        if model.startswith(prefix):
+            return table[prefix]
+    return None
+
+
+def context_window(model: str) -> int:
+    """Context window size for a model name"""
+    return _match_prefix(model, MODEL_CONTEXT_WINDOWS) or DEFAULT_CONTEXT_WINDOW
+
+
+# ===========================================
+# Tokenizers
+# ===========================================
+
+class Tokenizer:
+    """Base tokenizer: counts tokens and truncates text to a token limit"""
+
+    name: str = "base"
+
+    def count(self, text: str) -> int:
+        raise NotImplementedError
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Longest prefix of text within max_tokens (binary search on length)"""
+        if self.count(text) <= max_tokens:
+            return text
+        low, high = 0, len(text)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count(text[:mid]) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+        return text[:low]
+
+
+class HeuristicTokenizer(Tokenizer):
+    """
+    Offline approximation of BPE token counts.
+
+    Splits like a BPE pre-tokenizer (words, numbers, punctuation runs), then
+    charges ~4 characters per token within each piece. Much closer than
+    len(text) / 4 for code and punctuation-heavy prompts.
+    """
+
+    name = "heuristic"
+
+    _PIECES = re.compile(r" ?[A-Za-z]+| ?\d{1,3}| ?[^\sA-Za-z\d]+|\s+")
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        tokens = 0
+        for piece in self._PIECES.findall(text):
+            stripped = piece.strip()
+            if not stripped:
+                tokens += 1
+            elif not stripped[0].isalnum():
+                tokens += len(stripped)  # Symbols rarely merge
+            else:
+                tokens += math.ceil(len(stripped) / 4)
+        return tokens
+
+
+class BPETokenizer(Tokenizer):
+    """Exact counts from a tiktoken encoding"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.name = encoding.name
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return self.encoding.decode(tokens[:max_tokens])
+
+
+@lru_cache(maxsize=None)
+def load_bpe_tokenizer(encoding_name: str, vocab_dir: Optional[str] = None) -> Optional[BPETokenizer]:
+    """
+    Load a BPE tokenizer from a local vocab file.
+
+    Returns None when tiktoken is not installed, the encoding is unknown or
+    `<vocab_dir>/<encoding_name>.tiktoken` does not exist.
+    """
+    spec = _BPE_SPECS.get(encoding_name)
+    vocab_path = tokenizer_dir(vocab_dir) / f"{encoding_name}.tiktoken"
+    if spec is None or not vocab_path.exists():
+        return None
+
+    try:
+        import tiktoken
+        from tiktoken.load import load_tiktoken_bpe
+    except ImportError:
+        logger.debug("tiktoken not installed, using heuristic token counts")
+        return None
+
+    try:
+        pat_str, special_tokens = spec
+        encoding = tiktoken.Encoding(
+            name=encoding_name,
+            pat_str=pat_str,
+            mergeable_ranks=load_tiktoken_bpe(str(vocab_path)),
+            special_tokens=special_tokens,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to load tokenizer {vocab_path}: {e}")
+        return None
+
+    logger.info(f"Loaded BPE tokenizer {encoding_name} from {vocab_path}")
+    return BPETokenizer(encoding)
+
+
+# ===========================================
+# Token Counter
+# ===========================================
+
+class TokenCounter:
+    """
+    Counts tokens per model with an LRU cache keyed by text hash.
+
+    Custom tokenizers can be registered for a model name prefix; otherwise
+    the model's BPE encoding is used when its vocab is available locally,
+    falling back to the heuristic.
+    """
+
+    def __init__(self, vocab_dir: Optional[str] = None, max_cached: int = MAX_CACHED_COUNTS):
+        self.vocab_dir = vocab_dir
+        self.max_cached = max_cached
+        self._custom: Dict[str, Tokenizer] = {}
+        self._tokenizers: Dict[str, Tokenizer] = {}
+        self._heuristic = HeuristicTokenizer()
+        self._cache: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0}
+
+    def register_tokenizer(self, model_prefix: str, tokenizer: Tokenizer) -> None:
+        """Use a tokenizer for every model whose name starts with model_prefix"""
+        self._custom[model_prefix.lower()] = tokenizer
+        self._tokenizers.clear()
+
+    def tokenizer_for(self, model: Optional[str] = None) -> Tokenizer:
+        """Best available tokenizer for a model"""
+        key = (model or "").lower()
+        tokenizer = self._tokenizers.get(key)
+        if tokenizer is None:
+            tokenizer = _match_prefix(key, self._custom)
+            if tokenizer is None:
+                encoding = _match_prefix(key, MODEL_ENCODINGS) or "cl100k_base"
+                tokenizer = load_bpe_tokenizer(encoding, self.vocab_dir) or self._heuristic
+            self._tokenizers[key] = tokenizer
+        return tokenizer
+
+    def count(self, text: str, model: Optional[str] = None) -> int:
+        """Token count of text for a model"""
+        if not text:
+            return 0
+        tokenizer = self.tokenizer_for(model)
+        key = (tokenizer.name, hashlib.sha1(text.encode("utf-8")).hexdigest())
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_stats["hits"] += 1
+                return cached
+            self.cache_stats["misses"] += 1
+
+        tokens = tokenizer.count(text)
+
+        with self._lock:
+            self._cache[key] = tokens
+            if len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def count_messages(self, messages: List[LLMMessage], model: Optional[str] = None) -> int:
+        """Token count of a conversation including per-message overhead"""
+        return sum(self.count(m.content, model) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+    def truncate(self, text: str, max_tokens: int, model: Optional[str] = None) -> str:
+        """Truncate text to at most max_tokens for a model"""
+        return self.tokenizer_for(model).truncate(text, max_tokens)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.cache_stats = {"hits": 0, "misses": 0}
+
+
+# Global instance
+_counter: Optional[TokenCounter] = None
+
+
+def get_token_counter() -> TokenCounter:
+    """Get the global token counter"""
+    global _counter
+    if _counter is None:
+        _counter = TokenCounter()
+    return _counter
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count tokens with the global counter"""
+    return get_token_counter().count(text, model)
+
+
+# ===========================================
+# Context Budgeting
+# ===========================================
+
+SummarizeFunction = Callable[[List[LLMMessage]], str]
+
+
+@dataclass
+class BudgetResult:
+    """A conversation fitted to a context budget"""
+    messages: List[LLMMessage]
+    input_tokens: int
+    budget: int
+    dropped_messages: int = 0
+    truncated_messages: int = 0
+    summarized: bool = False
+
+    @property
+    def fits(self) -> bool:
+        return self.input_tokens <= self.budget
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.dropped_messages or self.truncated_messages)
+
+
+class ContextBudgeter:
+    """
+    Fits messages into a model's context window minus an output reserve.
+
+    In order, until the conversation fits:
+    1. Drop the oldest history messages (everything except system messages
+       and the final message) and replace them with a summary
+    2. Truncate the largest remaining message, final message last
+    """
+
+    def __init__(
+        self,
+        model: str,
+        reserved_output_tokens: int = 4096,
+        counter: Optional[TokenCounter] = None,
+        window: Optional[int] = None,
+        summarize_fn: Optional[SummarizeFunction] = None,
+    ):
+        """
+        Args:
+            model: Model name (selects tokenizer and context window)
+            reserved_output_tokens: Tokens kept free for the response
+            counter: Token counter (default: global)
+            window: Override the model's context window
+            summarize_fn: Summarizes dropped history (default: a short note)
+        """
+        self.model = model
+        self.counter = counter or get_token_counter()
+        self.window = window or context_window(model)
+        # Never let the output reserve eat more than half of the window
+        self.budget = self.window - min(reserved_output_tokens, self.window // 2)
+        self.summarize_fn = summarize_fn
+
+    def _count(self, messages: List[LLMMessage]) -> int:
+        return self.counter.count_messages(messages, self.model)
+
+    @staticmethod
+    def _omitted_note(dropped: List[LLMMessage]) -> str:
+        return f"[{len(dropped)} earlier messages omitted to fit the context window]"
+
+    @staticmethod
+    def _with_summary(messages: List[LLMMessage], dropped: List[LLMMessage], text: str) -> List[LLMMessage]:
+        """messages without the dropped ones, with a summary where the first one was"""
+        dropped_ids = {id(m) for m in dropped}
+        kept = [m for m in messages if id(m) not in dropped_ids]
+        insert_at = next(i for i, m in enumerate(messages) if id(m) in dropped_ids)
+        summary = LLMMessage(role="system", content=f"Summary of earlier conversation:\n{text}")
+        return kept[:insert_at] + [summary] + kept[insert_at:]
+
+    def _largest(self, messages: List[LLMMessage], min_tokens: int) -> Tuple[int, int]:
+        """(index, tokens) of the largest earlier message, else the final one"""
+        sizes = [(self.counter.count(m.content, self.model), i) for i, m in enumerate(messages)]
+        earlier = [s for s in sizes[:-1] if s[0] > min_tokens]
+        size, index = max(earlier) if earlier else sizes[-1]
+        return index, size
+
+    def fit(self, messages: List[LLMMessage]) -> BudgetResult:
+        """Return messages trimmed to the budget (unchanged when they fit)"""
+        total = self._count(messages)
+        if total <= self.budget or not messages:
+            return BudgetResult(list(messages), total, self.budget)
+
+        result = list(messages)
+        history = [
+            i for i, m in enumerate(messages[:-1]) if m.role != "system"
+        ]
+
+        # 1. Drop oldest history, replaced by a summary message. The drop
+        # loop sizes against the short omitted note; summarize_fn runs once on
+        # the final set, and step 2 trims an oversized summary.
+        dropped: List[LLMMessage] = []
+        while history and total > self.budget:
+            dropped.append(messages[history.pop(0)])
+            result = self._with_summary(messages, dropped, self._omitted_note(dropped))
+            total = self._count(result)
+
+        if dropped and self.summarize_fn:
+            result = self._with_summary(messages, dropped, self.summarize_fn(dropped))
+            total = self._count(result)
+
+        # 2. Truncate the largest messages, the final one only when nothing else is left
+        truncated = 0
+        marker_tokens = self.counter.count(TRUNCATION_MARKER, self.model)
+        while total > self.budget:
+            index, size = self._largest(result, marker_tokens)
+            if size <= marker_tokens:
+                break
+            keep = max(0, size - (total - self.budget) - marker_tokens)
+            text = self.counter.truncate(result[index].content, keep, self.model)
+            result[index] = replace(result[index], content=text + TRUNCATION_MARKER)
+            truncated += 1
+            new_total = self._count(result)
+            if new_total >= total:
+                break
+            total = new_total
+
+        if dropped or truncated:
+            logger.info(
+                f"Fitted {len(messages)} messages into {self.budget} tokens for {self.model}: "
+                f"dropped {len(dropped)}, truncated {truncated}"
+            )
+
+        return BudgetResult(
+            messages=result,
+            input_tokens=total,
+            budget=self.budget,
+            dropped_messages=len(dropped),
+            truncated_messages=truncated,
+            summarized=bool(dropped),
+        )
@@ -44,10 +44,22 @@ async def lifespan(app: FastAPI):
     # TODO: Initialize database connection
     # TODO: Initialize LLM clients
 
+    # Token counts fall back to a heuristic until the BPE vocab files are fetched
+    from .llm.tokenizer import warn_if_vocab_missing
+    warn_if_vocab_missing()
+
+    # Keep industry research for the most requested industries warm
+    from .services.domain_expertise import get_expertise_synthesizer
+    expertise_synthesizer = get_expertise_synthesizer()
+    expertise_synthesizer.start_background_refresh()
+
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    await expertise_synthesizer.stop_background_refresh()
+    from .services.supervisor import close_supervisor
+    await close_supervisor()
     # TODO: Clean up connections
 
 
@@ -103,6 +103,7 @@ class GenerationEvent(BaseModel):
         "clarification_required",  # User needs to answer questions
         "research_progress",        # Web research progress
         "report_complete",          # Business report is ready
+        "prototype_upgrade",        # Late creative result replacing a delivered fallback
     ]
     message: Optional[str] = None
     agent: Optional[str] = None
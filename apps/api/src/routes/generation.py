@@ -14,6 +14,7 @@ from ..models import GenerationRequest, GenerationEvent, Platform
 from ..services import manager, CodeGenerator
 from ..services.agent_registry import list_agents, get_registry
 from ..services.workflows import list_workflows, get_workflow
+from ..services.workflow_checkpoints import get_checkpoint_store
 from ..services.prompts.smart_presets import get_smart_preset_system, extract_concepts
 
 logger = logging.getLogger(__name__)
@@ -185,6 +186,8 @@ async def generate_code(request: GenerationRequest):
 
             # Update orchestrator with the response callback
             orchestrator.response_callback = clarification_callback
+            # The stream ends at "complete", so a late upgrade could not be delivered
+            orchestrator.upgrade_late_results = False
 
             # Run generation
             return await generator.generate(
@@ -232,6 +235,7 @@ async def generate_code(request: GenerationRequest):
                     await generation_task
                 except asyncio.CancelledError:
                     pass
+            await generator.close()
 
     return StreamingResponse(
         event_stream(),
@@ -262,6 +266,7 @@ async def generation_websocket(websocket: WebSocket, project_id: str):
     """
     await manager.connect(websocket, project_id)
     logger.info(f"WebSocket connected for project: {project_id}")
+    generator: Optional[CodeGenerator] = None
 
     try:
         while True:
@@ -287,6 +292,9 @@ async def generation_websocket(websocket: WebSocket, project_id: str):
                 async def ws_callback(event: GenerationEvent):
                     await manager.send_json(websocket, event.model_dump())
 
+                # A pending upgrade from an earlier run would overwrite these files
+                if generator:
+                    await generator.close()
                 generator = CodeGenerator(event_callback=ws_callback)
 
                 # Run generation
@@ -319,6 +327,8 @@ async def generation_websocket(websocket: WebSocket, project_id: str):
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
+        if generator:
+            await generator.close()
         await manager.disconnect(websocket)
 
 
@@ -809,3 +819,68 @@ async def get_workflow_details(workflow_type: str):
         "estimated_minutes": workflow.estimated_duration_minutes,
         "parallel_groups": workflow.parallel_groups,
     }
+
+
+@router.get("/runs/{run_id}")
+async def get_run_checkpoint(run_id: str):
+    """
+    Get the last checkpoint of a workflow run.
+
+    Shows which agents finished and which would run on resume.
+    """
+    checkpoint = await get_checkpoint_store().load_state(run_id)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
+
+    return checkpoint.to_dict()
+
+
+# Resumed runs still in progress, by run ID
+_resume_tasks: Dict[str, asyncio.Task] = {}
+
+
+@router.post("/runs/{run_id}/resume", status_code=202)
+async def resume_run(run_id: str):
+    """
+    Resume a workflow run from its last checkpoint in the background.
+
+    Agents that already succeeded are not run again. Progress is streamed
+    to the run's project over WebSocket /generate/ws/{project_id}, the
+    files are saved to the project, and GET /generate/runs/{run_id} reports
+    the run's status.
+    """
+    checkpoint = await get_checkpoint_store().load_state(run_id)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
+
+    running = _resume_tasks.get(run_id)
+    if running and not running.done():
+        raise HTTPException(status_code=409, detail=f"Run is already resuming: {run_id}")
+
+    project_id = checkpoint.state.get("project_id")
+    platform = checkpoint.state.get("platform", Platform.WEB.value)
+
+    async def broadcast_callback(event: GenerationEvent):
+        await manager.broadcast_to_project(project_id, event.model_dump())
+
+    generator = CodeGenerator(event_callback=broadcast_callback)
+
+    async def run_resume():
+        try:
+            await generator.resume_workflow(run_id, platform=platform)
+        except Exception as e:
+            logger.error(f"Resuming run {run_id} failed: {e}")
+            await broadcast_callback(GenerationEvent(type="error", error=str(e)))
+        finally:
+            _resume_tasks.pop(run_id, None)
+
+    _resume_tasks[run_id] = asyncio.create_task(run_resume())
+
+    return {
+        "run_id": run_id,
+        "project_id": project_id,
+        "workflow_type": checkpoint.workflow_type,
+        "status": "resuming",
+        "completed_agents": checkpoint.completed_agents,
+        "pending_agents": checkpoint.pending_agents,
+    }
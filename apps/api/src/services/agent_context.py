@@ -0,0 +1,311 @@
+"""
+Agent Context Manager
+
+Keeps a rolling, structured summary of every agent output in a workflow
+and decides what each later agent actually sees, under a per-agent token
+budget:
+
+- Declared inputs (the agent's direct dependencies) are sent in full
+- Other upstream outputs are sent as summaries, most relevant first,
+  relevance being the similarity between the agent's role and the summary
+- When over budget: least relevant summaries are dropped, then declared
+  inputs fall back to their summaries, then the largest is truncated
+
+Summaries are built from the output's structure (keys, scalar values,
+list sizes and item names), so no extra model call is made.
+
+Prompt sizes before (every upstream output in full) and after selection
+are recorded per agent for reporting.
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from ..llm.tokenizer import get_token_counter
+
+# Tokens of upstream context an agent may receive
+DEFAULT_CONTEXT_BUDGET_TOKENS = 12000
+
+# Summary shape
+SUMMARY_MAX_CHARS = 200
+SUMMARY_MAX_ITEMS = 5
+SUMMARY_MAX_TEXT_CHARS = 1200
+
+EmbedFunction = Callable[[str], Sequence[float]]
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9_]+")
+_NAME_KEYS = ("name", "title", "path", "id", "endpoint", "table", "component")
+
+
+def render_output(output: Any) -> str:
+    """Render an agent output the way it appears in a prompt"""
+    if isinstance(output, BaseModel):
+        return output.model_dump_json(indent=2)
+    if isinstance(output, (dict, list)):
+        return json.dumps(output, indent=2, default=str)
+    return str(output)
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def _item_name(item: Any) -> str:
+    if isinstance(item, dict):
+        for key in _NAME_KEYS:
+            if item.get(key):
+                return _clip(str(item[key]), 60)
+        for value in item.values():
+            if isinstance(value, str) and value:
+                return _clip(value, 60)
+        return "{" + ", ".join(list(item)[:4]) + "}"
+    return _clip(str(item), 60)
+
+
+def _summarize_value(value: Any) -> str:
+    if isinstance(value, dict):
+        keys = list(value)
+        more = f", +{len(keys) - SUMMARY_MAX_ITEMS} more" if len(keys) > SUMMARY_MAX_ITEMS else ""
+        return "{" + ", ".join(map(str, keys[:SUMMARY_MAX_ITEMS])) + more + "}"
+    if isinstance(value, list):
+        names = [_item_name(item) for item in value[:SUMMARY_MAX_ITEMS]]
+        more = ", ..." if len(value) > SUMMARY_MAX_ITEMS else ""
+        return f"{len(value)} items: " + "; ".join(names) + more
+    return _clip(str(value), SUMMARY_MAX_CHARS)
+
+
+def summarize_output(output: Any) -> str:
+    """
+    Structured digest of an agent output.
+
+    Objects become one line per field (scalars clipped, lists reduced to
+    their size and item names, nested objects to their keys); text is
+    clipped. Short outputs come back unchanged.
+    """
+    if isinstance(output, BaseModel):
+        output = output.model_dump()
+    if isinstance(output, dict):
+        lines = [f"- {key}: {_summarize_value(value)}" for key, value in output.items() if value not in (None, "", [], {})]
+        return "\n".join(lines)
+    if isinstance(output, list):
+        return _summarize_value(output)
+    text = str(output)
+    if len(text) <= SUMMARY_MAX_TEXT_CHARS:
+        return text
+    return text[:SUMMARY_MAX_TEXT_CHARS].rsplit(" ", 1)[0] + " ..."
+
+
+def _bag_of_words(text: str) -> Counter:
+    return Counter(_WORD_RE.findall(text.lower()))
+
+
+def _cosine(a: Dict[Any, float], b: Dict[Any, float]) -> float:
+    dot = sum(weight * b.get(key, 0.0) for key, weight in a.items())
+    norm = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+    return dot / norm if norm else 0.0
+
+
+@dataclass
+class Artifact:
+    """One agent's output, in full and summarized"""
+    agent_id: str
+    output: Any
+    text: str
+    summary: str
+    text_tokens: int
+    summary_tokens: int
+
+
+@dataclass
+class ContextSelection:
+    """What an agent receives from upstream, and what it cost"""
+    agent_id: str
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    full_tokens: int = 0
+    sent_tokens: int = 0
+    full: List[str] = field(default_factory=list)
+    summarized: List[str] = field(default_factory=list)
+    truncated: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "full_tokens": self.full_tokens,
+            "sent_tokens": self.sent_tokens,
+            "full": self.full,
+            "summarized": self.summarized,
+            "truncated": self.truncated,
+            "dropped": self.dropped,
+        }
+
+
+class AgentContextManager:
+    """
+    Rolling summary of a workflow's agent outputs with per-agent selection.
+
+    One instance per workflow run: add each output as it completes, then
+    select() the context for the next agent.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int = DEFAULT_CONTEXT_BUDGET_TOKENS,
+        embed_fn: Optional[EmbedFunction] = None,
+        model: Optional[str] = None,
+    ):
+        """
+        Args:
+            budget_tokens: Max upstream context tokens per agent
+            embed_fn: Text -> embedding used for relevance (default: bag of words)
+            model: Model whose tokenizer counts the budget
+        """
+        self.budget_tokens = budget_tokens
+        self.embed_fn = embed_fn
+        self.model = model
+        self.counter = get_token_counter()
+        self._artifacts: Dict[str, Artifact] = {}
+        self._selections: Dict[str, ContextSelection] = {}
+
+    def _count(self, text: str) -> int:
+        return self.counter.count(text, self.model)
+
+    def _vector(self, text: str) -> Dict[Any, float]:
+        if self.embed_fn:
+            return dict(enumerate(self.embed_fn(text)))
+        return dict(_bag_of_words(text))
+
+    def add(self, agent_id: str, output: Any) -> Artifact:
+        """Record an agent's output (replacing any earlier one)"""
+        text = render_output(output)
+        summary = summarize_output(output)
+        artifact = Artifact(
+            agent_id=agent_id,
+            output=output,
+            text=text,
+            summary=summary,
+            text_tokens=self._count(text),
+            summary_tokens=self._count(summary) if summary != text else self._count(text),
+        )
+        self._artifacts[agent_id] = artifact
+        return artifact
+
+    def relevance(self, query: str, agent_ids: Sequence[str]) -> Dict[str, float]:
+        """Similarity of each stored artifact's summary to the query"""
+        query_vector = self._vector(query)
+        return {
+            agent_id: _cosine(query_vector, self._vector(self._artifacts[agent_id].summary))
+            for agent_id in agent_ids
+            if agent_id in self._artifacts
+        }
+
+    def select(
+        self,
+        agent_id: str,
+        declared_inputs: Sequence[str],
+        upstream: Sequence[str],
+        query: str = "",
+    ) -> ContextSelection:
+        """
+        Choose the upstream context for an agent.
+
+        Args:
+            agent_id: Agent about to run
+            declared_inputs: Agents whose output it consumes directly
+            upstream: Every agent it may see (declared inputs included), in
+                workflow order
+            query: Text describing the agent (role, goal) for relevance
+
+        Returns:
+            ContextSelection whose outputs keep upstream order; full outputs
+            are passed as the original objects, summaries as text
+        """
+        available = [a for a in upstream if a in self._artifacts]
+        declared = [a for a in available if a in declared_inputs]
+        scores = self.relevance(query, [a for a in available if a not in declared])
+        # Most relevant first; ties keep the later (closer) agent first
+        others = sorted(scores, key=lambda a: (-scores[a], -available.index(a)))
+
+        # mode per agent: "full", "summary" or a truncated string
+        chosen: Dict[str, Any] = {a: "full" for a in declared}
+        chosen.update({a: "summary" for a in others})
+
+        def size(a: str) -> int:
+            mode = chosen[a]
+            artifact = self._artifacts[a]
+            if mode == "full":
+                return artifact.text_tokens
+            if mode == "summary":
+                return artifact.summary_tokens
+            return self._count(mode)
+
+        def total() -> int:
+            return sum(size(a) for a in chosen)
+
+        selection = ContextSelection(
+            agent_id=agent_id,
+            full_tokens=sum(self._artifacts[a].text_tokens for a in available),
+        )
+
+        # 1. Drop the least relevant summaries
+        for a in reversed(others):
+            if total() <= self.budget_tokens:
+                break
+            del chosen[a]
+            selection.dropped.append(a)
+
+        # 2. Fall back to summaries of declared inputs, largest first
+        for a in sorted(declared, key=lambda a: -self._artifacts[a].text_tokens):
+            if total() <= self.budget_tokens:
+                break
+            chosen[a] = "summary"
+
+        # 3. Truncate the largest remaining entry
+        while chosen and total() > self.budget_tokens:
+            largest = max(chosen, key=size)
+            excess = total() - self.budget_tokens
+            current = self._artifacts[largest].summary if chosen[largest] == "summary" else chosen[largest]
+            keep = max(0, size(largest) - excess)
+            chosen[largest] = self.counter.truncate(current, keep, self.model) if keep else ""
+            if largest not in selection.truncated:
+                selection.truncated.append(largest)
+            if not keep:
+                break
+
+        for a in available:
+            if a not in chosen:
+                continue
+            artifact = self._artifacts[a]
+            mode = chosen[a]
+            if mode == "full" or (mode == "summary" and artifact.summary == artifact.text):
+                selection.outputs[a] = artifact.output
+                selection.full.append(a)
+            elif mode == "summary":
+                selection.outputs[a] = f"[Summary]\n{artifact.summary}"
+                selection.summarized.append(a)
+            else:
+                selection.outputs[a] = mode
+        selection.sent_tokens = total()
+
+        self._selections[agent_id] = selection
+        return selection
+
+    def report(self) -> Dict[str, Any]:
+        """Upstream context tokens per agent, before and after selection"""
+        agents = {a: s.to_dict() for a, s in self._selections.items()}
+        full = sum(s.full_tokens for s in self._selections.values())
+        sent = sum(s.sent_tokens for s in self._selections.values())
+        return {
+            "budget_tokens": self.budget_tokens,
+            "full_tokens": full,
+            "sent_tokens": sent,
+            "saved_tokens": full - sent,
+            "reduction": (full - sent) / full if full else 0.0,
+            "agents": agents,
+        }
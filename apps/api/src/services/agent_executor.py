@@ -8,12 +8,16 @@ Integrates with the agent registry and existing AI modules.
 from typing import Dict, List, Optional, Any, Callable, Awaitable
 from pydantic import BaseModel, Field
 from datetime import datetime
+from enum import Enum
 import asyncio
 import logging
 
+from .agent_context import render_output
 from .agent_registry import AgentConfig, get_agent
+from .prompt_assembly import AssembledPrompt, PromptSegment, get_prefix_tracker
 from ..ai.structured_output import (
     StructuredOutputClient,
+    SystemPrompt,
     ProjectStructure,
     CodeFile,
     CodeReview,
@@ -136,6 +140,57 @@ AGENT_OUTPUT_TYPES: Dict[str, type] = {
 # Agent Executor
 # ===========================================
 
+# Platform guidelines shared by every Development agent building for the web.
+# Kept in one constant so the prompt prefix is byte-identical across agents.
+WEB_DEVELOPMENT_GUIDELINES = "\n".join([
+    "## CRITICAL: Next.js Configuration Requirements for WebContainer",
+    "- MUST use Next.js version '13.5.6' (NOT 14.x) - version 14 has SWC issues in WebContainer",
+    "- ALWAYS use 'next.config.mjs' (NOT next.config.ts) - TypeScript config is not supported",
+    "- ALWAYS use 'tailwind.config.js' (NOT tailwind.config.ts)",
+    "- ALWAYS use 'postcss.config.js' (NOT postcss.config.mjs or .ts)",
+    "- ALWAYS include '.babelrc' with {\"presets\": [\"next/babel\"]} for WebContainer compatibility",
+    "- In next.config.mjs, set swcMinify: false (do NOT include experimental.appDir - it's default now)",
+    "- Include autoprefixer in postcss.config.js",
+    "- package.json dependencies MUST have: \"next\": \"13.5.6\" (exact version, no caret)",
+    "- NEVER use 'next/font' - it requires SWC which conflicts with Babel",
+    "- For fonts, use Google Fonts via <link> tag in layout.tsx head or @import in globals.css",
+    "",
+    "## React Server Components Rules (CRITICAL)",
+    "- Any file using React hooks (useState, useEffect, useContext, etc.) MUST have 'use client' at the very top",
+    "- Any file using browser APIs (window, document, localStorage) MUST have 'use client' at the top",
+    "- If page.tsx uses useState or any hook, add 'use client' as the FIRST line before any imports",
+    "- layout.tsx should stay as Server Component (no 'use client') - wrap children with client ErrorBoundary",
+    "- Components with onClick, onChange, or any event handlers MUST have 'use client'",
+    "- NEVER export 'metadata' from a 'use client' file - metadata exports only work in Server Components",
+    "- Use 'next/navigation' for useRouter, usePathname, useSearchParams (NOT 'next/router' which is for Pages Router)",
+    "",
+    "## Common Mistakes to Avoid",
+    "- NEVER use next/image - use regular <img> tags instead (next/image has WebContainer issues)",
+    "- NEVER access window, document, or localStorage at module level - only inside useEffect or event handlers",
+    "- ALWAYS include ALL imported packages in package.json dependencies before using them",
+    "- tsconfig.json MUST have: paths: { '@/*': ['./src/*'] } for @/ import aliases to work",
+    "- tsconfig.json MUST have: resolveJsonModule: true if importing JSON files",
+    "- NEVER mix Pages Router (pages/) with App Router (app/) - use App Router only",
+    "",
+    "## Tailwind CSS Rules",
+    "- ONLY use standard Tailwind classes (bg-blue-500, text-white, p-4, etc.)",
+    "- NEVER use shadcn/ui style classes like 'border-border', 'bg-background', 'text-foreground' unless defined in tailwind.config.js",
+    "- If using CSS variables, define them in globals.css AND extend them in tailwind.config.js",
+    "- globals.css should ONLY contain: @tailwind base; @tailwind components; @tailwind utilities; and optional @import for fonts",
+    "- DO NOT add @layer rules with undefined classes in globals.css",
+    "",
+    "## Error Handling Requirements (CRITICAL for visibility)",
+    "- Create src/components/ErrorBoundary.tsx with 'use client' directive containing an ErrorBoundary class component",
+    "- ErrorBoundary MUST render errors with high-contrast colors (red background #dc2626, white text, 20px padding, minHeight 100vh)",
+    "- In layout.tsx, import ErrorBoundary and wrap {children} with it (layout.tsx stays as Server Component)",
+    "- In layout.tsx <head>, add error reporting: <script dangerouslySetInnerHTML={{__html: `window.onerror=function(m){window.parent?.postMessage({type:'preview-error',message:m},'*')}`}} />",
+    "- page.tsx MUST have visible content even if Tailwind CSS fails to load (use inline styles as fallback)",
+    "- NEVER return null, undefined, or empty JSX from page components",
+    "- ALWAYS wrap main page content with: style={{ minHeight: '100vh', background: '#0f172a', color: 'white' }}",
+    "- Include both Tailwind classes AND inline style fallbacks for critical visibility",
+])
+
+
 class AgentExecutor:
     """
     Executes individual agents using LLM calls.
@@ -162,84 +217,68 @@ class AgentExecutor:
             TaskPlan  # Default fallback
         )
 
-    def _build_system_prompt(self, context: AgentContext) -> str:
-        """Build the system prompt from agent config"""
-        parts = [
-            f"You are the {self.config.role}.",
-            "",
-            "## Your Background",
-            self.config.backstory,
-            "",
-            "## Your Goal",
-            self.config.goal,
-            "",
+    def assemble_prompt(self, context: AgentContext) -> AssembledPrompt:
+        """
+        Split the prompt into cacheable and volatile segments.
+
+        Stable segments are ordered from most to least widely shared
+        (project context, platform guidelines, agent persona) so agents of
+        the same workflow send identical prompt prefixes.
+        """
+        project = [
             "## Project Context",
             f"Project: {context.description}",
             f"Platform: {context.platform}",
         ]
 
         if context.constraints:
-            parts.append("")
-            parts.append("## Constraints")
+            project.append("")
+            project.append("## Constraints")
             for constraint in context.constraints:
-                parts.append(f"- {constraint}")
+                project.append(f"- {constraint}")
 
         if context.preferences:
-            parts.append("")
-            parts.append("## Preferences")
+            project.append("")
+            project.append("## Preferences")
             for key, value in context.preferences.items():
-                parts.append(f"- {key}: {value}")
+                project.append(f"- {key}: {value}")
+
+        segments = [PromptSegment("project", "\n".join(project))]
 
         # Add platform-specific guidelines for Development agents
         if self.config.category == "Development" and context.platform == "web":
-            parts.append("")
-            parts.append("## CRITICAL: Next.js Configuration Requirements for WebContainer")
-            parts.append("- MUST use Next.js version '13.5.6' (NOT 14.x) - version 14 has SWC issues in WebContainer")
-            parts.append("- ALWAYS use 'next.config.mjs' (NOT next.config.ts) - TypeScript config is not supported")
-            parts.append("- ALWAYS use 'tailwind.config.js' (NOT tailwind.config.ts)")
-            parts.append("- ALWAYS use 'postcss.config.js' (NOT postcss.config.mjs or .ts)")
-            parts.append("- ALWAYS include '.babelrc' with {\"presets\": [\"next/babel\"]} for WebContainer compatibility")
-            parts.append("- In next.config.mjs, set swcMinify: false (do NOT include experimental.appDir - it's default now)")
-            parts.append("- Include autoprefixer in postcss.config.js")
-            parts.append("- package.json dependencies MUST have: \"next\": \"13.5.6\" (exact version, no caret)")
-            parts.append("- NEVER use 'next/font' - it requires SWC which conflicts with Babel")
-            parts.append("- For fonts, use Google Fonts via <link> tag in layout.tsx head or @import in globals.css")
-            parts.append("")
-            parts.append("## React Server Components Rules (CRITICAL)")
-            parts.append("- Any file using React hooks (useState, useEffect, useContext, etc.) MUST have 'use client' at the very top")
-            parts.append("- Any file using browser APIs (window, document, localStorage) MUST have 'use client' at the top")
-            parts.append("- If page.tsx uses useState or any hook, add 'use client' as the FIRST line before any imports")
-            parts.append("- layout.tsx should stay as Server Component (no 'use client') - wrap children with client ErrorBoundary")
-            parts.append("- Components with onClick, onChange, or any event handlers MUST have 'use client'")
-            parts.append("- NEVER export 'metadata' from a 'use client' file - metadata exports only work in Server Components")
-            parts.append("- Use 'next/navigation' for useRouter, usePathname, useSearchParams (NOT 'next/router' which is for Pages Router)")
-            parts.append("")
-            parts.append("## Common Mistakes to Avoid")
-            parts.append("- NEVER use next/image - use regular <img> tags instead (next/image has WebContainer issues)")
-            parts.append("- NEVER access window, document, or localStorage at module level - only inside useEffect or event handlers")
-            parts.append("- ALWAYS include ALL imported packages in package.json dependencies before using them")
-            parts.append("- tsconfig.json MUST have: paths: { '@/*': ['./src/*'] } for @/ import aliases to work")
-            parts.append("- tsconfig.json MUST have: resolveJsonModule: true if importing JSON files")
-            parts.append("- NEVER mix Pages Router (pages/) with App Router (app/) - use App Router only")
-            parts.append("")
-            parts.append("## Tailwind CSS Rules")
-            parts.append("- ONLY use standard Tailwind classes (bg-blue-500, text-white, p-4, etc.)")
-            parts.append("- NEVER use shadcn/ui style classes like 'border-border', 'bg-background', 'text-foreground' unless defined in tailwind.config.js")
-            parts.append("- If using CSS variables, define them in globals.css AND extend them in tailwind.config.js")
-            parts.append("- globals.css should ONLY contain: @tailwind base; @tailwind components; @tailwind utilities; and optional @import for fonts")
-            parts.append("- DO NOT add @layer rules with undefined classes in globals.css")
-            parts.append("")
-            parts.append("## Error Handling Requirements (CRITICAL for visibility)")
-            parts.append("- Create src/components/ErrorBoundary.tsx with 'use client' directive containing an ErrorBoundary class component")
-            parts.append("- ErrorBoundary MUST render errors with high-contrast colors (red background #dc2626, white text, 20px padding, minHeight 100vh)")
-            parts.append("- In layout.tsx, import ErrorBoundary and wrap {children} with it (layout.tsx stays as Server Component)")
-            parts.append("- In layout.tsx <head>, add error reporting: <script dangerouslySetInnerHTML={{__html: `window.onerror=function(m){window.parent?.postMessage({type:'preview-error',message:m},'*')}`}} />")
-            parts.append("- page.tsx MUST have visible content even if Tailwind CSS fails to load (use inline styles as fallback)")
-            parts.append("- NEVER return null, undefined, or empty JSX from page components")
-            parts.append("- ALWAYS wrap main page content with: style={{ minHeight: '100vh', background: '#0f172a', color: 'white' }}")
-            parts.append("- Include both Tailwind classes AND inline style fallbacks for critical visibility")
+            segments.append(PromptSegment("platform_guidelines", WEB_DEVELOPMENT_GUIDELINES))
 
-        return "\n".join(parts)
+        persona = [
+            f"You are the {self.config.role}.",
+            "",
+            "## Your Background",
+            self.config.backstory,
+            "",
+            "## Your Goal",
+            self.config.goal,
+        ]
+        segments.append(PromptSegment("persona", "\n".join(persona)))
+        segments.append(PromptSegment("task", self._build_user_prompt(context), stable=False))
+
+        return AssembledPrompt(segments)
+
+    def _build_system_prompt(self, context: AgentContext) -> str:
+        """Build the system prompt from agent config"""
+        return self.assemble_prompt(context).system_text
+
+    def _system_for_client(self, prompt: AssembledPrompt) -> SystemPrompt:
+        """
+        System prompt in the form the client's provider caches best.
+
+        Anthropic gets content blocks with cache_control breakpoints; OpenAI
+        and Grok cache identical prefixes automatically, so they get text.
+        The request is recorded with the prefix tracker.
+        """
+        get_prefix_tracker().record(prompt, provider=self.client.provider)
+        if self.client.provider == "anthropic":
+            return prompt.system_blocks()
+        return prompt.system_text
 
     def _build_user_prompt(self, context: AgentContext) -> str:
         """Build the user prompt with context from previous agents"""
@@ -250,13 +289,7 @@ class AgentExecutor:
             parts.append("\n\n## Context from Previous Agents")
             for agent_id, output in context.previous_outputs.items():
                 parts.append(f"\n### {agent_id} Output")
-                if isinstance(output, BaseModel):
-                    parts.append(output.model_dump_json(indent=2))
-                elif isinstance(output, dict):
-                    import json
-                    parts.append(json.dumps(output, indent=2, default=str))
-                else:
-                    parts.append(str(output))
+                parts.append(render_output(output))
 
         # Add existing files if relevant
         if context.files and self.config.category in ["Development", "Quality", "Operations"]:
@@ -290,16 +323,16 @@ class AgentExecutor:
             if on_progress:
                 await on_progress(f"Starting {self.config.role}...")
 
-            # Build prompts
-            system_prompt = self._build_system_prompt(context)
-            user_prompt = self._build_user_prompt(context)
+            # Build prompts (stable prefix first so providers can cache it)
+            prompt = self.assemble_prompt(context)
+            user_prompt = prompt.user_text
 
             logger.info(f"Executing agent {self.config.id} with {len(user_prompt)} chars")
 
             # Generate structured output
             output = await self.client.generate(
                 response_model=self.output_type,
-                system=system_prompt,
+                system=self._system_for_client(prompt),
                 messages=[{"role": "user", "content": user_prompt}],
                 temperature=self.config.temperature,
                 max_tokens=self.config.max_tokens,
@@ -465,13 +498,13 @@ class AgentExecutor:
         accumulated_output = []
 
         try:
-            system_prompt = self._build_system_prompt(context)
-            user_prompt = self._build_user_prompt(context)
+            prompt = self.assemble_prompt(context)
+            user_prompt = prompt.user_text
 
             # Use streaming generation
             async for partial in self.client.generate_stream(
                 response_model=self.output_type,
-                system=system_prompt,
+                system=self._system_for_client(prompt),
                 messages=[{"role": "user", "content": user_prompt}],
             ):
                 # Send partial updates
@@ -560,29 +593,172 @@ async def execute_agent(
     return await executor.execute(context, on_progress)
 
 
+class GroupPolicy(str, Enum):
+    """How a parallel group reacts to a failed agent"""
+    BEST_EFFORT = "best_effort"  # Run every agent regardless of failures
+    FAIL_FAST = "fail_fast"  # Cancel the rest once a required agent fails
+
+
+async def execute_agent_with_deadline(
+    agent_id: str,
+    context: AgentContext,
+    timeout_seconds: Optional[float] = None,
+    on_progress: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> AgentResult:
+    """
+    Execute an agent, turning a timeout or exception into a failed result.
+
+    Args:
+        agent_id: Agent identifier
+        context: Execution context
+        timeout_seconds: Deadline for the agent (None = no deadline)
+        on_progress: Optional progress callback
+
+    Returns:
+        AgentResult
+    """
+    started_at = datetime.utcnow()
+    try:
+        return await asyncio.wait_for(execute_agent(agent_id, context, on_progress), timeout_seconds)
+    except asyncio.TimeoutError:
+        error = f"Timed out after {timeout_seconds:g}s"
+        details = {"timeout_seconds": timeout_seconds}
+    except Exception as e:
+        logger.error(f"Agent {agent_id} raised: {e}")
+        error, details = str(e), None
+
+    completed_at = datetime.utcnow()
+    return AgentResult(
+        agent_id=agent_id,
+        success=False,
+        started_at=started_at,
+        completed_at=completed_at,
+        duration_ms=int((completed_at - started_at).total_seconds() * 1000),
+        error=error,
+        error_details=details,
+    )
+
+
 async def execute_agents_parallel(
     agent_ids: List[str],
-    context: AgentContext,
+    context: Optional[AgentContext],
     on_agent_complete: Optional[Callable[[str, AgentResult], Awaitable[None]]] = None,
+    max_concurrency: Optional[int] = None,
+    timeout_seconds: Optional[float] = None,
+    deadlines: Optional[Dict[str, float]] = None,
+    policy: GroupPolicy = GroupPolicy.BEST_EFFORT,
+    required: Optional[List[str]] = None,
+    priorities: Optional[Dict[str, int]] = None,
+    dependencies: Optional[Dict[str, List[str]]] = None,
+    run_agent: Optional[Callable[[str], Awaitable[AgentResult]]] = None,
 ) -> Dict[str, AgentResult]:
     """
     Execute multiple agents in parallel.
 
+    At most max_concurrency agents run at once; waiting agents get slots in
+    priority order (lower first, then list order), so agents on the critical
+    path should be given the lowest values. on_agent_complete is called as
+    each agent finishes, not when the whole group is done.
+
+    With dependencies, an agent only becomes ready once every dependency
+    listed in agent_ids has finished (successfully or not), so a workflow
+    DAG runs as a ready set rather than in waves.
+
+    With GroupPolicy.FAIL_FAST, the first failed agent from `required`
+    cancels the agents still running or waiting; they are reported as
+    failed with error_details["cancelled_by"] set.
+
     Args:
         agent_ids: List of agent IDs to execute
-        context: Shared execution context
+        context: Shared execution context (unused with run_agent)
         on_agent_complete: Callback when each agent completes
+        max_concurrency: Most agents running at once (None = all)
+        timeout_seconds: Deadline for each agent (None = no deadline)
+        deadlines: Per-agent deadlines overriding timeout_seconds
+        policy: Reaction to a failed agent
+        required: Agents whose failure triggers FAIL_FAST (default: all)
+        priorities: Agent -> priority (default: registry priority)
+        dependencies: Agent -> agents it must wait for
+        run_agent: Runs one agent (default: execute_agent_with_deadline with
+            the shared context); context and deadlines are then up to it
 
     Returns:
-        Dict mapping agent_id to result
+        Dict mapping agent_id to result, in agent_ids order
+
+    Raises:
+        ValueError: The dependencies contain a cycle
     """
-    async def run_one(agent_id: str) -> tuple[str, AgentResult]:
-        result = await execute_agent(agent_id, context)
+    deadlines = deadlines or {}
+    dependencies = dependencies or {}
+    required_ids = set(agent_ids if required is None else required)
+    group = set(agent_ids)
+
+    def start(agent_id: str) -> Awaitable[AgentResult]:
+        if run_agent:
+            return run_agent(agent_id)
+        return execute_agent_with_deadline(agent_id, context, deadlines.get(agent_id, timeout_seconds))
+
+    def ready(agent_id: str) -> bool:
+        return all(dep in results for dep in dependencies.get(agent_id, []) if dep in group)
+
+    def priority(agent_id: str) -> int:
+        if priorities and agent_id in priorities:
+            return priorities[agent_id]
+        config = get_agent(agent_id)
+        return config.priority if config else 99
+
+    waiting = sorted(agent_ids, key=lambda a: (priority(a), agent_ids.index(a)))
+    running: Dict[asyncio.Task, str] = {}
+    results: Dict[str, AgentResult] = {}
+    failed_required: Optional[str] = None
+
+    async def finish(agent_id: str, result: AgentResult) -> None:
+        results[agent_id] = result
         if on_agent_complete:
             await on_agent_complete(agent_id, result)
-        return agent_id, result
-
-    tasks = [run_one(aid) for aid in agent_ids]
-    results = await asyncio.gather(*tasks)
 
-    return {agent_id: result for agent_id, result in results}
+    try:
+        while waiting or running:
+            for agent_id in [a for a in waiting if ready(a)]:
+                if max_concurrency and len(running) >= max_concurrency:
+                    break
+                waiting.remove(agent_id)
+                running[asyncio.create_task(start(agent_id))] = agent_id
+
+            if not running:
+                raise ValueError(f"Agent dependencies cannot be satisfied: {waiting}")
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: agent_ids.index(running[t])):
+                agent_id = running.pop(task)
+                result = task.result()
+                await finish(agent_id, result)
+                if (
+                    policy == GroupPolicy.FAIL_FAST
+                    and failed_required is None
+                    and not result.success
+                    and agent_id in required_ids
+                ):
+                    failed_required = agent_id
+
+            if failed_required:
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                cancelled = set(running.values()) | set(waiting)
+                running.clear()
+                waiting.clear()
+                for agent_id in [a for a in agent_ids if a in cancelled]:
+                    await finish(agent_id, AgentResult(
+                        agent_id=agent_id,
+                        success=False,
+                        error=f"Cancelled: required agent {failed_required} failed",
+                        error_details={"cancelled_by": failed_required},
+                    ))
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    return {agent_id: results[agent_id] for agent_id in agent_ids if agent_id in results}
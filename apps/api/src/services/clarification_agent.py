@@ -17,6 +17,8 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .prompts.smart_presets import CLARIFICATION_SLOT_SIGNALS, analyze_description
+
 logger = logging.getLogger(__name__)
 
 
@@ -296,13 +298,9 @@ INDUSTRY_QUESTIONS = {
     ],
 }
 
-# Keywords that indicate missing information
-MISSING_INFO_INDICATORS = {
-    "target_market": ["customer", "client", "user", "buyer", "audience", "market", "b2b", "b2c", "consumer"],
-    "pricing": ["price", "pricing", "cost", "subscription", "fee", "charge", "pay", "payment", "tier"],
-    "services": ["service", "product", "offering", "feature", "provide", "offer", "sell"],
-    "scale": ["volume", "scale", "size", "capacity", "daily", "monthly", "users", "customers"],
-}
+# Keywords that indicate missing information (compiled into the shared
+# description matcher, see smart_presets.analyze_description)
+MISSING_INFO_INDICATORS = CLARIFICATION_SLOT_SIGNALS
 
 
 class ClarificationAgent:
@@ -338,13 +336,11 @@ class ClarificationAgent:
         actions: List[str],
     ) -> List[str]:
         """Detect what critical information is missing from the description"""
-        description_lower = description.lower()
-        missing = []
-
-        for info_type, indicators in MISSING_INFO_INDICATORS.items():
-            has_indicator = any(ind in description_lower for ind in indicators)
-            if not has_indicator:
-                missing.append(info_type)
+        match = analyze_description(description)
+        missing = [
+            info_type for info_type in MISSING_INFO_INDICATORS
+            if not match.has(f"slot:{info_type}")
+        ]
 
         # Additional checks based on entities/actions
         if not entities:
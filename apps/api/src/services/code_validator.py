@@ -3,14 +3,26 @@ Code Validator Service
 
 Validates generated code BEFORE sending to WebContainer to catch common errors.
 This provides pre-flight validation to prevent white page failures.
+
+Per-file results are cached by content hash, so re-validating a project
+after a fix round only re-checks files whose contents changed.
+validate_and_fix_async() runs per-file checks concurrently and sends every
+file that still fails to the LLM in a single batched fix prompt.
 """
 
+import asyncio
+import hashlib
 import re
 import json
-from typing import Dict, List, Optional, Tuple
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 
 class ValidationSeverity(Enum):
     ERROR = "error"      # Will definitely break WebContainer
@@ -125,6 +137,25 @@ FORBIDDEN_PATTERNS: List[Tuple[str, str, str, str]] = [
     ),
 ]
 
+# Files checked by project-level validation; their issues depend on the whole project
+PROJECT_LEVEL_FILES = ("package.json", "tsconfig.json")
+
+# Maximum number of per-file / project-level results kept in the validation cache
+MAX_CACHED_RESULTS = 2048
+
+# Concurrent per-file checks in validate_project_async
+VALIDATION_CONCURRENCY = 8
+
+# LLM fix rounds in validate_and_fix_async
+MAX_FIX_ROUNDS = 2
+
+# Async function that takes a fix prompt and returns {path: fixed content}
+FixFunction = Callable[[str], Awaitable[Dict[str, str]]]
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
 # React hooks that require 'use client' directive
 REACT_HOOKS = [
     "useState", "useEffect", "useContext", "useReducer", "useCallback",
@@ -138,9 +169,13 @@ REACT_HOOKS = [
 class CodeValidator:
     """Validates generated code before WebContainer execution"""
 
-    def __init__(self):
+    def __init__(self, cache_size: int = MAX_CACHED_RESULTS):
         self.forbidden_patterns = FORBIDDEN_PATTERNS
         self.react_hooks = REACT_HOOKS
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0}
 
     def validate_project(self, files: Dict[str, str]) -> ValidationResult:
         """
@@ -152,37 +187,178 @@ class CodeValidator:
         Returns:
             ValidationResult with all issues found
         """
-        errors: List[ValidationIssue] = []
-        warnings: List[ValidationIssue] = []
+        project_issues, dependency_issues = self._check_project(files)
 
-        # Check package.json exists and is valid
-        pkg_issues = self._validate_package_json(files)
-        errors.extend([i for i in pkg_issues if i.severity == ValidationSeverity.ERROR])
-        warnings.extend([i for i in pkg_issues if i.severity == ValidationSeverity.WARNING])
+        # Check each source file
+        file_issues = [
+            issue
+            for file_path, content in files.items()
+            if self._is_source_file(file_path)
+            for issue in self._check_file(file_path, content)
+        ]
+
+        return self._build_result(project_issues + file_issues + dependency_issues)
+
+    async def validate_project_async(
+        self,
+        files: Dict[str, str],
+        max_concurrency: int = VALIDATION_CONCURRENCY,
+    ) -> ValidationResult:
+        """
+        Validate all files in a project without blocking the event loop.
 
-        # Check tsconfig.json has proper path aliases
-        ts_issues = self._validate_tsconfig(files)
-        errors.extend([i for i in ts_issues if i.severity == ValidationSeverity.ERROR])
-        warnings.extend([i for i in ts_issues if i.severity == ValidationSeverity.WARNING])
+        Per-file checks for files not already in the cache run concurrently
+        in worker threads, at most max_concurrency at a time.
 
-        # Check each source file
-        for file_path, content in files.items():
-            if self._is_source_file(file_path):
-                file_issues = self._validate_file(file_path, content, files)
-                errors.extend([i for i in file_issues if i.severity == ValidationSeverity.ERROR])
-                warnings.extend([i for i in file_issues if i.severity == ValidationSeverity.WARNING])
+        Args:
+            files: Dictionary mapping file paths to content
+            max_concurrency: Maximum number of files checked at once
+
+        Returns:
+            ValidationResult identical to validate_project(files)
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def check(path: str, content: str) -> List[ValidationIssue]:
+            if self._cached(("file", path, _content_hash(content))) is not None:
+                return self._check_file(path, content)
+            async with semaphore:
+                return await asyncio.to_thread(self._check_file, path, content)
+
+        sources = [(path, content) for path, content in files.items() if self._is_source_file(path)]
+        project, *per_file = await asyncio.gather(
+            asyncio.to_thread(self._check_project, files),
+            *(check(path, content) for path, content in sources),
+        )
 
-        # Check for missing dependencies
-        dep_issues = self._validate_dependencies(files)
-        errors.extend([i for i in dep_issues if i.severity == ValidationSeverity.ERROR])
-        warnings.extend([i for i in dep_issues if i.severity == ValidationSeverity.WARNING])
+        project_issues, dependency_issues = project
+        file_issues = [issue for issues in per_file for issue in issues]
+        return self._build_result(project_issues + file_issues + dependency_issues)
 
+    @staticmethod
+    def _build_result(issues: List[ValidationIssue]) -> ValidationResult:
+        errors = [i for i in issues if i.severity == ValidationSeverity.ERROR]
+        warnings = [i for i in issues if i.severity == ValidationSeverity.WARNING]
         return ValidationResult(
             is_valid=len(errors) == 0,
             errors=errors,
             warnings=warnings
         )
 
+    def _cached(self, key: Tuple[str, ...]) -> Any:
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def _store(self, key: Tuple[str, ...], value: Any) -> None:
+        with self._cache_lock:
+            self._cache[key] = value
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _check_file(self, file_path: str, content: str) -> List[ValidationIssue]:
+        """Per-file issues, cached by path and content hash"""
+        key = ("file", file_path, _content_hash(content))
+        issues = self._cached(key)
+        if issues is None:
+            with self._cache_lock:
+                self.cache_stats["misses"] += 1
+            issues = self._validate_file(file_path, content, {})
+            self._store(key, issues)
+        else:
+            with self._cache_lock:
+                self.cache_stats["hits"] += 1
+        return list(issues)
+
+    def _check_project(self, files: Mapping[str, str]) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+        """
+        Project-level issues: (package.json + tsconfig.json, missing dependencies).
+
+        These only depend on the two config files and the set of external
+        imports, so they are cached on exactly that.
+        """
+        imports = sorted(set().union(*(
+            self._imports(content) for path, content in files.items() if self._is_source_file(path)
+        )))
+        key = (
+            "project",
+            *(_content_hash(files[name]) if name in files else "-" for name in PROJECT_LEVEL_FILES),
+            _content_hash("\n".join(imports)),
+        )
+        cached = self._cached(key)
+        if cached is None:
+            files = dict(files)
+            cached = (
+                self._validate_package_json(files) + self._validate_tsconfig(files),
+                self._validate_dependencies(files),
+            )
+            self._store(key, cached)
+        return list(cached[0]), list(cached[1])
+
+    def clear_cache(self) -> None:
+        """Drop all cached validation results"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def validate_changed(
+        self,
+        files: Dict[str, str],
+        changed: Iterable[str],
+        previous_files: Mapping[str, str],
+        previous_result: ValidationResult,
+    ) -> ValidationResult:
+        """
+        Re-validate a project where only some files changed.
+
+        Per-file issues of unchanged files are carried over from
+        previous_result; changed source files are checked again. The
+        project-level checks (package.json, tsconfig.json, dependencies) are
+        only re-run when one of those files changed or a changed file's
+        imports differ from before.
+
+        Args:
+            files: Current file contents
+            changed: Paths added, removed or modified since previous_files
+            previous_files: File contents previous_result was computed for
+            previous_result: Validation result for previous_files
+
+        Returns:
+            ValidationResult equivalent to validate_project(files)
+        """
+        changed = set(changed)
+        project_paths = set(PROJECT_LEVEL_FILES)
+
+        rerun_project = bool(changed & project_paths) or any(
+            self._imports(files.get(path, "")) != self._imports(previous_files.get(path, ""))
+            for path in changed
+            if self._is_source_file(path)
+        )
+
+        issues: List[ValidationIssue] = []
+        for issue in previous_result.all_issues:
+            if issue.file_path in project_paths:
+                if not rerun_project:
+                    issues.append(issue)
+            elif issue.file_path not in changed:
+                issues.append(issue)
+
+        if rerun_project:
+            project_issues, dependency_issues = self._check_project(files)
+            issues.extend(project_issues + dependency_issues)
+
+        for path in sorted(changed):
+            if path in files and self._is_source_file(path):
+                issues.extend(self._check_file(path, files[path]))
+
+        return self._build_result(issues)
+
+    @staticmethod
+    def _imports(content: str) -> set:
+        """External package imports of a source file"""
+        return set(re.findall(r"(?:import|from)\s+['\"]([^'\"./][^'\"]*)['\"]", content))
+
     def _is_source_file(self, path: str) -> bool:
         """Check if file is a source file we should validate"""
         extensions = [".tsx", ".ts", ".jsx", ".js", ".css"]
@@ -520,10 +696,121 @@ def validate_and_fix(files: Dict[str, str]) -> Tuple[Dict[str, str], ValidationR
     result = validator.validate_project(files)
 
     if not result.is_valid:
-        # Attempt auto-fix
-        fixed_files = validator.auto_fix(files, result)
-        # Re-validate after fixes
-        result = validator.validate_project(fixed_files)
-        return fixed_files, result
+        # Attempt auto-fix, then re-validate the files it touched
+        return _auto_fix_changed(validator, files, result)
+
+    return files, result
+
+
+def build_fix_prompt(files: Mapping[str, str], result: ValidationResult, paths: Iterable[str]) -> str:
+    """
+    Build one prompt asking the LLM to fix several files at once.
+
+    Args:
+        files: Current project files
+        result: Validation result listing the issues
+        paths: Files to include in the prompt
+
+    Returns:
+        Prompt requesting a JSON object of {path: fixed content}
+    """
+    sections = []
+    for path in paths:
+        issues = [i for i in result.errors if i.file_path == path]
+        issue_lines = "\n".join(
+            f"- [{i.code}]{f' line {i.line_number}' if i.line_number else ''}: {i.message}"
+            + (f" (suggestion: {i.suggestion})" if i.suggestion else "")
+            for i in issues
+        )
+        sections.append(f"### {path}\nIssues:\n{issue_lines}\n\n```\n{files.get(path, '')}\n```")
+
+    return (
+        "The following files of a Next.js project failed validation. Fix every listed issue "
+        "without changing unrelated behavior.\n\n"
+        + "\n\n".join(sections)
+        + "\n\nFor each file, respond with a `### <path>` heading followed by its complete "
+        "fixed content in a fenced code block, in the same layout as above. Only include the "
+        "files listed above."
+    )
+
+
+# One "### path" heading followed by a fenced block; the lazy body stops at
+# the first fence on its own line so adjacent blocks stay separate
+_FIX_BLOCK_PATTERN = re.compile(
+    r"^###[ \t]+(?P<path>\S+)[ \t]*\n+```[^\n]*\n(?P<content>.*?)^```[ \t]*$",
+    re.MULTILINE | re.DOTALL,
+)
+
+
+def parse_fix_response(text: str) -> Dict[str, str]:
+    """Extract {path: content} from the fenced file blocks of an LLM fix response"""
+    return {
+        match.group("path"): match.group("content")
+        for match in _FIX_BLOCK_PATTERN.finditer(text)
+    }
+
+
+def _auto_fix_changed(
+    validator: CodeValidator,
+    files: Dict[str, str],
+    result: ValidationResult,
+) -> Tuple[Dict[str, str], ValidationResult]:
+    """Apply rule-based fixes and re-validate only the files they changed"""
+    fixed_files = validator.auto_fix(files, result)
+    changed = {path for path, content in fixed_files.items() if files.get(path) != content}
+    if not changed:
+        return files, result
+    return fixed_files, validator.validate_changed(fixed_files, changed, files, result)
+
+
+async def validate_and_fix_async(
+    files: Dict[str, str],
+    fix_fn: Optional[FixFunction] = None,
+    max_rounds: int = MAX_FIX_ROUNDS,
+) -> Tuple[Dict[str, str], ValidationResult]:
+    """
+    Validate, auto-fix and optionally LLM-fix a project.
+
+    Per-file checks run concurrently. If errors remain after the rule-based
+    fixes, all failing files are sent to fix_fn in a single prompt per
+    round, and only the files it changed are re-validated.
+
+    Args:
+        files: Project files
+        fix_fn: Async function taking a fix prompt and returning {path: content}
+        max_rounds: Maximum number of LLM fix rounds
+
+    Returns:
+        Tuple of (fixed files, remaining issues)
+    """
+    validator = get_validator()
+    result = await validator.validate_project_async(files)
+    if result.is_valid:
+        return files, result
+
+    files, result = _auto_fix_changed(validator, files, result)
+
+    for _ in range(max_rounds if fix_fn else 0):
+        if result.is_valid:
+            break
+
+        failing = list(dict.fromkeys(e.file_path for e in result.errors if e.file_path in files))
+        if not failing:
+            break
+
+        try:
+            fixed = await fix_fn(build_fix_prompt(files, result, failing))
+        except Exception as e:
+            logger.warning(f"LLM fix failed: {e}")
+            break
+
+        changed = {path for path in failing if path in fixed and fixed[path] != files[path]}
+        if not changed:
+            break
+
+        previous = files
+        files = {**files, **{path: fixed[path] for path in changed}}
+        result = validator.validate_changed(files, changed, previous, result)
+        files, result = _auto_fix_changed(validator, files, result)
 
     return files, result
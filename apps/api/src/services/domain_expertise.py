@@ -8,9 +8,18 @@ Combines all sources of domain knowledge into a unified DomainExpertise profile:
 4. Smart presets (from keyword extraction)
 
 The result is a rich domain context that agents use for informed generation.
+
+Industry-level web research and knowledge patterns are cached per industry
+(and refreshed in the background for the most requested industries). Each
+request adds its own layer on top: research queries driven by its
+clarifications, patterns matching its description, and its concepts and
+preset.
 """
 
+import asyncio
 import logging
+import time
+from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 from pydantic import BaseModel, Field
@@ -67,6 +76,11 @@ class DomainExpertise(BaseModel):
     confidence_score: float = Field(default=0.0, ge=0, le=1, description="Overall confidence in expertise")
     sources_used: List[str] = Field(default_factory=list, description="Which sources contributed")
 
+    # Industry-level cache metadata
+    industry_data_computed_at: Optional[str] = Field(default=None, description="When research/patterns were gathered (ISO 8601)")
+    industry_data_age_seconds: float = Field(default=0.0, description="Age of the industry-level data")
+    industry_data_stale: bool = Field(default=False, description="Industry data is past its refresh interval")
+
     def to_agent_context(self) -> str:
         """
         Generate a rich context string for agent prompts.
@@ -136,6 +150,28 @@ class DomainExpertise(BaseModel):
         return "\n".join(parts)
 
 
+# Industry-level data older than this is refreshed
+INDUSTRY_REFRESH_SECONDS = 6 * 3600
+
+# Stale data is served (while refreshing in the background) up to this age
+INDUSTRY_MAX_STALE_SECONDS = 24 * 3600
+
+# How many of the most requested industries the background task keeps warm
+BACKGROUND_REFRESH_TOP_K = 8
+
+
+@dataclass
+class _IndustryEntry:
+    """Cached industry-level expertise"""
+    expertise: DomainExpertise  # Research and pattern fields only
+    research: Optional[DomainResearch]
+    patterns: List[PatternMatch]
+    computed_at: float  # time.time()
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.computed_at
+
+
 class DomainExpertiseSynthesizer:
     """
     Synthesizes domain expertise from multiple sources.
@@ -147,12 +183,20 @@ class DomainExpertiseSynthesizer:
     4. Smart presets (from SmartPresetSystem)
 
     Into a unified DomainExpertise profile.
+
+    Web research and knowledge patterns are cached per industry. Fresh
+    entries are used as-is, stale ones are served while a background
+    refresh runs, and expired ones are recomputed inline (once, even for
+    concurrent requests; every waiter gets its progress, and a cancelled
+    request does not cancel the computation the others are waiting on).
     """
 
     def __init__(
         self,
         enable_web_research: bool = True,
         enable_knowledge_retrieval: bool = True,
+        refresh_seconds: float = INDUSTRY_REFRESH_SECONDS,
+        max_stale_seconds: float = INDUSTRY_MAX_STALE_SECONDS,
     ):
         """
         Initialize the synthesizer.
@@ -160,9 +204,20 @@ class DomainExpertiseSynthesizer:
         Args:
             enable_web_research: Enable web research (requires Tavily API key)
             enable_knowledge_retrieval: Enable knowledge store queries
+            refresh_seconds: Age at which industry data is refreshed
+            max_stale_seconds: Age beyond which stale data is not served
         """
         self.enable_web_research = enable_web_research
         self.enable_knowledge_retrieval = enable_knowledge_retrieval
+        self.refresh_seconds = refresh_seconds
+        self.max_stale_seconds = max_stale_seconds
+
+        self._industry_cache: Dict[str, _IndustryEntry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._progress_listeners: Dict[str, List[callable]] = {}
+        self._request_counts: Dict[str, int] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.cache_stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
 
         self._clarification_agent = get_clarification_agent()
         self._web_researcher = get_web_researcher()
@@ -184,7 +239,7 @@ class DomainExpertiseSynthesizer:
             description: User's project description
             concepts: Pre-extracted concepts (optional, will extract if not provided)
             user_clarifications: User's clarification responses (optional)
-            web_research: Pre-fetched web research (optional, will fetch if enabled)
+            web_research: Pre-fetched web research (optional, replaces the cached research)
             progress_callback: Optional callback for progress updates
 
         Returns:
@@ -197,52 +252,41 @@ class DomainExpertiseSynthesizer:
             concepts = self._smart_system.get_concepts(description)
 
         sources_used.append("smart_presets")
+        industry = concepts.best_industry
 
-        expertise = DomainExpertise(
-            industry=concepts.best_industry,
-            app_name=concepts.app_name,
-            tagline=concepts.tagline,
-            key_entities=concepts.entities[:7],
-        )
+        # Step 2: Industry-level research and patterns (cached)
+        entry = await self.get_industry_entry(industry, progress_callback)
+
+        # Step 3: Per-request layer: research driven by the clarifications
+        # and patterns matching this description
+        if web_research is None:
+            web_research = await self._request_research(entry, user_clarifications, progress_callback)
+        patterns = await self._request_patterns(description, entry, progress_callback)
+
+        if web_research is entry.research and patterns is entry.patterns:
+            base = entry.expertise
+        else:
+            base = self._build_industry_expertise(industry, web_research, patterns)
 
-        # Step 2: Add user clarifications
+        expertise = base.model_copy(deep=True)
+        expertise.app_name = concepts.app_name
+        expertise.tagline = concepts.tagline
+        expertise.key_entities = concepts.entities[:7]
+
+        # Step 4: Add user clarifications
         if user_clarifications:
             self._apply_clarifications(expertise, user_clarifications)
             sources_used.append("user_clarifications")
 
-        # Step 3: Web research (if enabled and available)
-        if self.enable_web_research and self._web_researcher.is_available():
-            if web_research is None:
-                if progress_callback:
-                    await progress_callback("Researching industry...")
-
-                web_research = await self._web_researcher.research_domain(
-                    business_idea=description,
-                    industry=concepts.best_industry,
-                    clarifications=user_clarifications or {},
-                    progress_callback=progress_callback,
-                )
-
-            self._apply_web_research(expertise, web_research)
+        if web_research is not None:
             sources_used.append("web_research")
-
-        # Step 4: Knowledge retrieval (if enabled)
-        if self.enable_knowledge_retrieval:
-            if progress_callback:
-                await progress_callback("Finding similar successful patterns...")
-
-            patterns = await self._knowledge_store.find_similar_patterns(
-                description=description,
-                industry=concepts.best_industry,
-                top_k=3,
-            )
-
-            if patterns:
-                self._apply_patterns(expertise, patterns)
-                sources_used.append("knowledge_store")
+        if patterns:
+            sources_used.append("knowledge_store")
 
         # Step 5: Get base preset data (always available)
-        domain_preset, arch_preset, mock_preset = self._smart_system.get_preset(description)
+        domain_preset, arch_preset, mock_preset = self._smart_system.get_preset(
+            description, concepts=concepts
+        )
 
         self._apply_preset(expertise, domain_preset, arch_preset, mock_preset)
 
@@ -252,16 +296,235 @@ class DomainExpertiseSynthesizer:
             concepts=concepts,
             has_clarifications=bool(user_clarifications),
             has_web_research=bool(web_research and web_research.confidence_score > 0.3),
-            has_patterns=bool(patterns) if self.enable_knowledge_retrieval else False,
+            has_patterns=bool(patterns),
         )
 
+        age = entry.age()
+        expertise.industry_data_computed_at = datetime.fromtimestamp(
+            entry.computed_at, tz=timezone.utc
+        ).isoformat()
+        expertise.industry_data_age_seconds = age
+        expertise.industry_data_stale = age >= self.refresh_seconds
+
         logger.info(
-            f"Synthesized domain expertise for '{concepts.best_industry}' "
-            f"(confidence={expertise.confidence_score:.2f}, sources={sources_used})"
+            f"Synthesized domain expertise for '{industry}' "
+            f"(confidence={expertise.confidence_score:.2f}, sources={sources_used}, "
+            f"industry data age={age:.0f}s)"
+        )
+
+        return expertise
+
+    # ===========================================
+    # Industry-level cache
+    # ===========================================
+
+    async def get_industry_entry(
+        self,
+        industry: str,
+        progress_callback: Optional[callable] = None,
+    ) -> _IndustryEntry:
+        """
+        Cached research and patterns for an industry.
+
+        Stale entries are returned immediately and refreshed in the
+        background; missing or expired entries are computed inline.
+        """
+        self._request_counts[industry] = self._request_counts.get(industry, 0) + 1
+        entry = self._industry_cache.get(industry)
+
+        if entry is not None:
+            age = entry.age()
+            if age < self.refresh_seconds:
+                self.cache_stats["hits"] += 1
+                return entry
+            if age < self.max_stale_seconds:
+                self.cache_stats["stale_hits"] += 1
+                self._start_refresh(industry)
+                return entry
+
+        self.cache_stats["misses"] += 1
+        task = self._start_refresh(industry)
+        listeners = self._progress_listeners.setdefault(industry, [])
+        if progress_callback:
+            listeners.append(progress_callback)
+        try:
+            # Shielded so a cancelled request leaves the shared computation running
+            return await asyncio.shield(task)
+        finally:
+            if progress_callback in listeners:
+                listeners.remove(progress_callback)
+            if not listeners:
+                self._progress_listeners.pop(industry, None)
+
+    def _start_refresh(self, industry: str) -> asyncio.Task:
+        """Start (or join) the computation of an industry entry"""
+        task = self._inflight.get(industry)
+        if task is None:
+            async def broadcast(message: str) -> None:
+                await self._broadcast_progress(industry, message)
+
+            task = asyncio.create_task(self._refresh_industry(industry, broadcast))
+            self._inflight[industry] = task
+            task.add_done_callback(lambda done: self._refresh_done(industry, done))
+        return task
+
+    async def _broadcast_progress(self, industry: str, message: str) -> None:
+        """Send progress of a shared computation to every request waiting on it"""
+        for callback in list(self._progress_listeners.get(industry, [])):
+            try:
+                await callback(message)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+    def _refresh_done(self, industry: str, task: asyncio.Task) -> None:
+        self._inflight.pop(industry, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Refreshing expertise for '{industry}' failed: {task.exception()}")
+
+    async def _refresh_industry(
+        self,
+        industry: str,
+        progress_callback: Optional[callable] = None,
+    ) -> _IndustryEntry:
+        """Gather research and patterns for an industry and cache them"""
+        research: Optional[DomainResearch] = None
+        patterns: List[PatternMatch] = []
+
+        if self.enable_web_research and self._web_researcher.is_available():
+            if progress_callback:
+                await progress_callback("Researching industry...")
+            research = await self._web_researcher.research_domain(
+                business_idea=industry.replace("-", " "),
+                industry=industry,
+                clarifications={},
+                progress_callback=progress_callback,
+            )
+
+        if self.enable_knowledge_retrieval:
+            if progress_callback:
+                await progress_callback("Finding similar successful patterns...")
+            patterns = await self._knowledge_store.find_similar_patterns(
+                description=industry.replace("-", " "),
+                industry=industry,
+                top_k=3,
+            )
+
+        entry = _IndustryEntry(
+            expertise=self._build_industry_expertise(industry, research, patterns),
+            research=research,
+            patterns=patterns or [],
+            computed_at=time.time(),
         )
+        self._industry_cache[industry] = entry
+        self.cache_stats["refreshes"] += 1
+        return entry
 
+    async def _request_research(
+        self,
+        entry: _IndustryEntry,
+        clarifications: Optional[Dict[str, str]],
+        progress_callback: Optional[callable] = None,
+    ) -> Optional[DomainResearch]:
+        """Cached industry research plus the queries this request's clarifications add"""
+        if entry.research is None or not clarifications:
+            return entry.research
+        queries = self._web_researcher.clarification_queries(entry.research.industry, clarifications)
+        if not queries:
+            return entry.research
+        return await self._web_researcher.extend_research(entry.research, queries, progress_callback)
+
+    async def _request_patterns(
+        self,
+        description: str,
+        entry: _IndustryEntry,
+        progress_callback: Optional[callable] = None,
+    ) -> List[PatternMatch]:
+        """Patterns matching this description, or the industry's when none match"""
+        if not self.enable_knowledge_retrieval:
+            return entry.patterns
+        if progress_callback:
+            await progress_callback("Finding similar successful patterns...")
+        patterns = await self._knowledge_store.find_similar_patterns(
+            description=description,
+            industry=entry.expertise.industry,
+            top_k=3,
+        )
+        return patterns or entry.patterns
+
+    def _build_industry_expertise(
+        self,
+        industry: str,
+        research: Optional[DomainResearch],
+        patterns: List[PatternMatch],
+    ) -> DomainExpertise:
+        """Expertise holding only the industry-level fields"""
+        expertise = DomainExpertise(industry=industry)
+        if research is not None:
+            self._apply_web_research(expertise, research)
+        if patterns:
+            self._apply_patterns(expertise, patterns)
         return expertise
 
+    async def precompute(self, industries: List[str]) -> None:
+        """Compute (or refresh) industry entries ahead of requests"""
+        results = await asyncio.gather(
+            *(asyncio.shield(self._start_refresh(industry)) for industry in industries),
+            return_exceptions=True,
+        )
+        for industry, result in zip(industries, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Precomputing expertise for '{industry}' failed: {result}")
+
+    def popular_industries(self, top_k: int = BACKGROUND_REFRESH_TOP_K) -> List[str]:
+        """Most requested industries, most popular first"""
+        return sorted(self._request_counts, key=self._request_counts.get, reverse=True)[:top_k]
+
+    def start_background_refresh(
+        self,
+        industries: Optional[List[str]] = None,
+        interval_seconds: Optional[float] = None,
+        top_k: int = BACKGROUND_REFRESH_TOP_K,
+    ) -> None:
+        """
+        Periodically refresh the given and the most requested industries.
+
+        Entries are refreshed shortly before they go stale, so requests for
+        popular industries never wait on research.
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        interval = interval_seconds or self.refresh_seconds / 4
+        pinned = list(industries or [])
+
+        async def refresh_loop() -> None:
+            while True:
+                now = time.time()
+                due = [
+                    industry
+                    for industry in dict.fromkeys(pinned + self.popular_industries(top_k))
+                    if industry not in self._industry_cache
+                    or self._industry_cache[industry].age(now) >= self.refresh_seconds - interval
+                ]
+                if due:
+                    await self.precompute(due)
+                await asyncio.sleep(interval)
+
+        self._refresh_task = asyncio.create_task(refresh_loop())
+
+    async def stop_background_refresh(self) -> None:
+        """Stop the background refresh task"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def clear_cache(self) -> None:
+        """Drop all cached industry data"""
+        self._industry_cache.clear()
+
     def _apply_clarifications(
         self,
         expertise: DomainExpertise,
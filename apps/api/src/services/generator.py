@@ -34,7 +34,13 @@ from .template_customizer import (
     BrandProfile,
     get_template_customizer,
 )
-from .code_validator import validate_files, validate_and_fix, ValidationResult
+from .code_validator import (
+    validate_files,
+    validate_and_fix,
+    validate_and_fix_async,
+    parse_fix_response,
+    ValidationResult,
+)
 from .prototype_orchestrator import (
     PrototypeOrchestrator,
     PrototypeEvent,
@@ -51,6 +57,16 @@ USE_CREATIVE_MODE = os.environ.get("USE_CREATIVE_MODE", "true").lower() == "true
 # Environment flag to force mock mode
 USE_MOCK_MODE = os.environ.get("USE_MOCK_AGENTS", "false").lower() == "true"
 
+# Environment flag for LLM repair of files that still fail validation after the
+# rule-based fixes. Off by default: each round is an extra LLM call
+# (max_tokens=8192) on top of generation.
+USE_LLM_VALIDATION_FIXES = os.environ.get("USE_LLM_VALIDATION_FIXES", "false").lower() == "true"
+
+# Environment flag for speculative fallbacks in creative mode: cheap fallbacks
+# race the creative pipeline and a late creative result arrives as a
+# "prototype_upgrade" event
+USE_SPECULATIVE_FALLBACKS = os.environ.get("USE_SPECULATIVE_FALLBACKS", "false").lower() == "true"
+
 
 class CodeGenerator:
     """
@@ -97,9 +113,17 @@ class CodeGenerator:
                 """Bridge prototype events to generation events"""
                 await self._handle_prototype_event(event)
 
-            self._prototype_orchestrator = PrototypeOrchestrator(event_callback=bridge_prototype_events)
+            self._prototype_orchestrator = PrototypeOrchestrator(
+                event_callback=bridge_prototype_events,
+                speculative=USE_SPECULATIVE_FALLBACKS,
+            )
         return self._prototype_orchestrator
 
+    async def close(self) -> None:
+        """Cancel background work (pending prototype upgrades) for this generator"""
+        if self._prototype_orchestrator is not None:
+            await self._prototype_orchestrator.cancel_upgrades()
+
     async def _handle_prototype_event(self, event: PrototypeEvent) -> None:
         """Convert prototype orchestrator events to generation events"""
         event_map = {
@@ -127,6 +151,34 @@ class CodeGenerator:
             await self._emit_event(gen_event)
             return
 
+        if event.type == "prototype_upgrade":
+            files = event.data.get("files", {}) if event.data else {}
+            project_id = event.data.get("project_id") if event.data else None
+            if files and project_id:
+                try:
+                    await save_project_files(project_id, files)
+                except Exception as e:
+                    logger.warning(f"Failed to save upgraded files to storage: {e}")
+
+            await self._emit_event(GenerationEvent(
+                type="prototype_upgrade",
+                message=event.message,
+                progress=event.progress,
+                agent=event.agent,
+                files=files,
+                data={"fallback_level": event.data.get("fallback_level")} if event.data else None,
+            ))
+            return
+
+        if event.type == "phase_timings":
+            await self._emit_event(GenerationEvent(
+                type="status",
+                message=event.message,
+                progress=event.progress,
+                data=event.data,
+            ))
+            return
+
         if event.type == "research_progress":
             gen_event = GenerationEvent(
                 type="research_progress",
@@ -277,6 +329,31 @@ class CodeGenerator:
             project_id=project_id,
         )
 
+        return await self._deliver_workflow_result(result, platform.value)
+
+    async def resume_workflow(self, run_id: str, platform: str = Platform.WEB.value) -> Dict[str, str]:
+        """
+        Resume a checkpointed orchestrator run.
+
+        Streams the same events as a fresh generation and saves the files
+        to the run's project.
+
+        Raises:
+            KeyError: No checkpoint exists for run_id
+        """
+        await self._emit_event(GenerationEvent(
+            type="status",
+            message=f"Resuming workflow run {run_id}...",
+            progress=0
+        ))
+
+        result = await self._get_orchestrator().resume_workflow(run_id)
+        return await self._deliver_workflow_result(result, platform)
+
+    async def _deliver_workflow_result(self, result: WorkflowResult, platform: str) -> Dict[str, str]:
+        """Save an orchestrator run's files and emit the files and complete events"""
+        project_id = result.project_id
+
         # Log workflow result
         logger.info(f"Workflow completed: status={result.status}, files={len(result.files)}, agents={result.successful_agents}/{result.total_agents}")
         if result.errors:
@@ -311,7 +388,7 @@ class CodeGenerator:
             message="Code generation complete!",
             summary={
                 "filesGenerated": len(files),
-                "platform": platform.value,
+                "platform": platform,
                 "agents": result.total_agents,
                 "successfulAgents": result.successful_agents,
                 "failedAgents": result.failed_agents,
@@ -410,6 +487,10 @@ class CodeGenerator:
         """
         Validate generated files and fix issues.
         Falls back to clean template if validation fails.
+
+        When USE_LLM_VALIDATION_FIXES is set, files that still fail after the
+        rule-based fixes are sent to the LLM together in one prompt per round
+        (up to MAX_FIX_ROUNDS extra calls).
         """
         await self._emit_event(GenerationEvent(
             type="status",
@@ -418,7 +499,8 @@ class CodeGenerator:
         ))
 
         # Try to fix issues
-        fixed_files, validation = validate_and_fix(files)
+        fix_fn = self._fix_files_with_llm if USE_LLM_VALIDATION_FIXES else None
+        fixed_files, validation = await validate_and_fix_async(files, fix_fn=fix_fn)
 
         if validation.is_valid:
             logger.info(f"Validation passed for project {project_id}")
@@ -448,6 +530,21 @@ class CodeGenerator:
         logger.warning("No template available for fallback, returning fixed files")
         return fixed_files
 
+    async def _fix_files_with_llm(self, prompt: str) -> Dict[str, str]:
+        """Ask the LLM to fix a batch of files; returns {path: fixed content}"""
+        from ..llm.router import get_llm_router
+        from ..llm.providers import LLMMessage
+
+        messages = [
+            LLMMessage(
+                role="system",
+                content="You fix validation errors in Next.js projects. Respond only with the fixed file blocks."
+            ),
+            LLMMessage(role="user", content=prompt),
+        ]
+        response = await get_llm_router().generate(messages, max_tokens=8192, temperature=0.2)
+        return parse_fix_response(response.content)
+
     async def _generate_from_template(
         self,
         description: str,
@@ -2,7 +2,11 @@
 Agent Orchestrator using LangGraph
 
 Coordinates multi-agent workflows with state management and real-time updates.
-Executes agents in sequence or parallel based on workflow configuration.
+Agents run on the workflow's dependency graph: each starts as soon as the
+agents whose output it consumes have finished, under a concurrency limit.
+State is checkpointed after every agent so an interrupted run can resume.
+Each agent receives upstream outputs selected and summarized to fit a
+per-agent context budget.
 """
 
 from typing import Dict, List, Optional, Any, Callable, Awaitable, TypedDict
@@ -11,6 +15,8 @@ from datetime import datetime
 from enum import Enum
 import asyncio
 import logging
+import time
+import uuid
 
 from langgraph.graph import StateGraph, END
 
@@ -25,9 +31,13 @@ from .agent_executor import (
     AgentExecutor,
     AgentContext,
     AgentResult,
-    execute_agent,
+    GroupPolicy,
+    execute_agent_with_deadline,
     execute_agents_parallel,
 )
+from .agent_context import AgentContextManager, DEFAULT_CONTEXT_BUDGET_TOKENS
+from .phase_graph import PhaseTiming, timing_report
+from .workflow_checkpoints import CheckpointStore, get_checkpoint_store, node_input_hash
 from ..ai.structured_output import CodeFile
 
 logger = logging.getLogger(__name__)
@@ -49,6 +59,7 @@ class WorkflowStatus(str, Enum):
 class WorkflowState(TypedDict):
     """State tracked through the workflow execution"""
     project_id: str
+    run_id: str
     description: str
     platform: str
     workflow_type: str
@@ -63,6 +74,9 @@ class WorkflowState(TypedDict):
     files: List[Dict[str, Any]]  # Generated files
     errors: List[str]
 
+    # Upstream context tokens per agent, before and after selection
+    context_report: Dict[str, Any]
+
     # Metadata
     started_at: str
     status: str
@@ -73,6 +87,7 @@ class WorkflowResult(BaseModel):
     project_id: str
     workflow_type: str
     status: WorkflowStatus
+    run_id: Optional[str] = None
 
     # Results
     files: List[CodeFile] = Field(default_factory=list)
@@ -91,6 +106,9 @@ class WorkflowResult(BaseModel):
     # Errors
     errors: List[str] = Field(default_factory=list)
 
+    # Upstream context tokens per agent, before and after selection
+    context_report: Dict[str, Any] = Field(default_factory=dict)
+
 
 # ===========================================
 # Event Types for Real-time Updates
@@ -116,21 +134,60 @@ class AgentOrchestrator:
     Orchestrates multi-agent workflows using LangGraph.
 
     Features:
-    - Sequential and parallel agent execution
+    - Dependency-scheduled agent execution with bounded concurrency
     - State management across agents
     - Real-time event streaming
     - Error recovery and retry
+    - Checkpointing after every agent, with resume by run ID
+    - Optional reuse of stored outputs for identical agent inputs
     """
 
     def __init__(
         self,
         event_callback: Optional[EventCallback] = None,
         max_parallel_agents: int = 3,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        reuse_outputs: bool = False,
+        context_budget_tokens: int = DEFAULT_CONTEXT_BUDGET_TOKENS,
+        agent_timeout_seconds: Optional[float] = None,
+        group_policy: GroupPolicy = GroupPolicy.BEST_EFFORT,
     ):
+        """
+        Args:
+            event_callback: Receives orchestrator events
+            max_parallel_agents: Most agents running at once
+            checkpoint_store: Where run state is persisted (global store by default)
+            reuse_outputs: Reuse a stored output, from any run, when an agent's
+                inputs hash to the same value instead of running it again
+            context_budget_tokens: Max tokens of upstream outputs per agent
+            agent_timeout_seconds: Deadline per agent; a late agent fails
+            group_policy: Reaction to a failed agent (FAIL_FAST cancels the rest)
+        """
         self.event_callback = event_callback
         self.max_parallel_agents = max_parallel_agents
+        self.checkpoint_store = checkpoint_store
+        self.reuse_outputs = reuse_outputs
+        self.context_budget_tokens = context_budget_tokens
+        self.agent_timeout_seconds = agent_timeout_seconds
+        self.group_policy = group_policy
         self.registry = get_registry()
 
+    def _get_checkpoint_store(self) -> CheckpointStore:
+        if self.checkpoint_store is None:
+            self.checkpoint_store = get_checkpoint_store()
+        return self.checkpoint_store
+
+    async def _checkpoint(self, state: WorkflowState, status: str) -> None:
+        """Persist the state; a failed write is logged, never fatal"""
+        if not state.get("run_id"):
+            return
+        try:
+            await self._get_checkpoint_store().save_state(
+                state["run_id"], state["workflow_type"], status, dict(state)
+            )
+        except Exception as e:
+            logger.warning(f"Could not checkpoint run {state['run_id']}: {e}")
+
     async def _emit_event(
         self,
         event_type: str,
@@ -152,6 +209,7 @@ class AgentOrchestrator:
         platform: str,
         project_id: str,
         workflow_type: Optional[str] = None,
+        run_id: Optional[str] = None,
     ) -> WorkflowResult:
         """
         Execute a complete workflow.
@@ -161,11 +219,13 @@ class AgentOrchestrator:
             platform: Target platform (web, mobile, api, etc.)
             project_id: Unique project identifier
             workflow_type: Specific workflow or auto-detect
+            run_id: Checkpoint key for this run (generated if omitted)
 
         Returns:
             WorkflowResult with all generated files and agent outputs
         """
         started_at = datetime.utcnow()
+        run_id = run_id or uuid.uuid4().hex
 
         # Auto-detect workflow if not specified
         if workflow_type is None:
@@ -179,6 +239,7 @@ class AgentOrchestrator:
                 project_id=project_id,
                 workflow_type=workflow_type,
                 status=WorkflowStatus.FAILED,
+                run_id=run_id,
                 started_at=started_at,
                 errors=[f"Unknown workflow type: {workflow_type}"],
             )
@@ -186,6 +247,7 @@ class AgentOrchestrator:
         agent_sequence = get_workflow_sequence(workflow_type)
 
         await self._emit_event("workflow_start", project_id, {
+            "run_id": run_id,
             "workflow_type": workflow_type,
             "total_agents": len(agent_sequence),
             "agents": agent_sequence,
@@ -194,6 +256,7 @@ class AgentOrchestrator:
         # Initialize state
         state: WorkflowState = {
             "project_id": project_id,
+            "run_id": run_id,
             "description": description,
             "platform": platform,
             "workflow_type": workflow_type,
@@ -203,9 +266,98 @@ class AgentOrchestrator:
             "agent_results": {},
             "files": [],
             "errors": [],
+            "context_report": {},
             "started_at": started_at.isoformat(),
             "status": WorkflowStatus.RUNNING.value,
         }
+        await self._checkpoint(state, WorkflowStatus.RUNNING.value)
+
+        return await self._run(state, workflow_config, started_at)
+
+    async def resume_workflow(self, run_id: str) -> WorkflowResult:
+        """
+        Resume a run from its last checkpoint.
+
+        Agents that succeeded keep their results; every other agent of the
+        workflow (never started, interrupted or failed) runs again, along
+        with everything downstream of it.
+
+        Raises:
+            KeyError: No checkpoint exists for run_id
+        """
+        checkpoint = await self._get_checkpoint_store().load_state(run_id)
+        if checkpoint is None:
+            raise KeyError(f"No checkpoint for run {run_id}")
+
+        started_at = datetime.utcnow()
+        saved = checkpoint.state
+        project_id = saved["project_id"]
+        workflow_type = checkpoint.workflow_type
+        workflow_config = get_workflow(workflow_type)
+        if workflow_config is None:
+            return WorkflowResult(
+                project_id=project_id,
+                workflow_type=workflow_type,
+                status=WorkflowStatus.FAILED,
+                run_id=run_id,
+                started_at=started_at,
+                errors=[f"Unknown workflow type: {workflow_type}"],
+            )
+
+        saved_results = saved.get("agent_results", {})
+        dependencies = workflow_config.agent_dependencies()
+        rerun = {
+            agent_id for agent_id in workflow_config.agent_ids
+            if agent_id not in saved.get("completed_agents", [])
+            or not saved_results.get(agent_id, {}).get("success")
+        }
+        changed = True
+        while changed:
+            changed = False
+            for agent_id in workflow_config.agent_ids:
+                if agent_id not in rerun and rerun.intersection(dependencies.get(agent_id, [])):
+                    rerun.add(agent_id)
+                    changed = True
+        completed = [agent_id for agent_id in workflow_config.agent_ids if agent_id not in rerun]
+        pending = [agent_id for agent_id in workflow_config.agent_ids if agent_id in rerun]
+
+        state: WorkflowState = {
+            **saved,
+            "run_id": run_id,
+            "current_agent": "",
+            "completed_agents": completed,
+            "pending_agents": pending,
+            "agent_results": {agent_id: saved_results[agent_id] for agent_id in completed},
+            "files": [f for agent_id in completed for f in saved_results[agent_id].get("files", [])],
+            "errors": [
+                e for e in saved.get("errors", [])
+                if not any(e.startswith(f"{agent_id}: ") for agent_id in pending)
+            ],
+            "status": WorkflowStatus.RUNNING.value,
+        }
+
+        await self._emit_event("workflow_resume", project_id, {
+            "run_id": run_id,
+            "workflow_type": workflow_type,
+            "completed_agents": completed,
+            "pending_agents": pending,
+            "message": f"Resuming run {run_id}: {len(completed)} agents done, {len(pending)} to run",
+        })
+        await self._checkpoint(state, WorkflowStatus.RUNNING.value)
+
+        return await self._run(state, workflow_config, started_at)
+
+    async def _run(
+        self,
+        state: WorkflowState,
+        workflow_config: WorkflowConfig,
+        started_at: datetime,
+    ) -> WorkflowResult:
+        """Execute the pending agents of a prepared state and compile the result"""
+        project_id = state["project_id"]
+        run_id = state["run_id"]
+        workflow_type = state["workflow_type"]
+        total_agents = len(state["completed_agents"]) + len(state["pending_agents"])
 
         # Build and execute the workflow graph
         try:
@@ -249,16 +401,20 @@ class AgentOrchestrator:
                 status=status,
                 files=files,
                 agent_results=agent_results,
-                total_agents=len(agent_sequence),
+                run_id=run_id,
+                total_agents=total_agents,
                 successful_agents=success_count,
-                failed_agents=len(agent_sequence) - success_count,
+                failed_agents=total_agents - success_count,
                 started_at=started_at,
                 completed_at=completed_at,
                 duration_ms=duration_ms,
                 errors=final_state.get("errors", []),
+                context_report=final_state.get("context_report", {}),
             )
+            await self._checkpoint(final_state, status.value)
 
             await self._emit_event("workflow_complete", project_id, {
+                "run_id": run_id,
                 "status": status.value,
                 "total_agents": result.total_agents,
                 "successful_agents": result.successful_agents,
@@ -275,6 +431,7 @@ class AgentOrchestrator:
             duration_ms = int((completed_at - started_at).total_seconds() * 1000)
 
             await self._emit_event("workflow_error", project_id, {
+                "run_id": run_id,
                 "error": str(e),
             })
 
@@ -282,170 +439,247 @@ class AgentOrchestrator:
                 project_id=project_id,
                 workflow_type=workflow_type,
                 status=WorkflowStatus.FAILED,
+                run_id=run_id,
                 started_at=started_at,
                 completed_at=completed_at,
                 duration_ms=duration_ms,
                 errors=[str(e)],
             )
 
-    async def _execute_workflow_graph(
+    async def _execute_agent_dag(
         self,
-        initial_state: WorkflowState,
+        state: WorkflowState,
         workflow_config: WorkflowConfig,
     ) -> WorkflowState:
-        """Build and execute the LangGraph workflow"""
-
-        # Create the state graph
-        graph = StateGraph(WorkflowState)
-
-        # Add agent nodes
-        async def execute_agent_node(state: WorkflowState) -> WorkflowState:
-            """Execute the current agent"""
-            if not state["pending_agents"]:
-                return state
-
-            current_agent = state["pending_agents"][0]
-            state["current_agent"] = current_agent
-
-            await self._emit_event("agent_start", state["project_id"], {
-                "agent_id": current_agent,
-                "progress": len(state["completed_agents"]) / (
-                    len(state["completed_agents"]) + len(state["pending_agents"])
-                ),
+        """
+        Run the pending agents on the workflow's dependency graph.
+
+        Scheduling is done by execute_agents_parallel: each agent starts
+        once every agent whose output it consumes has finished, with at most
+        max_parallel_agents running at a time, each under
+        agent_timeout_seconds, and group_policy applied to failures; when
+        slots are short, agents heading the longest chain of dependents
+        start first. An agent sees the outputs and files of its transitive dependencies
+        only, selected and summarized to fit the context budget. Agents
+        already completed in the state count as finished.
+        The state is checkpointed after every agent when it has a run ID.
+        Emits the critical path and per-agent slack when done.
+        """
+        project_id = state["project_id"]
+        run_id = state.get("run_id")
+        dependencies = workflow_config.agent_dependencies()
+        pending = list(state["pending_agents"])
+        total = len(state["completed_agents"]) + len(pending)
+
+        new_state = state.copy()
+        new_state["agent_results"] = dict(state["agent_results"])
+        new_state["completed_agents"] = list(state["completed_agents"])
+        new_state["errors"] = list(state["errors"])
+        files_by_agent: Dict[str, List[Dict[str, Any]]] = {
+            agent_id: new_state["agent_results"].get(agent_id, {}).get("files", [])
+            for agent_id in new_state["completed_agents"]
+        }
+        running: List[str] = []
+
+        context_manager = AgentContextManager(budget_tokens=self.context_budget_tokens)
+        for agent_id in new_state["completed_agents"]:
+            context_manager.add(agent_id, new_state["agent_results"].get(agent_id, {}).get("output"))
+
+        def ancestors(agent_id: str) -> List[str]:
+            found: set = set()
+            stack = list(dependencies.get(agent_id, []))
+            while stack:
+                dep = stack.pop()
+                if dep not in found:
+                    found.add(dep)
+                    stack.extend(dependencies.get(dep, []))
+            # Keep workflow order so prompts are stable across runs
+            return [a for a in workflow_config.agent_ids if a in found]
+
+        dependents: Dict[str, List[str]] = {}
+        for agent_id, deps in dependencies.items():
+            for dep in deps:
+                dependents.setdefault(dep, []).append(agent_id)
+        chain_lengths: Dict[str, int] = {}
+
+        def chain_length(agent_id: str) -> int:
+            """Agents on the longest path from this agent to the end"""
+            if agent_id not in chain_lengths:
+                chain_lengths[agent_id] = 1 + max(
+                    (chain_length(d) for d in dependents.get(agent_id, [])), default=0
+                )
+            return chain_lengths[agent_id]
+
+        origin = time.perf_counter()
+        timings: Dict[str, PhaseTiming] = {}
+
+        def elapsed_ms() -> int:
+            return int((time.perf_counter() - origin) * 1000)
+
+        async def run_agent(agent_id: str) -> AgentResult:
+            started_ms = elapsed_ms()
+            upstream = ancestors(agent_id)
+            running.append(agent_id)
+            await self._emit_event("agent_start", project_id, {
+                "agent_id": agent_id,
+                "progress": len(new_state["completed_agents"]) / total,
+                "parallel": len(running) > 1,
+                "depends_on": dependencies.get(agent_id, []),
             })
 
-            # Build context from previous results
+            agent_config = self.registry.get(agent_id)
+            selection = context_manager.select(
+                agent_id,
+                declared_inputs=dependencies.get(agent_id, []),
+                upstream=upstream,
+                query=f"{agent_config.role} {agent_config.goal}" if agent_config else agent_id,
+            )
+            previous_outputs = selection.outputs
+            upstream_files = [f for aid in upstream for f in files_by_agent.get(aid, [])]
             context = AgentContext(
-                project_id=state["project_id"],
+                project_id=project_id,
                 description=state["description"],
                 platform=state["platform"],
-                previous_outputs={
-                    aid: state["agent_results"].get(aid, {}).get("output")
-                    for aid in state["completed_agents"]
-                },
-                files=[CodeFile(**f) for f in state["files"]],
+                previous_outputs=previous_outputs,
+                files=[CodeFile(**f) for f in upstream_files],
             )
+            input_hash = node_input_hash(agent_id, {
+                "description": state["description"],
+                "platform": state["platform"],
+                "previous_outputs": previous_outputs,
+                "files": upstream_files,
+            })
 
-            # Execute the agent
-            result = await execute_agent(
-                current_agent,
-                context,
-                on_progress=lambda msg: self._emit_event(
-                    "agent_progress",
-                    state["project_id"],
-                    {"agent_id": current_agent, "message": msg}
-                ),
-            )
-
-            # Update state
-            new_state = state.copy()
-            new_state["agent_results"][current_agent] = result.model_dump()
-            new_state["completed_agents"] = state["completed_agents"] + [current_agent]
-            new_state["pending_agents"] = state["pending_agents"][1:]
-            new_state["current_agent"] = ""
-
-            # Add generated files
-            if result.files:
-                for f in result.files:
-                    new_state["files"].append(f.model_dump())
-
-            # Track errors
+            result = None
+            if self.reuse_outputs:
+                try:
+                    stored = await self._get_checkpoint_store().find_output(input_hash)
+                    if stored is not None:
+                        result = AgentResult(**stored)
+                except Exception as e:
+                    logger.warning(f"Could not look up stored output for {agent_id}: {e}")
+            reused = result is not None
+
+            try:
+                if result is None:
+                    result = await execute_agent_with_deadline(
+                        agent_id,
+                        context,
+                        self.agent_timeout_seconds,
+                        on_progress=lambda msg: self._emit_event(
+                            "agent_progress",
+                            project_id,
+                            {"agent_id": agent_id, "message": msg}
+                        ),
+                    )
+            finally:
+                running.remove(agent_id)
+
+            new_state["agent_results"][agent_id] = result.model_dump()
+            context_manager.add(agent_id, new_state["agent_results"][agent_id].get("output"))
+            new_state["completed_agents"].append(agent_id)
+            files_by_agent[agent_id] = [f.model_dump() for f in result.files]
+            new_state["files"] = new_state["files"] + files_by_agent[agent_id]
             if not result.success and result.error:
-                new_state["errors"].append(f"{current_agent}: {result.error}")
+                new_state["errors"].append(f"{agent_id}: {result.error}")
+
+            if run_id:
+                if result.success and not reused:
+                    try:
+                        await self._get_checkpoint_store().save_node_output(
+                            run_id, agent_id, input_hash, new_state["agent_results"][agent_id]
+                        )
+                    except Exception as e:
+                        logger.warning(f"Could not store output of {agent_id}: {e}")
+                new_state["pending_agents"] = [
+                    a for a in pending if a not in new_state["completed_agents"]
+                ]
+                await self._checkpoint(new_state, WorkflowStatus.RUNNING.value)
 
-            await self._emit_event("agent_complete", state["project_id"], {
-                "agent_id": current_agent,
+            await self._emit_event("agent_complete", project_id, {
+                "agent_id": agent_id,
                 "success": result.success,
                 "duration_ms": result.duration_ms,
                 "file_count": len(result.files),
+                "reused": reused,
             })
+            timings[agent_id] = PhaseTiming(
+                name=agent_id,
+                started_ms=started_ms,
+                finished_ms=elapsed_ms(),
+                depends_on=[d for d in dependencies.get(agent_id, []) if d in pending],
+            )
+            return result
 
-            return new_state
-
-        # Check for parallel execution opportunities
-        async def execute_parallel_node(state: WorkflowState) -> WorkflowState:
-            """Execute parallelizable agents together"""
-            if not state["pending_agents"]:
-                return state
-
-            parallel_groups = workflow_config.parallel_groups or []
-
-            # Find agents that can run in parallel
-            parallel_agents = []
-            for group in parallel_groups:
-                group_agents = [
-                    a for a in group
-                    if a in state["pending_agents"]
-                ]
-                if len(group_agents) > 1:
-                    parallel_agents = group_agents[:self.max_parallel_agents]
-                    break
+        async def record_cancelled(agent_id: str, result: AgentResult) -> None:
+            """Record agents cancelled by FAIL_FAST; run_agent records the rest"""
+            if agent_id not in new_state["agent_results"]:
+                new_state["agent_results"][agent_id] = result.model_dump()
+                new_state["errors"].append(f"{agent_id}: {result.error}")
+
+        await execute_agents_parallel(
+            pending,
+            None,
+            on_agent_complete=record_cancelled,
+            max_concurrency=self.max_parallel_agents,
+            policy=self.group_policy,
+            priorities={agent_id: -chain_length(agent_id) for agent_id in pending},
+            dependencies=dependencies,
+            run_agent=run_agent,
+        )
 
-            if not parallel_agents:
-                # No parallel group found, run next agent sequentially
-                return await execute_agent_node(state)
+        new_state["pending_agents"] = []
+        new_state["current_agent"] = ""
+
+        context_report = context_manager.report()
+        new_state["context_report"] = context_report
+        await self._emit_event("workflow_context", project_id, {
+            "message": (
+                f"Upstream context: {context_report['full_tokens']} -> "
+                f"{context_report['sent_tokens']} tokens"
+            ),
+            "budget_tokens": context_report["budget_tokens"],
+            "full_tokens": context_report["full_tokens"],
+            "sent_tokens": context_report["sent_tokens"],
+            "saved_tokens": context_report["saved_tokens"],
+            "reduction": context_report["reduction"],
+            "per_agent": context_report["agents"],
+        })
 
-            await self._emit_event("parallel_start", state["project_id"], {
-                "agents": parallel_agents,
-            })
+        # Dependencies always finish before their dependents start, so start
+        # order is a valid dependency order
+        report = timing_report(sorted(
+            timings.values(), key=lambda t: (t.started_ms, t.finished_ms, pending.index(t.name))
+        ))
+        critical_path = report["critical_path"]
+        await self._emit_event("workflow_schedule", project_id, {
+            "message": f"Critical path: {' -> '.join(critical_path)} ({report['total_ms']}ms)",
+            "critical_path": critical_path,
+            "slack_ms": report["slack_ms"],
+            "schedule": report["phases"],
+            "total_ms": report["total_ms"],
+        })
 
-            # Emit agent_start for each agent in parallel group
-            for agent_id in parallel_agents:
-                await self._emit_event("agent_start", state["project_id"], {
-                    "agent_id": agent_id,
-                    "progress": len(state["completed_agents"]) / (
-                        len(state["completed_agents"]) + len(state["pending_agents"])
-                    ),
-                    "parallel": True,
-                })
-
-            # Build shared context
-            context = AgentContext(
-                project_id=state["project_id"],
-                description=state["description"],
-                platform=state["platform"],
-                previous_outputs={
-                    aid: state["agent_results"].get(aid, {}).get("output")
-                    for aid in state["completed_agents"]
-                },
-                files=[CodeFile(**f) for f in state["files"]],
-            )
+        return new_state
 
-            # Execute in parallel
-            results = await execute_agents_parallel(
-                parallel_agents,
-                context,
-                on_agent_complete=lambda aid, r: self._emit_event(
-                    "agent_complete",
-                    state["project_id"],
-                    {"agent_id": aid, "success": r.success}
-                ),
-            )
+    async def _execute_workflow_graph(
+        self,
+        initial_state: WorkflowState,
+        workflow_config: WorkflowConfig,
+    ) -> WorkflowState:
+        """Build and execute the LangGraph workflow"""
 
-            # Update state
-            new_state = state.copy()
-            for agent_id, result in results.items():
-                new_state["agent_results"][agent_id] = result.model_dump()
-                if result.files:
-                    for f in result.files:
-                        new_state["files"].append(f.model_dump())
-                if not result.success and result.error:
-                    new_state["errors"].append(f"{agent_id}: {result.error}")
-
-            new_state["completed_agents"] = state["completed_agents"] + parallel_agents
-            new_state["pending_agents"] = [
-                a for a in state["pending_agents"]
-                if a not in parallel_agents
-            ]
-
-            await self._emit_event("parallel_complete", state["project_id"], {
-                "agents": parallel_agents,
-            })
+        # Create the state graph
+        graph = StateGraph(WorkflowState)
 
-            return new_state
+        async def execute_dag_node(state: WorkflowState) -> WorkflowState:
+            """Run the pending agents, each as soon as its dependencies finish"""
+            if not state["pending_agents"]:
+                return state
+            return await self._execute_agent_dag(state, workflow_config)
 
         # Add the main execution node
-        graph.add_node("execute", execute_parallel_node)
+        graph.add_node("execute", execute_dag_node)
 
         # Define edges
         def should_continue(state: WorkflowState) -> str:
@@ -508,3 +742,12 @@ async def run_workflow(
         project_id=project_id,
         workflow_type=workflow_type,
     )
+
+
+async def resume_workflow(
+    run_id: str,
+    event_callback: Optional[EventCallback] = None,
+) -> WorkflowResult:
+    """Resume a checkpointed run with optional event streaming"""
+    orchestrator = AgentOrchestrator(event_callback=event_callback)
+    return await orchestrator.resume_workflow(run_id)
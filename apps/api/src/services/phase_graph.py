@@ -0,0 +1,263 @@
+"""
+Phase Graph
+
+Runs a pipeline described as phases with declared inputs and outputs.
+A phase starts as soon as every input it requires is available, so phases
+that don't depend on each other run concurrently (optionally capped at a
+number of phases in flight). Per-phase timings are recorded so the critical
+path of a run, and the slack of every other phase, can be reported.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Phase:
+    """A unit of work in a PhaseGraph"""
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    requires: Tuple[str, ...] = ()
+    provides: Tuple[str, ...] = ()
+    priority: int = 0  # Lower gets a free slot first
+
+
+@dataclass
+class PhaseTiming:
+    """When a phase ran, relative to the start of the graph run"""
+    name: str
+    started_ms: int
+    finished_ms: int
+    depends_on: List[str] = field(default_factory=list)
+
+    @property
+    def duration_ms(self) -> int:
+        return self.finished_ms - self.started_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "started_ms": self.started_ms,
+            "finished_ms": self.finished_ms,
+            "duration_ms": self.duration_ms,
+            "depends_on": self.depends_on,
+        }
+
+
+class PhaseGraph:
+    """
+    Dependency graph of pipeline phases.
+
+    Each phase receives the shared context (initial values plus every output
+    produced so far) and returns a dict containing the keys it provides.
+    If a phase raises, the phases still running are cancelled and the error
+    propagates; optional work should handle its own errors.
+
+    With max_concurrency set, ready phases wait for a free slot and start in
+    priority order, then dependency order.
+    """
+
+    def __init__(
+        self,
+        phases: Iterable[Phase],
+        initial_keys: Iterable[str] = (),
+        max_concurrency: Optional[int] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.phases: Dict[str, Phase] = {}
+        self._producers: Dict[str, str] = {}
+        initial = set(initial_keys)
+
+        for phase in phases:
+            if phase.name in self.phases:
+                raise ValueError(f"Duplicate phase: {phase.name}")
+            self.phases[phase.name] = phase
+            for key in phase.provides:
+                if key in self._producers or key in initial:
+                    raise ValueError(f"Output '{key}' is provided more than once")
+                self._producers[key] = phase.name
+
+        for phase in self.phases.values():
+            missing = [k for k in phase.requires if k not in self._producers and k not in initial]
+            if missing:
+                raise ValueError(f"Phase '{phase.name}' requires unknown inputs: {missing}")
+
+        self._order = self._topological_order()
+        self.timings: Dict[str, PhaseTiming] = {}
+
+    def dependencies(self, name: str) -> List[str]:
+        """Phases whose outputs the named phase requires"""
+        deps = []
+        for key in self.phases[name].requires:
+            producer = self._producers.get(key)
+            if producer and producer not in deps:
+                deps.append(producer)
+        return deps
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Cycle detected at phase '{name}'")
+            state[name] = 1
+            for dep in self.dependencies(name):
+                visit(dep)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.phases:
+            visit(name)
+        return order
+
+    async def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute all phases, starting each one once its inputs are ready.
+
+        Args:
+            context: Initial values; phase outputs are merged into it
+
+        Returns:
+            The context with every phase's outputs
+        """
+        self.timings = {}
+        origin = time.perf_counter()
+
+        def elapsed_ms() -> int:
+            return int((time.perf_counter() - origin) * 1000)
+
+        pending = sorted(self._order, key=lambda name: self.phases[name].priority)
+        running: Dict[asyncio.Task, Tuple[str, int]] = {}
+
+        try:
+            while pending or running:
+                for name in list(pending):
+                    if self.max_concurrency and len(running) >= self.max_concurrency:
+                        break
+                    if all(key in context for key in self.phases[name].requires):
+                        pending.remove(name)
+                        task = asyncio.create_task(self.phases[name].run(context))
+                        running[task] = (name, elapsed_ms())
+
+                if not running:
+                    raise RuntimeError(f"Phases cannot be scheduled: {pending}")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name, started_ms = running.pop(task)
+                    outputs = task.result() or {}
+                    missing = [k for k in self.phases[name].provides if k not in outputs]
+                    if missing:
+                        raise RuntimeError(f"Phase '{name}' did not provide: {missing}")
+                    context.update({k: outputs[k] for k in self.phases[name].provides})
+                    self.timings[name] = PhaseTiming(
+                        name=name,
+                        started_ms=started_ms,
+                        finished_ms=elapsed_ms(),
+                        depends_on=self.dependencies(name),
+                    )
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return context
+
+    def _ordered_timings(self) -> List[PhaseTiming]:
+        return [self.timings[name] for name in self._order if name in self.timings]
+
+    def critical_path(self) -> List[str]:
+        """Phases on the longest dependency chain of the last run"""
+        return critical_path(self._ordered_timings())
+
+    def slack(self) -> Dict[str, int]:
+        """Per-phase slack of the last run, in milliseconds"""
+        return slack(self._ordered_timings())
+
+    def timing_report(self) -> Dict[str, Any]:
+        """Per-phase timings, slack and the critical path of the last run"""
+        return timing_report(self._ordered_timings())
+
+
+# ===========================================
+# Timing analysis
+# ===========================================
+# Each function takes the timings of a run in dependency order (every phase
+# after the phases it depends on), so runs scheduled by something other than
+# PhaseGraph can be analysed too.
+
+def critical_path(timings: List[PhaseTiming]) -> List[str]:
+    """
+    Phases on the longest dependency chain of a run.
+
+    Walks back from the phase that finished last, following whichever
+    dependency finished latest (the one that actually gated the start).
+    """
+    if not timings:
+        return []
+
+    by_name = {t.name: t for t in timings}
+    order = {t.name: i for i, t in enumerate(timings)}
+
+    # Ties (same millisecond) go to the phase later in dependency order
+    def finish_key(timing: PhaseTiming) -> Tuple[int, int]:
+        return timing.finished_ms, order[timing.name]
+
+    current: Optional[str] = max(timings, key=finish_key).name
+    path = []
+    while current:
+        path.append(current)
+        deps = [by_name[d] for d in by_name[current].depends_on if d in by_name]
+        current = max(deps, key=finish_key).name if deps else None
+    return list(reversed(path))
+
+
+def slack(timings: List[PhaseTiming]) -> Dict[str, int]:
+    """
+    How long each phase of a run could have been delayed without delaying
+    the whole run, in milliseconds.
+
+    Computed from measured durations over the dependency graph alone, so
+    it shows how much a phase could slip if slots were unlimited. Phases
+    on the longest chain have zero slack.
+    """
+    if not timings:
+        return {}
+
+    earliest_finish: Dict[str, int] = {}
+    for timing in timings:
+        start = max((earliest_finish[d] for d in timing.depends_on if d in earliest_finish), default=0)
+        earliest_finish[timing.name] = start + timing.duration_ms
+
+    total = max(earliest_finish.values())
+    latest_finish: Dict[str, int] = {}
+    for timing in reversed(timings):
+        latest_finish[timing.name] = min(
+            (
+                latest_finish[other.name] - other.duration_ms
+                for other in timings
+                if timing.name in other.depends_on
+            ),
+            default=total,
+        )
+
+    return {t.name: latest_finish[t.name] - earliest_finish[t.name] for t in timings}
+
+
+def timing_report(timings: List[PhaseTiming]) -> Dict[str, Any]:
+    """Per-phase timings, slack and the critical path of a run"""
+    return {
+        "phases": [t.to_dict() for t in sorted(timings, key=lambda t: t.started_ms)],
+        "critical_path": critical_path(timings),
+        "slack_ms": slack(timings),
+        "total_ms": max((t.finished_ms for t in timings), default=0),
+    }
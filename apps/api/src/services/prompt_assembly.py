@@ -0,0 +1,204 @@
+"""
+Prompt Assembly
+
+Splits agent prompts into stable prefixes (project context, platform
+guidelines, agent persona) and a volatile suffix (the task and outputs of
+upstream agents). Stable segments always come first and in a fixed order,
+most widely shared first, so providers with prompt caching can reuse them
+across the agents of a workflow and across retries:
+
+- Anthropic: stable segments carry explicit cache_control breakpoints
+- OpenAI-compatible: identical prefixes are cached automatically
+
+PrefixCacheTracker records how often each prefix is reused so the hit
+rate (and the billed tokens it saves) can be reported.
+"""
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..llm.providers import LLMMessage
+from ..llm.tokenizer import count_tokens
+
+# How long a provider keeps a cached prefix (Anthropic ephemeral cache)
+CACHE_TTL_SECONDS = 300
+
+# Anthropic allows at most 4 cache breakpoints per request
+MAX_CACHE_BREAKPOINTS = 4
+
+# Input pricing relative to uncached tokens (Anthropic)
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+
+def billed_input_tokens(usage: Dict[str, int]) -> float:
+    """Input tokens weighted by cache pricing, in units of uncached tokens"""
+    return (
+        usage.get("input_tokens", 0)
+        + usage.get("cache_creation_input_tokens", 0) * CACHE_WRITE_MULTIPLIER
+        + usage.get("cache_read_input_tokens", 0) * CACHE_READ_MULTIPLIER
+    )
+
+
+@dataclass(frozen=True)
+class PromptSegment:
+    """A labelled piece of a prompt"""
+    label: str
+    text: str
+    stable: bool = True  # Same across agents / retries; eligible for caching
+
+
+@dataclass
+class AssembledPrompt:
+    """
+    A prompt split into a cacheable prefix and a volatile suffix.
+
+    Stable segments form the system prompt; volatile segments form the
+    user message.
+    """
+    segments: List[PromptSegment] = field(default_factory=list)
+
+    @property
+    def stable_segments(self) -> List[PromptSegment]:
+        return [s for s in self.segments if s.stable and s.text]
+
+    @property
+    def system_text(self) -> str:
+        return "\n\n".join(s.text for s in self.stable_segments)
+
+    @property
+    def user_text(self) -> str:
+        return "\n\n".join(s.text for s in self.segments if not s.stable and s.text)
+
+    def prefixes(self) -> List[Tuple[str, str, int]]:
+        """
+        Cumulative prefixes of the stable segments.
+
+        Returns:
+            List of (label of last segment, prefix hash, prefix tokens)
+        """
+        digest = hashlib.sha256()
+        tokens = 0
+        result = []
+        for segment in self.stable_segments:
+            digest.update(segment.text.encode("utf-8") + b"\0")
+            tokens += count_tokens(segment.text)
+            result.append((segment.label, digest.hexdigest(), tokens))
+        return result
+
+    def _breakpoints(self) -> List[Tuple[PromptSegment, bool]]:
+        """
+        Stable segments paired with whether they end a cache breakpoint.
+
+        Breakpoints go on the last MAX_CACHE_BREAKPOINTS stable segments, so
+        the longest shared prefix is always cacheable.
+        """
+        stable = self.stable_segments
+        first_breakpoint = max(0, len(stable) - MAX_CACHE_BREAKPOINTS)
+        return [(segment, index >= first_breakpoint) for index, segment in enumerate(stable)]
+
+    def system_blocks(self) -> List[Dict[str, Any]]:
+        """Anthropic system content blocks with cache_control breakpoints"""
+        blocks = []
+        for segment, breakpoint in self._breakpoints():
+            block: Dict[str, Any] = {"type": "text", "text": segment.text}
+            if breakpoint:
+                block["cache_control"] = {"type": "ephemeral"}
+            blocks.append(block)
+        return blocks
+
+    def to_messages(self) -> List[LLMMessage]:
+        """Messages for the LLM router, one system message per stable segment"""
+        messages = [
+            LLMMessage(role="system", content=segment.text, cacheable=breakpoint)
+            for segment, breakpoint in self._breakpoints()
+        ]
+        messages.append(LLMMessage(role="user", content=self.user_text))
+        return messages
+
+
+class PrefixCacheTracker:
+    """
+    Tracks reuse of stable prompt prefixes per provider.
+
+    A request counts as a prefix hit when some cumulative prefix of its
+    stable segments was sent to the same provider within the cache TTL.
+    """
+
+    def __init__(self, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._last_used: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "prefix_hits": 0,
+            "prefix_tokens": 0,
+            "reused_tokens": 0,
+        }
+        self._hits_by_segment: Dict[str, int] = {}
+
+    def record(self, prompt: AssembledPrompt, provider: str = "default", now: Optional[float] = None) -> int:
+        """
+        Record a request.
+
+        Returns:
+            Estimated tokens of the longest prefix that was already cached
+        """
+        now = time.monotonic() if now is None else now
+        prefixes = prompt.prefixes()
+
+        with self._lock:
+            reused, reused_label = 0, None
+            for label, prefix_hash, tokens in prefixes:
+                last = self._last_used.get((provider, prefix_hash))
+                if last is not None and now - last < self.ttl_seconds:
+                    reused, reused_label = tokens, label
+                self._last_used[(provider, prefix_hash)] = now
+
+            self._stats["requests"] += 1
+            self._stats["prefix_tokens"] += prefixes[-1][2] if prefixes else 0
+            self._stats["reused_tokens"] += reused
+            if reused_label:
+                self._stats["prefix_hits"] += 1
+                self._hits_by_segment[reused_label] = self._hits_by_segment.get(reused_label, 0) + 1
+
+            # Forget expired prefixes so the table doesn't grow without bound
+            if len(self._last_used) > 4096:
+                self._last_used = {
+                    key: used for key, used in self._last_used.items()
+                    if now - used < self.ttl_seconds
+                }
+
+        return reused
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["hits_by_segment"] = dict(self._hits_by_segment)
+        stats["reuse_rate"] = stats["prefix_hits"] / stats["requests"] if stats["requests"] else 0.0
+        stats["token_reuse_rate"] = (
+            stats["reused_tokens"] / stats["prefix_tokens"] if stats["prefix_tokens"] else 0.0
+        )
+        return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._last_used.clear()
+            self._hits_by_segment.clear()
+            for key in self._stats:
+                self._stats[key] = 0
+
+
+# Global instance
+_tracker: Optional[PrefixCacheTracker] = None
+
+
+def get_prefix_tracker() -> PrefixCacheTracker:
+    """Get the global prefix cache tracker"""
+    global _tracker
+    if _tracker is None:
+        _tracker = PrefixCacheTracker()
+    return _tracker
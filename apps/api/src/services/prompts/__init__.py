@@ -43,7 +43,9 @@ from .smart_presets import (
     get_smart_preset_system,
     get_smart_preset,
     extract_concepts,
+    analyze_description,
 )
+from .keyword_matcher import DescriptionMatch, KeywordAutomaton
 from .preset_quality import (
     QualityScore,
     QualityIssue,
@@ -91,6 +93,9 @@ __all__ = [
     "get_smart_preset_system",
     "get_smart_preset",
     "extract_concepts",
+    "analyze_description",
+    "DescriptionMatch",
+    "KeywordAutomaton",
     # Quality evaluation
     "QualityScore",
     "QualityIssue",
@@ -0,0 +1,143 @@
+"""
+Keyword Matcher
+
+Compiles every keyword table used to read a description (industry signals,
+clarification slots) into a single Aho-Corasick automaton, so a description
+is scanned once regardless of how many keywords there are.
+
+Matching is by substring, like the `keyword in text` checks it replaces.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+
+@dataclass
+class DescriptionMatch:
+    """
+    Everything the keyword tables found in one description.
+
+    Attributes:
+        text: Lowercased description
+        tokens: Stemmed tokens without stop words
+        keywords: Keywords occurring anywhere in the text
+        labels: Label (e.g. "slot:pricing") -> keywords found for it
+    """
+    text: str
+    tokens: List[str] = field(default_factory=list)
+    keywords: Set[str] = field(default_factory=set)
+    labels: Dict[str, Set[str]] = field(default_factory=dict)
+
+    @property
+    def token_set(self) -> FrozenSet[str]:
+        return frozenset(self.tokens)
+
+    def has(self, label: str) -> bool:
+        """Whether any keyword for the label was found"""
+        return bool(self.labels.get(label))
+
+    def labels_with_prefix(self, prefix: str) -> Dict[str, Set[str]]:
+        """Labels starting with prefix, with the prefix stripped"""
+        return {
+            label[len(prefix):]: keywords
+            for label, keywords in self.labels.items()
+            if label.startswith(prefix)
+        }
+
+    def extended(self, suffix: "DescriptionMatch") -> "DescriptionMatch":
+        """Match for this text followed by the suffix's text"""
+        labels = {label: set(keywords) for label, keywords in self.labels.items()}
+        for label, keywords in suffix.labels.items():
+            labels.setdefault(label, set()).update(keywords)
+        return DescriptionMatch(
+            text=self.text + suffix.text,
+            tokens=self.tokens + suffix.tokens,
+            keywords=self.keywords | suffix.keywords,
+            labels=labels,
+        )
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over labelled keywords.
+
+    Each keyword can carry several labels (a word can signal more than one
+    industry or slot). Matching reports every keyword occurring in the text,
+    including overlapping ones, in a single pass.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        """
+        Compile the automaton.
+
+        Args:
+            groups: Label -> keywords for that label
+        """
+        self._labels: Dict[str, Set[str]] = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword:
+                    self._labels.setdefault(keyword, set()).add(label)
+
+        # State 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+
+        for keyword in self._labels:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (keyword,)
+
+        # Breadth-first: fail links point to the longest proper suffix that
+        # is also a trie path; outputs inherit the fail state's outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    @property
+    def keywords(self) -> Set[str]:
+        return set(self._labels)
+
+    def labels_for(self, keyword: str) -> Set[str]:
+        return self._labels.get(keyword, set())
+
+    def find(self, text: str) -> Set[str]:
+        """Keywords occurring in text (text should already be lowercased)"""
+        found: Set[str] = set()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def match(self, text: str, tokens: List[str]) -> DescriptionMatch:
+        """Scan lowercased text and group the keywords found by label"""
+        keywords = self.find(text)
+        labels: Dict[str, Set[str]] = {}
+        for keyword in keywords:
+            for label in self._labels[keyword]:
+                labels.setdefault(label, set()).add(keyword)
+        return DescriptionMatch(text=text, tokens=tokens, keywords=keywords, labels=labels)
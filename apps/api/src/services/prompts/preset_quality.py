@@ -24,6 +24,9 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Learned patterns and feedback outcomes are written here (runtime data, gitignored)
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
 
 # Custom exceptions for better error handling
 class PresetQualityError(Exception):
@@ -328,7 +331,7 @@ class PresetEnhancer:
 
     def __init__(self, data_dir: Optional[Path] = None):
         self.evaluator = PresetQualityEvaluator()
-        self.data_dir = data_dir or Path(__file__).parent.parent.parent / "data"
+        self.data_dir = data_dir or DATA_DIR
 
         # Patterns learned from successful presets (loaded from disk)
         self._successful_patterns = self._load_patterns()
@@ -643,7 +646,7 @@ class PresetFeedbackAnalyzer:
     """
 
     def __init__(self, data_dir: Optional[Path] = None):
-        self.data_dir = data_dir or Path(__file__).parent.parent.parent / "data"
+        self.data_dir = data_dir or DATA_DIR
         # Track correlations between features and outcomes (loaded from disk)
         self.feature_outcomes = self._load_data()
 
@@ -20,14 +20,20 @@ import json
 import hashlib
 import logging
 import math
+import threading
 from typing import Dict, List, Any, Optional, Tuple, Set
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from collections import Counter
+from collections import Counter, OrderedDict
+
+from .keyword_matcher import DescriptionMatch, KeywordAutomaton
 
 logger = logging.getLogger(__name__)
 
+# Cached presets are written here (runtime data, gitignored)
+PRESET_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "preset_cache"
+
 
 # Common words to ignore (high frequency = low signal)
 STOP_WORDS = {
@@ -284,6 +290,22 @@ INDUSTRY_SIGNALS = {
     ],
 }
 
+# Words signalling that the description already covers a clarification slot
+CLARIFICATION_SLOT_SIGNALS = {
+    "target_market": ["customer", "client", "user", "buyer", "audience", "market", "b2b", "b2c", "consumer"],
+    "pricing": ["price", "pricing", "cost", "subscription", "fee", "charge", "pay", "payment", "tier"],
+    "services": ["service", "product", "offering", "feature", "provide", "offer", "sell"],
+    "scale": ["volume", "scale", "size", "capacity", "daily", "monthly", "users", "customers"],
+}
+
+# Industry signal words distinctive enough to boost a token's weight
+DISTINCTIVE_SIGNAL_WORDS = {
+    word
+    for signals in INDUSTRY_SIGNALS.values()
+    for word, weight in signals
+    if weight > 0.85
+}
+
 # Pattern templates for common descriptions
 # These help extract structure from natural language
 DESCRIPTION_PATTERNS = [
@@ -317,6 +339,76 @@ DOMAIN_TO_PRESET = {
 }
 
 
+_automaton: Optional[KeywordAutomaton] = None
+_analysis_cache: "OrderedDict[str, DescriptionMatch]" = OrderedDict()
+_analysis_lock = threading.Lock()
+ANALYSIS_CACHE_SIZE = 256
+
+# Text appended by ClarificationAgent.enrich_description starts on a new
+# line; no keyword spans a line break, so the original's match is reused
+_EXTENSION_SEPARATOR = "\n"
+
+
+def _get_automaton() -> KeywordAutomaton:
+    """Automaton over all industry and clarification slot keywords"""
+    global _automaton
+    if _automaton is None:
+        groups: Dict[str, List[str]] = {}
+        for industry, signals in INDUSTRY_SIGNALS.items():
+            groups[f"industry:{industry}"] = [word for word, _ in signals]
+        for slot, words in CLARIFICATION_SLOT_SIGNALS.items():
+            groups[f"slot:{slot}"] = words
+        _automaton = KeywordAutomaton(groups)
+    return _automaton
+
+
+def _tokenize(text: str) -> List[str]:
+    """Tokenize and stem lowercased text, removing stop words"""
+    words = re.findall(r'\b\w+\b', text)
+    return [WORD_STEMS.get(w, w) for w in words if w not in STOP_WORDS and len(w) > 2]
+
+
+def _scan(text: str) -> DescriptionMatch:
+    return _get_automaton().match(text, _tokenize(text))
+
+
+def analyze_description(description: str) -> DescriptionMatch:
+    """
+    Tokenize a description and match it against every keyword table.
+
+    Results are cached, so concept extraction and the clarification agent
+    share one scan per description. An enriched description (the original
+    plus appended clarifications) only scans the appended part.
+    """
+    with _analysis_lock:
+        cached = _analysis_cache.get(description)
+        if cached is not None:
+            _analysis_cache.move_to_end(description)
+            return cached
+        base_text = max(
+            (
+                text for text in _analysis_cache
+                if len(text) < len(description)
+                and description.startswith(text)
+                and description[len(text)] == _EXTENSION_SEPARATOR
+            ),
+            key=len,
+            default=None,
+        )
+        base = _analysis_cache.get(base_text) if base_text is not None else None
+
+    if base is not None:
+        match = base.extended(_scan(description[len(base_text):].lower()))
+    else:
+        match = _scan(description.lower())
+
+    with _analysis_lock:
+        _analysis_cache[description] = match
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    return match
+
+
 class KeywordExtractor:
     """
     Extracts meaningful concepts from user descriptions using weighted scoring.
@@ -339,8 +431,7 @@ class KeywordExtractor:
 
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize and stem text, removing stop words"""
-        words = re.findall(r'\b\w+\b', text.lower())
-        return [self._stem(w) for w in words if w not in STOP_WORDS and len(w) > 2]
+        return _tokenize(text.lower())
 
     def _calculate_word_weights(self, tokens: List[str]) -> Dict[str, float]:
         """
@@ -368,12 +459,7 @@ class KeywordExtractor:
                 idf = 1.0 if token in STOP_WORDS else 2.0
 
             # Extra boost for very distinctive terms
-            distinctiveness = 1.0
-            for signals in INDUSTRY_SIGNALS.values():
-                for word, weight in signals:
-                    if word == token and weight > 0.85:
-                        distinctiveness = 1.5
-                        break
+            distinctiveness = 1.5 if token in DISTINCTIVE_SIGNAL_WORDS else 1.0
 
             weights[token] = norm_tf * idf * distinctiveness
 
@@ -425,21 +511,23 @@ class KeywordExtractor:
 
         return sorted(matched.items(), key=lambda x: -x[1])
 
-    def _score_industries(self, text: str, tokens: List[str], weights: Dict[str, float]) -> Dict[str, float]:
+    def _score_industries(self, match: DescriptionMatch, weights: Dict[str, float]) -> Dict[str, float]:
         """
         Score how well the description matches each industry.
 
         Uses weighted matching - distinctive terms contribute more.
         """
         scores = {}
+        tokens = match.token_set
 
         for industry, signals in INDUSTRY_SIGNALS.items():
             score = 0.0
             matches = 0
+            found = match.labels.get(f"industry:{industry}", set())
 
             for signal_word, signal_weight in signals:
                 # Check for exact match or phrase match
-                if signal_word in text or signal_word in tokens:
+                if signal_word in found or signal_word in tokens:
                     # Weight by signal importance and token weight
                     token_weight = weights.get(signal_word, 1.0)
                     score += signal_weight * token_weight
@@ -474,8 +562,8 @@ class KeywordExtractor:
 
         Returns comprehensive concept extraction for preset generation.
         """
-        text = description.lower()
-        tokens = self._tokenize(text)
+        match = analyze_description(description)
+        tokens = match.tokens
 
         # Update frequency tracking for future IDF calculations
         self._total_descriptions += 1
@@ -497,7 +585,7 @@ class KeywordExtractor:
         concepts.actions = [a for a, _ in action_matches]
 
         # Score industries
-        concepts.industry_scores = self._score_industries(text, tokens, concepts.weighted_keywords)
+        concepts.industry_scores = self._score_industries(match, concepts.weighted_keywords)
 
         # Find best industry (and secondaries for composite matching)
         if concepts.industry_scores:
@@ -1014,13 +1102,15 @@ class PresetComposer:
                 if source:
                     needed_sources.add(source)
 
-        # Ensure stats has all needed metrics
+        # Ensure stats has all needed metrics (presets that ship a list of
+        # ready-made stat cards are left as they are)
         stats = mock.get("stats", {})
-        for stat_card in architecture.get("stat_cards", []):
-            key = stat_card.get("data_key")
-            if key and key not in stats:
-                stats[key] = self._generate_stat_value(key)
-                stats[f"change_{key}"] = f"+{(hash(key) % 15) + 5}%"
+        if isinstance(stats, dict):
+            for stat_card in architecture.get("stat_cards", []):
+                key = stat_card.get("data_key")
+                if key and key not in stats:
+                    stats[key] = self._generate_stat_value(key)
+                    stats[f"change_{key}"] = f"+{(hash(key) % 15) + 5}%"
         mock["stats"] = stats
 
         # Add entity-specific data if needed
@@ -1129,7 +1219,7 @@ class PresetCache:
     """
 
     def __init__(self, cache_dir: Optional[Path] = None):
-        self.cache_dir = cache_dir or Path(__file__).parent.parent.parent / "data" / "preset_cache"
+        self.cache_dir = cache_dir or PRESET_CACHE_DIR
         self.cache: Dict[str, CachedPreset] = {}
         self._load_cache()
 
@@ -1415,7 +1505,8 @@ class SmartPresetSystem:
     def get_preset(
         self,
         description: str,
-        use_cache: bool = True
+        use_cache: bool = True,
+        concepts: Optional[ExtractedConcepts] = None,
     ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
         """
         Get or generate presets for a description.
@@ -1427,6 +1518,8 @@ class SmartPresetSystem:
         4. Compose new preset from concepts
         5. Cache for future use
 
+        Pass concepts already extracted from the description to skip step 2.
+
         Returns: (domain_preset, architecture_preset, mock_data_preset)
         """
         self._load_base_presets()
@@ -1442,7 +1535,8 @@ class SmartPresetSystem:
                 )
 
         # 2. Extract concepts
-        concepts = self.extractor.extract(description)
+        if concepts is None:
+            concepts = self.extractor.extract(description)
         logger.info(
             f"Smart preset extraction: "
             f"industry={concepts.best_industry} (score={concepts.best_score:.2f}), "
@@ -1486,7 +1580,8 @@ class SmartPresetSystem:
         """
         Get extracted concepts without generating presets.
 
-        Useful for debugging or inspection.
+        The description's keyword scan is cached and shared with the
+        clarification agent (see analyze_description).
         """
         return self.extractor.extract(description)
 
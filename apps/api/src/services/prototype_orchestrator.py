@@ -18,12 +18,18 @@ Features Smart Fallback Cascade for reliability:
 - Level 3: Template with domain-specific mock data
 - Level 4: Clean template with generic data
 - Level 5: Minimal working prototype
+
+In speculative mode the cheap fallbacks (levels 2 and 3) run concurrently
+with the creative pipeline, so a slow or failing LLM call never delays the
+first usable prototype past a deadline. A creative result that lands later
+is delivered as a "prototype_upgrade" event.
 """
 
 import asyncio
 import logging
 import json
-from typing import Dict, List, Optional, Any, Callable, Awaitable
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Any, Callable, Awaitable, Sequence, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -76,6 +82,7 @@ from .template_loader import get_template_loader, Template
 from .template_customizer import BrandProfile, get_template_customizer
 from .code_validator import validate_and_fix, ValidationResult
 from .report_generator import BusinessReportGenerator, generate_business_report
+from .phase_graph import Phase, PhaseGraph
 from ..models.report import (
     BusinessReport,
     ReportType,
@@ -98,6 +105,18 @@ from ..models.report import (
 
 logger = logging.getLogger(__name__)
 
+# How long speculative mode waits for the creative pipeline before delivering
+# the best fallback that is already available
+SPECULATIVE_DEADLINE_SECONDS = 20.0
+
+# Context keys available to the creative pipeline graph before any phase runs
+CREATIVE_GRAPH_INPUTS = ("description", "enriched_description", "brand", "concepts", "user_clarifications")
+
+# Highest progress emitted so far by the current creative pipeline run. Its
+# phases run concurrently (e.g. the report can finish before validation), so
+# progress is held at this floor to never move backwards.
+_run_progress: ContextVar[Optional[List[int]]] = ContextVar("prototype_run_progress", default=None)
+
 
 class FallbackLevel(Enum):
     """
@@ -147,7 +166,7 @@ class FallbackInfo:
 @dataclass
 class PrototypeEvent:
     """Event emitted during prototype generation"""
-    type: str  # "agent_start", "agent_complete", "status", "error", "fallback", "clarification_required", "research_progress"
+    type: str  # "agent_start", "agent_complete", "status", "error", "fallback", "clarification_required", "research_progress", "prototype_upgrade", "phase_timings"
     agent: Optional[str] = None
     message: str = ""
     progress: int = 0
@@ -170,6 +189,8 @@ class PrototypeResult:
     # Business report HTML (new for consultant mode)
     report_html: Optional[str] = None
     report_type: Optional[str] = None  # "transformation_proposal", "ux_audit", "comprehensive"
+    # Per-phase timing breakdown and critical path (full creative pipeline only)
+    phase_timings: Optional[Dict[str, Any]] = None
 
     @property
     def customization_level(self) -> str:
@@ -200,6 +221,9 @@ class PrototypeOrchestrator:
         use_smart_presets: bool = True,
         response_callback: Optional[Callable[[List[ClarificationQuestion]], Awaitable[Dict[str, str]]]] = None,
         skip_clarification: bool = False,
+        speculative: bool = False,
+        speculative_deadline: float = SPECULATIVE_DEADLINE_SECONDS,
+        upgrade_late_results: bool = True,
     ):
         """
         Initialize the orchestrator.
@@ -209,11 +233,19 @@ class PrototypeOrchestrator:
             use_smart_presets: Use smart preset system (learns from usage)
             response_callback: Optional callback to get user responses to clarification questions
             skip_clarification: Skip the clarification phase (for testing or quick generation)
+            speculative: Run the cheap fallbacks concurrently with the creative pipeline
+            speculative_deadline: Seconds to wait for the creative pipeline in speculative mode
+            upgrade_late_results: Keep a late creative pipeline running after a fallback is
+                delivered and emit a "prototype_upgrade" event when it finishes
         """
         self.event_callback = event_callback
         self.response_callback = response_callback
         self.use_smart_presets = use_smart_presets
         self.skip_clarification = skip_clarification
+        self.speculative = speculative
+        self.speculative_deadline = speculative_deadline
+        self.upgrade_late_results = upgrade_late_results
+        self._upgrade_tasks: Set[asyncio.Task] = set()
         self._template_loader = get_template_loader()
         self._template_customizer = get_template_customizer()
         self._smart_system = get_smart_preset_system() if use_smart_presets else None
@@ -223,6 +255,10 @@ class PrototypeOrchestrator:
 
     async def _emit(self, event: PrototypeEvent) -> None:
         """Emit an event if callback is set"""
+        floor = _run_progress.get()
+        if floor is not None:
+            event.progress = max(event.progress, floor[0])
+            floor[0] = event.progress
         if self.event_callback:
             await self.event_callback(event)
 
@@ -532,254 +568,421 @@ class PrototypeOrchestrator:
                 if enriched_description != description:
                     concepts = self._smart_system.get_concepts(enriched_description)
 
-        # If clarifications were provided, enrich the description
-        if user_clarifications and not enriched_description.endswith("Additional details:"):
+        # If clarifications were provided up front, enrich the description
+        if user_clarifications and enriched_description == description:
             enriched_description = self._clarification_agent.enrich_description(
                 description, user_clarifications
             )
             # Re-extract concepts with enriched description
-            if self._smart_system:
+            if self._smart_system and enriched_description != description:
                 concepts = self._smart_system.get_concepts(enriched_description)
 
-        # Store domain expertise for enhanced agent context (optional, computed lazily)
-        domain_expertise: Optional[DomainExpertise] = None
+        if self.speculative:
+            return await self._generate_speculative(
+                description=description,
+                enriched_description=enriched_description,
+                brand=brand,
+                concepts=concepts,
+                user_clarifications=user_clarifications,
+                start_time=start_time,
+                project_id=project_id,
+            )
 
         try:
-            # Step 0.5: Domain Expertise Synthesis (optional, runs in background or on-demand)
-            # This enriches the domain analysis with web research and learned patterns
-            try:
-                await self._emit(PrototypeEvent(
-                    type="research_progress",
-                    agent="Domain Expert",
-                    message="Synthesizing domain expertise...",
-                    progress=3
-                ))
-
-                domain_expertise = await self._expertise_synthesizer.synthesize(
-                    description=enriched_description,
-                    concepts=concepts,
-                    user_clarifications=user_clarifications,
-                    progress_callback=None,  # Could emit progress events here
-                )
-
-                await self._emit(PrototypeEvent(
-                    type="agent_complete",
-                    agent="Domain Expert",
-                    message=f"Built expertise profile (confidence: {domain_expertise.confidence_score:.0%})",
-                    progress=5,
-                    data={
-                        "confidence": domain_expertise.confidence_score,
-                        "sources": domain_expertise.sources_used,
-                        "industry_trends": domain_expertise.industry_trends[:3],
-                    }
-                ))
-            except Exception as expertise_error:
-                logger.warning(f"Domain expertise synthesis failed (non-fatal): {expertise_error}")
-                # Continue without expertise - domain analysis will use presets
-
-            # Step 1: Domain Analysis
-            await self._emit(PrototypeEvent(
-                type="agent_start",
-                agent="Domain Analyst",
-                message="Understanding your business domain...",
-                progress=5
-            ))
+            return await self._run_creative_pipeline(
+                description=description,
+                enriched_description=enriched_description,
+                brand=brand,
+                concepts=concepts,
+                user_clarifications=user_clarifications,
+                start_time=start_time,
+            )
 
-            domain_analysis = await self._analyze_domain(enriched_description, concepts, domain_expertise)
+        except Exception as e:
+            logger.error(f"Prototype generation failed: {e}")
 
+            # Mark any running agents as complete (interrupted) before fallback
+            # This ensures the UI doesn't show agents stuck in "running" state
             await self._emit(PrototypeEvent(
                 type="agent_complete",
                 agent="Domain Analyst",
-                message=f"Identified industry: {domain_analysis.get('industry_display_name', domain_analysis.get('industry', 'general'))}",
-                progress=20,
-                data={"domain": domain_analysis}
+                message="Switching to fallback system",
+                progress=50
             ))
 
-            # Step 2: Architecture Planning
+            # Execute fallback cascade
             await self._emit(PrototypeEvent(
-                type="agent_start",
-                agent="Architect",
-                message="Planning app structure...",
-                progress=20
+                type="status",
+                message="Trying alternative generation methods...",
+                progress=50
             ))
 
-            architecture = await self._plan_architecture(enriched_description, domain_analysis)
+            fallback_result = await self._execute_fallback_cascade(
+                description=description,
+                brand=brand,
+                original_error=str(e),
+                start_time=start_time,
+            )
+
+            return fallback_result
+
+    def _build_creative_graph(self) -> PhaseGraph:
+        """
+        Declare the creative pipeline as a phase graph.
 
-            # Store description for downstream use
-            architecture["_source_description"] = enriched_description
+        Architecture and content only need the base domain preset, so they
+        run while web research for domain expertise is still in flight.
+        UI composition/validation and the business report both only need
+        the quality-checked preset, so they run concurrently too; progress
+        events are held monotonic across them (see _run_progress).
+        """
+        return PhaseGraph(
+            phases=[
+                Phase("expertise", self._phase_expertise, provides=("domain_expertise",)),
+                Phase("domain_base", self._phase_domain_base, provides=("base_domain",)),
+                Phase(
+                    "domain", self._phase_domain,
+                    requires=("base_domain", "domain_expertise"), provides=("domain_analysis",),
+                ),
+                Phase("architecture", self._phase_architecture, requires=("base_domain",), provides=("architecture",)),
+                Phase(
+                    "content", self._phase_content,
+                    requires=("base_domain", "architecture"), provides=("mock_data",),
+                ),
+                Phase(
+                    "quality", self._phase_quality,
+                    requires=("domain_analysis", "architecture", "mock_data"),
+                    provides=("quality_result", "preset"),
+                ),
+                Phase("compose", self._phase_compose, requires=("preset",), provides=("files",)),
+                Phase("validate", self._phase_validate, requires=("files",), provides=("validated_files", "validation")),
+                Phase(
+                    "report", self._phase_report,
+                    requires=("preset", "domain_expertise"), provides=("report_html", "report_type"),
+                ),
+            ],
+            initial_keys=CREATIVE_GRAPH_INPUTS,
+        )
 
+    async def _phase_expertise(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 0.5: Domain Expertise Synthesis (optional, non-fatal)"""
+        # This enriches the domain analysis with web research and learned patterns
+        try:
             await self._emit(PrototypeEvent(
-                type="agent_complete",
-                agent="Architect",
-                message=f"Planned {len(architecture.get('pages', []))} pages with {len(architecture.get('stat_cards', []))} key metrics",
-                progress=40,
-                data={"architecture": architecture}
+                type="research_progress",
+                agent="Domain Expert",
+                message="Synthesizing domain expertise...",
+                progress=3
             ))
 
-            # Step 3: Content Generation
+            domain_expertise = await self._expertise_synthesizer.synthesize(
+                description=ctx["enriched_description"],
+                concepts=ctx["concepts"],
+                user_clarifications=ctx["user_clarifications"],
+                progress_callback=None,  # Could emit progress events here
+            )
+
             await self._emit(PrototypeEvent(
-                type="agent_start",
-                agent="Content Generator",
-                message="Creating realistic mock data...",
-                progress=40
+                type="agent_complete",
+                agent="Domain Expert",
+                message=f"Built expertise profile (confidence: {domain_expertise.confidence_score:.0%})",
+                progress=5,
+                data={
+                    "confidence": domain_expertise.confidence_score,
+                    "sources": domain_expertise.sources_used,
+                    "industry_trends": domain_expertise.industry_trends[:3],
+                }
             ))
+            return {"domain_expertise": domain_expertise}
+        except Exception as expertise_error:
+            logger.warning(f"Domain expertise synthesis failed (non-fatal): {expertise_error}")
+            # Continue without expertise - domain analysis will use presets
+            return {"domain_expertise": None}
+
+    async def _phase_domain_base(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 1a: Domain preset from extracted concepts"""
+        await self._emit(PrototypeEvent(
+            type="agent_start",
+            agent="Domain Analyst",
+            message="Understanding your business domain...",
+            progress=5
+        ))
 
-            mock_data = await self._generate_content(domain_analysis, architecture)
+        base_domain = await self._analyze_domain(ctx["enriched_description"], ctx["concepts"])
+        return {"base_domain": base_domain}
+
+    async def _phase_domain(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 1b: Enrich the domain preset with synthesized expertise"""
+        domain_analysis = ctx["base_domain"]
+        if self._smart_system and ctx["domain_expertise"]:
+            domain_analysis = self._apply_domain_expertise(dict(domain_analysis), ctx["domain_expertise"])
+
+        await self._emit(PrototypeEvent(
+            type="agent_complete",
+            agent="Domain Analyst",
+            message=f"Identified industry: {domain_analysis.get('industry_display_name', domain_analysis.get('industry', 'general'))}",
+            progress=20,
+            data={"domain": domain_analysis}
+        ))
+        return {"domain_analysis": domain_analysis}
+
+    async def _phase_architecture(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 2: Architecture Planning"""
+        await self._emit(PrototypeEvent(
+            type="agent_start",
+            agent="Architect",
+            message="Planning app structure...",
+            progress=20
+        ))
+
+        architecture = await self._plan_architecture(ctx["enriched_description"], ctx["base_domain"])
+
+        # Store description for downstream use
+        architecture["_source_description"] = ctx["enriched_description"]
+
+        await self._emit(PrototypeEvent(
+            type="agent_complete",
+            agent="Architect",
+            message=f"Planned {len(architecture.get('pages', []))} pages with {len(architecture.get('stat_cards', []))} key metrics",
+            progress=40,
+            data={"architecture": architecture}
+        ))
+        return {"architecture": architecture}
+
+    async def _phase_content(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 3: Content Generation"""
+        await self._emit(PrototypeEvent(
+            type="agent_start",
+            agent="Content Generator",
+            message="Creating realistic mock data...",
+            progress=40
+        ))
+
+        mock_data = await self._generate_content(ctx["base_domain"], ctx["architecture"])
+
+        await self._emit(PrototypeEvent(
+            type="agent_complete",
+            agent="Content Generator",
+            message=f"Generated data for {len(mock_data.keys())} data sources",
+            progress=55,
+            data={"mock_data_keys": list(mock_data.keys())}
+        ))
+        return {"mock_data": mock_data}
+
+    async def _phase_quality(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 3.5: Quality Evaluation & Enhancement"""
+        await self._emit(PrototypeEvent(
+            type="agent_start",
+            agent="Quality Analyst",
+            message="Evaluating preset quality...",
+            progress=55
+        ))
+
+        domain_analysis = ctx["domain_analysis"]
+        architecture = ctx["architecture"]
+        mock_data = ctx["mock_data"]
+
+        quality_result = await self._evaluate_and_enhance(
+            description=ctx["description"],
+            domain_analysis=domain_analysis,
+            architecture=architecture,
+            mock_data=mock_data,
+            concepts=ctx["concepts"]  # Reuse pre-extracted concepts
+        )
+
+        # Update with enhanced versions if improvements were made
+        if quality_result.get("enhanced"):
+            if quality_result.get("new_domain"):
+                domain_analysis = quality_result["new_domain"]
+            if quality_result.get("new_architecture"):
+                architecture = quality_result["new_architecture"]
+                architecture["_source_description"] = ctx["description"]  # Preserve
+            if quality_result.get("new_mock_data"):
+                mock_data = quality_result["new_mock_data"]
 
             await self._emit(PrototypeEvent(
                 type="agent_complete",
-                agent="Content Generator",
-                message=f"Generated data for {len(mock_data.keys())} data sources",
-                progress=55,
-                data={"mock_data_keys": list(mock_data.keys())}
+                agent="Quality Analyst",
+                message=f"Enhanced preset: {len(quality_result.get('changes', []))} improvements applied",
+                progress=60,
+                data={
+                    "quality_score": quality_result.get("score"),
+                    "changes": quality_result.get("changes", [])
+                }
             ))
-
-            # Step 3.5: Quality Evaluation & Enhancement
+        else:
             await self._emit(PrototypeEvent(
-                type="agent_start",
+                type="agent_complete",
                 agent="Quality Analyst",
-                message="Evaluating preset quality...",
-                progress=55
+                message=f"Quality check passed (score: {quality_result.get('score', 0):.0%})",
+                progress=60,
+                data={"quality_score": quality_result.get("score")}
             ))
 
-            quality_result = await self._evaluate_and_enhance(
-                description=description,
-                domain_analysis=domain_analysis,
-                architecture=architecture,
-                mock_data=mock_data,
-                concepts=concepts  # Reuse pre-extracted concepts
-            )
+        return {
+            "quality_result": quality_result,
+            "preset": {
+                "domain_analysis": domain_analysis,
+                "architecture": architecture,
+                "mock_data": mock_data,
+            },
+        }
 
-            # Update with enhanced versions if improvements were made
-            if quality_result.get("enhanced"):
-                if quality_result.get("new_domain"):
-                    domain_analysis = quality_result["new_domain"]
-                if quality_result.get("new_architecture"):
-                    architecture = quality_result["new_architecture"]
-                    architecture["_source_description"] = description  # Preserve
-                if quality_result.get("new_mock_data"):
-                    mock_data = quality_result["new_mock_data"]
+    async def _phase_compose(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 4: UI Composition"""
+        await self._emit(PrototypeEvent(
+            type="agent_start",
+            agent="UI Composer",
+            message="Building interface components...",
+            progress=60
+        ))
 
-                await self._emit(PrototypeEvent(
-                    type="agent_complete",
-                    agent="Quality Analyst",
-                    message=f"Enhanced preset: {len(quality_result.get('changes', []))} improvements applied",
-                    progress=60,
-                    data={
-                        "quality_score": quality_result.get("score"),
-                        "changes": quality_result.get("changes", [])
-                    }
-                ))
-            else:
-                await self._emit(PrototypeEvent(
-                    type="agent_complete",
-                    agent="Quality Analyst",
-                    message=f"Quality check passed (score: {quality_result.get('score', 0):.0%})",
-                    progress=60,
-                    data={"quality_score": quality_result.get("score")}
-                ))
+        preset = ctx["preset"]
+        files = await self._compose_ui(
+            description=ctx["enriched_description"],
+            domain_analysis=preset["domain_analysis"],
+            architecture=preset["architecture"],
+            mock_data=preset["mock_data"],
+            brand=ctx["brand"],
+        )
+
+        await self._emit(PrototypeEvent(
+            type="agent_complete",
+            agent="UI Composer",
+            message=f"Generated {len(files)} files",
+            progress=80,
+            data={"file_count": len(files)}
+        ))
+        return {"files": files}
+
+    async def _phase_validate(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 5: Validation"""
+        await self._emit(PrototypeEvent(
+            type="agent_start",
+            agent="Validator",
+            message="Validating generated code...",
+            progress=80
+        ))
+
+        # Off the event loop so the report phase keeps making progress meanwhile
+        validated_files, validation = await asyncio.to_thread(validate_and_fix, ctx["files"])
 
-            # Step 4: UI Composition
+        if validation.is_valid:
+            await self._emit(PrototypeEvent(
+                type="agent_complete",
+                agent="Validator",
+                message="All checks passed!",
+                progress=85
+            ))
+        else:
+            # Log issues but continue with fixed files
+            issue_count = len(validation.errors) + len(validation.warnings)
+            await self._emit(PrototypeEvent(
+                type="agent_complete",
+                agent="Validator",
+                message=f"Fixed {issue_count} issues",
+                progress=85,
+                data={"fixed_issues": issue_count}
+            ))
+        return {"validated_files": validated_files, "validation": validation}
+
+    async def _phase_report(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 6: Business Report Generation (consultant mode, non-fatal)"""
+        report_html = None
+        report_type = None
+        try:
             await self._emit(PrototypeEvent(
                 type="agent_start",
-                agent="UI Composer",
-                message="Building interface components...",
-                progress=60
+                agent="Report Generator",
+                message="Generating business insights report...",
+                progress=85
             ))
 
-            files = await self._compose_ui(
-                description=enriched_description,
-                domain_analysis=domain_analysis,
-                architecture=architecture,
-                mock_data=mock_data,
-                brand=brand,
+            preset = ctx["preset"]
+            report_html, report_type = await self._generate_business_report(
+                description=ctx["enriched_description"],
+                domain_analysis=preset["domain_analysis"],
+                architecture=preset["architecture"],
+                mock_data=preset["mock_data"],
+                domain_expertise=ctx["domain_expertise"],
+                user_clarifications=ctx["user_clarifications"],
+                concepts=ctx["concepts"],
             )
 
             await self._emit(PrototypeEvent(
                 type="agent_complete",
-                agent="UI Composer",
-                message=f"Generated {len(files)} files",
-                progress=80,
-                data={"file_count": len(files)}
+                agent="Report Generator",
+                message=f"Generated {report_type.replace('_', ' ').title()} report",
+                progress=100,
+                data={"report_type": report_type}
             ))
 
-            # Step 5: Validation
+            # Emit report as a separate event for the frontend
             await self._emit(PrototypeEvent(
-                type="agent_start",
-                agent="Validator",
-                message="Validating generated code...",
-                progress=80
+                type="report_complete",
+                agent="Report Generator",
+                message="Business report ready!",
+                progress=100,
+                data={
+                    "report_html": report_html,
+                    "report_type": report_type,
+                }
             ))
 
-            validated_files, validation = validate_and_fix(files)
+        except Exception as report_error:
+            logger.warning(f"Report generation failed (non-fatal): {report_error}")
+            await self._emit(PrototypeEvent(
+                type="agent_complete",
+                agent="Report Generator",
+                message="Report generation skipped",
+                progress=100
+            ))
+        return {"report_html": report_html, "report_type": report_type}
 
-            if validation.is_valid:
-                await self._emit(PrototypeEvent(
-                    type="agent_complete",
-                    agent="Validator",
-                    message="All checks passed!",
-                    progress=85
-                ))
-            else:
-                # Log issues but continue with fixed files
-                issue_count = len(validation.errors) + len(validation.warnings)
-                await self._emit(PrototypeEvent(
-                    type="agent_complete",
-                    agent="Validator",
-                    message=f"Fixed {issue_count} issues",
-                    progress=85,
-                    data={"fixed_issues": issue_count}
-                ))
+    async def _run_creative_pipeline(
+        self,
+        description: str,
+        enriched_description: str,
+        brand: Optional[BrandProfile],
+        concepts: Optional[ExtractedConcepts],
+        user_clarifications: Optional[Dict[str, str]],
+        start_time: datetime,
+    ) -> PrototypeResult:
+        """
+        Fallback Level 1: Run the full creative pipeline.
 
-            # Step 6: Business Report Generation (NEW - consultant mode)
-            report_html = None
-            report_type = None
-            try:
-                await self._emit(PrototypeEvent(
-                    type="agent_start",
-                    agent="Report Generator",
-                    message="Generating business insights report...",
-                    progress=85
-                ))
+        Phases run as a dependency graph (see _build_creative_graph) and a
+        "phase_timings" event reports how long each took and which chain of
+        phases was the critical path.
 
-                report_html, report_type = await self._generate_business_report(
-                    description=enriched_description,
-                    domain_analysis=domain_analysis,
-                    architecture=architecture,
-                    mock_data=mock_data,
-                    domain_expertise=domain_expertise,
-                    user_clarifications=user_clarifications,
-                    concepts=concepts,
-                )
+        Raises on failure (after recording it for learning) so callers can
+        decide how to fall back.
+        """
+        graph = self._build_creative_graph()
+        ctx: Dict[str, Any] = {
+            "description": description,
+            "enriched_description": enriched_description,
+            "brand": brand,
+            "concepts": concepts,
+            "user_clarifications": user_clarifications,
+        }
+        progress_token = _run_progress.set([0])
 
-                await self._emit(PrototypeEvent(
-                    type="agent_complete",
-                    agent="Report Generator",
-                    message=f"Generated {report_type.replace('_', ' ').title()} report",
-                    progress=100,
-                    data={"report_type": report_type}
-                ))
+        try:
+            await graph.run(ctx)
 
-                # Emit report as a separate event for the frontend
-                await self._emit(PrototypeEvent(
-                    type="report_complete",
-                    agent="Report Generator",
-                    message="Business report ready!",
-                    progress=100,
-                    data={
-                        "report_html": report_html,
-                        "report_type": report_type,
-                    }
-                ))
+            timing_report = graph.timing_report()
+            await self._emit(PrototypeEvent(
+                type="phase_timings",
+                message=f"Critical path: {' → '.join(timing_report['critical_path'])}",
+                progress=100,
+                data=timing_report,
+            ))
 
-            except Exception as report_error:
-                logger.warning(f"Report generation failed (non-fatal): {report_error}")
-                await self._emit(PrototypeEvent(
-                    type="agent_complete",
-                    agent="Report Generator",
-                    message="Report generation skipped",
-                    progress=100
-                ))
+            domain_analysis = ctx["preset"]["domain_analysis"]
+            architecture = ctx["preset"]["architecture"]
+            mock_data = ctx["preset"]["mock_data"]
+            quality_result = ctx["quality_result"]
 
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
 
@@ -810,60 +1013,180 @@ class PrototypeOrchestrator:
 
             return PrototypeResult(
                 success=True,
-                files=validated_files,
+                files=ctx["validated_files"],
                 domain_analysis=domain_analysis,
                 architecture=architecture,
                 mock_data=mock_data,
-                validation=validation,
+                validation=ctx["validation"],
                 duration_ms=duration_ms,
                 fallback_info=FallbackInfo(
                     level=FallbackLevel.FULL_CREATIVE,
                     reason="Full creative pipeline completed",
                     customization_applied=customizations,
                 ),
-                report_html=report_html,
-                report_type=report_type,
+                report_html=ctx["report_html"],
+                report_type=ctx["report_type"],
+                phase_timings=timing_report,
             )
 
-        except Exception as e:
-            logger.error(f"Prototype generation failed: {e}")
-
+        except Exception:
             # Record failure for learning
             if self._smart_system:
                 self._smart_system.record_failure(description)
 
             # Record negative feedback if we have domain/architecture info
             try:
-                if 'domain_analysis' in dir() and 'architecture' in dir():
+                if "domain_analysis" in ctx and "architecture" in ctx:
                     feedback_analyzer = get_feedback_analyzer()
-                    feedback_analyzer.record_outcome(domain_analysis, architecture, positive=False)
+                    feedback_analyzer.record_outcome(ctx["domain_analysis"], ctx["architecture"], positive=False)
             except Exception:
                 pass  # Don't fail on analytics
 
-            # Mark any running agents as complete (interrupted) before fallback
-            # This ensures the UI doesn't show agents stuck in "running" state
-            await self._emit(PrototypeEvent(
-                type="agent_complete",
-                agent="Domain Analyst",
-                message="Switching to fallback system",
-                progress=50
-            ))
+            raise
 
-            # Execute fallback cascade
-            await self._emit(PrototypeEvent(
-                type="status",
-                message="Trying alternative generation methods...",
-                progress=50
-            ))
+        finally:
+            _run_progress.reset(progress_token)
 
-            fallback_result = await self._execute_fallback_cascade(
-                description=description,
-                brand=brand,
-                original_error=str(e),
-                start_time=start_time,
-            )
+    async def _generate_speculative(
+        self,
+        description: str,
+        enriched_description: str,
+        brand: Optional[BrandProfile],
+        concepts: Optional[ExtractedConcepts],
+        user_clarifications: Optional[Dict[str, str]],
+        start_time: datetime,
+        project_id: Optional[str] = None,
+    ) -> PrototypeResult:
+        """
+        Race the creative pipeline against the cheap fallbacks.
 
-            return fallback_result
+        Levels 2 and 3 start alongside the creative pipeline. If the pipeline
+        succeeds within speculative_deadline its result wins and the fallbacks
+        are cancelled. Otherwise the best fallback available is returned and,
+        if upgrade_late_results is set, the pipeline keeps running so its
+        result can be delivered later as a "prototype_upgrade" event.
+        """
+        creative = asyncio.create_task(self._run_creative_pipeline(
+            description=description,
+            enriched_description=enriched_description,
+            brand=brand,
+            concepts=concepts,
+            user_clarifications=user_clarifications,
+            start_time=start_time,
+        ))
+        speculative_levels = {
+            FallbackLevel.CACHED_SIMILAR: asyncio.create_task(self._try_cached_similar(description, brand)),
+            FallbackLevel.TEMPLATE_CUSTOMIZED: asyncio.create_task(self._try_template_customized(description, brand)),
+        }
+        pending = {creative, *speculative_levels.values()}
+
+        try:
+            done, _ = await asyncio.wait({creative}, timeout=self.speculative_deadline)
+            if creative in done and creative.exception() is None:
+                return creative.result()
+
+            if creative in done:
+                original_error = str(creative.exception())
+                logger.error(f"Prototype generation failed: {original_error}")
+            else:
+                original_error = f"Creative pipeline did not finish within {self.speculative_deadline:.0f}s"
+                logger.warning(original_error)
+
+            # Fallbacks were started with the pipeline, so they are usually done already
+            await asyncio.gather(*speculative_levels.values(), return_exceptions=True)
+
+            result = None
+            for task in speculative_levels.values():
+                if not task.cancelled() and task.exception() is None and task.result():
+                    result = task.result()
+                    break
+
+            if result is None:
+                result = await self._execute_fallback_cascade(
+                    description=description,
+                    brand=brand,
+                    original_error=original_error,
+                    start_time=start_time,
+                    skip_levels=tuple(speculative_levels),
+                )
+            else:
+                result.duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                level_name = result.fallback_info.level.name if result.fallback_info else "UNKNOWN"
+                if result.fallback_info:
+                    result.fallback_info.original_error = original_error
+                logger.info(f"Speculative fallback delivered at level: {level_name}")
+
+                await self._emit(PrototypeEvent(
+                    type="agent_start",
+                    agent="Fallback System",
+                    message="Activating fallback system...",
+                    progress=55
+                ))
+                await self._emit(PrototypeEvent(
+                    type="agent_complete",
+                    agent="Fallback System",
+                    message=result.fallback_info.user_message if result.fallback_info else "Prototype ready",
+                    progress=100,
+                    data={"fallback_level": level_name}
+                ))
+
+            if not creative.done() and self.upgrade_late_results:
+                pending.discard(creative)
+                upgrade = asyncio.create_task(self._deliver_upgrade(creative, start_time, project_id))
+                # Track the pipeline too: an upgrade cancelled before it starts never cancels it
+                for task in (creative, upgrade):
+                    self._upgrade_tasks.add(task)
+                    task.add_done_callback(self._upgrade_tasks.discard)
+
+            return result
+
+        finally:
+            # Cancel losing branches, including when generate() itself is cancelled
+            await self._cancel_tasks(pending)
+
+    async def _deliver_upgrade(
+        self,
+        creative: "asyncio.Task[PrototypeResult]",
+        start_time: datetime,
+        project_id: Optional[str],
+    ) -> None:
+        """Wait for a late creative pipeline and emit its result as an upgrade."""
+        try:
+            result = await creative
+        except asyncio.CancelledError:
+            creative.cancel()
+            raise
+        except Exception as e:
+            logger.info(f"Late creative pipeline failed, keeping fallback prototype: {e}")
+            return
+
+        result.duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+
+        await self._emit(PrototypeEvent(
+            type="prototype_upgrade",
+            agent="Fallback System",
+            message=result.fallback_info.user_message if result.fallback_info else "Prototype upgraded",
+            progress=100,
+            data={
+                "files": result.files,
+                "fallback_level": FallbackLevel.FULL_CREATIVE.name,
+                "project_id": project_id,
+                "duration_ms": result.duration_ms,
+            }
+        ))
+
+    @staticmethod
+    async def _cancel_tasks(tasks: Set[asyncio.Task]) -> None:
+        """Cancel unfinished tasks and wait for them to unwind."""
+        unfinished = [task for task in tasks if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        if unfinished:
+            await asyncio.gather(*unfinished, return_exceptions=True)
+
+    async def cancel_upgrades(self) -> None:
+        """Cancel any creative pipelines still running to upgrade a delivered fallback."""
+        await self._cancel_tasks(set(self._upgrade_tasks))
 
     async def _execute_fallback_cascade(
         self,
@@ -871,6 +1194,7 @@ class PrototypeOrchestrator:
         brand: Optional[BrandProfile],
         original_error: str,
         start_time: datetime,
+        skip_levels: Sequence[FallbackLevel] = (),
     ) -> PrototypeResult:
         """
         Execute the fallback cascade to ensure users always get something useful.
@@ -882,6 +1206,7 @@ class PrototypeOrchestrator:
         4. MINIMAL - Absolute minimum working prototype
 
         Each level provides less customization but more reliability.
+        Levels in skip_levels (already attempted speculatively) are not retried.
         """
         cascade_levels = [
             (FallbackLevel.CACHED_SIMILAR, self._try_cached_similar, "Checking similar projects..."),
@@ -898,6 +1223,9 @@ class PrototypeOrchestrator:
         ))
 
         for level, method, status_msg in cascade_levels:
+            if level in skip_levels:
+                continue
+
             await self._emit(PrototypeEvent(
                 type="status",
                 message=status_msg,
@@ -991,13 +1319,13 @@ class PrototypeOrchestrator:
             domain_expertise: Rich domain expertise from synthesizer (optional)
         """
         if self._smart_system:
-            # Use smart preset system
-            domain, _, _ = self._smart_system.get_preset(description)
-
             # Use pre-extracted concepts if available (performance optimization)
             if concepts is None:
                 concepts = self._smart_system.get_concepts(description)
 
+            # Use smart preset system
+            domain, _, _ = self._smart_system.get_preset(description, concepts=concepts)
+
             # Add concepts info to domain for richer context
             domain["_concepts"] = {
                 "entities": concepts.entities,
@@ -1009,49 +1337,7 @@ class PrototypeOrchestrator:
 
             # Enrich with domain expertise (if available)
             if domain_expertise:
-                # Add expertise-derived data
-                domain["_expertise"] = {
-                    "target_market": domain_expertise.target_market,
-                    "service_model": domain_expertise.service_model,
-                    "pricing_approach": domain_expertise.pricing_approach,
-                    "scale_expectation": domain_expertise.scale_expectation,
-                    "industry_trends": domain_expertise.industry_trends[:5],
-                    "competitor_features": domain_expertise.competitor_features[:7],
-                    "best_practices": domain_expertise.best_practices[:5],
-                    "pricing_benchmarks": domain_expertise.pricing_benchmarks,
-                    "confidence_score": domain_expertise.confidence_score,
-                }
-
-                # Merge terminology (expertise takes priority)
-                if domain_expertise.terminology:
-                    existing_terminology = domain.get("terminology", {})
-                    merged_terminology = {**existing_terminology, **domain_expertise.terminology}
-                    domain["terminology"] = merged_terminology
-
-                # Enhance metrics with expertise recommendations
-                if domain_expertise.recommended_metrics:
-                    existing_metrics = domain.get("metrics", [])
-                    for metric in domain_expertise.recommended_metrics:
-                        if metric not in existing_metrics:
-                            existing_metrics.append(metric)
-                    domain["metrics"] = existing_metrics[:8]
-
-                # Add suggested sections from expertise
-                if domain_expertise.suggested_features:
-                    existing_sections = domain.get("suggested_sections", [])
-                    for feature in domain_expertise.suggested_features[:4]:
-                        if feature not in existing_sections:
-                            existing_sections.append(feature)
-                    domain["suggested_sections"] = existing_sections[:8]
-
-                # Add agent context string for prompts
-                domain["_agent_context"] = domain_expertise.to_agent_context()
-
-                logger.info(
-                    f"Enhanced domain with expertise: "
-                    f"confidence={domain_expertise.confidence_score:.2f}, "
-                    f"sources={domain_expertise.sources_used}"
-                )
+                domain = self._apply_domain_expertise(domain, domain_expertise)
 
             logger.info(
                 f"Smart domain analysis: industry={concepts.best_industry} "
@@ -1066,6 +1352,63 @@ class PrototypeOrchestrator:
             logger.info(f"Using static domain preset for: {preset.get('industry', 'universal')}")
             return preset
 
+    def _apply_domain_expertise(
+        self,
+        domain: Dict[str, Any],
+        domain_expertise: DomainExpertise,
+    ) -> Dict[str, Any]:
+        """
+        Merge synthesized domain expertise into a domain analysis.
+
+        Adds web research insights, expertise terminology, recommended metrics
+        and suggested sections on top of the preset.
+        """
+        # Add expertise-derived data
+        domain["_expertise"] = {
+            "target_market": domain_expertise.target_market,
+            "service_model": domain_expertise.service_model,
+            "pricing_approach": domain_expertise.pricing_approach,
+            "scale_expectation": domain_expertise.scale_expectation,
+            "industry_trends": domain_expertise.industry_trends[:5],
+            "competitor_features": domain_expertise.competitor_features[:7],
+            "best_practices": domain_expertise.best_practices[:5],
+            "pricing_benchmarks": domain_expertise.pricing_benchmarks,
+            "confidence_score": domain_expertise.confidence_score,
+        }
+
+        # Merge terminology (expertise takes priority)
+        if domain_expertise.terminology:
+            existing_terminology = domain.get("terminology", {})
+            merged_terminology = {**existing_terminology, **domain_expertise.terminology}
+            domain["terminology"] = merged_terminology
+
+        # Enhance metrics with expertise recommendations
+        if domain_expertise.recommended_metrics:
+            existing_metrics = domain.get("metrics", [])
+            for metric in domain_expertise.recommended_metrics:
+                if metric not in existing_metrics:
+                    existing_metrics.append(metric)
+            domain["metrics"] = existing_metrics[:8]
+
+        # Add suggested sections from expertise
+        if domain_expertise.suggested_features:
+            existing_sections = domain.get("suggested_sections", [])
+            for feature in domain_expertise.suggested_features[:4]:
+                if feature not in existing_sections:
+                    existing_sections.append(feature)
+            domain["suggested_sections"] = existing_sections[:8]
+
+        # Add agent context string for prompts
+        domain["_agent_context"] = domain_expertise.to_agent_context()
+
+        logger.info(
+            f"Enhanced domain with expertise: "
+            f"confidence={domain_expertise.confidence_score:.2f}, "
+            f"sources={domain_expertise.sources_used}"
+        )
+
+        return domain
+
     async def _plan_architecture(
         self,
         description: str,
@@ -3,15 +3,29 @@ Agent Supervisor Service
 
 Provides error handling, retry logic, and circuit breaker patterns
 for reliable agent execution.
+
+Breaker state, statistics and a global retry budget live in a shared
+state backend (see supervisor_state), so with several API workers a
+failing agent is detected once and every worker opens and closes its
+breaker together. With SUPERVISOR_RETRY_BUDGET=true, retries are also
+capped to a share of all traffic.
 """
 
 from typing import Dict, Optional, Callable, Awaitable, TypeVar, Generic, Any
 from pydantic import BaseModel, Field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from collections import defaultdict
 import asyncio
 import logging
+import os
+
+from .supervisor_state import (
+    InMemorySupervisorState,
+    SupervisorStateBackend,
+    close_supervisor_state,
+    get_supervisor_state,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -42,21 +56,71 @@ class CircuitBreaker:
     Circuit breaker pattern implementation.
 
     Prevents cascading failures by stopping requests to failing services.
+
+    Counters and transitions go through the state backend: failures from
+    every worker count towards the threshold, and a transition made by any
+    worker is applied by all of them. If the backend is unreachable the
+    breaker carries on with its local counts.
     """
 
-    def __init__(self, name: str, config: Optional[CircuitBreakerConfig] = None):
+    def __init__(
+        self,
+        name: str,
+        config: Optional[CircuitBreakerConfig] = None,
+        state_backend: Optional[SupervisorStateBackend] = None,
+    ):
         self.name = name
         self.config = config or CircuitBreakerConfig()
+        self.backend = state_backend or InMemorySupervisorState()
         self.state = CircuitState.CLOSED
         self.failure_count = 0
         self.success_count = 0
         self.last_failure_time: Optional[datetime] = None
         self.half_open_calls = 0
         self._lock = asyncio.Lock()
+        self._synced = False
+        self.backend.subscribe(self.apply)
+
+    def apply(self, record: Dict[str, Any]) -> None:
+        """Adopt a circuit state from the backend or a broadcast transition"""
+        if record.get("name", self.name) != self.name:
+            return
+        state = CircuitState(record["state"])
+        if state != self.state:
+            logger.info(f"Circuit {self.name} is now {state.value}")
+        self.state = state
+        self.failure_count = record.get("failure_count", 0)
+        self.success_count = record.get("success_count", 0)
+        self.half_open_calls = record.get("half_open_calls", 0)
+        if record.get("opened_at"):
+            self.last_failure_time = datetime.utcfromtimestamp(record["opened_at"])
+
+    async def _shared(self, operation: Awaitable[Any], fallback: Any) -> Any:
+        """Run a backend operation, falling back to local state on error"""
+        try:
+            return await operation
+        except Exception as e:
+            logger.warning(f"Circuit {self.name} state backend unavailable: {e}")
+            return fallback
+
+    async def _transition(self, state: CircuitState, **fields: Any) -> None:
+        local = {"name": self.name, "state": state.value, **fields}
+        event = await self._shared(self.backend.transition(self.name, state.value, **fields), local)
+        self.apply(event)
+
+    async def _sync(self) -> None:
+        """Pick up the shared state the first time the breaker is used"""
+        if not self._synced:
+            self._synced = True
+            record = await self._shared(self.backend.get_circuit(self.name), None)
+            if record:
+                self.apply({**record, "name": self.name})
 
     async def is_allowed(self) -> bool:
         """Check if a request should be allowed"""
         async with self._lock:
+            await self._sync()
+
             if self.state == CircuitState.CLOSED:
                 return True
 
@@ -66,16 +130,16 @@ class CircuitBreaker:
                     elapsed = (datetime.utcnow() - self.last_failure_time).total_seconds()
                     if elapsed >= self.config.timeout_seconds:
                         logger.info(f"Circuit {self.name} transitioning to half-open")
-                        self.state = CircuitState.HALF_OPEN
-                        self.half_open_calls = 0
+                        await self._transition(CircuitState.HALF_OPEN)
                         return True
                 return False
 
             if self.state == CircuitState.HALF_OPEN:
-                if self.half_open_calls < self.config.half_open_max_calls:
-                    self.half_open_calls += 1
-                    return True
-                return False
+                self.half_open_calls = await self._shared(
+                    self.backend.incr_circuit(self.name, "half_open_calls"),
+                    self.half_open_calls + 1,
+                )
+                return self.half_open_calls <= self.config.half_open_max_calls
 
             return False
 
@@ -83,32 +147,50 @@ class CircuitBreaker:
         """Record a successful call"""
         async with self._lock:
             if self.state == CircuitState.HALF_OPEN:
-                self.success_count += 1
+                self.success_count = await self._shared(
+                    self.backend.incr_circuit(self.name, "success_count"),
+                    self.success_count + 1,
+                )
                 if self.success_count >= self.config.success_threshold:
                     logger.info(f"Circuit {self.name} closing after recovery")
-                    self.state = CircuitState.CLOSED
-                    self.failure_count = 0
-                    self.success_count = 0
+                    await self._transition(CircuitState.CLOSED)
 
-            elif self.state == CircuitState.CLOSED:
-                # Reset failure count on success
+            elif self.state == CircuitState.CLOSED and self.failure_count:
+                # Reset failure count on success (no backend write when already clear)
                 self.failure_count = 0
+                await self._shared(self.backend.reset_counter(self.name, "failure_count"), None)
 
     async def record_failure(self) -> None:
         """Record a failed call"""
         async with self._lock:
-            self.failure_count += 1
+            self.failure_count = await self._shared(
+                self.backend.incr_circuit(self.name, "failure_count"),
+                self.failure_count + 1,
+            )
             self.last_failure_time = datetime.utcnow()
+            opened_at = self.last_failure_time.replace(tzinfo=timezone.utc).timestamp()
 
             if self.state == CircuitState.HALF_OPEN:
                 logger.warning(f"Circuit {self.name} opening after half-open failure")
-                self.state = CircuitState.OPEN
-                self.success_count = 0
+                await self._transition(
+                    CircuitState.OPEN, opened_at=opened_at, failure_count=self.failure_count
+                )
 
             elif self.state == CircuitState.CLOSED:
                 if self.failure_count >= self.config.failure_threshold:
                     logger.warning(f"Circuit {self.name} opening after {self.failure_count} failures")
-                    self.state = CircuitState.OPEN
+                    await self._transition(
+                        CircuitState.OPEN, opened_at=opened_at, failure_count=self.failure_count
+                    )
+
+    async def reset(self) -> None:
+        """Close the breaker on every worker"""
+        async with self._lock:
+            await self._transition(CircuitState.CLOSED)
+
+    def close(self) -> None:
+        """Stop receiving transitions from the backend"""
+        self.backend.unsubscribe(self.apply)
 
     def get_status(self) -> Dict[str, Any]:
         """Get circuit breaker status"""
@@ -134,6 +216,14 @@ class RetryConfig(BaseModel):
     jitter: bool = Field(default=True, description="Add random jitter to delays")
 
 
+class RetryBudgetConfig(BaseModel):
+    """Cap on retries as a share of all requests, across workers (opt-in)"""
+    enabled: bool = Field(default=False, description="Enforce the retry budget")
+    ratio: float = Field(default=0.2, description="Retries allowed per request in the window")
+    min_retries: int = Field(default=10, description="Retries always allowed per window")
+    window_seconds: float = Field(default=60.0, description="Sliding window length")
+
+
 class RetryResult(BaseModel, Generic[T]):
     """Result of a retry operation"""
     success: bool
@@ -153,7 +243,8 @@ class AgentSupervisor:
 
     Features:
     - Exponential backoff retries
-    - Circuit breaker per agent
+    - Circuit breaker per agent, shared across workers
+    - Global retry budget
     - Fallback to simpler agents
     - Execution statistics
     """
@@ -162,9 +253,13 @@ class AgentSupervisor:
         self,
         retry_config: Optional[RetryConfig] = None,
         circuit_config: Optional[CircuitBreakerConfig] = None,
+        state_backend: Optional[SupervisorStateBackend] = None,
+        retry_budget: Optional[RetryBudgetConfig] = None,
     ):
         self.retry_config = retry_config or RetryConfig()
         self.circuit_config = circuit_config or CircuitBreakerConfig()
+        self.state_backend = state_backend or InMemorySupervisorState()
+        self.retry_budget = retry_budget or RetryBudgetConfig()
         self._circuits: Dict[str, CircuitBreaker] = {}
         self._stats: Dict[str, Dict[str, int]] = defaultdict(
             lambda: {"attempts": 0, "successes": 0, "failures": 0}
@@ -176,9 +271,32 @@ class AgentSupervisor:
             self._circuits[agent_id] = CircuitBreaker(
                 name=f"agent:{agent_id}",
                 config=self.circuit_config,
+                state_backend=self.state_backend,
             )
         return self._circuits[agent_id]
 
+    async def _count(self, agent_id: str, stat: str) -> None:
+        """Count a statistic locally and in the shared backend"""
+        stats = self._stats[agent_id]
+        stats[stat] = stats.get(stat, 0) + 1
+        try:
+            await self.state_backend.incr_stat(agent_id, stat)
+        except Exception as e:
+            logger.warning(f"Could not record {stat} for {agent_id}: {e}")
+
+    async def _acquire_retry(self) -> bool:
+        """Take a retry from the global budget (allowed if the backend is down)"""
+        budget = self.retry_budget
+        if not budget.enabled:
+            return True
+        try:
+            return await self.state_backend.acquire_retry(
+                budget.ratio, budget.min_retries, budget.window_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Retry budget unavailable: {e}")
+            return True
+
     def _calculate_delay(self, attempt: int) -> float:
         """Calculate delay for a retry attempt with exponential backoff"""
         delay = self.retry_config.initial_delay * (
@@ -241,17 +359,23 @@ class AgentSupervisor:
                 errors=["Circuit breaker open"],
             )
 
+        if self.retry_budget.enabled:
+            try:
+                await self.state_backend.record_request(self.retry_budget.window_seconds)
+            except Exception as e:
+                logger.warning(f"Retry budget unavailable: {e}")
+
         # Attempt execution with retries
         for attempt in range(self.retry_config.max_retries + 1):
             attempts += 1
-            self._stats[agent_id]["attempts"] += 1
+            await self._count(agent_id, "attempts")
 
             try:
                 result = await execute_fn()
 
                 # Success!
                 await circuit.record_success()
-                self._stats[agent_id]["successes"] += 1
+                await self._count(agent_id, "successes")
 
                 return RetryResult(
                     success=True,
@@ -271,6 +395,12 @@ class AgentSupervisor:
 
                 # Check if we should retry
                 if attempt < self.retry_config.max_retries:
+                    if not await self._acquire_retry():
+                        logger.warning(f"Retry budget exhausted, not retrying {agent_id}")
+                        errors.append("Retry budget exhausted")
+                        await self._count(agent_id, "budget_denied")
+                        break
+
                     delay = self._calculate_delay(attempt)
                     total_delay += delay
 
@@ -281,7 +411,7 @@ class AgentSupervisor:
                     await asyncio.sleep(delay)
 
         # All retries exhausted
-        self._stats[agent_id]["failures"] += 1
+        await self._count(agent_id, "failures")
 
         # Try fallback
         if fallback_fn:
@@ -351,6 +481,10 @@ class AgentSupervisor:
         """Get execution statistics for all agents"""
         return dict(self._stats)
 
+    async def get_global_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get execution statistics for all agents, summed over every worker"""
+        return await self.state_backend.get_stats()
+
     def get_agent_stats(self, agent_id: str) -> Dict[str, int]:
         """Get execution statistics for a specific agent"""
         return dict(self._stats.get(agent_id, {}))
@@ -371,6 +505,17 @@ class AgentSupervisor:
         for agent_id in self._circuits:
             self.reset_circuit(agent_id)
 
+    async def reset_shared_circuit(self, agent_id: str) -> None:
+        """Reset a circuit breaker on every worker"""
+        await self._get_circuit(agent_id).reset()
+        logger.info(f"Circuit {agent_id} reset on all workers")
+
+    def close(self) -> None:
+        """Detach every circuit breaker from the state backend"""
+        for circuit in self._circuits.values():
+            circuit.close()
+        self._circuits.clear()
+
 
 # ===========================================
 # Agent Fallback Registry
@@ -413,10 +558,24 @@ def get_supervisor() -> AgentSupervisor:
     """Get or create the global supervisor instance"""
     global _supervisor
     if _supervisor is None:
-        _supervisor = AgentSupervisor()
+        _supervisor = AgentSupervisor(
+            state_backend=get_supervisor_state(),
+            retry_budget=RetryBudgetConfig(
+                enabled=os.environ.get("SUPERVISOR_RETRY_BUDGET", "false").lower() == "true"
+            ),
+        )
     return _supervisor
 
 
+async def close_supervisor() -> None:
+    """Close the global supervisor and its state backend (app shutdown)"""
+    global _supervisor
+    if _supervisor is not None:
+        _supervisor.close()
+        _supervisor = None
+    await close_supervisor_state()
+
+
 async def supervised_execute(
     agent_id: str,
     execute_fn: Callable[[], Awaitable[T]],
@@ -0,0 +1,318 @@
+"""
+Supervisor State
+
+Shared state for AgentSupervisor, so every API worker sees the same
+circuit breakers and retry budget:
+
+- Circuit records: state plus failure/success/half-open counters per
+  breaker; every state transition is broadcast to all workers
+- Retry budget: requests and retries in a sliding window, so retries can be
+  capped to a fraction of traffic across all workers
+- Execution statistics per agent
+
+Backends:
+- InMemorySupervisorState: one process (default)
+- RedisSupervisorState: shared across workers (requires `redis`); transitions
+  are published on a pub/sub channel
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Called with {"name", "state", "changed_at", ...} on every transition
+TransitionCallback = Callable[[Dict[str, Any]], None]
+
+CIRCUIT_COUNTERS = ("failure_count", "success_count", "half_open_calls")
+
+# The retry budget window is counted in this many buckets (Redis backend)
+BUDGET_BUCKETS = 6
+
+
+class SupervisorStateBackend(ABC):
+    """Interface for supervisor state backends"""
+
+    def __init__(self):
+        self._callbacks: List[TransitionCallback] = []
+
+    def subscribe(self, callback: TransitionCallback) -> None:
+        """Receive every circuit transition, including this worker's own"""
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: TransitionCallback) -> None:
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        for callback in list(self._callbacks):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"Circuit transition callback failed: {e}")
+
+    @abstractmethod
+    async def get_circuit(self, name: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def incr_circuit(self, name: str, counter: str) -> int:
+        """Increment a circuit counter and return the new value"""
+        pass
+
+    @abstractmethod
+    async def reset_counter(self, name: str, counter: str) -> None:
+        pass
+
+    @abstractmethod
+    async def transition(self, name: str, state: str, **fields: Any) -> Dict[str, Any]:
+        """Move a circuit to a state (counters reset) and broadcast it"""
+        pass
+
+    @abstractmethod
+    async def record_request(self, window_seconds: float) -> None:
+        """Count a first attempt towards the retry budget"""
+        pass
+
+    @abstractmethod
+    async def acquire_retry(self, ratio: float, min_retries: int, window_seconds: float) -> bool:
+        """
+        Take a retry from the budget.
+
+        Allowed while retries in the window stay within
+        max(min_retries, ratio * requests in the window).
+        """
+        pass
+
+    @abstractmethod
+    async def incr_stat(self, agent_id: str, stat: str) -> None:
+        pass
+
+    @abstractmethod
+    async def get_stats(self) -> Dict[str, Dict[str, int]]:
+        pass
+
+    async def close(self) -> None:
+        self._callbacks.clear()
+
+
+class InMemorySupervisorState(SupervisorStateBackend):
+    """Supervisor state for a single process"""
+
+    def __init__(self):
+        super().__init__()
+        self._circuits: Dict[str, Dict[str, Any]] = {}
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(dict)
+
+    def _circuit(self, name: str) -> Dict[str, Any]:
+        return self._circuits.setdefault(name, {"state": "closed", **{c: 0 for c in CIRCUIT_COUNTERS}})
+
+    async def get_circuit(self, name: str) -> Optional[Dict[str, Any]]:
+        record = self._circuits.get(name)
+        return dict(record) if record else None
+
+    async def incr_circuit(self, name: str, counter: str) -> int:
+        record = self._circuit(name)
+        record[counter] = record.get(counter, 0) + 1
+        return record[counter]
+
+    async def reset_counter(self, name: str, counter: str) -> None:
+        self._circuit(name)[counter] = 0
+
+    async def transition(self, name: str, state: str, **fields: Any) -> Dict[str, Any]:
+        event = {"name": name, "state": state, "changed_at": time.time(), **fields}
+        self._circuits[name] = {**{c: 0 for c in CIRCUIT_COUNTERS}, **event}
+        self._dispatch(event)
+        return event
+
+    def _prune(self, window_seconds: float, now: float) -> None:
+        for events in (self._requests, self._retries):
+            while events and now - events[0] > window_seconds:
+                events.popleft()
+
+    async def record_request(self, window_seconds: float) -> None:
+        now = time.monotonic()
+        self._prune(window_seconds, now)
+        self._requests.append(now)
+
+    async def acquire_retry(self, ratio: float, min_retries: int, window_seconds: float) -> bool:
+        now = time.monotonic()
+        self._prune(window_seconds, now)
+        if len(self._retries) >= max(min_retries, ratio * len(self._requests)):
+            return False
+        self._retries.append(now)
+        return True
+
+    async def incr_stat(self, agent_id: str, stat: str) -> None:
+        stats = self._stats[agent_id]
+        stats[stat] = stats.get(stat, 0) + 1
+
+    async def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {agent_id: dict(stats) for agent_id, stats in self._stats.items()}
+
+
+class RedisSupervisorState(SupervisorStateBackend):
+    """
+    Supervisor state in Redis, shared by every worker.
+
+    Circuits are hashes, counters use HINCRBY, and transitions are published
+    on `<prefix>:transitions`. Each worker listens for transitions in a
+    background task started on first use.
+    """
+
+    def __init__(self, url: str, prefix: str = "supervisor"):
+        super().__init__()
+        import redis.asyncio as redis  # Optional dependency
+
+        self._redis = redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.channel = f"{prefix}:transitions"
+        self._listener: Optional[asyncio.Task] = None
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    self._dispatch(json.loads(message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Circuit transition listener stopped: {e}")
+        finally:
+            await pubsub.unsubscribe(self.channel)
+
+    @staticmethod
+    def _decode(record: Dict[str, str]) -> Dict[str, Any]:
+        decoded: Dict[str, Any] = {}
+        for key, value in record.items():
+            if key in CIRCUIT_COUNTERS:
+                decoded[key] = int(value)
+            elif key in ("changed_at", "opened_at"):
+                decoded[key] = float(value)
+            else:
+                decoded[key] = value
+        return decoded
+
+    async def get_circuit(self, name: str) -> Optional[Dict[str, Any]]:
+        self._ensure_listener()
+        record = await self._redis.hgetall(self._key("circuit", name))
+        return self._decode(record) if record else None
+
+    async def incr_circuit(self, name: str, counter: str) -> int:
+        self._ensure_listener()
+        return int(await self._redis.hincrby(self._key("circuit", name), counter, 1))
+
+    async def reset_counter(self, name: str, counter: str) -> None:
+        await self._redis.hset(self._key("circuit", name), counter, 0)
+
+    async def transition(self, name: str, state: str, **fields: Any) -> Dict[str, Any]:
+        self._ensure_listener()
+        event = {"name": name, "state": state, "changed_at": time.time(), **fields}
+        record = {**{c: 0 for c in CIRCUIT_COUNTERS}, **{k: v for k, v in event.items() if v is not None}}
+        pipe = self._redis.pipeline()
+        pipe.hset(self._key("circuit", name), mapping=record)
+        pipe.publish(self.channel, json.dumps(event))
+        await pipe.execute()
+        return event
+
+    def _bucket_keys(self, kind: str, window_seconds: float, now: float) -> List[str]:
+        width = max(window_seconds / BUDGET_BUCKETS, 1.0)
+        current = int(now // width)
+        return [self._key("budget", kind, str(current - i)) for i in range(BUDGET_BUCKETS)]
+
+    async def record_request(self, window_seconds: float) -> None:
+        key = self._bucket_keys("requests", window_seconds, time.time())[0]
+        pipe = self._redis.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, int(window_seconds * 2) + 1)
+        await pipe.execute()
+
+    async def acquire_retry(self, ratio: float, min_retries: int, window_seconds: float) -> bool:
+        now = time.time()
+        request_keys = self._bucket_keys("requests", window_seconds, now)
+        retry_keys = self._bucket_keys("retries", window_seconds, now)
+
+        pipe = self._redis.pipeline()
+        pipe.incr(retry_keys[0])
+        pipe.expire(retry_keys[0], int(window_seconds * 2) + 1)
+        pipe.mget(retry_keys + request_keys)
+        _, _, counts = await pipe.execute()
+
+        counts = [int(c or 0) for c in counts]
+        retries = sum(counts[:BUDGET_BUCKETS])
+        requests = sum(counts[BUDGET_BUCKETS:])
+        # The retry was counted optimistically; give it back if over budget
+        if retries > max(min_retries, ratio * requests):
+            await self._redis.decr(retry_keys[0])
+            return False
+        return True
+
+    async def incr_stat(self, agent_id: str, stat: str) -> None:
+        await self._redis.hincrby(self._key("stats", agent_id), stat, 1)
+
+    async def get_stats(self) -> Dict[str, Dict[str, int]]:
+        stats = {}
+        async for key in self._redis.scan_iter(match=self._key("stats", "*")):
+            agent_id = key[len(self._key("stats", "")):]
+            stats[agent_id] = {k: int(v) for k, v in (await self._redis.hgetall(key)).items()}
+        return stats
+
+    async def close(self) -> None:
+        await super().close()
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+        await self._redis.aclose()
+
+
+# Global instance
+_state: Optional[SupervisorStateBackend] = None
+
+
+def get_supervisor_state() -> SupervisorStateBackend:
+    """
+    Get the global supervisor state backend.
+
+    Uses Redis when SUPERVISOR_REDIS_URL is set and the redis package is
+    installed, in-memory otherwise.
+    """
+    global _state
+    if _state is None:
+        redis_url = os.environ.get("SUPERVISOR_REDIS_URL")
+        if redis_url:
+            try:
+                _state = RedisSupervisorState(redis_url)
+                logger.info("Using Redis supervisor state")
+            except ImportError:
+                logger.warning("redis not installed. Using in-memory supervisor state. Run: pip install redis")
+        if _state is None:
+            _state = InMemorySupervisorState()
+    return _state
+
+
+async def close_supervisor_state() -> None:
+    """Close the global backend (stops the Redis listener and connection)"""
+    global _state
+    if _state is not None:
+        await _state.close()
+        _state = None
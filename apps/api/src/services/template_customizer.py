@@ -9,15 +9,28 @@ Orchestrates the template-first generation approach:
 5. Fall back to clean template if validation fails
 
 This ensures a working base that AI customizes, rather than generating from scratch.
+
+Customizations are expressed as structured patches (token replacements,
+JSON / JS-object key edits, whole-file writes) against the cached template
+files. Only the files a patch actually changes are re-validated, and the
+output is memoized by (template id, customization params hash).
 """
 
+import hashlib
 import json
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+from dataclasses import dataclass, asdict, field, replace
 from enum import Enum
 
 from .template_loader import get_template_loader, Template, TemplateFile
-from .code_validator import validate_files, validate_and_fix, ValidationResult
+from .code_validator import get_validator, validate_files, ValidationResult
+
+# Maximum number of customized outputs kept in memory
+MAX_CACHED_RENDERS = 128
 
 
 class CustomizationMode(Enum):
@@ -107,6 +120,233 @@ class CustomizationResult:
     validation: ValidationResult
     warnings: List[str]
     fallback_used: bool = False
+    touched_files: List[str] = field(default_factory=list)  # Files changed from the template
+    cached: bool = False  # Served from the render cache
+
+
+class PatchError(Exception):
+    """A patch could not be applied to its target file"""
+    pass
+
+
+class PatchOp(Enum):
+    """Kinds of structured edits to a template file"""
+    REPLACE_TOKEN = "replace_token"    # Literal text replacement
+    SET_JSON_VALUE = "set_json_value"  # Set a dotted key in a JSON document
+    SET_JS_VALUE = "set_js_value"      # Set a dotted key in a JS object literal (tailwind.config.js)
+    WRITE_FILE = "write_file"          # Replace the whole file
+
+
+@dataclass(frozen=True)
+class FilePatch:
+    """
+    A structured change to one file of a template.
+
+    Patches are applied to the cached template files, so a customization
+    that only changes brand colors touches a single file instead of
+    regenerating the project.
+    """
+    path: str
+    op: PatchOp
+    target: str = ""  # Token to replace, or dotted key path
+    value: Any = None
+
+    def apply(self, content: Optional[str]) -> str:
+        """Apply the patch to a file's content (None if the file doesn't exist)"""
+        if self.op == PatchOp.WRITE_FILE:
+            return self.value
+
+        if content is None:
+            raise PatchError(f"{self.path} does not exist")
+
+        if self.op == PatchOp.REPLACE_TOKEN:
+            return content.replace(self.target, self.value)
+
+        if self.op == PatchOp.SET_JSON_VALUE:
+            try:
+                document = json.loads(content)
+            except json.JSONDecodeError as e:
+                raise PatchError(f"{self.path} is not valid JSON: {e}") from e
+            node = document
+            *parents, leaf = self.target.split(".")
+            for key in parents:
+                node = node.setdefault(key, {})
+            if node.get(leaf, object()) == self.value:
+                return content
+            node[leaf] = self.value
+            trailing = "\n" if content.endswith("\n") else ""
+            return json.dumps(document, indent=2) + trailing
+
+        if self.op == PatchOp.SET_JS_VALUE:
+            return _set_js_value(content, self.target.split("."), self.value)
+
+        raise PatchError(f"Unsupported patch op: {self.op}")
+
+    def fingerprint(self) -> str:
+        """Stable representation used in memoization keys"""
+        return json.dumps([self.path, self.op.value, self.target, self.value], sort_keys=True, default=str)
+
+
+def apply_patches(
+    files: Mapping[str, str],
+    patches: Sequence[FilePatch],
+) -> Tuple[Dict[str, str], Set[str]]:
+    """
+    Apply patches to a set of files.
+
+    Returns:
+        Tuple of (patched files, paths whose content actually changed)
+    """
+    result = dict(files)
+    for patch in patches:
+        result[patch.path] = patch.apply(result.get(patch.path))
+
+    touched = {path for path, content in result.items() if files.get(path) != content}
+    return result, touched
+
+
+# Object keys in JS source: identifier, 'quoted' or "quoted", followed by a colon
+_JS_KEY = re.compile(r"""(?:([A-Za-z_$][\w$]*)|'([^']*)'|"([^"]*)")\s*:""")
+
+
+def _skip_js_literal(source: str, i: int) -> int:
+    """If a string or comment starts at i, return the index just past it; otherwise i"""
+    if source.startswith("//", i):
+        end = source.find("\n", i)
+        return len(source) if end == -1 else end
+    if source.startswith("/*", i):
+        end = source.find("*/", i + 2)
+        return len(source) if end == -1 else end + 2
+    if source[i] in ("'", '"', "`"):
+        quote = source[i]
+        j = i + 1
+        while j < len(source) and source[j] != quote:
+            j += 2 if source[j] == "\\" else 1
+        return j + 1
+    return i
+
+
+def _js_value_end(source: str, start: int) -> int:
+    """End index of the JS value (object, array or scalar) starting at start"""
+    depth = 0
+    i = start
+    while i < len(source):
+        skipped = _skip_js_literal(source, i)
+        if skipped != i:
+            i = skipped
+            continue
+        c = source[i]
+        if c in "{[(":
+            depth += 1
+        elif c in "}])":
+            if depth == 0:
+                break
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        elif c == "," and depth == 0:
+            break
+        i += 1
+    return len(source[:i].rstrip())
+
+
+def _find_js_key(source: str, key_path: List[str]) -> Optional[Tuple[int, int]]:
+    """
+    Locate the value of a dotted key path within the first object literal in source.
+
+    Strings and comments are skipped, so braces inside them don't count.
+
+    Returns:
+        (start, end) span of the value, or None if the key isn't present
+    """
+    stack: List[Tuple[str, Optional[str]]] = []  # (bracket, key that opened it)
+    expect_key = False
+    pending_key: Optional[str] = None
+    i = 0
+
+    while i < len(source):
+        skipped = _skip_js_literal(source, i)
+        if skipped != i:
+            i = skipped
+            continue
+
+        c = source[i]
+        if c.isspace():
+            i += 1
+            continue
+
+        if expect_key:
+            expect_key = False
+            match = _JS_KEY.match(source, i)
+            if match:
+                key = next(g for g in match.groups() if g is not None)
+                if [k for _, k in stack[1:]] + [key] == key_path:
+                    start = match.end()
+                    while start < len(source) and source[start].isspace():
+                        start += 1
+                    return start, _js_value_end(source, start)
+                pending_key = key
+                i = match.end()
+                continue
+
+        if c in "{[(":
+            stack.append((c, pending_key))
+            expect_key = c == "{"
+            pending_key = None
+        elif c in "}])":
+            if stack:
+                stack.pop()
+            if not stack:
+                return None  # End of the first top-level object
+            pending_key = None
+        elif c == ",":
+            expect_key = bool(stack) and stack[-1][0] == "{"
+            pending_key = None
+        i += 1
+
+    return None
+
+
+def _to_js(value: Any) -> str:
+    """Serialize a Python value as a JS literal"""
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+        return f"'{escaped}'"
+    if isinstance(value, dict):
+        items = ", ".join(f"{key}: {_to_js(val)}" for key, val in value.items())
+        return "{ " + items + " }"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_to_js(v) for v in value) + "]"
+    return json.dumps(value)
+
+
+def _set_js_value(source: str, key_path: List[str], value: Any) -> str:
+    """Set (or insert) a key in a JS object literal, leaving the rest of the file untouched"""
+    span = _find_js_key(source, key_path)
+    if span:
+        start, end = span
+        return source[:start] + _to_js(value) + source[end:]
+
+    # Insert the key into its parent object if that exists
+    parent = _find_js_key(source, key_path[:-1]) if len(key_path) > 1 else None
+    if not parent or source[parent[0]] != "{":
+        raise PatchError(f"Key '{'.'.join(key_path)}' not found")
+
+    open_brace = parent[0]
+    line_start = source.rfind("\n", 0, open_brace) + 1
+    indent = re.match(r"\s*", source[line_start:]).group(0) + "  "
+    insertion = f"\n{indent}{key_path[-1]}: {_to_js(value)},"
+    return source[:open_brace + 1] + insertion + source[open_brace + 1:]
+
+
+@dataclass
+class _RenderedTemplate:
+    """Memoized output of applying patches to one version of a template"""
+    base: Mapping[str, str]  # Template files the render was built from
+    files: Mapping[str, str]
+    touched: Set[str]
+    validation: ValidationResult
+    from_cache: bool = False
 
 
 class TemplateCustomizer:
@@ -123,6 +363,11 @@ class TemplateCustomizer:
 
     def __init__(self):
         self.template_loader = get_template_loader()
+        self._lock = threading.Lock()
+        self._renders: "OrderedDict[Tuple[str, str], _RenderedTemplate]" = OrderedDict()
+        self._ai_patches: "OrderedDict[Tuple[str, str], List[FilePatch]]" = OrderedDict()
+        self._base_validations: Dict[str, Tuple[Mapping[str, str], ValidationResult]] = {}
+        self.cache_stats = {"hits": 0, "misses": 0}
 
     def get_customization_prompt(
         self,
@@ -237,6 +482,32 @@ Do NOT include protected files in your response. They will be merged automatical
 
         return result
 
+    def brand_patches(self, brand: BrandProfile) -> List[FilePatch]:
+        """
+        Express a brand profile as patches to tailwind.config.js.
+
+        Each color is set individually in theme.extend.colors, so the rest of
+        the config (comments, inverse colors, fonts) is left as-is.
+        """
+        colors = {
+            "brand.primary": brand.primary_color,
+            "brand.secondary": brand.secondary_color,
+            "brand.accent": brand.accent_color,
+            "surface.DEFAULT": brand.surface,
+            "surface.muted": brand.background,
+            "content.DEFAULT": brand.text_primary,
+            "content.muted": brand.text_muted,
+        }
+        return [
+            FilePatch(
+                path="tailwind.config.js",
+                op=PatchOp.SET_JS_VALUE,
+                target=f"theme.extend.colors.{key}",
+                value=value,
+            )
+            for key, value in colors.items()
+        ]
+
     def apply_brand_to_template(
         self,
         files: Dict[str, str],
@@ -247,14 +518,27 @@ Do NOT include protected files in your response. They will be merged automatical
 
         This is a safe operation that only modifies the color definitions.
         """
-        result = dict(files)
+        if "tailwind.config.js" not in files:
+            return dict(files)
+
+        try:
+            result, _ = apply_patches(files, self.brand_patches(brand))
+            return result
+        except PatchError:
+            # Config doesn't have the expected shape (e.g. rewritten by AI)
+            return self._apply_brand_with_regex(files, brand)
 
-        # Update tailwind.config.js with brand colors
-        if "tailwind.config.js" in result:
-            config_content = result["tailwind.config.js"]
+    def _apply_brand_with_regex(
+        self,
+        files: Dict[str, str],
+        brand: BrandProfile
+    ) -> Dict[str, str]:
+        """Replace the whole colors block of tailwind.config.js"""
+        result = dict(files)
+        config_content = result["tailwind.config.js"]
 
-            # Find and replace color definitions
-            new_colors = f"""colors: {{
+        # Find and replace color definitions
+        new_colors = f"""colors: {{
         brand: {{
           primary: '{brand.primary_color}',
           secondary: '{brand.secondary_color}',
@@ -270,22 +554,124 @@ Do NOT include protected files in your response. They will be merged automatical
         }},
       }},"""
 
-            # Replace existing colors block (simplified - in production, use AST)
-            import re
-            config_content = re.sub(
-                r"colors:\s*\{[^}]+\{[^}]+\}[^}]+\{[^}]+\}[^}]+\{[^}]+\}[^}]+\},",
-                new_colors,
-                config_content,
-                flags=re.DOTALL
-            )
-            result["tailwind.config.js"] = config_content
+        config_content = re.sub(
+            r"colors:\s*\{[^}]+\{[^}]+\}[^}]+\{[^}]+\}[^}]+\{[^}]+\}[^}]+\},",
+            new_colors,
+            config_content,
+            flags=re.DOTALL
+        )
+        result["tailwind.config.js"] = config_content
 
         return result
 
+    def _base_validation(self, template_id: str, base: Mapping[str, str]) -> ValidationResult:
+        """Validation of the unmodified template, computed once per template version"""
+        with self._lock:
+            cached = self._base_validations.get(template_id)
+            if cached and cached[0] is base:
+                return cached[1]
+
+        validation = validate_files(dict(base))
+        with self._lock:
+            self._base_validations[template_id] = (base, validation)
+        return validation
+
+    def render(
+        self,
+        template_id: str,
+        patches: Sequence[FilePatch] = (),
+    ) -> Optional[_RenderedTemplate]:
+        """
+        Apply patches to a template and validate only the files they touch.
+
+        Results are memoized by (template id, hash of the patches) and
+        invalidated when the template itself is reloaded.
+
+        Returns:
+            The rendered template, or None if the template doesn't exist
+        """
+        base = self.template_loader.get_template_files(template_id)
+        if not base:
+            return None
+
+        digest = hashlib.sha256("\n".join(p.fingerprint() for p in patches).encode()).hexdigest()
+        key = (template_id, digest)
+
+        with self._lock:
+            rendered = self._renders.get(key)
+            if rendered is not None and rendered.base is base:
+                self._renders.move_to_end(key)
+                self.cache_stats["hits"] += 1
+                return replace(rendered, from_cache=True)
+            self.cache_stats["misses"] += 1
+
+        files, touched = apply_patches(base, patches)
+        validation = get_validator().validate_changed(
+            files, touched, base, self._base_validation(template_id, base)
+        )
+        rendered = _RenderedTemplate(
+            base=base,
+            files=MappingProxyType(files),
+            touched=touched,
+            validation=validation,
+        )
+
+        with self._lock:
+            self._renders[key] = rendered
+            while len(self._renders) > MAX_CACHED_RENDERS:
+                self._renders.popitem(last=False)
+        return rendered
+
+    def clear_cache(self) -> None:
+        """Drop memoized renders and AI customizations"""
+        with self._lock:
+            self._renders.clear()
+            self._ai_patches.clear()
+            self._base_validations.clear()
+
+    def _request_key(self, template_id: str, request: CustomizationRequest) -> Tuple[str, str]:
+        """Memoization key for an AI customization request"""
+        params = {
+            "description": request.description,
+            "brand": asdict(request.brand) if request.brand else None,
+            "mode": request.mode.value,
+            "specific_pages": request.specific_pages,
+            "mock_data_context": request.mock_data_context,
+        }
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+        return template_id, digest
+
+    def _base_result(
+        self,
+        template: Template,
+        request: CustomizationRequest,
+        warnings: List[str],
+        fallback_used: bool,
+    ) -> CustomizationResult:
+        """The template with only brand patches applied"""
+        patches = self.brand_patches(request.brand) if request.brand else []
+        try:
+            rendered = self.render(template.id, patches)
+        except PatchError as e:
+            warnings.append(f"Brand could not be applied: {e}")
+            rendered = self.render(template.id)
+
+        return CustomizationResult(
+            success=True,
+            files=dict(rendered.files),
+            template_id=template.id,
+            validation=rendered.validation,
+            warnings=warnings,
+            fallback_used=fallback_used,
+            touched_files=sorted(rendered.touched),
+            cached=rendered.from_cache,
+        )
+
     async def customize(
         self,
         request: CustomizationRequest,
-        ai_generate_fn=None  # Function to call AI for customization
+        ai_generate_fn=None,  # Function to call AI for customization
+        use_cache: bool = True,
     ) -> CustomizationResult:
         """
         Main entry point for template customization.
@@ -298,9 +684,14 @@ Do NOT include protected files in your response. They will be merged automatical
         5. If validation fails, attempt auto-fix
         6. If still failing, fall back to clean template
 
+        AI output is turned into patches against the cached template, so only
+        files the AI actually changed are re-validated. Repeat requests with
+        the same parameters reuse the earlier AI output when use_cache is set.
+
         Args:
             request: Customization request with description and brand
             ai_generate_fn: Async function that takes prompt and returns Dict[str, str]
+            use_cache: Reuse memoized output for identical requests
 
         Returns:
             CustomizationResult with files and validation status
@@ -319,54 +710,66 @@ Do NOT include protected files in your response. They will be merged automatical
                 fallback_used=False
             )
 
-        # Step 2: Get template files as base
-        base_files = self.template_loader.get_template_files_dict(template.id)
-
         # If no AI function provided, just return template with brand applied
         if ai_generate_fn is None:
-            if request.brand:
-                base_files = self.apply_brand_to_template(base_files, request.brand)
-
-            validation = validate_files(base_files)
-            return CustomizationResult(
-                success=True,
-                files=base_files,
-                template_id=template.id,
-                validation=validation,
-                warnings=["No AI customization - returned base template"],
-                fallback_used=False
-            )
+            warnings.append("No AI customization - returned base template")
+            return self._base_result(template, request, warnings, fallback_used=False)
+
+        # Step 2: Reuse a previous customization of the same request
+        request_key = self._request_key(template.id, request)
+        with self._lock:
+            patches = self._ai_patches.get(request_key) if use_cache else None
+        cached = patches is not None
+
+        if patches is None:
+            # Step 3: Generate customization prompt
+            prompt = self.get_customization_prompt(template, request)
+
+            # Step 4: Call AI to customize
+            try:
+                customized_files = await ai_generate_fn(prompt)
+            except Exception as e:
+                warnings.append(f"AI customization failed: {e}")
+                # Fall back to template
+                return self._base_result(template, request, warnings, fallback_used=True)
+
+            # Step 5: Turn AI output into patches; protected files are never overwritten
+            base = self.template_loader.get_template_files(template.id)
+            patches = [
+                FilePatch(path=path, op=PatchOp.WRITE_FILE, value=content)
+                for path, content in sorted(customized_files.items())
+                if path not in template.protected_files and base.get(path) != content
+            ]
 
-        # Step 3: Generate customization prompt
-        prompt = self.get_customization_prompt(template, request)
+        # Apply brand if provided
+        if request.brand:
+            patches = patches + self.brand_patches(request.brand)
 
-        # Step 4: Call AI to customize
         try:
-            customized_files = await ai_generate_fn(prompt)
-        except Exception as e:
-            warnings.append(f"AI customization failed: {e}")
-            # Fall back to template
-            if request.brand:
-                base_files = self.apply_brand_to_template(base_files, request.brand)
-            validation = validate_files(base_files)
-            return CustomizationResult(
-                success=True,
-                files=base_files,
-                template_id=template.id,
-                validation=validation,
-                warnings=warnings,
-                fallback_used=True
+            rendered = self.render(template.id, patches)
+        except PatchError:
+            # AI rewrote tailwind.config.js into a shape brand patches can't target
+            patches = [p for p in patches if p.op == PatchOp.WRITE_FILE]
+            rendered = self.render(template.id, patches)
+            files = self._apply_brand_with_regex(dict(rendered.files), request.brand)
+            rendered = _RenderedTemplate(
+                base=rendered.base,
+                files=MappingProxyType(files),
+                touched=rendered.touched | {"tailwind.config.js"},
+                validation=get_validator().validate_changed(
+                    files, {"tailwind.config.js"}, rendered.files, rendered.validation
+                ),
             )
 
-        # Step 5: Merge with protected files
-        merged_files = self.merge_with_protected(template, customized_files)
-
-        # Apply brand if provided
-        if request.brand:
-            merged_files = self.apply_brand_to_template(merged_files, request.brand)
-
-        # Step 6: Validate
-        fixed_files, validation = validate_and_fix(merged_files)
+        # Step 6: Validate (only touched files were re-checked) and auto-fix
+        files = dict(rendered.files)
+        validation = rendered.validation
+        if not validation.is_valid:
+            validator = get_validator()
+            fixed_files = validator.auto_fix(files, validation)
+            fixed_paths = {path for path, content in fixed_files.items() if files.get(path) != content}
+            validation = validator.validate_changed(fixed_files, fixed_paths, files, validation)
+            files = fixed_files
 
         if not validation.is_valid:
             # Log what failed
@@ -375,26 +778,23 @@ Do NOT include protected files in your response. They will be merged automatical
 
             # Fall back to clean template
             warnings.append("Falling back to clean template due to validation errors")
-            if request.brand:
-                base_files = self.apply_brand_to_template(base_files, request.brand)
+            return self._base_result(template, request, warnings, fallback_used=True)
 
-            fallback_validation = validate_files(base_files)
-            return CustomizationResult(
-                success=True,  # Still "success" because we have working files
-                files=base_files,
-                template_id=template.id,
-                validation=fallback_validation,
-                warnings=warnings,
-                fallback_used=True
-            )
+        if use_cache and not cached:
+            with self._lock:
+                self._ai_patches[request_key] = [p for p in patches if p.op == PatchOp.WRITE_FILE]
+                while len(self._ai_patches) > MAX_CACHED_RENDERS:
+                    self._ai_patches.popitem(last=False)
 
         return CustomizationResult(
             success=True,
-            files=fixed_files,
+            files=files,
             template_id=template.id,
             validation=validation,
             warnings=warnings,
-            fallback_used=False
+            fallback_used=False,
+            touched_files=sorted(rendered.touched),
+            cached=cached or rendered.from_cache,
         )
 
     def get_template_for_preview(
@@ -414,12 +814,15 @@ Do NOT include protected files in your response. They will be merged automatical
         if not template:
             return {}
 
-        files = self.template_loader.get_template_files_dict(template.id)
-
         if brand:
-            files = self.apply_brand_to_template(files, brand)
-
-        return files
+            try:
+                return dict(self.render(template.id, self.brand_patches(brand)).files)
+            except PatchError:
+                return self._apply_brand_with_regex(
+                    self.template_loader.get_template_files_dict(template.id), brand
+                )
+
+        return self.template_loader.get_template_files_dict(template.id)
 
 
 # Global instance
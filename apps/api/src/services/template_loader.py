@@ -3,14 +3,29 @@ Template Loader Service
 
 Loads pre-built, WebContainer-tested templates as the foundation for generated projects.
 This ensures a working base that AI can customize, rather than generating from scratch.
+
+Only template manifests (metadata plus file listing) are read at startup; file
+contents are loaded the first time a template is used and cached as a frozen
+path -> content mapping. Template directories are re-checked by mtime at most
+every RELOAD_CHECK_INTERVAL seconds, so edited templates are picked up
+without restarting the server.
 """
 
 import os
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from pydantic import BaseModel
 
+# Minimum seconds between mtime checks of the templates directory
+RELOAD_CHECK_INTERVAL = 2.0
+
+# Path fragments that are never part of a template
+SKIP_PATHS = ["node_modules", ".git", ".next"]
+
 
 class TemplateFile(BaseModel):
     """A single file in a template"""
@@ -41,69 +56,135 @@ class Template(BaseModel):
     ]
 
 
+class TemplateManifest(BaseModel):
+    """Template metadata and file listing, read without loading file contents"""
+    id: str
+    name: str
+    description: str
+    category: str
+    keywords: List[str]
+    paths: List[str]  # Relative file paths, "/"-separated
+    signature: Tuple[int, int, int]  # (file count, newest mtime in ns, hash of paths) for change detection
+
+
 class TemplateLoader:
     """Loads and manages project templates"""
 
-    def __init__(self, templates_dir: Optional[str] = None):
+    def __init__(self, templates_dir: Optional[str] = None, hot_reload: bool = True):
         if templates_dir:
             self.templates_dir = Path(templates_dir)
         else:
             # Default to templates directory relative to this file
             self.templates_dir = Path(__file__).parent.parent.parent / "templates"
 
+        self.hot_reload = hot_reload
+        self._lock = threading.RLock()
+        self._manifests: Dict[str, TemplateManifest] = {}
         self._templates: Dict[str, Template] = {}
-        self._load_templates()
+        self._file_maps: Dict[str, Mapping[str, str]] = {}
+        self._keyword_index: Dict[str, List[str]] = {}
+        self._last_check = 0.0
 
-    def _load_templates(self):
-        """Load all templates from the templates directory"""
         if not self.templates_dir.exists():
             print(f"Warning: Templates directory not found: {self.templates_dir}")
-            return
-
-        for template_dir in self.templates_dir.iterdir():
-            if template_dir.is_dir():
-                template = self._load_template(template_dir)
-                if template:
-                    self._templates[template.id] = template
-
-    def _load_template(self, template_dir: Path) -> Optional[Template]:
-        """Load a single template from a directory"""
+        self._scan_manifests()
+
+    def _scan_manifests(self) -> None:
+        """Read the manifest of every template directory, dropping stale cached contents"""
+        manifests: Dict[str, TemplateManifest] = {}
+        if self.templates_dir.exists():
+            for template_dir in sorted(self.templates_dir.iterdir()):
+                if template_dir.is_dir():
+                    manifest = self._read_manifest(template_dir)
+                    if manifest:
+                        manifests[manifest.id] = manifest
+
+        with self._lock:
+            for template_id, old in self._manifests.items():
+                new = manifests.get(template_id)
+                if new is None or new.signature != old.signature:
+                    self._templates.pop(template_id, None)
+                    self._file_maps.pop(template_id, None)
+
+            self._manifests = manifests
+            self._keyword_index = {}
+            for template_id, manifest in manifests.items():
+                for keyword in manifest.keywords:
+                    self._keyword_index.setdefault(keyword, []).append(template_id)
+            self._last_check = time.monotonic()
+
+    def _read_manifest(self, template_dir: Path) -> Optional[TemplateManifest]:
+        """List a template directory (stat only, no reads)"""
         template_id = template_dir.name
-        files: Dict[str, TemplateFile] = {}
+        paths: List[str] = []
+        newest = 0
 
         # Walk through all files in the template directory
-        for file_path in template_dir.rglob("*"):
-            if file_path.is_file():
-                # Get relative path from template root
-                rel_path = file_path.relative_to(template_dir)
-                rel_path_str = str(rel_path).replace("\\", "/")
-
-                # Skip node_modules and other non-essential files
-                if any(skip in rel_path_str for skip in ["node_modules", ".git", ".next"]):
+        for root, dirs, filenames in os.walk(template_dir):
+            # Skip node_modules and other non-essential directories
+            dirs[:] = [d for d in dirs if d not in SKIP_PATHS]
+            for filename in filenames:
+                file_path = Path(root) / filename
+                rel_path_str = file_path.relative_to(template_dir).as_posix()
+                if any(skip in rel_path_str for skip in SKIP_PATHS):
                     continue
-
                 try:
-                    content = file_path.read_text(encoding="utf-8")
-                    files[rel_path_str] = TemplateFile(
-                        path=rel_path_str,
-                        content=content,
-                        is_customizable=rel_path_str not in Template.model_fields["protected_files"].default,
-                        description=self._get_file_description(rel_path_str)
-                    )
-                except Exception as e:
-                    print(f"Warning: Could not read {file_path}: {e}")
+                    newest = max(newest, file_path.stat().st_mtime_ns)
+                except OSError:
+                    continue
+                paths.append(rel_path_str)
 
-        if not files:
+        if not paths:
             return None
 
         # Determine template metadata
-        return Template(
+        return TemplateManifest(
             id=template_id,
             name=self._get_template_name(template_id),
             description=self._get_template_description(template_id),
             category=self._get_template_category(template_id),
+            keywords=self._get_template_keywords(template_id),
+            paths=sorted(paths),
+            signature=(len(paths), newest, hash(tuple(sorted(paths)))),
+        )
+
+    def _check_for_changes(self) -> None:
+        """Re-scan manifests if the check interval has elapsed (hot reload)"""
+        if self.hot_reload and time.monotonic() - self._last_check >= RELOAD_CHECK_INTERVAL:
+            self._scan_manifests()
+
+    def reload(self) -> None:
+        """Re-scan templates now, reloading any whose files changed"""
+        self._scan_manifests()
+
+    def _load_template(self, manifest: TemplateManifest) -> Optional[Template]:
+        """Read the files of a single template"""
+        template_dir = self.templates_dir / manifest.id
+        files: Dict[str, TemplateFile] = {}
+
+        for rel_path_str in manifest.paths:
+            file_path = template_dir / rel_path_str
+            try:
+                content = file_path.read_text(encoding="utf-8")
+                files[rel_path_str] = TemplateFile(
+                    path=rel_path_str,
+                    content=content,
+                    is_customizable=rel_path_str not in Template.model_fields["protected_files"].default,
+                    description=self._get_file_description(rel_path_str)
+                )
+            except Exception as e:
+                print(f"Warning: Could not read {file_path}: {e}")
+
+        if not files:
+            return None
+
+        return Template(
+            id=manifest.id,
+            name=manifest.name,
+            description=manifest.description,
+            category=manifest.category,
             files=files,
-            keywords=self._get_template_keywords(template_id)
+            keywords=manifest.keywords
         )
 
     def _get_file_description(self, path: str) -> str:
@@ -163,42 +244,77 @@ class TemplateLoader:
         return keywords.get(template_id, [template_id])
 
     def get_template(self, template_id: str) -> Optional[Template]:
-        """Get a specific template by ID"""
-        return self._templates.get(template_id)
+        """Get a specific template by ID, loading its files on first access"""
+        self._check_for_changes()
+
+        with self._lock:
+            template = self._templates.get(template_id)
+            if template is None:
+                manifest = self._manifests.get(template_id)
+                if manifest is None:
+                    return None
+                template = self._load_template(manifest)
+                if template is None:
+                    return None
+                self._templates[template_id] = template
+            return template
 
     def list_templates(self) -> List[Template]:
         """List all available templates"""
-        return list(self._templates.values())
+        self._check_for_changes()
+        templates = [self.get_template(template_id) for template_id in list(self._manifests)]
+        return [t for t in templates if t is not None]
+
+    def list_manifests(self) -> List[TemplateManifest]:
+        """List template manifests without loading any file contents"""
+        self._check_for_changes()
+        return list(self._manifests.values())
 
     def select_template(self, description: str) -> Template:
         """Select the best template based on user description"""
+        self._check_for_changes()
         description_lower = description.lower()
 
-        # Score each template based on keyword matches
-        scores: Dict[str, int] = {}
-        for template_id, template in self._templates.items():
-            score = 0
-            for keyword in template.keywords:
-                if keyword in description_lower:
-                    score += 1
-            scores[template_id] = score
+        # Score each template based on keyword matches; keywords shared by
+        # several templates are only searched for once
+        scores: Dict[str, int] = {template_id: 0 for template_id in self._manifests}
+        for keyword, template_ids in self._keyword_index.items():
+            if keyword in description_lower:
+                for template_id in template_ids:
+                    scores[template_id] += 1
 
         # Return template with highest score, or default to dashboard
         if scores:
             best_match = max(scores, key=scores.get)
             if scores[best_match] > 0:
-                return self._templates[best_match]
+                return self.get_template(best_match)
 
         # Default to dashboard if no match
-        return self._templates.get("dashboard", list(self._templates.values())[0] if self._templates else None)
+        if "dashboard" in self._manifests:
+            return self.get_template("dashboard")
+        return self.get_template(next(iter(self._manifests))) if self._manifests else None
 
-    def get_template_files_dict(self, template_id: str) -> Dict[str, str]:
-        """Get template files as a simple path -> content dictionary"""
+    def get_template_files(self, template_id: str) -> Mapping[str, str]:
+        """
+        Get a read-only path -> content mapping for a template.
+
+        The mapping is built once per template version and shared between
+        callers; use get_template_files_dict for a copy that can be modified.
+        """
         template = self.get_template(template_id)
         if not template:
-            return {}
+            return MappingProxyType({})
+
+        with self._lock:
+            files = self._file_maps.get(template_id)
+            if files is None:
+                files = MappingProxyType({path: file.content for path, file in template.files.items()})
+                self._file_maps[template_id] = files
+            return files
 
-        return {path: file.content for path, file in template.files.items()}
+    def get_template_files_dict(self, template_id: str) -> Dict[str, str]:
+        """Get template files as a simple path -> content dictionary"""
+        return dict(self.get_template_files(template_id))
 
     def get_protected_files(self, template_id: str) -> Dict[str, str]:
         """Get only the protected (non-modifiable) files from a template"""
@@ -227,11 +343,14 @@ class TemplateLoader:
 
 # Global instance
 _template_loader: Optional[TemplateLoader] = None
+_template_loader_lock = threading.Lock()
 
 
 def get_template_loader() -> TemplateLoader:
     """Get the global template loader instance"""
     global _template_loader
     if _template_loader is None:
-        _template_loader = TemplateLoader()
+        with _template_loader_lock:
+            if _template_loader is None:
+                _template_loader = TemplateLoader()
     return _template_loader
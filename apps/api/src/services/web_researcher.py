@@ -11,13 +11,24 @@ This module provides:
 
 Uses Tavily API for AI-optimized search results.
 Falls back to Perplexity API or simple web scraping if Tavily unavailable.
+
+Queries run concurrently under one overall deadline (ResearchExecutor).
+Results are cached on disk per (normalized query, industry, day), so
+projects in the same industry share research. The search backend is
+pluggable; FixtureSearchBackend serves canned results offline.
 """
 
 import asyncio
+import copy
+import hashlib
+import json
 import logging
 import os
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
+import re
+import time
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Optional, Tuple
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -116,6 +127,285 @@ class DomainResearch:
         }
 
 
+# ===========================================
+# Search Backends
+# ===========================================
+
+class SearchBackend:
+    """A web search provider"""
+
+    name: str = "base"
+
+    async def search(self, query: str, max_results: int = 5) -> List[SearchResult]:
+        raise NotImplementedError
+
+    def is_available(self) -> bool:
+        return True
+
+
+class TavilyBackend(SearchBackend):
+    """Tavily search (AI-optimized results)"""
+
+    name = "tavily"
+
+    def __init__(self, api_key: Optional[str] = None, search_depth: str = "advanced"):
+        self.api_key = api_key or os.getenv("TAVILY_API_KEY")
+        self.search_depth = search_depth
+        self._client = None
+
+    def _get_client(self):
+        """Get or create Tavily client"""
+        if self._client is None and self.api_key:
+            try:
+                from tavily import TavilyClient
+                self._client = TavilyClient(api_key=self.api_key)
+            except ImportError:
+                logger.warning("tavily-python not installed. Run: pip install tavily-python")
+                self._client = None
+        return self._client
+
+    async def search(self, query: str, max_results: int = 5) -> List[SearchResult]:
+        client = self._get_client()
+        if not client:
+            return []
+
+        # The Tavily client is blocking; run it off the event loop so
+        # queries actually overlap
+        response = await asyncio.to_thread(
+            client.search,
+            query=query,
+            search_depth=self.search_depth,
+            max_results=max_results,
+        )
+        return [
+            SearchResult(
+                title=item.get("title", ""),
+                url=item.get("url", ""),
+                content=item.get("content", ""),
+                score=item.get("score", 0.0),
+            )
+            for item in response.get("results", [])
+        ]
+
+    def is_available(self) -> bool:
+        return bool(self.api_key)
+
+
+class FixtureSearchBackend(SearchBackend):
+    """
+    Canned results for offline development and tests.
+
+    Fixtures map a query substring to a list of result dicts (title, url,
+    content, score); the first fixture contained in the query wins.
+    """
+
+    name = "fixture"
+
+    def __init__(
+        self,
+        fixtures: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        fixture_file: Optional[Path] = None,
+        delay_seconds: float = 0.0,
+    ):
+        self.fixtures = dict(fixtures or {})
+        if fixture_file:
+            self.fixtures.update(json.loads(Path(fixture_file).read_text(encoding="utf-8")))
+        self.delay = delay_seconds
+        self.queries: List[str] = []
+
+    async def search(self, query: str, max_results: int = 5) -> List[SearchResult]:
+        self.queries.append(query)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        lowered = query.lower()
+        for key, items in self.fixtures.items():
+            if key.lower() in lowered:
+                return [SearchResult(**item) for item in items[:max_results]]
+        return []
+
+
+# ===========================================
+# Research Cache
+# ===========================================
+
+CACHE_BUCKET_SECONDS = 86400  # Results are reused within the same UTC day
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    return " ".join(re.sub(r"[^\w\s$%-]", " ", query.lower()).split())
+
+
+class ResearchCache:
+    """
+    Persistent query-result cache.
+
+    Keyed by (normalized query, industry, day bucket); one JSON file per
+    entry, with an in-memory layer in front.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, bucket_seconds: int = CACHE_BUCKET_SECONDS):
+        self.cache_dir = cache_dir or Path(__file__).parent.parent / "data" / "research_cache"
+        self.bucket_seconds = bucket_seconds
+        self._memory: Dict[str, List[SearchResult]] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def key(self, query: str, industry: str, now: Optional[float] = None) -> str:
+        bucket = int((time.time() if now is None else now) // self.bucket_seconds)
+        raw = f"{normalize_query(query)}\0{industry.lower()}\0{bucket}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def get(self, query: str, industry: str, now: Optional[float] = None) -> Optional[List[SearchResult]]:
+        key = self.key(query, industry, now)
+        results = self._memory.get(key)
+        if results is None:
+            path = self.cache_dir / f"{key}.json"
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                results = [SearchResult(**item) for item in data["results"]]
+                self._memory[key] = results
+            except (OSError, ValueError, KeyError, TypeError):
+                self.stats["misses"] += 1
+                return None
+        self.stats["hits"] += 1
+        return list(results)
+
+    def put(self, query: str, industry: str, results: List[SearchResult], now: Optional[float] = None) -> None:
+        key = self.key(query, industry, now)
+        self._memory[key] = list(results)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "query": query,
+                "industry": industry,
+                "cached_at": datetime.utcnow().isoformat(),
+                "results": [asdict(r) for r in results],
+            }
+            (self.cache_dir / f"{key}.json").write_text(json.dumps(payload), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to persist research cache entry: {e}")
+
+    def prune(self, max_age_seconds: int = 7 * CACHE_BUCKET_SECONDS) -> int:
+        """Delete cache files older than max_age_seconds; returns count removed"""
+        if not self.cache_dir.exists():
+            return 0
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for path in self.cache_dir.glob("*.json"):
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        self._memory.clear()
+        return removed
+
+
+# ===========================================
+# Research Executor
+# ===========================================
+
+@dataclass
+class ResearchRun:
+    """Outcome of running a set of research queries"""
+    results: Dict[str, List[SearchResult]] = field(default_factory=dict)
+    cache_hits: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    timed_out: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+
+class ResearchExecutor:
+    """
+    Runs research queries concurrently under one overall deadline.
+
+    Cached queries are answered immediately; the rest run in parallel
+    (bounded by max_concurrency) and are reported as they complete.
+    Queries still running at the deadline are cancelled and count as
+    empty results.
+    """
+
+    def __init__(
+        self,
+        backend: SearchBackend,
+        cache: Optional[ResearchCache] = None,
+        max_results: int = 5,
+        deadline_seconds: float = 30.0,
+        max_concurrency: int = 8,
+    ):
+        self.backend = backend
+        self.cache = cache
+        self.max_results = max_results
+        self.deadline = deadline_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _search(self, query: str) -> List[SearchResult]:
+        async with self._semaphore:
+            return await self.backend.search(query, self.max_results)
+
+    async def stream(
+        self,
+        queries: Dict[str, str],
+        industry: str,
+        run: Optional[ResearchRun] = None,
+    ) -> AsyncIterator[Tuple[str, List[SearchResult]]]:
+        """Yield (query_type, results) as each query completes"""
+        run = run if run is not None else ResearchRun()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+
+        pending: Dict[asyncio.Task, Tuple[str, str]] = {}
+        for query_type, query in queries.items():
+            cached = self.cache.get(query, industry) if self.cache else None
+            if cached is not None:
+                run.cache_hits.append(query_type)
+                run.results[query_type] = cached
+                yield query_type, cached
+            else:
+                pending[asyncio.create_task(self._search(query))] = (query_type, query)
+
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    query_type, query = pending.pop(task)
+                    try:
+                        results = task.result()
+                    except Exception as e:
+                        logger.warning(f"Search failed for {query_type}: {e}")
+                        run.failed.append(query_type)
+                        results = []
+                    else:
+                        if self.cache:
+                            self.cache.put(query, industry, results)
+                    run.results[query_type] = results
+                    yield query_type, results
+        finally:
+            for task, (query_type, _) in pending.items():
+                task.cancel()
+                logger.warning(f"Search timeout for {query_type}")
+                run.timed_out.append(query_type)
+                run.results[query_type] = []
+
+    async def run(
+        self,
+        queries: Dict[str, str],
+        industry: str,
+        on_result: Optional[Callable[[str, List[SearchResult]], Awaitable[None]]] = None,
+    ) -> ResearchRun:
+        """Run all queries and collect the results"""
+        run = ResearchRun()
+        start = time.monotonic()
+        async for query_type, results in self.stream(queries, industry, run):
+            if on_result:
+                await on_result(query_type, results)
+        run.elapsed_seconds = time.monotonic() - start
+        return run
+
+
 class WebResearcher:
     """
     Real-time web research for domain expertise.
@@ -131,6 +421,9 @@ class WebResearcher:
         tavily_api_key: Optional[str] = None,
         max_results_per_query: int = 5,
         timeout_seconds: int = 30,
+        backend: Optional[SearchBackend] = None,
+        cache: Optional[ResearchCache] = None,
+        max_concurrency: int = 8,
     ):
         """
         Initialize the web researcher.
@@ -138,23 +431,23 @@ class WebResearcher:
         Args:
             tavily_api_key: Tavily API key (or set TAVILY_API_KEY env var)
             max_results_per_query: Maximum results per search query
-            timeout_seconds: Timeout for each search query
+            timeout_seconds: Overall deadline for all queries of one research run
+            backend: Search backend (default: Tavily)
+            cache: Query-result cache (default: on-disk cache in data/)
+            max_concurrency: Maximum queries in flight at once
         """
-        self.api_key = tavily_api_key or os.getenv("TAVILY_API_KEY")
+        self.backend = backend or TavilyBackend(api_key=tavily_api_key)
+        self.api_key = getattr(self.backend, "api_key", None)
         self.max_results = max_results_per_query
         self.timeout = timeout_seconds
-        self._client = None
-
-    async def _get_client(self):
-        """Get or create Tavily client"""
-        if self._client is None and self.api_key:
-            try:
-                from tavily import TavilyClient
-                self._client = TavilyClient(api_key=self.api_key)
-            except ImportError:
-                logger.warning("tavily-python not installed. Run: pip install tavily-python")
-                self._client = None
-        return self._client
+        self.cache = cache if cache is not None else ResearchCache()
+        self.executor = ResearchExecutor(
+            self.backend,
+            cache=self.cache,
+            max_results=max_results_per_query,
+            deadline_seconds=timeout_seconds,
+            max_concurrency=max_concurrency,
+        )
 
     def _generate_research_queries(
         self,
@@ -179,6 +472,15 @@ class WebResearcher:
         }
 
         # Add clarification-based queries
+        queries.update(self.clarification_queries(industry, clarifications))
+
+        return queries
+
+    def clarification_queries(self, industry: str, clarifications: Dict[str, str]) -> Dict[str, str]:
+        """Queries that depend on the user's clarification answers"""
+        industry_clean = industry.replace("-", " ")
+        queries = {}
+
         target_market = clarifications.get("target_market", "")
         if target_market:
             queries["target_market"] = f"{industry_clean} {target_market.lower()} customer needs"
@@ -195,39 +497,19 @@ class WebResearcher:
         search_depth: str = "advanced",
     ) -> List[SearchResult]:
         """
-        Execute a search using Tavily API.
+        Execute a single search with the configured backend.
 
         Args:
             query: Search query
-            search_depth: "basic" or "advanced" (advanced gives better results)
+            search_depth: Unused; kept for compatibility (set on TavilyBackend)
 
         Returns:
             List of SearchResult objects
         """
-        client = await self._get_client()
-        if not client:
-            return []
-
         try:
-            response = client.search(
-                query=query,
-                search_depth=search_depth,
-                max_results=self.max_results,
-            )
-
-            results = []
-            for item in response.get("results", []):
-                results.append(SearchResult(
-                    title=item.get("title", ""),
-                    url=item.get("url", ""),
-                    content=item.get("content", ""),
-                    score=item.get("score", 0.0),
-                ))
-
-            return results
-
+            return await self.backend.search(query, self.max_results)
         except Exception as e:
-            logger.warning(f"Tavily search failed for '{query}': {e}")
+            logger.warning(f"Search failed for '{query}': {e}")
             return []
 
     def _extract_trends(self, results: List[SearchResult]) -> List[str]:
@@ -365,36 +647,28 @@ class WebResearcher:
             DomainResearch with all gathered insights
         """
         clarifications = clarifications or {}
-        raw_results: Dict[str, List[SearchResult]] = {}
 
         # Generate queries
         queries = self._generate_research_queries(
             business_idea, industry, clarifications
         )
 
-        # Execute searches in parallel
+        # Execute searches in parallel under one deadline; cached queries
+        # return immediately
         if progress_callback:
             await progress_callback(f"Researching {industry} industry...")
 
-        search_tasks = []
-        for query_type, query in queries.items():
-            search_tasks.append(
-                (query_type, self._search_tavily(query))
-            )
+        async def on_result(query_type: str, results: List[SearchResult]) -> None:
+            if progress_callback:
+                await progress_callback(f"Completed: {query_type}")
 
-        # Gather results
-        for query_type, task in search_tasks:
-            try:
-                results = await asyncio.wait_for(task, timeout=self.timeout)
-                raw_results[query_type] = results
-                if progress_callback:
-                    await progress_callback(f"Completed: {query_type}")
-            except asyncio.TimeoutError:
-                logger.warning(f"Search timeout for {query_type}")
-                raw_results[query_type] = []
-            except Exception as e:
-                logger.warning(f"Search failed for {query_type}: {e}")
-                raw_results[query_type] = []
+        run = await self.executor.run(queries, industry, on_result=on_result)
+        raw_results = run.results
+
+        logger.info(
+            f"Executed {len(queries)} research queries in {run.elapsed_seconds:.1f}s "
+            f"({len(run.cache_hits)} cached, {len(run.timed_out)} timed out)"
+        )
 
         # Process results
         research = DomainResearch(
@@ -432,9 +706,33 @@ class WebResearcher:
 
         return research
 
+    async def extend_research(
+        self,
+        research: DomainResearch,
+        queries: Dict[str, str],
+        progress_callback: Optional[callable] = None,
+    ) -> DomainResearch:
+        """
+        Run extra queries on top of existing research.
+
+        Returns a copy of the research with the new raw results merged in
+        and its confidence recomputed; the original is left untouched.
+        """
+        async def on_result(query_type: str, results: List[SearchResult]) -> None:
+            if progress_callback:
+                await progress_callback(f"Completed: {query_type}")
+
+        run = await self.executor.run(queries, research.industry, on_result=on_result)
+
+        extended = copy.deepcopy(research)
+        extended.raw_results = {**research.raw_results, **run.results}
+        extended.queries_executed += len(queries)
+        extended.confidence_score = self._calculate_confidence(extended.raw_results)
+        return extended
+
     def is_available(self) -> bool:
-        """Check if web research is available (API key configured)"""
-        return bool(self.api_key)
+        """Check if web research is available (backend configured)"""
+        return self.backend.is_available()
 
 
 # Singleton instance
@@ -0,0 +1,293 @@
+"""
+Workflow Checkpoints
+
+Persists workflow state after every agent so a run interrupted by a crash,
+deploy or provider outage can resume without re-running (and re-paying
+for) the agents that already finished.
+
+Two kinds of records are kept:
+- Run checkpoints: the latest WorkflowState of a run, keyed by run ID
+- Node outputs: each agent's result, keyed by run ID and agent, and
+  indexed by a hash of the agent's inputs so identical work can be reused
+  across runs
+
+Backends:
+- SQLiteCheckpointStore: local file, no extra dependencies (default)
+- RedisCheckpointStore: shared across API instances (requires `redis`)
+
+Environment variables:
+- CHECKPOINT_DB_PATH: SQLite database file (default: ~/.codeweaver/checkpoints.db)
+- CHECKPOINT_REDIS_URL: use Redis instead of SQLite
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Outside the package so the database (and its -wal/-shm files) never lands in the source tree
+DEFAULT_DB_PATH = Path(os.path.expanduser("~")) / ".codeweaver" / "checkpoints.db"
+
+# Redis records expire after this long (a week)
+REDIS_TTL_SECONDS = 7 * 24 * 3600
+
+
+def node_input_hash(agent_id: str, inputs: Dict[str, Any]) -> str:
+    """Stable hash of an agent and everything it is given"""
+    payload = json.dumps({"agent": agent_id, "inputs": inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class WorkflowCheckpoint:
+    """Latest persisted state of a workflow run"""
+    run_id: str
+    workflow_type: str
+    status: str
+    state: Dict[str, Any]
+    updated_at: float
+
+    @property
+    def completed_agents(self) -> List[str]:
+        return list(self.state.get("completed_agents", []))
+
+    @property
+    def pending_agents(self) -> List[str]:
+        return list(self.state.get("pending_agents", []))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "workflow_type": self.workflow_type,
+            "status": self.status,
+            "completed_agents": self.completed_agents,
+            "pending_agents": self.pending_agents,
+            "errors": self.state.get("errors", []),
+            "updated_at": self.updated_at,
+        }
+
+
+class CheckpointStore(ABC):
+    """Interface for checkpoint backends"""
+
+    @abstractmethod
+    async def save_state(self, run_id: str, workflow_type: str, status: str, state: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    async def load_state(self, run_id: str) -> Optional[WorkflowCheckpoint]:
+        pass
+
+    @abstractmethod
+    async def save_node_output(
+        self,
+        run_id: str,
+        agent_id: str,
+        input_hash: str,
+        output: Dict[str, Any],
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def find_output(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        """Most recent stored output for an identical agent input, from any run"""
+        pass
+
+    @abstractmethod
+    async def delete_run(self, run_id: str) -> None:
+        pass
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    Checkpoints in a local SQLite database.
+
+    Writes are small and run in a worker thread so they don't block the
+    event loop.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file (default: $CHECKPOINT_DB_PATH, then DEFAULT_DB_PATH)
+        """
+        self.path = Path(path or os.environ.get("CHECKPOINT_DB_PATH") or DEFAULT_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    workflow_type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS node_outputs (
+                    run_id TEXT NOT NULL,
+                    agent_id TEXT NOT NULL,
+                    input_hash TEXT NOT NULL,
+                    output TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (run_id, agent_id)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_node_outputs_hash ON node_outputs (input_hash, created_at)"
+            )
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def save_state(self, run_id: str, workflow_type: str, status: str, state: Dict[str, Any]) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO runs (run_id, workflow_type, status, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (run_id, workflow_type, status, json.dumps(state, default=str), time.time()),
+        )
+
+    async def load_state(self, run_id: str) -> Optional[WorkflowCheckpoint]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT workflow_type, status, state, updated_at FROM runs WHERE run_id = ?",
+            (run_id,),
+        )
+        if not rows:
+            return None
+        workflow_type, status, state, updated_at = rows[0]
+        return WorkflowCheckpoint(run_id, workflow_type, status, json.loads(state), updated_at)
+
+    async def save_node_output(
+        self,
+        run_id: str,
+        agent_id: str,
+        input_hash: str,
+        output: Dict[str, Any],
+    ) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO node_outputs (run_id, agent_id, input_hash, output, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (run_id, agent_id, input_hash, json.dumps(output, default=str), time.time()),
+        )
+
+    async def find_output(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT output FROM node_outputs WHERE input_hash = ? ORDER BY created_at DESC LIMIT 1",
+            (input_hash,),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    async def delete_run(self, run_id: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM runs WHERE run_id = ?", (run_id,))
+        await asyncio.to_thread(self._execute, "DELETE FROM node_outputs WHERE run_id = ?", (run_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisCheckpointStore(CheckpointStore):
+    """
+    Checkpoints in Redis, shared by every API instance.
+
+    Records expire after ttl_seconds.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int = REDIS_TTL_SECONDS, prefix: str = "checkpoint"):
+        import redis.asyncio as redis  # Optional dependency
+
+        self._redis = redis.from_url(url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    async def save_state(self, run_id: str, workflow_type: str, status: str, state: Dict[str, Any]) -> None:
+        record = {
+            "workflow_type": workflow_type,
+            "status": status,
+            "state": state,
+            "updated_at": time.time(),
+        }
+        await self._redis.set(self._key("run", run_id), json.dumps(record, default=str), ex=self.ttl_seconds)
+
+    async def load_state(self, run_id: str) -> Optional[WorkflowCheckpoint]:
+        raw = await self._redis.get(self._key("run", run_id))
+        if raw is None:
+            return None
+        record = json.loads(raw)
+        return WorkflowCheckpoint(
+            run_id, record["workflow_type"], record["status"], record["state"], record["updated_at"]
+        )
+
+    async def save_node_output(
+        self,
+        run_id: str,
+        agent_id: str,
+        input_hash: str,
+        output: Dict[str, Any],
+    ) -> None:
+        raw = json.dumps(output, default=str)
+        pipe = self._redis.pipeline()
+        pipe.set(self._key("node", run_id, agent_id), raw, ex=self.ttl_seconds)
+        pipe.set(self._key("output", input_hash), raw, ex=self.ttl_seconds)
+        pipe.sadd(self._key("nodes", run_id), agent_id)
+        pipe.expire(self._key("nodes", run_id), self.ttl_seconds)
+        await pipe.execute()
+
+    async def find_output(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(self._key("output", input_hash))
+        return json.loads(raw) if raw is not None else None
+
+    async def delete_run(self, run_id: str) -> None:
+        agents = await self._redis.smembers(self._key("nodes", run_id))
+        keys = [self._key("run", run_id), self._key("nodes", run_id)]
+        keys += [self._key("node", run_id, agent_id) for agent_id in agents]
+        await self._redis.delete(*keys)
+
+
+# Global instance
+_store: Optional[CheckpointStore] = None
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """
+    Get the global checkpoint store.
+
+    Uses Redis when CHECKPOINT_REDIS_URL is set and the redis package is
+    installed, SQLite otherwise.
+    """
+    global _store
+    if _store is None:
+        redis_url = os.environ.get("CHECKPOINT_REDIS_URL")
+        if redis_url:
+            try:
+                _store = RedisCheckpointStore(redis_url)
+                logger.info("Using Redis workflow checkpoints")
+            except ImportError:
+                logger.warning("redis not installed. Using SQLite checkpoints. Run: pip install redis")
+        if _store is None:
+            _store = SQLiteCheckpointStore()
+    return _store
@@ -2,7 +2,9 @@
 Workflow Templates
 
 Defines agent sequences for different types of code generation workflows.
-Each workflow specifies which agents run and in what order.
+Each workflow specifies which agents run and in what order, and optionally
+which agents' outputs each agent consumes so independent agents can run
+concurrently.
 """
 
 from typing import Dict, List, Optional, Any
@@ -145,6 +147,47 @@ class WorkflowConfig(BaseModel):
         default=None,
         description="Groups of agents that can run in parallel"
     )
+    dependencies: Optional[Dict[str, List[str]]] = Field(
+        default=None,
+        description="Agent ID -> agent IDs whose output it consumes"
+    )
+
+    def agent_dependencies(self) -> Dict[str, List[str]]:
+        """
+        Input dependencies of every agent in the workflow.
+
+        Uses the declared dependencies when set. Otherwise the workflow runs
+        in stages: consecutive agents of the same parallel group form one
+        stage, and each stage depends on the stage before it.
+        """
+        if self.dependencies is not None:
+            unknown = {
+                dep
+                for agent_id, deps in self.dependencies.items()
+                for dep in [agent_id, *deps]
+                if dep not in self.agent_ids
+            }
+            if unknown:
+                raise ValueError(f"Dependencies reference agents outside the workflow: {sorted(unknown)}")
+            return {agent_id: list(self.dependencies.get(agent_id, [])) for agent_id in self.agent_ids}
+
+        group_of: Dict[str, int] = {}
+        for index, group in enumerate(self.parallel_groups or []):
+            for agent_id in group:
+                group_of.setdefault(agent_id, index)
+
+        dependencies: Dict[str, List[str]] = {}
+        previous_stage: List[str] = []
+        stage: List[str] = []
+        for agent_id in self.agent_ids:
+            if stage and agent_id in group_of and group_of.get(stage[0]) == group_of[agent_id]:
+                stage.append(agent_id)
+            else:
+                if stage:
+                    previous_stage = stage
+                stage = [agent_id]
+            dependencies[agent_id] = list(previous_stage)
+        return dependencies
 
 
 # Workflow metadata
@@ -160,7 +203,22 @@ WORKFLOW_CONFIGS: Dict[str, WorkflowConfig] = {
             ["Ideas", "Designs"],  # Can run together (independent creative tasks)
             ["BackendEngineer", "FrontendEngineer"],  # Can run together (code generation)
             ["QA", "SecurityEngineer"],  # Can run together (code review)
-        ]
+        ],
+        dependencies={
+            "PM": [],
+            "Memory": ["PM"],
+            "Research": ["PM"],
+            "Ideas": ["PM", "Memory", "Research"],
+            "Designs": ["PM", "Memory", "Research"],
+            "Senior": ["PM", "Research", "Ideas"],
+            "DatabaseAdmin": ["Senior"],
+            "BackendEngineer": ["Senior", "DatabaseAdmin"],
+            "FrontendEngineer": ["Designs", "Senior"],  # Doesn't wait on the schema
+            "QA": ["BackendEngineer", "FrontendEngineer"],
+            "SecurityEngineer": ["BackendEngineer", "FrontendEngineer"],
+            "DevOps": ["BackendEngineer", "FrontendEngineer"],  # Runs alongside the reviews
+            "Verifier": ["QA", "SecurityEngineer", "DevOps"],
+        },
     ),
     "mvp_sprint": WorkflowConfig(
         type=WorkflowType.MVP_SPRINT,
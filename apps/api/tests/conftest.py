@@ -21,6 +21,18 @@ from unittest.mock import AsyncMock, MagicMock
 # Common Fixtures
 # ============================================================================
 
+@pytest.fixture(scope="session", autouse=True)
+def isolated_preset_data(tmp_path_factory):
+    """Keep learned presets and feedback written during tests out of src/data."""
+    from src.services.prompts import preset_quality, smart_presets
+
+    data_dir = tmp_path_factory.mktemp("data")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(preset_quality, "DATA_DIR", data_dir)
+        mp.setattr(smart_presets, "PRESET_CACHE_DIR", data_dir / "preset_cache")
+        yield data_dir
+
+
 @pytest.fixture
 def sample_description():
     """Sample project description for testing."""
@@ -0,0 +1,158 @@
+"""
+Tests for rolling agent context selection
+
+Tests cover:
+- Structured summaries of agent outputs
+- Declared inputs in full, other upstream outputs summarized by relevance
+- Per-agent token budget (drop, summarize, truncate)
+- Before/after context sizes reported by the orchestrator
+"""
+
+import asyncio
+
+import pytest
+
+from src.services import agent_executor as agent_executor_module
+from src.services.agent_context import AgentContextManager, summarize_output
+from src.services.agent_executor import AgentResult
+from src.services.orchestrator import AgentOrchestrator
+from src.services.workflows import WorkflowConfig, WorkflowType
+
+
+def big_output(name, n=60):
+    return {
+        "summary": f"{name} details " * 20,
+        "items": [{"name": f"{name}-{i}", "notes": "lorem ipsum " * 30} for i in range(n)],
+    }
+
+
+class TestSummarizeOutput:
+    """Tests for summarize_output"""
+
+    def test_structured_summary(self):
+        output = {
+            "title": "Sprint plan",
+            "tasks": [{"name": f"Task {i}", "body": "x" * 500} for i in range(8)],
+            "meta": {"owner": "PM", "estimate": 3},
+            "empty": [],
+        }
+
+        summary = summarize_output(output)
+
+        assert "- title: Sprint plan" in summary
+        assert "- tasks: 8 items: Task 0; Task 1; Task 2; Task 3; Task 4, ..." in summary
+        assert "- meta: {owner, estimate}" in summary
+        assert "empty" not in summary
+        assert "x" * 100 not in summary
+
+    def test_short_text_unchanged(self):
+        assert summarize_output("PM output") == "PM output"
+
+
+class TestAgentContextManager:
+    """Tests for AgentContextManager.select"""
+
+    def test_declared_inputs_full_others_summarized(self):
+        manager = AgentContextManager(budget_tokens=100000)
+        manager.add("Research", big_output("research"))
+        manager.add("Backend", big_output("backend"))
+
+        selection = manager.select("QA", declared_inputs=["Backend"], upstream=["Research", "Backend"])
+
+        assert selection.outputs["Backend"] == big_output("backend")
+        assert selection.outputs["Research"].startswith("[Summary]")
+        assert selection.full == ["Backend"]
+        assert selection.summarized == ["Research"]
+        assert selection.sent_tokens < selection.full_tokens
+
+    def test_drops_least_relevant_first(self):
+        manager = AgentContextManager(budget_tokens=100000)
+        manager.add("Dev", big_output("dev"))
+        manager.add("Database", {"schema": "database tables indexes migrations " * 5})
+        manager.add("Marketing", {"plan": "social campaign branding launch " * 5})
+        manager.budget_tokens = manager._artifacts["Dev"].text_tokens + 60
+
+        selection = manager.select(
+            "DBA",
+            declared_inputs=["Dev"],
+            upstream=["Database", "Marketing", "Dev"],
+            query="Database administrator designing tables and migrations",
+        )
+
+        assert selection.dropped == ["Marketing"]
+        assert "Database" in selection.outputs
+        assert selection.sent_tokens <= manager.budget_tokens
+
+    def test_declared_inputs_summarized_then_truncated_to_budget(self):
+        manager = AgentContextManager(budget_tokens=40)
+        manager.add("Backend", big_output("backend"))
+
+        selection = manager.select("QA", declared_inputs=["Backend"], upstream=["Backend"])
+
+        assert selection.truncated == ["Backend"]
+        assert selection.sent_tokens <= 40
+        assert isinstance(selection.outputs["Backend"], str)
+
+    def test_report_totals(self):
+        manager = AgentContextManager(budget_tokens=500)
+        manager.add("PM", big_output("pm"))
+        manager.select("Dev", declared_inputs=["PM"], upstream=["PM"])
+
+        report = manager.report()
+
+        assert report["agents"]["Dev"]["full_tokens"] == report["full_tokens"]
+        assert report["sent_tokens"] <= 500
+        assert report["saved_tokens"] == report["full_tokens"] - report["sent_tokens"]
+
+
+class TestOrchestratorContext:
+    """Context selection inside AgentOrchestrator"""
+
+    @pytest.mark.asyncio
+    async def test_budget_applied_and_reported(self, monkeypatch):
+        contexts = {}
+        events = []
+
+        async def fake_execute_agent(agent_id, context, on_progress=None):
+            contexts[agent_id] = context
+            await asyncio.sleep(0)
+            return AgentResult(agent_id=agent_id, success=True, output=big_output(agent_id, n=10))
+
+        async def collect(event):
+            events.append(event)
+
+        monkeypatch.setattr(agent_executor_module, "execute_agent", fake_execute_agent)
+        workflow = WorkflowConfig(
+            type=WorkflowType.FULL_APP,
+            name="Test",
+            description="Test workflow",
+            agent_ids=["PM", "Research", "Senior", "QA"],
+            dependencies={"Research": ["PM"], "Senior": ["Research"], "QA": ["Senior"]},
+        )
+        state = {
+            "project_id": "p1",
+            "description": "A todo app",
+            "platform": "web",
+            "workflow_type": "test",
+            "current_agent": "",
+            "completed_agents": [],
+            "pending_agents": list(workflow.agent_ids),
+            "agent_results": {},
+            "files": [],
+            "errors": [],
+            "started_at": "",
+            "status": "running",
+        }
+
+        final = await AgentOrchestrator(
+            event_callback=collect, context_budget_tokens=3000
+        )._execute_agent_dag(state, workflow)
+
+        qa = contexts["QA"].previous_outputs
+        assert qa["Senior"] == big_output("Senior", n=10)
+        assert all(qa[a].startswith("[Summary]") for a in qa if a != "Senior")
+        report = next(e for e in events if e.type == "workflow_context").data
+        assert "agents" not in report
+        assert report["per_agent"]["QA"]["sent_tokens"] < report["per_agent"]["QA"]["full_tokens"]
+        assert all(a["sent_tokens"] <= 3000 for a in report["per_agent"].values())
+        assert final["context_report"]["sent_tokens"] == report["sent_tokens"]
@@ -0,0 +1,153 @@
+"""
+Tests for parallel agent execution
+
+Tests cover:
+- Concurrency limit and priority ordering
+- Per-agent deadlines
+- Best-effort and fail-fast group policies
+- Results streamed as each agent finishes
+- Dependencies: agents start as soon as what they wait for has finished
+"""
+
+import asyncio
+
+import pytest
+
+from src.services import agent_executor
+from src.services.agent_executor import (
+    AgentContext,
+    AgentResult,
+    GroupPolicy,
+    execute_agents_parallel,
+)
+
+
+@pytest.fixture
+def fake_agents(monkeypatch):
+    """Timed agent stubs; agents in `fail` return a failed result"""
+    calls = {"log": [], "delays": {}, "fail": set(), "in_flight": 0, "peak": 0}
+
+    async def fake_execute_agent(agent_id, context, on_progress=None):
+        calls["log"].append(f"start:{agent_id}")
+        calls["in_flight"] += 1
+        calls["peak"] = max(calls["peak"], calls["in_flight"])
+        try:
+            await asyncio.sleep(calls["delays"].get(agent_id, 0.01))
+        finally:
+            calls["in_flight"] -= 1
+        calls["log"].append(f"end:{agent_id}")
+        success = agent_id not in calls["fail"]
+        return AgentResult(agent_id=agent_id, success=success, error=None if success else "bad output")
+
+    monkeypatch.setattr(agent_executor, "execute_agent", fake_execute_agent)
+    return calls
+
+
+@pytest.fixture
+def context():
+    return AgentContext(project_id="p1", description="A todo app")
+
+
+class TestExecuteAgentsParallel:
+    """Tests for execute_agents_parallel"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_priority(self, fake_agents, context):
+        results = await execute_agents_parallel(
+            ["a", "b", "c", "d"],
+            context,
+            max_concurrency=2,
+            priorities={"a": 3, "b": 2, "c": 0, "d": 1},
+        )
+
+        starts = [entry for entry in fake_agents["log"] if entry.startswith("start")]
+        assert starts == ["start:c", "start:d", "start:b", "start:a"]
+        assert fake_agents["peak"] == 2
+        assert list(results) == ["a", "b", "c", "d"]
+        assert all(r.success for r in results.values())
+
+    @pytest.mark.asyncio
+    async def test_deadline_fails_only_slow_agent(self, fake_agents, context):
+        fake_agents["delays"] = {"slow": 1.0}
+
+        results = await execute_agents_parallel(
+            ["fast", "slow"], context, timeout_seconds=5, deadlines={"slow": 0.05}
+        )
+
+        assert results["fast"].success
+        assert not results["slow"].success
+        assert results["slow"].error == "Timed out after 0.05s"
+        assert fake_agents["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_best_effort_runs_everything(self, fake_agents, context):
+        fake_agents["fail"] = {"a"}
+
+        results = await execute_agents_parallel(["a", "b", "c"], context, max_concurrency=1)
+
+        assert [r.success for r in results.values()] == [False, True, True]
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_cancels_siblings(self, fake_agents, context):
+        fake_agents["fail"] = {"required"}
+        fake_agents["delays"] = {"required": 0.01, "running": 1.0}
+
+        results = await execute_agents_parallel(
+            ["required", "running", "waiting"],
+            context,
+            max_concurrency=2,
+            policy=GroupPolicy.FAIL_FAST,
+        )
+
+        assert results["required"].error == "bad output"
+        for agent_id in ("running", "waiting"):
+            assert results[agent_id].error_details == {"cancelled_by": "required"}
+        assert "start:waiting" not in fake_agents["log"]
+        assert fake_agents["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_ignores_optional_agents(self, fake_agents, context):
+        fake_agents["fail"] = {"optional"}
+
+        results = await execute_agents_parallel(
+            ["optional", "core"],
+            context,
+            policy=GroupPolicy.FAIL_FAST,
+            required=["core"],
+        )
+
+        assert not results["optional"].success
+        assert results["core"].success
+
+    @pytest.mark.asyncio
+    async def test_streams_results_as_agents_finish(self, fake_agents, context):
+        fake_agents["delays"] = {"slow": 0.05, "fast": 0.01}
+        completed = []
+
+        async def on_complete(agent_id, result):
+            completed.append((agent_id, "end:slow" in fake_agents["log"]))
+
+        await execute_agents_parallel(["slow", "fast"], context, on_agent_complete=on_complete)
+
+        assert completed == [("fast", False), ("slow", True)]
+
+    @pytest.mark.asyncio
+    async def test_dependencies_form_a_ready_set(self, fake_agents, context):
+        fake_agents["delays"] = {"slow": 0.05}
+
+        results = await execute_agents_parallel(
+            ["slow", "fast", "after_fast", "after_both"],
+            context,
+            dependencies={"after_fast": ["fast"], "after_both": ["slow", "after_fast"]},
+        )
+
+        log = fake_agents["log"]
+        # after_fast doesn't wait for the unrelated slow agent
+        assert log.index("start:after_fast") < log.index("end:slow")
+        assert log.index("start:after_both") > log.index("end:slow")
+        assert all(r.success for r in results.values())
+
+    @pytest.mark.asyncio
+    async def test_dependency_cycle_rejected(self, fake_agents, context):
+        with pytest.raises(ValueError, match="cannot be satisfied"):
+            await execute_agents_parallel(["a", "b"], context, dependencies={"a": ["b"], "b": ["a"]})
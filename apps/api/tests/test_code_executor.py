@@ -0,0 +1,272 @@
+"""
+Tests for the code execution sandbox pool
+
+Tests cover:
+- Sandbox reuse and reset between executions
+- Recycling after max_uses and on policy violations
+- Dropping privileges to an unprivileged sandbox user
+- CodeExecutor / TestRunner integration with the pool
+- Dependency layer caching
+- Host dependency installs opt-in, offline and wheels only
+"""
+
+import os
+import sys
+
+import pytest
+
+from src.ai.code_executor import (
+    CodeExecutor,
+    DependencyCache,
+    ExecutionConfig,
+    ExecutionStatus,
+    Language,
+    MultiFileExecutor,
+    Sandbox,
+    SandboxPool,
+    SubprocessSandbox,
+    get_dependency_cache,
+)
+from src.ai.code_executor import TestRunner as CodeTestRunner
+
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32",
+    reason="Subprocess sandbox relies on POSIX rlimits"
+)
+
+
+@pytest.fixture
+async def pool():
+    pool = SandboxPool(backend="subprocess", max_size=2, max_uses=3)
+    yield pool
+    await pool.close()
+
+
+@pytest.fixture
+def executor(pool):
+    executor = CodeExecutor(use_docker=False, pool=pool)
+    return executor
+
+
+class TestSandboxPool:
+    """Tests for SandboxPool with the subprocess backend"""
+
+    @pytest.mark.asyncio
+    async def test_warm_prestarts_sandboxes(self, pool):
+        started = await pool.warm(Language.PYTHON, count=2)
+
+        assert started == 2
+        assert pool.get_stats()["idle"] == 2
+
+    @pytest.mark.asyncio
+    async def test_sandbox_reused_and_reset(self, executor, pool):
+        code = "import os\nprint(sorted(os.listdir('.')))\nopen('leftover.txt', 'w').write('x')"
+
+        first = await executor.execute(code, Language.PYTHON)
+        second = await executor.execute(code, Language.PYTHON)
+
+        assert first.is_success and second.is_success
+        # The file written by the first run must not be visible to the second
+        assert "leftover.txt" not in second.stdout
+        stats = pool.get_stats()
+        assert stats["created"] == 1
+        assert stats["reused"] == 1
+
+    @pytest.mark.asyncio
+    async def test_recycled_after_max_uses(self, executor, pool):
+        for _ in range(3):
+            await executor.execute("print('ok')", Language.PYTHON)
+
+        stats = pool.get_stats()
+        assert stats["recycled"] == 1
+        assert stats["idle"] == 0
+
+    @pytest.mark.asyncio
+    async def test_timeout_recycles_sandbox(self, executor, pool):
+        result = await executor.execute(
+            "while True:\n    pass",
+            Language.PYTHON,
+            ExecutionConfig(timeout_seconds=1)
+        )
+
+        assert result.status == ExecutionStatus.TIMEOUT
+        stats = pool.get_stats()
+        assert stats["violations"] == 1
+        assert stats["recycled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_output_flood_is_violation(self, executor, pool):
+        result = await executor.execute(
+            "print('a' * 5000)",
+            Language.PYTHON,
+            ExecutionConfig(max_output_size=1000)
+        )
+
+        assert result.status == ExecutionStatus.RESOURCE_LIMIT
+        assert len(result.stdout) == 1000
+        assert pool.get_stats()["recycled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_path_escape_rejected(self, pool):
+        async with pool.sandbox(Language.PYTHON, ExecutionConfig()) as sandbox:
+            assert isinstance(sandbox, SubprocessSandbox)
+            with pytest.raises(ValueError):
+                sandbox.write_files({"../escape.py": "print(1)"})
+
+    def test_sandbox_is_abstract(self):
+        with pytest.raises(TypeError):
+            Sandbox(Language.PYTHON, ExecutionConfig())
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(
+        sys.platform == "win32" or os.geteuid() != 0,
+        reason="Dropping privileges needs root"
+    )
+    async def test_runs_as_sandbox_user(self):
+        pool = SandboxPool(backend="subprocess", sandbox_user="nobody")
+        executor = CodeExecutor(use_docker=False, pool=pool)
+        try:
+            result = await executor.execute(
+                "id -u; echo data > out.txt && cat out.txt",
+                Language.BASH,
+                # unshare -r would map the user to root inside its namespace
+                ExecutionConfig(allow_file_write=True, allow_network=True)
+            )
+        finally:
+            await pool.close()
+
+        assert result.is_success, result.stderr
+        assert result.stdout.split() == ["65534", "data"]
+
+
+class TestPooledTestRunner:
+    """TestRunner sharing a pooled executor"""
+
+    @pytest.mark.asyncio
+    async def test_run_tests_through_pool(self, executor, pool):
+        runner = CodeTestRunner(executor)
+
+        result = await runner.run_tests(
+            code="def add(a, b): return a + b",
+            tests="def test_add(): assert add(1, 2) == 3",
+            language=Language.PYTHON
+        )
+
+        assert result.is_success
+        assert result.return_value == {"passed": 1, "failed": 0, "total": 1}
+        assert pool.get_stats()["created"] == 1
+
+
+def _write_wheel(mirror, name="cwdemo", version="1.0", body="VALUE = 42\n"):
+    """Build a minimal pure-Python wheel so installs work offline"""
+    import zipfile
+
+    dist = f"{name}-{version}.dist-info"
+    with zipfile.ZipFile(mirror / f"{name}-{version}-py3-none-any.whl", "w") as wheel:
+        wheel.writestr(f"{name}/__init__.py", body)
+        wheel.writestr(f"{dist}/METADATA", f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n")
+        wheel.writestr(
+            f"{dist}/WHEEL",
+            "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n"
+        )
+        wheel.writestr(f"{dist}/RECORD", "")
+
+
+class TestDependencyCache:
+    """Tests for the content-addressed dependency cache"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        mirror = tmp_path / "mirror"
+        mirror.mkdir()
+        _write_wheel(mirror)
+        return DependencyCache(cache_dir=tmp_path / "deps", mirror_dir=mirror, allow_host_install=True)
+
+    def test_layer_key_tracks_manifest(self, cache):
+        key = cache.layer_key({"requirements.txt": "cwdemo==1.0"}, Language.PYTHON)
+
+        assert key == cache.layer_key({"requirements.txt": "cwdemo==1.0", "main.py": "x"}, Language.PYTHON)
+        assert key != cache.layer_key({"requirements.txt": "cwdemo==2.0"}, Language.PYTHON)
+        assert cache.layer_key({"main.py": "print(1)"}, Language.PYTHON) is None
+
+    @pytest.mark.asyncio
+    async def test_repeat_runs_skip_install(self, cache):
+        executor = MultiFileExecutor(CodeExecutor(use_docker=False), dependency_cache=cache)
+        files = {
+            "main.py": "import cwdemo\nprint(cwdemo.VALUE)",
+            "requirements.txt": "cwdemo==1.0\n",
+        }
+
+        first = await executor.execute_project(files, Language.PYTHON)
+        second = await executor.execute_project(files, Language.PYTHON)
+
+        assert first.is_success and first.stdout.strip() == "42"
+        assert second.is_success and second.stdout.strip() == "42"
+        stats = cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["layers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_layer_shared_with_pooled_test_runner(self, cache, pool):
+        runner = CodeTestRunner(CodeExecutor(use_docker=False, pool=pool), dependency_cache=cache)
+
+        result = await runner.run_tests(
+            code="import cwdemo",
+            tests="def test_value(): assert cwdemo.VALUE == 42",
+            language=Language.PYTHON,
+            dependencies={"requirements.txt": "cwdemo==1.0\n"}
+        )
+
+        assert result.is_success
+        assert cache.get_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_install_falls_back(self, cache):
+        executor = MultiFileExecutor(CodeExecutor(use_docker=False), dependency_cache=cache)
+
+        result = await executor.execute_project(
+            {"main.py": "print('still runs')", "requirements.txt": "not-in-mirror==9.9\n"},
+            Language.PYTHON
+        )
+
+        assert result.is_success
+        assert cache.get_stats()["failures"] == 1
+        assert cache.get_stats()["layers"] == 0
+
+    @pytest.mark.asyncio
+    async def test_host_install_is_opt_in(self, tmp_path):
+        mirror = tmp_path / "mirror"
+        mirror.mkdir()
+        _write_wheel(mirror)
+        cache = DependencyCache(cache_dir=tmp_path / "deps", mirror_dir=mirror, allow_host_install=False)
+        executor = MultiFileExecutor(CodeExecutor(use_docker=False), dependency_cache=cache)
+
+        result = await executor.execute_project(
+            {"main.py": "print('no deps')", "requirements.txt": "cwdemo==1.0\n"},
+            Language.PYTHON
+        )
+
+        assert result.is_success
+        assert cache.get_stats()["failures"] == 1
+        assert not (tmp_path / "deps").exists()
+
+    @pytest.mark.asyncio
+    async def test_host_install_needs_mirror(self, tmp_path):
+        cache = DependencyCache(cache_dir=tmp_path / "deps", allow_host_install=True)
+
+        with pytest.raises(RuntimeError, match="package mirror"):
+            await cache.ensure({"requirements.txt": "cwdemo==1.0\n"}, Language.PYTHON)
+
+    def test_host_install_accepts_wheels_only(self, cache):
+        cmd = cache._install_command(Language.PYTHON, "/layer", str(cache.mirror_dir), {})
+
+        assert "--only-binary=:all:" in cmd
+        assert "--no-index" in cmd
+
+    def test_executors_share_one_cache(self):
+        executor = CodeExecutor(use_docker=False)
+
+        assert MultiFileExecutor(executor).dependency_cache is CodeTestRunner(executor).dependency_cache
+        assert get_dependency_cache(False) is MultiFileExecutor(executor).dependency_cache
@@ -0,0 +1,166 @@
+"""
+Tests for the generated-project validator
+
+Tests cover:
+- Content-hash caching of per-file and project-level checks
+- Concurrent validation matching serial validation
+- Batched LLM fix rounds that re-validate only changed files
+"""
+
+import json
+
+import pytest
+
+from src.services import code_validator as code_validator_module
+from src.services.code_validator import (
+    CodeValidator,
+    build_fix_prompt,
+    parse_fix_response,
+    validate_and_fix_async,
+)
+
+
+PACKAGE_JSON = json.dumps({
+    "name": "app",
+    "scripts": {"dev": "next dev"},
+    "dependencies": {"next": "13.5.6", "react": "18.2.0", "react-dom": "18.2.0"},
+})
+TSCONFIG = json.dumps({"compilerOptions": {"paths": {"@/*": ["./src/*"]}}})
+
+BROKEN_LAYOUT = (
+    "'use client'\n"
+    "export const metadata = { title: 'App' }\n"
+    "export default function Layout({ children }) { return children }\n"
+)
+BROKEN_PAGE = (
+    "'use client'\n"
+    "export const metadata = { title: 'Home' }\n"
+    "export default function Page() { return <main /> }\n"
+)
+
+
+def _project(**overrides):
+    files = {
+        "package.json": PACKAGE_JSON,
+        "tsconfig.json": TSCONFIG,
+        "src/app/layout.tsx": "export default function Layout({ children }) { return children }\n",
+        "src/app/page.tsx": "export default function Page() { return <main /> }\n",
+        "src/components/Button.tsx": "export function Button() { return <button /> }\n",
+    }
+    files.update(overrides)
+    return files
+
+
+@pytest.fixture
+def validator(monkeypatch):
+    validator = CodeValidator()
+    monkeypatch.setattr(code_validator_module, "_validator", validator)
+    return validator
+
+
+def _codes(result):
+    return [(i.file_path, i.code) for i in result.all_issues]
+
+
+class TestCaching:
+    """Per-file results are reused for unchanged content"""
+
+    def test_unchanged_files_not_rechecked(self, validator):
+        files = _project()
+        validator.validate_project(files)
+        assert validator.cache_stats == {"hits": 0, "misses": 3}
+
+        files["src/app/page.tsx"] = "export default function Page() { return <div /> }\n"
+        validator.validate_project(files)
+
+        assert validator.cache_stats == {"hits": 2, "misses": 4}
+
+    def test_cached_result_matches_uncached(self, validator):
+        files = _project(**{"src/app/page.tsx": BROKEN_PAGE})
+
+        first = validator.validate_project(files)
+        second = validator.validate_project(files)
+
+        assert _codes(second) == _codes(first)
+        assert _codes(first) == _codes(CodeValidator().validate_project(files))
+
+    def test_project_checks_follow_imports(self, validator):
+        files = _project(**{"src/app/page.tsx": "import dayjs from 'dayjs'\n"})
+
+        result = validator.validate_project(files)
+
+        assert ("package.json", "MISSING_DEPENDENCY") in _codes(result)
+
+
+class TestAsyncValidation:
+    """Concurrent validation"""
+
+    @pytest.mark.asyncio
+    async def test_async_matches_sync(self, validator):
+        files = _project(**{"src/app/page.tsx": BROKEN_PAGE, "src/app/layout.tsx": BROKEN_LAYOUT})
+
+        result = await validator.validate_project_async(files, max_concurrency=2)
+
+        assert _codes(result) == _codes(CodeValidator().validate_project(files))
+
+
+class TestFixLoop:
+    """validate_and_fix_async with a batched LLM fix function"""
+
+    def test_fix_prompt_round_trip(self, validator):
+        files = _project(**{"src/app/page.tsx": BROKEN_PAGE})
+        result = validator.validate_project(files)
+
+        prompt = build_fix_prompt(files, result, ["src/app/page.tsx"])
+
+        assert "METADATA_IN_CLIENT" in prompt
+        assert BROKEN_PAGE in prompt
+        assert parse_fix_response("no file blocks") == {}
+
+    def test_parse_fix_response_keeps_adjacent_blocks_apart(self):
+        response = (
+            "Here you go:\n\n"
+            "### src/app/page.tsx\n```tsx\nconst a = { b: 1 }\n```\n\n"
+            "### src/app/layout.tsx\n```tsx\nexport default function Layout() {}\n```\n"
+            "Done."
+        )
+
+        assert parse_fix_response(response) == {
+            "src/app/page.tsx": "const a = { b: 1 }\n",
+            "src/app/layout.tsx": "export default function Layout() {}\n",
+        }
+
+    @pytest.mark.asyncio
+    async def test_failing_files_fixed_in_one_call(self, validator):
+        prompts = []
+
+        async def fix(prompt):
+            prompts.append(prompt)
+            return {
+                "src/app/layout.tsx": BROKEN_LAYOUT.replace("'use client'\n", ""),
+                "src/app/page.tsx": BROKEN_PAGE.replace("'use client'\n", ""),
+                "src/components/Button.tsx": "should be ignored",
+            }
+
+        files = _project(**{"src/app/page.tsx": BROKEN_PAGE, "src/app/layout.tsx": BROKEN_LAYOUT})
+        fixed, result = await validate_and_fix_async(files, fix_fn=fix)
+
+        assert result.is_valid
+        assert len(prompts) == 1
+        assert "src/app/layout.tsx" in prompts[0] and "src/app/page.tsx" in prompts[0]
+        assert fixed["src/components/Button.tsx"] == files["src/components/Button.tsx"]
+        assert _codes(result) == _codes(CodeValidator().validate_project(fixed))
+
+    @pytest.mark.asyncio
+    async def test_stops_when_fix_makes_no_progress(self, validator):
+        calls = []
+
+        async def fix(prompt):
+            calls.append(prompt)
+            return {}
+
+        files = _project(**{"src/app/page.tsx": BROKEN_PAGE})
+        _, result = await validate_and_fix_async(files, fix_fn=fix, max_rounds=3)
+
+        assert not result.is_valid
+        assert len(calls) == 1
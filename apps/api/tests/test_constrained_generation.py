@@ -0,0 +1,297 @@
+"""
+Tests for token-level constrained generation
+
+Tests cover:
+- Regex compilation to a character FSM (agreement with re.fullmatch)
+- JSON schema to regex translation
+- Token masking over a deterministic vocabulary
+- Constrained decoding through MockProvider without validation retries
+- Structured output mode for providers that support it
+- Strict-mode schema normalization for OpenAI-compatible providers
+- Token FSM cache keyed on vocabulary contents
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from src.ai.constrained_generation import (
+    EOS_TOKEN,
+    REGEX_PATTERNS,
+    ConstrainedGenerator,
+    GenerationConfig,
+    OutputFormat,
+    RegexFSM,
+    TokenFSM,
+    schema_to_regex,
+)
+from src.ai.structured_output import TaskPlan
+from src.llm.providers import (
+    LLMProvider,
+    LLMResponse,
+    MockProvider,
+    OpenAIProvider,
+    strict_json_schema,
+)
+
+
+class Address(BaseModel):
+    city: str
+    zip_code: Optional[str] = None
+
+
+class Customer(BaseModel):
+    name: str
+    tier: str = "free"
+    address: Address
+    previous: List[Address] = []
+
+
+def assert_strict(node):
+    """Every object closed and listing all of its properties as required"""
+    if isinstance(node, dict):
+        assert "$ref" not in node
+        if "properties" in node:
+            assert node["additionalProperties"] is False
+            assert node["required"] == list(node["properties"])
+        for value in node.values():
+            assert_strict(value)
+    elif isinstance(node, list):
+        for value in node:
+            assert_strict(value)
+
+
+USER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "age": {"type": "integer"},
+        "role": {"enum": ["admin", "member"]},
+        "tags": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["name", "age"],
+}
+
+
+class TestRegexFSM:
+    """Tests for RegexFSM"""
+
+    @pytest.mark.parametrize("name,samples", [
+        ("email", ["dev@example.com", "dev@example", "@example.com"]),
+        ("hex_color", ["#a1B2c3", "#a1B2c3ff", "#a1B2c", "a1B2c3"]),
+        ("version", ["1.2", "1.2.3-beta", "1", "1.2."]),
+        ("uuid", ["123e4567-e89b-12d3-a456-426614174000", "123e4567-e89b-12d3-a456-42661417400"]),
+    ])
+    def test_matches_like_re(self, name, samples):
+        pattern = REGEX_PATTERNS[name]
+        fsm = RegexFSM(pattern)
+
+        for sample in samples:
+            assert fsm.matches(sample) == bool(re.fullmatch(pattern, sample)), sample
+
+    def test_bounded_repetition(self):
+        fsm = RegexFSM(r"a{2,3}(b|cd)?")
+
+        assert [fsm.matches(s) for s in ["a", "aa", "aaa", "aaaa", "aab", "aacd", "aac"]] == [
+            False, True, True, False, True, True, False
+        ]
+
+    def test_unsupported_escape_rejected(self):
+        with pytest.raises(ValueError):
+            RegexFSM(r"\bword\b")
+
+
+class TestSchemaToRegex:
+    """Tests for schema_to_regex"""
+
+    def test_accepts_compact_instances(self):
+        pattern = schema_to_regex(USER_SCHEMA)
+        value = {"name": "Ada \"L\"", "age": -36, "role": "member", "tags": ["x", "y"]}
+
+        assert re.fullmatch(pattern, json.dumps(value, separators=(",", ":")))
+        assert not re.fullmatch(pattern, json.dumps(dict(value, role="owner"), separators=(",", ":")))
+        assert not re.fullmatch(pattern, json.dumps(dict(value, age="36"), separators=(",", ":")))
+
+    def test_pydantic_schema(self):
+        pattern = schema_to_regex(TaskPlan.model_json_schema())
+        plan = TaskPlan(goal="g", steps=["a"], estimated_complexity="low")
+
+        assert RegexFSM(pattern).matches(plan.model_dump_json())
+
+
+class TestTokenFSM:
+    """Tests for TokenFSM"""
+
+    def test_masks_tokens_and_allows_eos_when_final(self):
+        vocabulary = ["a", "b", "ab", "ba", "c"]
+        token_fsm = TokenFSM(RegexFSM(r"ab?"), vocabulary)
+
+        start = token_fsm.initial
+        assert sorted(token_fsm.allowed_tokens(start)) == [0, 2]
+
+        after_a = token_fsm.next_state(start, 0)
+        assert sorted(token_fsm.allowed_tokens(after_a)) == [EOS_TOKEN, 1]
+
+    def test_cached_per_vocabulary_contents(self):
+        generator = ConstrainedGenerator()
+
+        first = generator.token_fsm("ab?", ["a", "b"])
+        same = generator.token_fsm("ab?", ["a", "b"])
+        other = generator.token_fsm("ab?", ["a", "c"])
+
+        assert first is same
+        assert other is not first
+
+
+class TestConstrainedDecoding:
+    """ConstrainedGenerator.generate_async with a token-level provider"""
+
+    @pytest.mark.asyncio
+    async def test_follows_model_when_it_is_valid(self):
+        wanted = '{"name":"Ada","age":36,"role":"admin","tags":["math"]}'
+        generator = ConstrainedGenerator(provider=MockProvider(delay=0, scripted_output=wanted))
+
+        result = await generator.generate_async(
+            "Create a user", GenerationConfig(format=OutputFormat.JSON, schema=USER_SCHEMA)
+        )
+
+        assert result.content == wanted
+        assert result.is_valid
+        assert result.parsed_content["age"] == 36
+
+    @pytest.mark.asyncio
+    async def test_malformed_model_output_is_steered_to_valid_json(self):
+        # The unconstrained model would add prose, spaces and a string age
+        unconstrained = 'Sure! {"name": "Ada", "age": "36"}'
+        generator = ConstrainedGenerator(provider=MockProvider(delay=0, scripted_output=unconstrained))
+
+        result = await generator.generate_async(
+            "Create a user", GenerationConfig(format=OutputFormat.JSON, schema=USER_SCHEMA)
+        )
+
+        assert result.is_valid, result.validation_errors
+        assert set(json.loads(result.content)) == {"name", "age", "role", "tags"}
+
+    @pytest.mark.asyncio
+    async def test_regex_and_choice_constraints(self):
+        provider = MockProvider(delay=0, scripted_output="maybe")
+        generator = ConstrainedGenerator(provider=provider)
+
+        choice = await generator.generate_async(
+            "Pick one", GenerationConfig(format=OutputFormat.REGEX, regex_pattern="(yes|no)")
+        )
+        color = await generator.generate_async(
+            "A color", GenerationConfig(format=OutputFormat.REGEX, regex_pattern=REGEX_PATTERNS["hex_color"])
+        )
+
+        assert choice.content in ("yes", "no") and choice.is_valid
+        assert re.fullmatch(REGEX_PATTERNS["hex_color"], color.content)
+
+    @pytest.mark.asyncio
+    async def test_max_tokens_reported(self):
+        generator = ConstrainedGenerator(provider=MockProvider(delay=0, scripted_output="aaaaaaaa"))
+
+        result = await generator.generate_async(
+            "Letters", GenerationConfig(format=OutputFormat.REGEX, regex_pattern="a+b", max_tokens=3)
+        )
+
+        assert not result.is_valid
+        assert "max_tokens" in result.validation_errors[0]
+
+
+class TestStructuredOutputMode:
+    """Providers with a native structured output mode get the schema"""
+
+    @pytest.mark.asyncio
+    async def test_schema_sent_with_request(self):
+        class SchemaProvider(MockProvider):
+            supports_token_constraints = False
+            supports_structured_output = True
+
+            def structured_output_kwargs(self, schema, name="output"):
+                return {"response_format": schema}
+
+            async def generate(self, messages, max_tokens=4096, temperature=0.7, **kwargs):
+                self.kwargs = kwargs
+                return LLMResponse(content='{"name":"A","age":1,"role":"admin","tags":[]}', model="m", provider="p")
+
+        provider = SchemaProvider(delay=0)
+        result = await ConstrainedGenerator(provider=provider).generate_async(
+            "Create a user", GenerationConfig(format=OutputFormat.JSON, schema=USER_SCHEMA)
+        )
+
+        assert provider.kwargs == {"response_format": USER_SCHEMA}
+        assert result.is_valid
+
+    @pytest.mark.asyncio
+    async def test_optional_nulls_from_strict_mode_dropped(self):
+        schema = Customer.model_json_schema()
+
+        class StrictProvider(MockProvider):
+            supports_token_constraints = False
+            supports_structured_output = True
+
+            async def generate(self, messages, max_tokens=4096, temperature=0.7, **kwargs):
+                content = {"name": "Ada", "tier": None, "address": {"city": "London", "zip_code": None}, "previous": None}
+                return LLMResponse(content=json.dumps(content), model="m", provider="p")
+
+        result = await ConstrainedGenerator(provider=StrictProvider(delay=0)).generate_async(
+            "Create a customer", GenerationConfig(format=OutputFormat.JSON, schema=schema)
+        )
+
+        assert result.is_valid, result.validation_errors
+        assert result.parsed_content == {"name": "Ada", "address": {"city": "London"}}
+
+    def test_base_provider_capability_defaults(self):
+        class PlainProvider(LLMProvider):
+            name = "plain"
+
+            async def generate(self, messages, max_tokens=4096, temperature=0.7, **kwargs):
+                return LLMResponse(content="", model="m", provider="plain")
+
+            async def stream(self, messages, max_tokens=4096, temperature=0.7, **kwargs):
+                yield ""
+
+            def is_available(self):
+                return True
+
+        provider = PlainProvider()
+
+        assert not provider.supports_token_constraints and not provider.supports_structured_output
+        assert provider.vocabulary() == []
+        assert provider.structured_output_kwargs({"type": "object"}) == {}
+
+
+class TestStrictJsonSchema:
+    """Schemas sent to OpenAI-compatible strict structured outputs"""
+
+    def test_pydantic_schema_normalized(self):
+        strict = strict_json_schema(Customer.model_json_schema())
+
+        assert_strict(strict)
+        assert "$defs" not in strict
+        assert "default" not in json.dumps(strict)
+        # Optional properties stay optional by accepting null
+        assert {"type": "null"} in strict["properties"]["tier"]["anyOf"]
+        assert "anyOf" not in strict["properties"]["address"]
+        assert strict["properties"]["address"]["properties"]["city"] == {"title": "City", "type": "string"}
+
+    def test_free_form_objects_sent_non_strict(self):
+        class Settings(BaseModel):
+            values: Dict[str, str]
+
+        schema = Settings.model_json_schema()
+        response_format = OpenAIProvider(api_key="x").structured_output_kwargs(schema)["response_format"]
+
+        assert strict_json_schema(schema) is None
+        assert response_format["json_schema"]["strict"] is False
+        assert response_format["json_schema"]["schema"] == schema
+
+    def test_strict_response_format(self):
+        response_format = OpenAIProvider(api_key="x").structured_output_kwargs(USER_SCHEMA)["response_format"]
+
+        assert response_format["json_schema"]["strict"] is True
+        assert_strict(response_format["json_schema"]["schema"])
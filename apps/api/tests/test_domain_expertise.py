@@ -0,0 +1,262 @@
+"""
+Tests for the domain expertise synthesizer
+
+Tests cover:
+- Industry-level research and patterns cached across requests
+- Per-request overlay (concepts, clarifications) on the cached base
+- Per-request layer: clarification-driven queries, description-matched patterns
+- Staleness metadata and stale-while-refresh
+- Single-flight computation for concurrent requests (progress to every
+  waiter, unaffected by a cancelled waiter)
+- Background refresh of the most requested industries
+"""
+
+import asyncio
+import copy
+import gc
+
+import pytest
+
+from src.services.domain_expertise import DomainExpertiseSynthesizer
+from src.services.knowledge_store import DomainPattern, PatternMatch
+from src.services.web_researcher import DomainResearch, WebResearcher
+
+
+class FakeResearcher:
+    """Web researcher counting research calls"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.extended = []
+
+    def is_available(self):
+        return True
+
+    def clarification_queries(self, industry, clarifications):
+        return WebResearcher.clarification_queries(self, industry, clarifications)
+
+    async def extend_research(self, research, queries, progress_callback=None):
+        self.extended.append(sorted(queries))
+        extended = copy.deepcopy(research)
+        extended.queries_executed += len(queries)
+        return extended
+
+    async def research_domain(self, business_idea, industry, clarifications=None, progress_callback=None):
+        self.calls.append(industry)
+        await asyncio.sleep(self.delay)
+        if progress_callback:
+            await progress_callback("Completed: trends")
+        return DomainResearch(
+            industry=industry,
+            search_timestamp="t",
+            industry_trends=[f"{industry} trend {len(self.calls)}"],
+            common_features=["Online booking"],
+            confidence_score=0.8,
+        )
+
+
+class FakeKnowledgeStore:
+    """Knowledge store returning one pattern per industry"""
+
+    def __init__(self):
+        self.calls = []
+        self.descriptions = []
+
+    async def find_similar_patterns(self, description, industry=None, top_k=3):
+        self.calls.append(industry)
+        self.descriptions.append(description)
+        pattern = DomainPattern(
+            pattern_id=industry,
+            industry=industry,
+            description_keywords=[],
+            key_metrics=["Monthly bookings"],
+        )
+        return [PatternMatch(pattern=pattern, similarity=0.9, relevance_score=0.9)]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def collect_garbage():
+    """Preset composition allocates heavily; collect before timing-sensitive tests run"""
+    yield
+    gc.collect()
+
+
+@pytest.fixture
+def researcher():
+    return FakeResearcher()
+
+
+@pytest.fixture
+def synthesizer(researcher):
+    synthesizer = DomainExpertiseSynthesizer()
+    synthesizer._web_researcher = researcher
+    synthesizer._knowledge_store = FakeKnowledgeStore()
+    return synthesizer
+
+
+def age_entry(synthesizer, industry, seconds):
+    synthesizer._industry_cache[industry].computed_at -= seconds
+
+
+class TestIndustryCache:
+    """Cached industry data with per-request overlays"""
+
+    @pytest.mark.asyncio
+    async def test_research_reused_across_requests(self, synthesizer, researcher):
+        first = await synthesizer.synthesize("A dog grooming salon booking app")
+        second = await synthesizer.synthesize(
+            "A dog walking service app",
+            user_clarifications={"target_market": "Busy professionals"},
+        )
+
+        assert first.industry == second.industry
+        assert len(researcher.calls) == 1
+        assert synthesizer.cache_stats["hits"] == 1
+        assert first.industry_trends == second.industry_trends
+        assert "Monthly bookings" in second.recommended_metrics
+        assert second.sources_used == ["smart_presets", "user_clarifications", "web_research", "knowledge_store"]
+
+    @pytest.mark.asyncio
+    async def test_overlay_does_not_leak_into_cache(self, synthesizer):
+        with_clarification = await synthesizer.synthesize(
+            "A dog grooming salon booking app",
+            user_clarifications={"unique_value": "Mobile grooming van"},
+        )
+        without = await synthesizer.synthesize("A dog grooming salon booking app")
+
+        assert with_clarification.unique_differentiators == ["Mobile grooming van"]
+        assert without.unique_differentiators == []
+        assert without.confidence_score < with_clarification.confidence_score
+
+    @pytest.mark.asyncio
+    async def test_prefetched_research_overrides_cache(self, synthesizer, researcher):
+        await synthesizer.synthesize("A dog grooming salon booking app")
+        industry = next(iter(synthesizer._industry_cache))
+        custom = DomainResearch(industry=industry, search_timestamp="t", industry_trends=["custom"])
+
+        expertise = await synthesizer.synthesize("A dog grooming salon booking app", web_research=custom)
+
+        assert expertise.industry_trends == ["custom"]
+        assert len(researcher.calls) == 1
+
+
+    @pytest.mark.asyncio
+    async def test_request_layer_on_cached_research(self, synthesizer, researcher):
+        await synthesizer.synthesize("A dog grooming salon booking app")
+        await synthesizer.synthesize(
+            "A dog walking service app",
+            user_clarifications={"target_market": "Busy professionals", "service_model": "Subscriptions"},
+        )
+
+        assert len(researcher.calls) == 1
+        assert researcher.extended == [["service_specific", "target_market"]]
+        assert synthesizer._knowledge_store.descriptions[-2:] == [
+            "A dog grooming salon booking app",
+            "A dog walking service app",
+        ]
+
+
+class TestStaleness:
+    """Staleness metadata and refresh"""
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_then_refreshed(self, synthesizer, researcher):
+        fresh = await synthesizer.synthesize("A dog grooming salon booking app")
+        industry = fresh.industry
+        assert not fresh.industry_data_stale
+        assert fresh.industry_data_age_seconds < 1
+
+        age_entry(synthesizer, industry, synthesizer.refresh_seconds + 60)
+        stale = await synthesizer.synthesize("A dog grooming salon booking app")
+
+        assert stale.industry_data_stale
+        assert stale.industry_trends == fresh.industry_trends
+        await asyncio.gather(*synthesizer._inflight.values())
+
+        refreshed = await synthesizer.synthesize("A dog grooming salon booking app")
+        assert not refreshed.industry_data_stale
+        assert refreshed.industry_trends == [f"{industry} trend 2"]
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_recomputed_inline(self, synthesizer, researcher):
+        await synthesizer.synthesize("A dog grooming salon booking app")
+        industry = next(iter(synthesizer._industry_cache))
+        age_entry(synthesizer, industry, synthesizer.max_stale_seconds + 60)
+
+        expertise = await synthesizer.synthesize("A dog grooming salon booking app")
+
+        assert not expertise.industry_data_stale
+        assert len(researcher.calls) == 2
+        assert synthesizer.cache_stats["misses"] == 2
+
+
+class TestPrecomputation:
+    """Single-flight and background precomputation"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_computation(self, synthesizer, researcher):
+        researcher.delay = 0.05
+
+        results = await asyncio.gather(*(
+            synthesizer.synthesize("A dog grooming salon booking app") for _ in range(5)
+        ))
+
+        assert len(researcher.calls) == 1
+        assert len({r.industry_data_computed_at for r in results}) == 1
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_warms_popular_industries(self, synthesizer, researcher):
+        synthesizer.start_background_refresh(industries=["fitness"], interval_seconds=0.01)
+        try:
+            for _ in range(50):
+                if "fitness" in synthesizer._industry_cache:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await synthesizer.stop_background_refresh()
+
+        assert "fitness" in synthesizer._industry_cache
+        assert synthesizer._refresh_task is None
+
+    @pytest.mark.asyncio
+    async def test_popular_industries_ranked_by_requests(self, synthesizer):
+        await synthesizer.precompute(["fitness", "restaurant"])
+        for industry in ["restaurant", "restaurant", "fitness"]:
+            await synthesizer.get_industry_entry(industry)
+
+        assert synthesizer.popular_industries(top_k=1) == ["restaurant"]
+        assert synthesizer.cache_stats["hits"] == 3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self, synthesizer, researcher):
+        researcher.delay = 0.05
+        first = asyncio.create_task(synthesizer.get_industry_entry("fitness"))
+        second = asyncio.create_task(synthesizer.get_industry_entry("fitness"))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        entry = await second
+
+        assert entry.research.industry == "fitness"
+        assert first.cancelled()
+        assert len(researcher.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_progress_sent_to_every_waiter(self, synthesizer, researcher):
+        researcher.delay = 0.05
+        messages = {"a": [], "b": []}
+
+        def collector(name):
+            async def collect(message):
+                messages[name].append(message)
+            return collect
+
+        first = asyncio.create_task(synthesizer.get_industry_entry("fitness", collector("a")))
+        await asyncio.sleep(0)
+        await asyncio.gather(first, synthesizer.get_industry_entry("fitness", collector("b")))
+
+        # b joined after the computation started and still gets its progress
+        assert "Completed: trends" in messages["a"]
+        assert "Completed: trends" in messages["b"]
+        assert synthesizer._progress_listeners == {}
@@ -0,0 +1,103 @@
+"""
+Tests for the compiled description matcher
+
+Tests cover:
+- Aho-Corasick matching (overlapping keywords, substring semantics, labels)
+- Clarification slots detected from the shared scan
+- One scan per description shared by concept extraction and clarification
+- Enriched descriptions reusing the original's scan
+"""
+
+import pytest
+
+from src.services.clarification_agent import MISSING_INFO_INDICATORS, ClarificationAgent
+from src.services.prompts import smart_presets
+from src.services.prompts.keyword_matcher import KeywordAutomaton
+from src.services.prompts.smart_presets import KeywordExtractor, analyze_description
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Record every text scanned by the matcher"""
+    smart_presets._analysis_cache.clear()
+    scanned = []
+    scan = smart_presets._scan
+
+    def recording_scan(text):
+        scanned.append(text)
+        return scan(text)
+
+    monkeypatch.setattr(smart_presets, "_scan", recording_scan)
+    yield scanned
+    smart_presets._analysis_cache.clear()
+
+
+class TestKeywordAutomaton:
+    """Tests for KeywordAutomaton"""
+
+    def test_finds_overlapping_keywords(self):
+        automaton = KeywordAutomaton({"a": ["he", "she", "hers"], "b": ["his"]})
+
+        assert automaton.find("ushers") == {"he", "she", "hers"}
+        assert automaton.find("this") == {"his"}
+        assert automaton.find("nothing") == set()
+
+    def test_same_results_as_substring_checks(self):
+        words = [w for signals in smart_presets.INDUSTRY_SIGNALS.values() for w, _ in signals]
+        automaton = KeywordAutomaton({"all": words})
+        text = "a rapid e-commerce catering api with real estate and email campaigns"
+
+        assert automaton.find(text) == {w for w in words if w in text}
+
+    def test_groups_keywords_by_label(self):
+        automaton = KeywordAutomaton({"slot:pricing": ["pay", "fee"], "industry:finance": ["payment"]})
+
+        match = automaton.match("payment fees", tokens=[])
+
+        assert match.labels == {"slot:pricing": {"pay", "fee"}, "industry:finance": {"payment"}}
+        assert match.has("slot:pricing")
+        assert match.labels_with_prefix("industry:") == {"finance": {"payment"}}
+
+
+class TestSharedAnalysis:
+    """analyze_description shared by KeywordExtractor and ClarificationAgent"""
+
+    def test_missing_info_from_compiled_slots(self, scans):
+        agent = ClarificationAgent()
+        description = "Online shop where buyers pay per order"
+
+        missing = agent._detect_missing_info(description, ["order"], ["pay"])
+
+        lower = description.lower()
+        expected = [
+            slot for slot, words in MISSING_INFO_INDICATORS.items()
+            if not any(word in lower for word in words)
+        ]
+        assert missing == expected == ["services", "scale"]
+
+    def test_description_scanned_once(self, scans):
+        description = "A yoga studio app to book classes and track memberships"
+        agent = ClarificationAgent()
+
+        concepts = KeywordExtractor().extract(description)
+        agent.needs_clarification(concepts, description)
+        agent.generate_questions(description, concepts)
+
+        assert concepts.best_industry == "fitness"
+        assert scans == [description.lower()]
+
+    def test_enriched_description_scans_only_additions(self, scans):
+        description = "A yoga studio app to book classes"
+        enriched = ClarificationAgent().enrich_description(
+            description, {"target_market": "Busy professionals", "pricing_model": "Monthly fee"}
+        )
+
+        analyze_description(description)
+        extended = analyze_description(enriched)
+
+        assert len(scans) == 2
+        assert scans[1] == enriched[len(description):].lower()
+        smart_presets._analysis_cache.clear()
+        full = analyze_description(enriched)
+        assert (extended.tokens, extended.labels) == (full.tokens, full.labels)
+        assert extended.has("slot:pricing")
@@ -0,0 +1,262 @@
+"""
+Tests for dependency-scheduled workflow execution
+
+Tests cover:
+- Agent dependencies declared on WorkflowConfig or derived from stages
+- Agents starting as soon as their dependencies finish
+- Concurrency limit, with the longest dependency chain started first
+- Per-agent deadline and fail-fast group policy
+- Outputs passed along dependency edges only
+- Critical path and slack reported in orchestrator events
+- Orchestrator events accepted by CodeGenerator's event bridge
+"""
+
+import asyncio
+
+import pytest
+
+from src.models import Platform
+from src.services import agent_executor as agent_executor_module
+from src.services import generator as generator_module
+from src.services.agent_executor import AgentResult, GroupPolicy
+from src.services.generator import CodeGenerator
+from src.services.orchestrator import AgentOrchestrator, WorkflowStatus
+from src.services.workflow_checkpoints import SQLiteCheckpointStore
+from src.services.workflows import WORKFLOW_CONFIGS, WorkflowConfig, WorkflowType
+
+
+def make_workflow(agent_ids, dependencies=None, parallel_groups=None):
+    return WorkflowConfig(
+        type=WorkflowType.FULL_APP,
+        name="Test",
+        description="Test workflow",
+        agent_ids=agent_ids,
+        dependencies=dependencies,
+        parallel_groups=parallel_groups,
+    )
+
+
+@pytest.fixture
+def fake_agents(monkeypatch):
+    """Replace agent execution with timed stubs that log what they saw"""
+    calls = {"log": [], "contexts": {}, "delays": {}, "in_flight": 0, "peak": 0}
+
+    async def fake_execute_agent(agent_id, context, on_progress=None):
+        calls["contexts"][agent_id] = context
+        calls["log"].append(f"start:{agent_id}")
+        calls["in_flight"] += 1
+        calls["peak"] = max(calls["peak"], calls["in_flight"])
+        await asyncio.sleep(calls["delays"].get(agent_id, 0.01))
+        calls["in_flight"] -= 1
+        calls["log"].append(f"end:{agent_id}")
+        return AgentResult(agent_id=agent_id, success=True, output=f"{agent_id} output", duration_ms=10)
+
+    monkeypatch.setattr(agent_executor_module, "execute_agent", fake_execute_agent)
+    return calls
+
+
+def initial_state(agent_ids):
+    return {
+        "project_id": "p1",
+        "description": "A todo app",
+        "platform": "web",
+        "workflow_type": "test",
+        "current_agent": "",
+        "completed_agents": [],
+        "pending_agents": list(agent_ids),
+        "agent_results": {},
+        "files": [],
+        "errors": [],
+        "started_at": "",
+        "status": "running",
+    }
+
+
+class TestAgentDependencies:
+    """WorkflowConfig.agent_dependencies"""
+
+    def test_derived_from_stages(self):
+        workflow = make_workflow(["PM", "Ideas", "Designs", "Dev"], parallel_groups=[["Ideas", "Designs"]])
+
+        assert workflow.agent_dependencies() == {
+            "PM": [],
+            "Ideas": ["PM"],
+            "Designs": ["PM"],
+            "Dev": ["Ideas", "Designs"],
+        }
+
+    def test_unknown_agents_rejected(self):
+        workflow = make_workflow(["PM", "Dev"], dependencies={"Dev": ["Designer"]})
+
+        with pytest.raises(ValueError, match="Designer"):
+            workflow.agent_dependencies()
+
+    def test_builtin_workflows_resolve(self):
+        for config in WORKFLOW_CONFIGS.values():
+            deps = config.agent_dependencies()
+            assert set(deps) == set(config.agent_ids)
+
+
+class TestDagExecution:
+    """AgentOrchestrator._execute_agent_dag"""
+
+    @pytest.mark.asyncio
+    async def test_agents_start_when_dependencies_finish(self, fake_agents):
+        workflow = make_workflow(
+            ["PM", "Backend", "Frontend", "QA"],
+            dependencies={"Backend": ["PM"], "Frontend": [], "QA": ["Backend", "Frontend"]},
+        )
+        fake_agents["delays"] = {"PM": 0.05}
+
+        state = await AgentOrchestrator()._execute_agent_dag(initial_state(workflow.agent_ids), workflow)
+
+        log = fake_agents["log"]
+        # Frontend doesn't wait for PM; QA waits for both
+        assert log.index("end:Frontend") < log.index("end:PM")
+        assert log.index("start:QA") > log.index("end:Backend")
+        assert state["pending_agents"] == []
+        assert set(state["completed_agents"]) == set(workflow.agent_ids)
+
+    @pytest.mark.asyncio
+    async def test_outputs_follow_dependency_edges(self, fake_agents):
+        workflow = make_workflow(
+            ["PM", "Backend", "Frontend", "QA"],
+            dependencies={"Backend": ["PM"], "Frontend": [], "QA": ["Backend"]},
+        )
+        fake_agents["delays"] = {"QA": 0.03}
+
+        await AgentOrchestrator()._execute_agent_dag(initial_state(workflow.agent_ids), workflow)
+
+        contexts = fake_agents["contexts"]
+        assert contexts["Frontend"].previous_outputs == {}
+        assert contexts["QA"].previous_outputs == {"PM": "PM output", "Backend": "Backend output"}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded(self, fake_agents):
+        workflow = make_workflow([f"A{i}" for i in range(6)], dependencies={})
+
+        await AgentOrchestrator(max_parallel_agents=2)._execute_agent_dag(
+            initial_state(workflow.agent_ids), workflow
+        )
+
+        assert fake_agents["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_reports_critical_path_and_slack(self, fake_agents):
+        events = []
+
+        async def collect(event):
+            events.append(event)
+
+        workflow = make_workflow(
+            ["PM", "Backend", "Frontend", "QA"],
+            dependencies={"Backend": ["PM"], "Frontend": ["PM"], "QA": ["Backend", "Frontend"]},
+        )
+        fake_agents["delays"] = {"Backend": 0.06}
+
+        await AgentOrchestrator(event_callback=collect)._execute_agent_dag(
+            initial_state(workflow.agent_ids), workflow
+        )
+
+        schedule = next(e for e in events if e.type == "workflow_schedule")
+        assert schedule.data["critical_path"] == ["PM", "Backend", "QA"]
+        assert schedule.data["slack_ms"]["Backend"] == 0
+        assert schedule.data["slack_ms"]["Frontend"] >= 40
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_completed_agents(self, fake_agents):
+        workflow = make_workflow(["PM", "Dev"], dependencies={"Dev": ["PM"]})
+        state = initial_state(["Dev"])
+        state["completed_agents"] = ["PM"]
+        state["agent_results"] = {"PM": {"output": "earlier plan"}}
+
+        await AgentOrchestrator()._execute_agent_dag(state, workflow)
+
+        assert fake_agents["log"] == ["start:Dev", "end:Dev"]
+        assert fake_agents["contexts"]["Dev"].previous_outputs == {"PM": "earlier plan"}
+
+    @pytest.mark.asyncio
+    async def test_longest_chain_gets_slot_first(self, fake_agents):
+        workflow = make_workflow(
+            ["Side", "Head", "Mid", "Tail"],
+            dependencies={"Side": [], "Head": [], "Mid": ["Head"], "Tail": ["Mid"]},
+        )
+
+        await AgentOrchestrator(max_parallel_agents=1)._execute_agent_dag(
+            initial_state(workflow.agent_ids), workflow
+        )
+
+        starts = [entry for entry in fake_agents["log"] if entry.startswith("start")]
+        assert starts[0] == "start:Head"
+
+    @pytest.mark.asyncio
+    async def test_agent_deadline(self, fake_agents):
+        workflow = make_workflow(["PM", "Dev"], dependencies={"Dev": ["PM"]})
+        fake_agents["delays"] = {"PM": 1.0}
+
+        state = await AgentOrchestrator(agent_timeout_seconds=0.05)._execute_agent_dag(
+            initial_state(workflow.agent_ids), workflow
+        )
+
+        assert state["agent_results"]["PM"]["error"] == "Timed out after 0.05s"
+        assert state["errors"] == ["PM: Timed out after 0.05s"]
+        assert state["agent_results"]["Dev"]["success"]
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_cancels_remaining_agents(self, fake_agents, monkeypatch):
+        workflow = make_workflow(["PM", "Side", "Dev"], dependencies={"Side": [], "Dev": ["PM"]})
+        fake_agents["delays"] = {"PM": 1.0, "Side": 0.01}
+        fake_execute_agent = agent_executor_module.execute_agent
+
+        async def failing_side(agent_id, context, on_progress=None):
+            if agent_id == "Side":
+                raise RuntimeError("provider unavailable")
+            return await fake_execute_agent(agent_id, context, on_progress)
+
+        monkeypatch.setattr(agent_executor_module, "execute_agent", failing_side)
+
+        state = await AgentOrchestrator(group_policy=GroupPolicy.FAIL_FAST)._execute_agent_dag(
+            initial_state(workflow.agent_ids), workflow
+        )
+
+        assert state["agent_results"]["PM"]["error_details"] == {"cancelled_by": "Side"}
+        assert state["agent_results"]["Dev"]["error_details"] == {"cancelled_by": "Side"}
+        assert "start:Dev" not in fake_agents["log"]
+        assert state["completed_agents"] == ["Side"]
+
+
+class TestCodeGeneratorBridge:
+    """Workflows driven through CodeGenerator, whose events are validated"""
+
+    @pytest.mark.asyncio
+    async def test_workflow_events_convert_to_generation_events(self, fake_agents, monkeypatch, tmp_path):
+        events = []
+        results = []
+
+        async def collect(event):
+            events.append(event)
+
+        async def no_save(project_id, files):
+            return None
+
+        monkeypatch.setattr(generator_module, "save_project_files", no_save)
+        generator = CodeGenerator(event_callback=collect)
+        orchestrator = generator._get_orchestrator()
+        store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+        orchestrator.checkpoint_store = store
+        run_workflow = orchestrator.run_workflow
+
+        async def recording_run_workflow(*args, **kwargs):
+            result = await run_workflow(*args, **kwargs)
+            results.append(result)
+            return result
+
+        monkeypatch.setattr(orchestrator, "run_workflow", recording_run_workflow)
+
+        await generator._generate_with_orchestrator("A todo app", Platform.WEB, "p1")
+        store.close()
+
+        assert results[0].status == WorkflowStatus.COMPLETED
+        assert results[0].errors == []
+        assert not [e for e in events if e.type == "error"]
+        assert events[-1].type == "complete"
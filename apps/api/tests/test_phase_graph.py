@@ -0,0 +1,157 @@
+"""
+Tests for the phase dependency graph used by the creative pipeline
+
+Tests cover:
+- Graph validation (unknown inputs, duplicate outputs, cycles)
+- Concurrent execution of independent phases
+- Cancellation on failure
+- Timing report, critical path and slack
+- Concurrency limit and priority ordering
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.phase_graph import Phase, PhaseGraph
+
+
+def _phase(name, requires=(), provides=(), delay=0.0, log=None):
+    async def run(ctx):
+        if log is not None:
+            log.append(f"start:{name}")
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(f"end:{name}")
+        return {key: name for key in provides}
+
+    return Phase(name, run, requires=tuple(requires), provides=tuple(provides))
+
+
+class TestPhaseGraphValidation:
+    """Graph construction errors"""
+
+    def test_unknown_input_rejected(self):
+        with pytest.raises(ValueError):
+            PhaseGraph([_phase("a", requires=("missing",))])
+
+    def test_duplicate_output_rejected(self):
+        with pytest.raises(ValueError):
+            PhaseGraph([_phase("a", provides=("x",)), _phase("b", provides=("x",))])
+
+    def test_cycle_rejected(self):
+        with pytest.raises(ValueError):
+            PhaseGraph([
+                _phase("a", requires=("y",), provides=("x",)),
+                _phase("b", requires=("x",), provides=("y",)),
+            ])
+
+
+class TestPhaseGraphRun:
+    """Execution order, concurrency and timings"""
+
+    @pytest.mark.asyncio
+    async def test_independent_phases_overlap(self):
+        log = []
+        graph = PhaseGraph([
+            _phase("root", provides=("base",), log=log),
+            _phase("left", requires=("base",), provides=("l",), delay=0.05, log=log),
+            _phase("right", requires=("base",), provides=("r",), delay=0.01, log=log),
+            _phase("join", requires=("l", "r"), provides=("out",), log=log),
+        ])
+
+        ctx = await graph.run({})
+
+        assert ctx["out"] == "join"
+        # Both branches start before either finishes
+        assert log.index("start:right") < log.index("end:left")
+        assert log.index("start:left") < log.index("end:right")
+        assert log[-1] == "end:join"
+
+    @pytest.mark.asyncio
+    async def test_initial_keys_available(self):
+        graph = PhaseGraph([_phase("a", requires=("seed",), provides=("x",))], initial_keys=("seed",))
+
+        ctx = await graph.run({"seed": 1})
+
+        assert ctx == {"seed": 1, "x": "a"}
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_phases(self):
+        cancelled = asyncio.Event()
+
+        async def slow(ctx):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def boom(ctx):
+            raise RuntimeError("phase failed")
+
+        graph = PhaseGraph([
+            Phase("slow", slow, provides=("a",)),
+            Phase("boom", boom, provides=("b",)),
+        ])
+
+        with pytest.raises(RuntimeError, match="phase failed"):
+            await graph.run({})
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_critical_path_follows_slowest_chain(self):
+        graph = PhaseGraph([
+            _phase("root", provides=("base",)),
+            _phase("fast", requires=("base",), provides=("f",)),
+            _phase("slow", requires=("base",), provides=("s",), delay=0.05),
+            _phase("join", requires=("f", "s"), provides=("out",)),
+        ])
+
+        await graph.run({})
+        report = graph.timing_report()
+
+        assert report["critical_path"] == ["root", "slow", "join"]
+        assert [p["name"] for p in report["phases"]][0] == "root"
+        slow = next(p for p in report["phases"] if p["name"] == "slow")
+        assert slow["duration_ms"] >= 40
+        assert report["total_ms"] >= slow["finished_ms"]
+
+    @pytest.mark.asyncio
+    async def test_slack_zero_on_critical_path(self):
+        graph = PhaseGraph([
+            _phase("root", provides=("base",)),
+            _phase("fast", requires=("base",), provides=("f",)),
+            _phase("slow", requires=("base",), provides=("s",), delay=0.05),
+            _phase("join", requires=("f", "s"), provides=("out",)),
+        ])
+
+        await graph.run({})
+        slack = graph.timing_report()["slack_ms"]
+
+        assert slack["root"] == slack["slow"] == slack["join"] == 0
+        assert slack["fast"] >= 40
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limited(self):
+        log = []
+        graph = PhaseGraph(
+            [_phase(name, provides=(name,), delay=0.01, log=log) for name in "abc"],
+            max_concurrency=2,
+        )
+
+        await graph.run({})
+
+        assert log[:3] == ["start:a", "start:b", "end:a"]
+        assert log.index("start:c") > log.index("end:a")
+
+    @pytest.mark.asyncio
+    async def test_priority_gets_slots_first(self):
+        log = []
+        phases = [_phase(name, provides=(name,), delay=0.01, log=log) for name in "abc"]
+        phases[2].priority = -1
+        graph = PhaseGraph(phases, max_concurrency=1)
+
+        await graph.run({})
+
+        assert [entry for entry in log if entry.startswith("start")] == ["start:c", "start:a", "start:b"]
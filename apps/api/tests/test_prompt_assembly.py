@@ -0,0 +1,142 @@
+"""
+Tests for prompt prefix caching
+
+Tests cover:
+- Stable segment ordering shared across agents of a workflow
+- Anthropic cache_control breakpoints (payload and system blocks)
+- Billed input tokens with and without cacheable prefixes (MockProvider)
+- Prefix reuse tracking and TTL expiry
+"""
+
+import pytest
+
+from src.llm.providers import LLMMessage, MockProvider, _anthropic_payload
+from src.services.agent_executor import AgentContext, AgentExecutor
+from src.services.agent_registry import AgentConfig
+from src.services.prompt_assembly import (
+    MAX_CACHE_BREAKPOINTS,
+    AssembledPrompt,
+    PrefixCacheTracker,
+    PromptSegment,
+    billed_input_tokens,
+)
+
+
+def make_executor(agent_id, category="Development"):
+    config = AgentConfig(
+        id=agent_id,
+        role=f"{agent_id} Engineer",
+        goal=f"Build the {agent_id.lower()} layer",
+        backstory=f"Years of {agent_id.lower()} work.",
+        default_prompt=f"Implement the {agent_id.lower()} for this project.",
+        category=category,
+    )
+    return AgentExecutor(config, llm_client=object(), llm_router=object())
+
+
+def make_context(**overrides):
+    values = dict(
+        project_id="p1",
+        description="A todo app with reminders",
+        platform="web",
+        constraints=["No external database"],
+    )
+    values.update(overrides)
+    return AgentContext(**values)
+
+
+class TestAssembledPrompt:
+    """Tests for AgentExecutor.assemble_prompt and AssembledPrompt"""
+
+    def test_agents_share_leading_segments(self):
+        context = make_context()
+        frontend = make_executor("Frontend").assemble_prompt(context)
+        backend = make_executor("Backend").assemble_prompt(context)
+
+        assert [s.label for s in frontend.segments] == ["project", "platform_guidelines", "persona", "task"]
+        assert frontend.prefixes()[:2] == backend.prefixes()[:2]
+        assert frontend.prefixes()[2] != backend.prefixes()[2]
+        # Previous outputs only change the volatile part
+        later = make_executor("Frontend").assemble_prompt(
+            make_context(previous_outputs={"Backend": {"api": "/todos"}})
+        )
+        assert later.system_text == frontend.system_text
+        assert "/todos" in later.user_text
+
+    def test_breakpoints_limited_to_last_stable_segments(self):
+        prompt = AssembledPrompt(
+            [PromptSegment(f"s{i}", f"text {i}") for i in range(6)]
+            + [PromptSegment("task", "do it", stable=False)]
+        )
+
+        blocks = prompt.system_blocks()
+        messages = prompt.to_messages()
+
+        assert ["cache_control" in b for b in blocks] == [False, False, True, True, True, True]
+        assert sum(m.cacheable for m in messages) == MAX_CACHE_BREAKPOINTS
+        assert messages[-1] == LLMMessage(role="user", content="do it")
+
+    def test_anthropic_payload_marks_cacheable_messages(self):
+        system, api_messages = _anthropic_payload([
+            LLMMessage(role="system", content="shared", cacheable=True),
+            LLMMessage(role="system", content="persona"),
+            LLMMessage(role="user", content="task"),
+        ])
+
+        assert system == [
+            {"type": "text", "text": "shared", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "persona"},
+        ]
+        assert api_messages == [{"role": "user", "content": "task"}]
+
+
+class TestPromptCacheAccounting:
+    """Billed tokens for a multi-agent workflow with retries"""
+
+    async def _run_workflow(self, cacheable):
+        provider = MockProvider(delay=0)
+        context = make_context()
+        billed = 0.0
+        for agent_id in ["Frontend", "Backend", "Database", "Frontend"]:  # last one is a retry
+            prompt = make_executor(agent_id).assemble_prompt(context)
+            messages = prompt.to_messages()
+            if not cacheable:
+                messages = [LLMMessage(role=m.role, content=m.content) for m in messages]
+            response = await provider.generate(messages)
+            billed += billed_input_tokens(response.usage)
+        return billed, response.usage
+
+    @pytest.mark.asyncio
+    async def test_cached_prefixes_reduce_billed_tokens(self):
+        uncached, _ = await self._run_workflow(cacheable=False)
+        cached, retry_usage = await self._run_workflow(cacheable=True)
+
+        # The retry reads its whole system prompt from cache
+        assert retry_usage["cache_creation_input_tokens"] == 0
+        assert retry_usage["cache_read_input_tokens"] > retry_usage["input_tokens"]
+        assert cached < uncached * 0.6
+
+
+class TestPrefixCacheTracker:
+    """Tests for PrefixCacheTracker"""
+
+    def test_reuse_and_expiry(self):
+        tracker = PrefixCacheTracker(ttl_seconds=300)
+        context = make_context()
+        frontend = make_executor("Frontend").assemble_prompt(context)
+        backend = make_executor("Backend").assemble_prompt(context)
+
+        assert tracker.record(frontend, "anthropic", now=0) == 0
+        shared = tracker.record(backend, "anthropic", now=10)
+        full = tracker.record(frontend, "anthropic", now=20)
+        # Different provider has its own cache
+        assert tracker.record(frontend, "openai", now=30) == 0
+        # Expired
+        assert tracker.record(backend, "anthropic", now=1000) == 0
+
+        assert 0 < shared < full == frontend.prefixes()[-1][2]
+        stats = tracker.get_stats()
+        assert stats["requests"] == 5
+        assert stats["prefix_hits"] == 2
+        assert stats["hits_by_segment"] == {"platform_guidelines": 1, "persona": 1}
+        assert stats["reuse_rate"] == pytest.approx(0.4)
@@ -0,0 +1,211 @@
+"""
+Tests for the prompt optimizer
+
+Tests cover:
+- Query-aware retrieval (BM25 relevance combined with quality score)
+- Diversity of retrieved examples (MMR)
+- Hash-indexed score updates
+- Append-only persistence, replay, compaction and legacy migration
+- Parallel optimization: concurrency limit, caching, successive halving
+  and the token budget (MockProvider)
+"""
+
+import json
+
+import pytest
+
+from src.ai.prompt_optimizer import (
+    EvaluationBudget,
+    ExampleStore,
+    ParallelTemplateEvaluator,
+    PromptOptimizer,
+    PromptTemplate,
+)
+from src.llm.providers import MockProvider
+
+
+def lines(path):
+    return path.read_text().splitlines()
+
+
+class TestRetrieval:
+    """ExampleStore.get_examples"""
+
+    def test_query_selects_relevant_examples(self, tmp_path):
+        store = ExampleStore(str(tmp_path))
+        store.add_example("code", "parse a csv file into rows", "csv.reader(...)", score=0.8)
+        store.add_example("code", "sort a list of users by age", "sorted(...)", score=1.0)
+        store.add_example("code", "write rows to a csv file", "csv.writer(...)", score=0.9)
+
+        by_query = store.get_examples("code", query="read csv file", n=2)
+        by_score = store.get_examples("code", n=2)
+
+        assert {e.output for e in by_query} == {"csv.reader(...)", "csv.writer(...)"}
+        assert by_score[0].output == "sorted(...)"
+
+    def test_low_scores_excluded(self, tmp_path):
+        store = ExampleStore(str(tmp_path))
+        store.add_example("code", "parse csv", "bad", score=0.1)
+
+        assert store.get_examples("code", query="parse csv") == []
+
+    def test_mmr_prefers_diverse_examples(self, tmp_path):
+        store = ExampleStore(str(tmp_path))
+        for i in range(3):
+            store.add_example("code", f"login form with email validation variant {i}", f"dup{i}")
+        store.add_example("code", "login form with oauth buttons", "oauth")
+
+        picked = [e.output for e in store.get_examples("code", query="login form", n=2)]
+
+        # Near-duplicates are not picked twice
+        assert "oauth" in picked
+        assert sum(p.startswith("dup") for p in picked) == 1
+
+
+class TestPersistence:
+    """Append-only log persistence"""
+
+    def test_writes_are_appends_and_replay(self, tmp_path):
+        store = ExampleStore(str(tmp_path))
+        store.add_example("code", "a", "1")
+        store.add_example("code", "b", "2")
+        store.update_score("code", "a", 0.0)
+
+        log = tmp_path / ExampleStore.LOG_FILE
+        assert [json.loads(line)["op"] for line in lines(log)] == ["add", "add", "score"]
+
+        reloaded = ExampleStore(str(tmp_path))
+        scores = {e.input: e.score for e in reloaded.examples["code"]}
+        assert scores == {"a": 0.7, "b": 1.0}
+
+    def test_same_input_replaces_example(self, tmp_path):
+        store = ExampleStore(str(tmp_path))
+        store.add_example("code", "a", "old")
+        store.add_example("code", "a", "new")
+
+        assert [e.output for e in ExampleStore(str(tmp_path)).examples["code"]] == ["new"]
+
+    def test_log_compacted_when_mostly_stale(self, tmp_path):
+        store = ExampleStore(str(tmp_path))
+        store.add_example("code", "a", "1")
+        for _ in range(150):
+            store.update_score("code", "a", 1.0)
+
+        assert len(lines(tmp_path / ExampleStore.LOG_FILE)) < 100
+        assert ExampleStore(str(tmp_path)).examples["code"][0].input == "a"
+
+    def test_torn_last_record_ignored(self, tmp_path):
+        store = ExampleStore(str(tmp_path))
+        store.add_example("code", "a", "1")
+        with open(tmp_path / ExampleStore.LOG_FILE, "a") as f:
+            f.write('{"op": "add", "task": "co')
+
+        assert len(ExampleStore(str(tmp_path)).examples["code"]) == 1
+
+    def test_migrates_legacy_index(self, tmp_path):
+        legacy = {"code": [{"input": "a", "output": "1", "metadata": {}, "score": 0.9, "timestamp": "t"}]}
+        (tmp_path / ExampleStore.LEGACY_INDEX_FILE).write_text(json.dumps(legacy))
+
+        store = ExampleStore(str(tmp_path))
+
+        assert store.examples["code"][0].score == 0.9
+        assert (tmp_path / ExampleStore.LOG_FILE).exists()
+
+
+class CountingProvider(MockProvider):
+    """MockProvider recording peak concurrency and prompts"""
+
+    def __init__(self):
+        super().__init__(delay=0.02)
+        self.in_flight = 0
+        self.peak = 0
+        self.prompts = []
+
+    async def generate(self, messages, max_tokens=4096, temperature=0.7, **kwargs):
+        self.prompts.append(messages[-1].content)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            return await super().generate(messages, max_tokens, temperature, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+def reward_reasoning(prompt, output):
+    """Chain of thought helps most; format instructions help a little"""
+    score = 0.2
+    if "step by step" in prompt:
+        score += 0.5
+    if "Output format" in prompt:
+        score += 0.2
+    return score
+
+
+@pytest.fixture
+def optimizer(tmp_path):
+    optimizer = PromptOptimizer()
+    optimizer.example_store = ExampleStore(str(tmp_path))
+    return optimizer
+
+
+TEMPLATE = PromptTemplate(template="Write {language} code for: {task}", variables=["language", "task"])
+SAMPLES = [{"language": "python", "task": f"task {i}"} for i in range(8)]
+
+
+class TestParallelOptimization:
+    """PromptOptimizer.optimize(parallel=True)"""
+
+    @pytest.mark.asyncio
+    async def test_strategies_raced_concurrently(self, optimizer):
+        provider = CountingProvider()
+
+        result = await optimizer.optimize(
+            TEMPLATE, reward_reasoning, SAMPLES, parallel=True, llm=provider,
+            budget=EvaluationBudget(max_concurrency=4), target_score=0.95,
+        )
+
+        assert provider.peak == 4
+        assert "step by step" in result.optimized_prompt
+        assert "Output format" in result.optimized_prompt
+        assert result.best_score == pytest.approx(0.9)
+        # Two generations: chain of thought first, then format instructions
+        assert result.metrics["scores_history"] == pytest.approx([0.2, 0.7, 0.9])
+
+    @pytest.mark.asyncio
+    async def test_losers_pruned_early(self, optimizer):
+        provider = CountingProvider()
+
+        await optimizer.optimize(
+            TEMPLATE, reward_reasoning, SAMPLES, parallel=True, llm=provider, max_iterations=1,
+        )
+
+        with_cot = sum("step by step" in p for p in provider.prompts)
+        constraints_only = sum("Important constraints" in p and "step by step" not in p for p in provider.prompts)
+        # Winner is scored on every sample, the losing candidate only on the first rung
+        assert with_cot == len(SAMPLES)
+        assert constraints_only == 2
+
+    @pytest.mark.asyncio
+    async def test_evaluations_cached(self):
+        provider = CountingProvider()
+        evaluator = ParallelTemplateEvaluator(provider, reward_reasoning, EvaluationBudget())
+
+        first = await evaluator.evaluate([TEMPLATE], SAMPLES[:3])
+        second = await evaluator.evaluate([TEMPLATE], SAMPLES[:3])
+
+        assert first == second
+        assert evaluator.stats["llm_calls"] == 3
+        assert evaluator.stats["cache_hits"] == 3
+
+    @pytest.mark.asyncio
+    async def test_stops_when_budget_spent(self, optimizer):
+        provider = CountingProvider()
+
+        result = await optimizer.optimize(
+            TEMPLATE, reward_reasoning, SAMPLES, parallel=True, llm=provider,
+            budget=EvaluationBudget(max_concurrency=2, max_tokens=600), target_score=1.0,
+        )
+
+        assert result.metrics["budget_exhausted"]
+        assert result.metrics["tokens_used"] <= 600 + 2 * 200
+        assert len(provider.prompts) < 20
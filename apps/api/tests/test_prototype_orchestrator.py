@@ -6,9 +6,10 @@ Tests cover:
 2. Event emission
 3. Clarification phase
 4. Full pipeline execution with mocks
-5. Fallback behavior
+5. Fallback behavior, including speculative mode
 6. Error handling
 """
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
@@ -391,6 +392,185 @@ class TestOrchestratorIntegration:
         assert orchestrator is not None
 
 
+# ============================================================================
+# Speculative Fallback Tests
+# ============================================================================
+
+def _fallback_result(level):
+    return PrototypeResult(
+        success=True,
+        files={"App.tsx": level.name},
+        fallback_info=FallbackInfo(level=level),
+    )
+
+
+class TestSpeculativeCascade:
+    """Tests for racing the creative pipeline against cheap fallbacks."""
+
+    @pytest.fixture
+    def orchestrator(self, mock_services, mock_event_callback):
+        orchestrator = PrototypeOrchestrator(
+            event_callback=mock_event_callback,
+            use_smart_presets=False,
+            skip_clarification=True,
+            speculative=True,
+            speculative_deadline=0.05,
+        )
+        orchestrator._try_cached_similar = AsyncMock(return_value=None)
+        orchestrator._try_template_customized = AsyncMock(
+            return_value=_fallback_result(FallbackLevel.TEMPLATE_CUSTOMIZED)
+        )
+        return orchestrator
+
+    @pytest.mark.asyncio
+    async def test_fast_creative_result_wins(self, orchestrator):
+        """A creative result within the deadline is returned as-is."""
+        creative = _fallback_result(FallbackLevel.FULL_CREATIVE)
+        orchestrator._run_creative_pipeline = AsyncMock(return_value=creative)
+
+        result = await orchestrator.generate("pet grooming app")
+
+        assert result is creative
+
+    @pytest.mark.asyncio
+    async def test_creative_failure_uses_best_fallback(self, orchestrator):
+        """A failing pipeline returns the speculative fallback without retrying it."""
+        orchestrator._run_creative_pipeline = AsyncMock(side_effect=RuntimeError("LLM down"))
+
+        result = await orchestrator.generate("pet grooming app")
+
+        assert result.fallback_info.level == FallbackLevel.TEMPLATE_CUSTOMIZED
+        assert result.fallback_info.original_error == "LLM down"
+        orchestrator._try_template_customized.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_slow_creative_result_delivered_as_upgrade(self, orchestrator, mock_event_callback):
+        """The fallback is returned at the deadline and the late result is emitted."""
+        release = asyncio.Event()
+
+        async def slow_pipeline(**kwargs):
+            await release.wait()
+            return _fallback_result(FallbackLevel.FULL_CREATIVE)
+
+        orchestrator._run_creative_pipeline = slow_pipeline
+
+        result = await orchestrator.generate("pet grooming app")
+        assert result.fallback_info.level == FallbackLevel.TEMPLATE_CUSTOMIZED
+
+        release.set()
+        await asyncio.gather(*orchestrator._upgrade_tasks)
+
+        upgrades = [e for e in mock_event_callback.events if e.type == "prototype_upgrade"]
+        assert len(upgrades) == 1
+        assert upgrades[0].data["files"] == {"App.tsx": "FULL_CREATIVE"}
+
+    @pytest.mark.asyncio
+    async def test_losing_branches_cancelled(self, orchestrator):
+        """Without upgrades, a late pipeline is cancelled once a fallback is delivered."""
+        cancelled = asyncio.Event()
+
+        async def hanging_pipeline(**kwargs):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        orchestrator._run_creative_pipeline = hanging_pipeline
+        orchestrator.upgrade_late_results = False
+
+        result = await orchestrator.generate("pet grooming app")
+
+        assert result.fallback_info.level == FallbackLevel.TEMPLATE_CUSTOMIZED
+        assert cancelled.is_set()
+        assert not orchestrator._upgrade_tasks
+
+    @pytest.mark.asyncio
+    async def test_generator_flag_and_close(self, mock_services, monkeypatch):
+        """CodeGenerator enables speculative mode by flag and cancels upgrades on close."""
+        from src.services import generator as generator_module
+
+        monkeypatch.setattr(generator_module, "USE_SPECULATIVE_FALLBACKS", True)
+        generator = generator_module.CodeGenerator()
+        orchestrator = generator._get_prototype_orchestrator()
+        assert orchestrator.speculative
+
+        cancelled = asyncio.Event()
+
+        async def hanging_pipeline(**kwargs):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        orchestrator.skip_clarification = True
+        orchestrator.speculative_deadline = 0.05
+        orchestrator._run_creative_pipeline = hanging_pipeline
+        orchestrator._try_cached_similar = AsyncMock(return_value=None)
+        orchestrator._try_template_customized = AsyncMock(
+            return_value=_fallback_result(FallbackLevel.TEMPLATE_CUSTOMIZED)
+        )
+
+        await orchestrator.generate("pet grooming app")
+        assert orchestrator._upgrade_tasks
+
+        await generator.close()
+
+        assert cancelled.is_set()
+        assert not orchestrator._upgrade_tasks
+
+
+# ============================================================================
+# Phase Graph Tests
+# ============================================================================
+
+class TestCreativePhaseGraph:
+    """Tests for running the creative pipeline as a phase graph."""
+
+    @pytest.mark.asyncio
+    async def test_compose_and_report_run_concurrently(self, mock_services, mock_event_callback):
+        """UI composition and the business report overlap and timings are emitted."""
+        orchestrator = PrototypeOrchestrator(
+            event_callback=mock_event_callback,
+            use_smart_presets=False,
+            skip_clarification=True,
+        )
+        log = []
+
+        async def compose(**kwargs):
+            log.append("compose:start")
+            await asyncio.sleep(0.02)
+            log.append("compose:end")
+            return {"App.tsx": "export default function App() {}"}
+
+        async def report(**kwargs):
+            log.append("report:start")
+            await asyncio.sleep(0.02)
+            log.append("report:end")
+            return "<html></html>", "comprehensive"
+
+        orchestrator._compose_ui = compose
+        orchestrator._generate_business_report = report
+
+        result = await orchestrator.generate("pet grooming booking app")
+
+        assert result.fallback_info.level == FallbackLevel.FULL_CREATIVE
+        assert log.index("report:start") < log.index("compose:end")
+        assert result.report_type == "comprehensive"
+
+        timing_events = [e for e in mock_event_callback.events if e.type == "phase_timings"]
+        assert len(timing_events) == 1
+        names = {p["name"] for p in timing_events[0].data["phases"]}
+        assert {"domain", "architecture", "content", "quality", "compose", "report"} <= names
+        assert timing_events[0].data["critical_path"][-1] in ("validate", "report")
+        assert result.phase_timings == timing_events[0].data
+
+        # The report finishes (100%) before validation (80-85%); progress never goes back
+        progress = [e.progress for e in mock_event_callback.events]
+        assert progress == sorted(progress)
+
+
 # ============================================================================
 # Error Handling Tests
 # ============================================================================
@@ -0,0 +1,156 @@
+"""
+Tests for streaming structured output
+
+Tests cover:
+- Incremental JSON parsing across arbitrary chunk boundaries
+- Per-field validation of completed values
+- Progressive partial models
+- Early abort and corrective retry on the first invalid field
+"""
+
+import json
+from typing import List
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from src.ai.structured_output import (
+    FieldValidator,
+    IncrementalJSONParser,
+    StreamValidationError,
+    StructuredOutputClient,
+    TaskPlan,
+)
+
+
+VALID_PLAN = {
+    "goal": "Add login",
+    "steps": ["Create form", "Wire API"],
+    "files_to_modify": [],
+    "files_to_create": ["src/login.tsx"],
+    "estimated_complexity": "medium",
+    "risks": [],
+}
+
+
+def _chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def fake_stream(*responses):
+    """stream_fn returning each response in turn; records how much was consumed"""
+    calls = []
+
+    async def stream(messages, **kwargs):
+        text = responses[len(calls)]
+        call = {"messages": messages, "consumed": 0}
+        calls.append(call)
+        for chunk in _chunks(text):
+            call["consumed"] += len(chunk)
+            yield chunk
+
+    stream.calls = calls
+    return stream
+
+
+class TestIncrementalJSONParser:
+    """Tests for IncrementalJSONParser"""
+
+    def test_values_reported_as_they_close(self):
+        parser = IncrementalJSONParser()
+        text = '```json\n{"a": "x\\"}", "b": [1, {"c": 2}], "d": {"e": null}, "f": -1.5}\n```'
+
+        completed = []
+        for char in text:
+            completed.extend(parser.feed(char))
+
+        assert completed == [
+            (("a",), 'x"}'),
+            (("b", 0), 1),
+            (("b", 1), {"c": 2}),
+            (("b",), [1, {"c": 2}]),
+            (("d", "e"), None),
+            (("d",), {"e": None}),
+            (("f",), -1.5),
+        ]
+        assert parser.done
+        assert parser.value == json.loads(text.strip("`json\n"))
+
+    def test_incomplete_object_not_done(self):
+        parser = IncrementalJSONParser()
+
+        assert parser.feed('{"a": 1, "b": [tr') == [(("a",), 1)]
+        assert not parser.done
+
+
+class TestFieldValidator:
+    """Tests for FieldValidator"""
+
+    def test_list_items_validated_individually(self):
+        validator = FieldValidator(TaskPlan)
+
+        assert validator.validate(("steps", 0), "Do it") == "Do it"
+        with pytest.raises(ValidationError):
+            validator.validate(("steps", 1), {"not": "a string"})
+
+    def test_untyped_list_items_accepted(self):
+        class Notes(BaseModel):
+            items: List
+
+        validator = FieldValidator(Notes)
+
+        assert validator.validate(("items", 0), {"any": "value"}) == {"any": "value"}
+
+
+class TestValidatedStream:
+    """Tests for StructuredOutputClient.generate_validated_stream"""
+
+    @pytest.mark.asyncio
+    async def test_partials_then_complete_model(self):
+        stream = fake_stream(json.dumps(VALID_PLAN))
+        client = StructuredOutputClient()
+
+        results = [
+            r async for r in client.generate_validated_stream(
+                TaskPlan, [{"role": "user", "content": "plan"}], stream_fn=stream
+            )
+        ]
+
+        assert [r.completed_fields for r in results[:2]] == [["goal"], ["goal", "steps"]]
+        assert results[0].model.goal == "Add login"
+        assert results[-1].done
+        assert results[-1].model == TaskPlan(**VALID_PLAN)
+
+    @pytest.mark.asyncio
+    async def test_invalid_field_aborts_and_retries(self):
+        bad = dict(VALID_PLAN, steps=["Create form", {"oops": 1}], risks=["x" * 2000])
+        stream = fake_stream(json.dumps(bad), json.dumps(VALID_PLAN))
+        client = StructuredOutputClient()
+
+        results = [
+            r async for r in client.generate_validated_stream(
+                TaskPlan, [{"role": "user", "content": "plan"}], stream_fn=stream
+            )
+        ]
+
+        first, second = stream.calls
+        # The bad list item stopped the first stream long before its end
+        assert first["consumed"] < len(json.dumps(bad)) / 2
+        assert "steps.1" in second["messages"][-1].content
+        assert results[-1].done and results[-1].attempt == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        stream = fake_stream('{"goal": 5, "steps"', '{"goal": "ok"}', "no json at all")
+        client = StructuredOutputClient(max_retries=3)
+
+        with pytest.raises(StreamValidationError) as exc_info:
+            async for _ in client.generate_validated_stream(
+                TaskPlan, [{"role": "user", "content": "plan"}], stream_fn=stream
+            ):
+                pass
+
+        wrong_type, missing_fields, no_json = exc_info.value.errors
+        assert wrong_type.startswith("Field 'goal' is invalid")
+        assert missing_fields.startswith("Response failed validation")
+        assert no_json == "Response ended before the JSON object was complete"
@@ -0,0 +1,210 @@
+"""
+Tests for AgentSupervisor shared state
+
+Tests cover:
+- Circuit breaker open/half-open/closed cycle
+- Transitions broadcast to every supervisor sharing a backend
+- Global retry budget capping retries to a share of requests
+- Statistics summed across supervisors
+- Fail-open when the state backend is unavailable
+- Closing detaches breakers from the backend; the backend is an ABC
+"""
+
+import pytest
+
+from src.services.supervisor import (
+    AgentSupervisor,
+    CircuitBreakerConfig,
+    CircuitState,
+    RetryBudgetConfig,
+    RetryConfig,
+)
+from src.services.supervisor_state import InMemorySupervisorState, SupervisorStateBackend
+
+
+def make_supervisor(state, max_retries=0, failure_threshold=2, timeout_seconds=60.0, budget=None):
+    return AgentSupervisor(
+        retry_config=RetryConfig(max_retries=max_retries, initial_delay=0, jitter=False),
+        circuit_config=CircuitBreakerConfig(
+            failure_threshold=failure_threshold,
+            success_threshold=1,
+            timeout_seconds=timeout_seconds,
+        ),
+        state_backend=state,
+        retry_budget=budget,
+    )
+
+
+async def failing():
+    raise RuntimeError("provider unavailable")
+
+
+async def succeeding():
+    return "ok"
+
+
+class TestCircuitBreaker:
+    """Single-supervisor breaker behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_threshold_and_recovers(self):
+        supervisor = make_supervisor(InMemorySupervisorState(), timeout_seconds=0)
+
+        await supervisor.execute_with_supervision("PM", failing)
+        await supervisor.execute_with_supervision("PM", failing)
+        assert supervisor.get_circuit_status("PM")["state"] == CircuitState.OPEN.value
+
+        # Timeout elapsed: one half-open trial, which succeeds and closes the breaker
+        result = await supervisor.execute_with_supervision("PM", succeeding)
+
+        assert result.success
+        assert supervisor.get_circuit_status("PM")["state"] == CircuitState.CLOSED.value
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_rejects(self):
+        supervisor = make_supervisor(InMemorySupervisorState(), failure_threshold=1)
+
+        await supervisor.execute_with_supervision("PM", failing)
+        result = await supervisor.execute_with_supervision("PM", succeeding)
+
+        assert not result.success
+        assert result.errors == ["Circuit breaker open"]
+
+    @pytest.mark.asyncio
+    async def test_success_without_failures_skips_backend_write(self):
+        class CountingState(InMemorySupervisorState):
+            resets = 0
+
+            async def reset_counter(self, name, counter):
+                self.resets += 1
+                await super().reset_counter(name, counter)
+
+        state = CountingState()
+        supervisor = make_supervisor(state, failure_threshold=3)
+
+        await supervisor.execute_with_supervision("PM", succeeding)
+        await supervisor.execute_with_supervision("PM", succeeding)
+        assert state.resets == 0
+
+        await supervisor.execute_with_supervision("PM", failing)
+        await supervisor.execute_with_supervision("PM", succeeding)
+        assert state.resets == 1
+
+    @pytest.mark.asyncio
+    async def test_close_unsubscribes(self):
+        state = InMemorySupervisorState()
+        supervisor = make_supervisor(state)
+        supervisor._get_circuit("PM")
+        supervisor._get_circuit("QA")
+        assert len(state._callbacks) == 2
+
+        supervisor.close()
+
+        assert state._callbacks == []
+
+    def test_backend_is_abstract(self):
+        with pytest.raises(TypeError):
+            SupervisorStateBackend()
+
+
+class TestSharedCircuits:
+    """Supervisors (workers) sharing one state backend"""
+
+    @pytest.mark.asyncio
+    async def test_failures_counted_across_workers(self):
+        state = InMemorySupervisorState()
+        first, second = make_supervisor(state), make_supervisor(state)
+        second._get_circuit("PM")
+
+        await first.execute_with_supervision("PM", failing)
+        await second.execute_with_supervision("PM", failing)
+
+        assert first.get_circuit_status("PM")["state"] == CircuitState.OPEN.value
+        assert second.get_circuit_status("PM")["state"] == CircuitState.OPEN.value
+        result = await first.execute_with_supervision("PM", succeeding)
+        assert result.errors == ["Circuit breaker open"]
+
+    @pytest.mark.asyncio
+    async def test_new_worker_picks_up_open_circuit(self):
+        state = InMemorySupervisorState()
+        await make_supervisor(state, failure_threshold=1).execute_with_supervision("PM", failing)
+
+        result = await make_supervisor(state).execute_with_supervision("PM", succeeding)
+
+        assert result.errors == ["Circuit breaker open"]
+
+    @pytest.mark.asyncio
+    async def test_reset_closes_circuit_everywhere(self):
+        state = InMemorySupervisorState()
+        first, second = make_supervisor(state, failure_threshold=1), make_supervisor(state)
+        second._get_circuit("PM")
+        await first.execute_with_supervision("PM", failing)
+        assert second.get_circuit_status("PM")["state"] == CircuitState.OPEN.value
+
+        await first.reset_shared_circuit("PM")
+
+        assert second.get_circuit_status("PM")["state"] == CircuitState.CLOSED.value
+        assert (await second.execute_with_supervision("PM", succeeding)).success
+
+    @pytest.mark.asyncio
+    async def test_global_stats(self):
+        state = InMemorySupervisorState()
+        first, second = make_supervisor(state), make_supervisor(state)
+
+        await first.execute_with_supervision("PM", succeeding)
+        await second.execute_with_supervision("PM", succeeding)
+
+        assert first.get_stats()["PM"]["successes"] == 1
+        assert (await first.get_global_stats())["PM"] == {"attempts": 2, "successes": 2}
+
+
+class TestRetryBudget:
+    """Global retry budget"""
+
+    @pytest.mark.asyncio
+    async def test_retries_capped_across_workers(self):
+        state = InMemorySupervisorState()
+        budget = RetryBudgetConfig(enabled=True, ratio=0.5, min_retries=1)
+        workers = [
+            make_supervisor(state, max_retries=3, failure_threshold=100, budget=budget)
+            for _ in range(2)
+        ]
+
+        results = [await w.execute_with_supervision(f"agent-{i}", failing) for i, w in enumerate(workers)]
+
+        # Two requests allow max(1, 0.5 * 2) = 1 retry in total
+        assert sum(r.attempts for r in results) == 3
+        assert all("Retry budget exhausted" in r.errors for r in results)
+        assert (await workers[0].get_global_stats())["agent-0"]["budget_denied"] == 1
+
+    def test_budget_off_by_default(self):
+        assert not RetryBudgetConfig().enabled
+
+    @pytest.mark.asyncio
+    async def test_budget_disabled(self):
+        supervisor = make_supervisor(
+            InMemorySupervisorState(),
+            max_retries=2,
+            failure_threshold=100,
+            budget=RetryBudgetConfig(enabled=False, min_retries=0, ratio=0),
+        )
+
+        result = await supervisor.execute_with_supervision("PM", failing)
+
+        assert result.attempts == 3
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_fail_open(self):
+        class BrokenState(InMemorySupervisorState):
+            async def incr_circuit(self, name, counter):
+                raise ConnectionError("redis down")
+
+            async def acquire_retry(self, ratio, min_retries, window_seconds):
+                raise ConnectionError("redis down")
+
+        supervisor = make_supervisor(BrokenState(), max_retries=1, failure_threshold=2)
+
+        result = await supervisor.execute_with_supervision("PM", failing)
+
+        assert result.attempts == 2
+        assert supervisor.get_circuit_status("PM")["state"] == CircuitState.OPEN.value
@@ -0,0 +1,197 @@
+"""
+Tests for patch-based template customization
+
+Tests cover:
+- Structured patches (JS object keys, JSON keys, tokens)
+- Brand customization touching only tailwind.config.js
+- Memoized renders and invalidation on template reload
+- Incremental validation matching a full validation
+- Reuse of AI output for repeated requests
+"""
+
+import json
+import os
+
+import pytest
+
+from src.services.code_validator import CodeValidator
+from src.services.template_customizer import (
+    BrandProfile,
+    CustomizationRequest,
+    FilePatch,
+    PatchError,
+    PatchOp,
+    TemplateCustomizer,
+    apply_patches,
+)
+from src.services.template_loader import TemplateLoader
+
+
+TAILWIND_CONFIG = """module.exports = {
+  theme: {
+    extend: {
+      colors: {
+        // Brand colors
+        brand: {
+          primary: 'var(--brand-primary, #3B82F6)',
+          secondary: '#10B981',
+        },
+        surface: {
+          DEFAULT: '#ffffff',
+          inverse: '#0f172a',
+        },
+        content: {
+          DEFAULT: '#1e293b',
+        },
+      },
+    },
+  },
+}
+"""
+
+PAGE = "export default function Page() { return <main>Dashboard</main> }\n"
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    root = tmp_path / "dashboard"
+    (root / "src" / "app").mkdir(parents=True)
+    (root / "package.json").write_text(json.dumps({
+        "name": "dashboard",
+        "scripts": {"dev": "next dev"},
+        "dependencies": {"next": "14.0.0", "react": "18.2.0", "react-dom": "18.2.0"},
+    }, indent=2))
+    (root / "tailwind.config.js").write_text(TAILWIND_CONFIG)
+    (root / "src" / "app" / "page.tsx").write_text(PAGE)
+    return tmp_path
+
+
+@pytest.fixture
+def customizer(templates_dir):
+    customizer = TemplateCustomizer()
+    customizer.template_loader = TemplateLoader(str(templates_dir))
+    return customizer
+
+
+class TestPatches:
+    """Tests for FilePatch / apply_patches"""
+
+    def test_js_value_set_preserves_rest_of_file(self):
+        patch = FilePatch("tailwind.config.js", PatchOp.SET_JS_VALUE, "theme.extend.colors.brand.primary", "#ff0000")
+
+        result = patch.apply(TAILWIND_CONFIG)
+
+        assert "primary: '#ff0000'," in result
+        assert "// Brand colors" in result
+        assert "inverse: '#0f172a'" in result
+        assert result.replace("'#ff0000'", "'var(--brand-primary, #3B82F6)'") == TAILWIND_CONFIG
+
+    def test_js_value_inserted_into_parent(self):
+        patch = FilePatch("tailwind.config.js", PatchOp.SET_JS_VALUE, "theme.extend.colors.surface.muted", "#f1f5f9")
+
+        result = patch.apply(TAILWIND_CONFIG)
+
+        assert "muted: '#f1f5f9'," in result
+        assert "DEFAULT: '#ffffff'" in result
+
+    def test_missing_js_parent_raises(self):
+        patch = FilePatch("tailwind.config.js", PatchOp.SET_JS_VALUE, "theme.spacing.gutter", "1rem")
+
+        with pytest.raises(PatchError):
+            patch.apply(TAILWIND_CONFIG)
+
+    def test_apply_patches_reports_touched_files(self):
+        files = {"package.json": '{"name": "a"}', "README.md": "Hello NAME"}
+        patches = [
+            FilePatch("package.json", PatchOp.SET_JSON_VALUE, "name", "a"),
+            FilePatch("README.md", PatchOp.REPLACE_TOKEN, "NAME", "Acme"),
+        ]
+
+        result, touched = apply_patches(files, patches)
+
+        assert result["README.md"] == "Hello Acme"
+        # Setting a value to what it already was leaves the file untouched
+        assert touched == {"README.md"}
+
+
+class TestRender:
+    """Tests for memoized, incrementally validated renders"""
+
+    def test_brand_touches_only_tailwind_config(self, customizer):
+        brand = BrandProfile(primary_color="#123456")
+
+        rendered = customizer.render("dashboard", customizer.brand_patches(brand))
+
+        assert rendered.touched == {"tailwind.config.js"}
+        assert "primary: '#123456'" in rendered.files["tailwind.config.js"]
+        assert rendered.files["src/app/page.tsx"] == PAGE
+
+    def test_repeat_render_is_memoized(self, customizer):
+        patches = customizer.brand_patches(BrandProfile())
+
+        first = customizer.render("dashboard", patches)
+        second = customizer.render("dashboard", list(patches))
+
+        assert not first.from_cache
+        assert second.from_cache
+        assert second.files is first.files
+        assert customizer.cache_stats == {"hits": 1, "misses": 1}
+
+    def test_template_reload_invalidates_render(self, customizer, templates_dir):
+        patches = customizer.brand_patches(BrandProfile())
+        customizer.render("dashboard", patches)
+
+        page = templates_dir / "dashboard" / "src" / "app" / "page.tsx"
+        stat = page.stat()
+        page.write_text(PAGE.replace("Dashboard", "Overview"))
+        os.utime(page, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        customizer.template_loader.reload()
+
+        rendered = customizer.render("dashboard", patches)
+
+        assert not rendered.from_cache
+        assert "Overview" in rendered.files["src/app/page.tsx"]
+
+    def test_incremental_validation_matches_full(self, customizer):
+        patches = [FilePatch("src/app/page.tsx", PatchOp.WRITE_FILE, value="export default function Page( {\n")]
+
+        rendered = customizer.render("dashboard", patches)
+        full = CodeValidator().validate_project(dict(rendered.files))
+
+        assert rendered.validation.is_valid == full.is_valid
+        assert sorted(e.code for e in rendered.validation.errors) == sorted(e.code for e in full.errors)
+        assert sorted(w.code for w in rendered.validation.warnings) == sorted(w.code for w in full.warnings)
+
+
+class TestCustomize:
+    """Tests for TemplateCustomizer.customize"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_skips_ai(self, customizer):
+        calls = []
+
+        async def ai_generate(prompt):
+            calls.append(prompt)
+            return {"src/app/page.tsx": PAGE.replace("Dashboard", "Sales"), "package.json": "{}"}
+
+        request = CustomizationRequest(description="sales dashboard", brand=BrandProfile())
+        first = await customizer.customize(request, ai_generate)
+        second = await customizer.customize(request, ai_generate)
+
+        assert len(calls) == 1
+        assert first.success and not first.fallback_used
+        assert first.touched_files == ["src/app/page.tsx", "tailwind.config.js"]
+        # package.json is protected and keeps the template's content
+        assert json.loads(first.files["package.json"])["name"] == "dashboard"
+        assert second.cached
+        assert second.files == first.files
+
+    @pytest.mark.asyncio
+    async def test_without_ai_returns_branded_template(self, customizer):
+        result = await customizer.customize(
+            CustomizationRequest(description="dashboard", brand=BrandProfile(accent_color="#abcdef"))
+        )
+
+        assert result.success
+        assert result.touched_files == ["tailwind.config.js"]
+        assert "accent: '#abcdef'" in result.files["tailwind.config.js"]
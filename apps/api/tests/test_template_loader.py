@@ -0,0 +1,127 @@
+"""
+Tests for the template registry
+
+Tests cover:
+- Lazy loading of template file contents
+- Frozen, shared file mappings
+- Hot reload of changed templates
+- Process-wide singleton
+"""
+
+import os
+
+import pytest
+
+from src.services import template_loader as template_loader_module
+from src.services.template_loader import TemplateLoader, get_template_loader
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    for template_id, page in [("dashboard", "Dashboard"), ("e-commerce", "Shop")]:
+        root = tmp_path / template_id
+        (root / "src" / "app").mkdir(parents=True)
+        (root / "package.json").write_text('{"name": "%s"}' % template_id)
+        (root / "src" / "app" / "page.tsx").write_text(f"export default function Page() {{ return '{page}' }}")
+        (root / "node_modules" / "dep").mkdir(parents=True)
+        (root / "node_modules" / "dep" / "index.js").write_text("module.exports = {}")
+    return tmp_path
+
+
+def _touch_later(path, content):
+    """Rewrite a file with an mtime guaranteed to differ from the original"""
+    stat = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestLazyLoading:
+    """Manifests up front, contents on first access"""
+
+    def test_manifests_read_without_contents(self, templates_dir):
+        loader = TemplateLoader(str(templates_dir))
+
+        manifests = {m.id: m for m in loader.list_manifests()}
+
+        assert set(manifests) == {"dashboard", "e-commerce"}
+        assert manifests["dashboard"].paths == ["package.json", "src/app/page.tsx"]
+        assert loader._templates == {}
+
+    def test_select_loads_only_chosen_template(self, templates_dir):
+        loader = TemplateLoader(str(templates_dir))
+
+        template = loader.select_template("an online shop with a cart")
+
+        assert template.id == "e-commerce"
+        assert set(loader._templates) == {"e-commerce"}
+
+    def test_select_defaults_to_dashboard(self, templates_dir):
+        loader = TemplateLoader(str(templates_dir))
+
+        assert loader.select_template("something unrelated").id == "dashboard"
+
+
+class TestFileMappings:
+    """Frozen per-template mappings"""
+
+    def test_frozen_mapping_shared(self, templates_dir):
+        loader = TemplateLoader(str(templates_dir))
+
+        files = loader.get_template_files("dashboard")
+
+        assert files is loader.get_template_files("dashboard")
+        with pytest.raises(TypeError):
+            files["package.json"] = "{}"
+
+    def test_files_dict_is_a_private_copy(self, templates_dir):
+        loader = TemplateLoader(str(templates_dir))
+
+        copy = loader.get_template_files_dict("dashboard")
+        copy["src/data/mock.json"] = "{}"
+
+        assert "src/data/mock.json" not in loader.get_template_files("dashboard")
+        assert loader.get_template_files_dict("missing") == {}
+
+
+class TestHotReload:
+    """mtime-based reload without restarting"""
+
+    def test_changed_template_reloaded(self, templates_dir, monkeypatch):
+        monkeypatch.setattr(template_loader_module, "RELOAD_CHECK_INTERVAL", 0.0)
+        loader = TemplateLoader(str(templates_dir))
+        before = loader.get_template_files("dashboard")
+        shop = loader.get_template("e-commerce")
+
+        _touch_later(templates_dir / "dashboard" / "src" / "app" / "page.tsx", "export default 'v2'")
+
+        after = loader.get_template_files("dashboard")
+        assert after is not before
+        assert after["src/app/page.tsx"] == "export default 'v2'"
+        # Unchanged templates keep their cached contents
+        assert loader.get_template("e-commerce") is shop
+
+    def test_new_template_discovered(self, templates_dir, monkeypatch):
+        monkeypatch.setattr(template_loader_module, "RELOAD_CHECK_INTERVAL", 0.0)
+        loader = TemplateLoader(str(templates_dir))
+
+        (templates_dir / "saas-app").mkdir()
+        (templates_dir / "saas-app" / "package.json").write_text("{}")
+
+        assert loader.get_template("saas-app") is not None
+
+    def test_no_reload_within_interval(self, templates_dir):
+        loader = TemplateLoader(str(templates_dir))
+        before = loader.get_template_files("dashboard")
+
+        _touch_later(templates_dir / "dashboard" / "package.json", "{}")
+
+        assert loader.get_template_files("dashboard") is before
+        loader.reload()
+        assert loader.get_template_files("dashboard")["package.json"] == "{}"
+
+
+class TestSingleton:
+    """Process-wide loader"""
+
+    def test_get_template_loader_returns_same_instance(self):
+        assert get_template_loader() is get_template_loader()
@@ -0,0 +1,175 @@
+"""
+Tests for token counting and context budgeting
+
+Tests cover:
+- BPE tokenizer loaded from a local vocab file
+- Heuristic fallback, with a startup warning, when no vocab is available
+- Count caching by text hash
+- Context budgeting: history dropped and summarized, context truncated
+- Router trimming messages to the provider's window
+"""
+
+import base64
+
+import pytest
+
+from src.llm.providers import LLMMessage, MockProvider
+from src.llm.router import LLMRouter
+from src.llm.tokenizer import (
+    TRUNCATION_MARKER,
+    ContextBudgeter,
+    HeuristicTokenizer,
+    TokenCounter,
+    Tokenizer,
+    context_window,
+    load_bpe_tokenizer,
+    warn_if_vocab_missing,
+)
+
+
+class WordTokenizer(Tokenizer):
+    """One token per whitespace-separated word"""
+
+    name = "words"
+
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, text):
+        self.calls += 1
+        return len(text.split())
+
+
+@pytest.fixture
+def counter():
+    counter = TokenCounter(vocab_dir="/nonexistent")
+    counter.register_tokenizer("", WordTokenizer())
+    return counter
+
+
+def write_vocab(directory, merges):
+    """Write a .tiktoken vocab: all single bytes plus the given merges"""
+    tokens = [bytes([b]) for b in range(256)] + [m.encode() for m in merges]
+    lines = [f"{base64.b64encode(t).decode()} {rank}" for rank, t in enumerate(tokens)]
+    (directory / "cl100k_base.tiktoken").write_text("\n".join(lines) + "\n")
+
+
+class TestTokenCounter:
+    """Tests for TokenCounter"""
+
+    def test_bpe_from_local_vocab(self, tmp_path):
+        pytest.importorskip("tiktoken")
+        write_vocab(tmp_path, ["he", "ll", "hell", "hello"])
+        counter = TokenCounter(vocab_dir=str(tmp_path))
+
+        tokenizer = counter.tokenizer_for("claude-sonnet-4")
+        assert tokenizer.name == "cl100k_base"
+        # "hello" merges to one token; " world" stays bytes
+        assert counter.count("hello", "claude-sonnet-4") == 1
+        assert counter.count("hello world", "claude-sonnet-4") == 7
+        assert counter.truncate("hello world", 3, "claude-sonnet-4") == "hello w"
+        load_bpe_tokenizer.cache_clear()
+
+    def test_heuristic_without_vocab(self):
+        counter = TokenCounter(vocab_dir="/nonexistent")
+
+        assert isinstance(counter.tokenizer_for("gpt-4o"), HeuristicTokenizer)
+        # Symbols count individually; words cost ~1 token per 4 characters
+        assert counter.count("a = b + c;") == 6
+        assert counter.count("internationalization") == 5
+
+    def test_warns_about_missing_vocab(self, tmp_path, caplog):
+        (tmp_path / "cl100k_base.tiktoken").write_text("")
+
+        assert warn_if_vocab_missing(str(tmp_path)) == ["o200k_base"]
+        assert "fetch_tokenizers.py" in caplog.text
+
+    def test_counts_cached_by_hash(self, counter):
+        tokenizer = counter.tokenizer_for("any")
+
+        for _ in range(3):
+            assert counter.count("one two three") == 3
+
+        assert tokenizer.calls == 1
+        assert counter.cache_stats == {"hits": 2, "misses": 1}
+
+    def test_context_window_by_prefix(self):
+        assert context_window("claude-sonnet-4-20250514") == 200_000
+        assert context_window("gpt-4o-mini") == 128_000
+        assert context_window("gpt-4") == 8_192
+
+
+class TestContextBudgeter:
+    """Tests for ContextBudgeter"""
+
+    def test_unchanged_when_within_budget(self, counter):
+        messages = [LLMMessage("system", "be brief"), LLMMessage("user", "hi")]
+
+        result = ContextBudgeter("m", reserved_output_tokens=10, counter=counter, window=100).fit(messages)
+
+        assert result.messages == messages
+        assert not result.changed
+
+    def test_drops_oldest_history_with_summary(self, counter):
+        messages = [LLMMessage("system", "rules " * 10)]
+        messages += [LLMMessage("user" if i % 2 else "assistant", f"turn{i} " * 30) for i in range(6)]
+        messages.append(LLMMessage("user", "final question"))
+
+        summaries = []
+
+        def summarize(dropped):
+            summaries.append(list(dropped))
+            return f"{len(dropped)} turns about setup"
+
+        result = ContextBudgeter(
+            "m", reserved_output_tokens=50, counter=counter, window=200, summarize_fn=summarize,
+        ).fit(messages)
+
+        assert result.fits
+        assert result.dropped_messages == 3
+        assert summaries == [messages[1:4]]
+        assert result.messages[0] == messages[0]
+        assert "3 turns about setup" in result.messages[1].content
+        assert result.messages[2:] == messages[4:]
+
+    def test_truncates_context_before_final_message(self, counter):
+        messages = [
+            LLMMessage("system", "context " * 500, cacheable=True),
+            LLMMessage("user", "question " * 20),
+        ]
+
+        result = ContextBudgeter("m", reserved_output_tokens=100, counter=counter, window=300).fit(messages)
+
+        assert result.fits
+        assert result.truncated_messages == 1
+        assert result.messages[0].content.endswith(TRUNCATION_MARKER)
+        assert result.messages[0].cacheable
+        assert result.messages[1] == messages[1]
+
+    def test_output_reserve_capped_at_half_window(self, counter):
+        assert ContextBudgeter("m", reserved_output_tokens=10_000, counter=counter, window=1000).budget == 500
+
+
+class TestRouterBudgeting:
+    """LLMRouter trims requests to the provider's window"""
+
+    @pytest.mark.asyncio
+    async def test_oversized_history_trimmed(self):
+        class SmallProvider(MockProvider):
+            name = "small"
+            model = "gpt-4"  # 8K window
+
+            async def generate(self, messages, max_tokens=4096, temperature=0.7, **kwargs):
+                self.sent = messages
+                return await super().generate(messages, max_tokens, temperature, **kwargs)
+
+        provider = SmallProvider(delay=0)
+        router = LLMRouter(use_mock_fallback=False)
+        router.add_provider(provider)
+        history = [LLMMessage("assistant", "x " * 4000) for _ in range(5)]
+
+        await router.generate(history + [LLMMessage("user", "continue")], max_tokens=1000)
+
+        assert len(provider.sent) < 6
+        assert provider.sent[-1].content == "continue"
+        assert router.get_stats()["context_trims"] == 1
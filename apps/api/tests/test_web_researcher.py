@@ -7,7 +7,11 @@ Tests cover:
 3. Result parsing
 4. Confidence scoring
 5. Error handling and fallbacks
+6. Concurrent execution under an overall deadline
+7. Persistent query-result cache
 """
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from dataclasses import dataclass
@@ -16,6 +20,14 @@ from typing import List, Dict
 # Note: conftest.py sets up the Python path correctly
 try:
     from src.services.web_researcher import WebResearcher, DomainResearch, get_web_researcher
+    from src.services.web_researcher import (
+        FixtureSearchBackend,
+        ResearchCache,
+        ResearchExecutor,
+        SearchBackend,
+        SearchResult,
+        normalize_query,
+    )
     WEB_RESEARCHER_AVAILABLE = True
 except ImportError:
     WEB_RESEARCHER_AVAILABLE = False
@@ -293,5 +305,105 @@ class TestIntegration:
         pass
 
 
+# ============================================================================
+# Concurrent Execution Tests
+# ============================================================================
+
+class SlowBackend(SearchBackend):
+    """Backend with per-query latency; tracks peak concurrency"""
+
+    def __init__(self, delays, fail=()):
+        self.delays = delays
+        self.fail = fail
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+
+    async def search(self, query, max_results=5):
+        self.calls.append(query)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(query, 0.01))
+            if query in self.fail:
+                raise RuntimeError("backend error")
+            return [SearchResult(title=query, url=f"https://example.com/{query}", content=query, score=0.5)]
+        finally:
+            self.in_flight -= 1
+
+
+class TestResearchExecutor:
+    """Tests for ResearchExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_queries_run_concurrently(self):
+        backend = SlowBackend({f"q{i}": 0.1 for i in range(5)})
+        executor = ResearchExecutor(backend, deadline_seconds=5)
+
+        run = await executor.run({f"t{i}": f"q{i}" for i in range(5)}, "pets")
+
+        assert backend.peak == 5
+        assert run.elapsed_seconds < 0.3
+        assert sorted(run.results) == [f"t{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_partial_results_at_deadline(self):
+        backend = SlowBackend({"fast": 0.01, "slow": 5.0, "broken": 0.01}, fail={"broken"})
+        executor = ResearchExecutor(backend, deadline_seconds=0.2)
+        seen = []
+
+        async def on_result(query_type, results):
+            seen.append(query_type)
+
+        run = await executor.run({"a": "fast", "b": "slow", "c": "broken"}, "pets", on_result=on_result)
+
+        assert sorted(seen) == ["a", "c"]
+        assert run.timed_out == ["b"] and run.failed == ["c"]
+        assert run.results["b"] == [] and len(run.results["a"]) == 1
+        assert run.elapsed_seconds < 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded(self):
+        backend = SlowBackend({f"q{i}": 0.02 for i in range(6)})
+        executor = ResearchExecutor(backend, max_concurrency=2)
+
+        await executor.run({f"t{i}": f"q{i}" for i in range(6)}, "pets")
+
+        assert backend.peak == 2
+
+
+class TestResearchCache:
+    """Tests for ResearchCache."""
+
+    def test_key_normalizes_query_and_buckets_by_day(self, tmp_path):
+        cache = ResearchCache(tmp_path)
+        day = 86400 * 20000
+
+        assert normalize_query("  Pet  Grooming, Trends! ") == "pet grooming trends"
+        assert cache.key("Pet grooming trends", "Pets", now=day) == cache.key("pet grooming  trends?", "pets", now=day + 100)
+        assert cache.key("pet grooming trends", "pets", now=day) != cache.key("pet grooming trends", "pets", now=day + 86400)
+        assert cache.key("pet grooming trends", "pets", now=day) != cache.key("pet grooming trends", "vets", now=day)
+
+    @pytest.mark.asyncio
+    async def test_second_project_in_industry_hits_cache(self, tmp_path):
+        backend = FixtureSearchBackend({
+            "trends": MOCK_TAVILY_RESPONSE["results"][:1],
+            "companies": MOCK_TAVILY_RESPONSE["results"][2:],
+        })
+        first = WebResearcher(backend=backend, cache=ResearchCache(tmp_path))
+        research = await first.research_domain("Grooming dashboard", "pet-services")
+        calls_after_first = len(backend.queries)
+
+        # New researcher instance: cache is read back from disk
+        second = WebResearcher(backend=backend, cache=ResearchCache(tmp_path))
+        again = await second.research_domain("Mobile grooming app", "pet-services")
+
+        assert calls_after_first == research.queries_executed == 5
+        assert len(backend.queries) == calls_after_first
+        assert second.cache.stats["hits"] == 5
+        assert [c.name for c in again.competitors] == [c.name for c in research.competitors]
+        assert again.raw_results["trends"][0].title == "Pet Grooming Industry Trends 2024"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,268 @@
+"""
+Tests for workflow checkpointing and resume
+
+Tests cover:
+- SQLite store round trip for run state and node outputs
+- State checkpointed after every agent
+- Resume after a crash runs only unfinished agents and their dependents
+- Cross-run reuse of outputs for identical agent inputs
+- Database location outside the source tree, overridable by environment
+- Resume endpoint running the workflow in the background
+"""
+
+import asyncio
+
+import pytest
+
+from fastapi import HTTPException
+
+from src.routes import generation as generation_routes
+from src.services import agent_executor as agent_executor_module
+from src.services import generator as generator_module
+from src.services import workflow_checkpoints
+from src.services.agent_executor import AgentResult
+from src.services.orchestrator import AgentOrchestrator, WorkflowStatus
+from src.services.workflow_checkpoints import (
+    DEFAULT_DB_PATH,
+    CheckpointStore,
+    SQLiteCheckpointStore,
+    node_input_hash,
+)
+from src.services.workflows import get_workflow
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def fake_agents(monkeypatch):
+    """Replace agent execution with stubs; agents listed in `fail` raise"""
+    calls = {"ran": [], "fail": set()}
+
+    async def fake_execute_agent(agent_id, context, on_progress=None):
+        calls["ran"].append(agent_id)
+        await asyncio.sleep(0)
+        if agent_id in calls["fail"]:
+            raise RuntimeError("provider unavailable")
+        return AgentResult(agent_id=agent_id, success=True, output=f"{agent_id} output", duration_ms=5)
+
+    monkeypatch.setattr(agent_executor_module, "execute_agent", fake_execute_agent)
+    return calls
+
+
+class TestSQLiteCheckpointStore:
+    """Tests for SQLiteCheckpointStore"""
+
+    @pytest.mark.asyncio
+    async def test_state_round_trip(self, store):
+        state = {"project_id": "p1", "completed_agents": ["a"], "pending_agents": ["b"], "errors": []}
+
+        await store.save_state("run-1", "research_only", "running", state)
+        checkpoint = await store.load_state("run-1")
+
+        assert checkpoint.state == state
+        assert checkpoint.completed_agents == ["a"]
+        assert checkpoint.pending_agents == ["b"]
+        assert await store.load_state("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_finds_latest_output_by_input_hash(self, store):
+        input_hash = node_input_hash("a", {"description": "x"})
+
+        await store.save_node_output("run-1", "a", input_hash, {"output": 1})
+        await store.save_node_output("run-2", "a", input_hash, {"output": 2})
+
+        assert await store.find_output(input_hash) == {"output": 2}
+        assert await store.find_output(node_input_hash("a", {"description": "y"})) is None
+
+    @pytest.mark.asyncio
+    async def test_delete_run(self, store):
+        await store.save_state("run-1", "research_only", "running", {})
+        await store.save_node_output("run-1", "a", "h", {"output": 1})
+
+        await store.delete_run("run-1")
+
+        assert await store.load_state("run-1") is None
+        assert await store.find_output("h") is None
+
+    def test_database_path(self, tmp_path, monkeypatch):
+        package_dir = workflow_checkpoints.__file__.rsplit("/src/", 1)[0]
+        assert not str(DEFAULT_DB_PATH).startswith(package_dir)
+
+        monkeypatch.setenv("CHECKPOINT_DB_PATH", str(tmp_path / "env.db"))
+        store = SQLiteCheckpointStore()
+
+        assert store.path == tmp_path / "env.db"
+        store.close()
+
+    def test_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            CheckpointStore()
+
+
+class TestResume:
+    """AgentOrchestrator checkpointing and resume_workflow"""
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_after_every_agent(self, store, fake_agents):
+        saved = []
+        save_state = store.save_state
+
+        async def recording_save(run_id, workflow_type, status, state):
+            saved.append((status, list(state["completed_agents"])))
+            await save_state(run_id, workflow_type, status, state)
+
+        store.save_state = recording_save
+        agents = get_workflow("research_only").agent_ids
+
+        result = await AgentOrchestrator(checkpoint_store=store).run_workflow(
+            "A todo app", "web", "p1", workflow_type="research_only", run_id="run-1"
+        )
+
+        assert result.status == WorkflowStatus.COMPLETED
+        assert result.run_id == "run-1"
+        assert [completed for status, completed in saved if status == "running"][1:] == [
+            agents[:i] for i in range(1, len(agents) + 1)
+        ]
+        checkpoint = await store.load_state("run-1")
+        assert checkpoint.status == "completed"
+        assert checkpoint.pending_agents == []
+
+    @pytest.mark.asyncio
+    async def test_resume_runs_only_unfinished_agents(self, store, fake_agents):
+        agents = get_workflow("research_only").agent_ids
+        fake_agents["fail"] = {agents[1]}
+
+        first = await AgentOrchestrator(checkpoint_store=store).run_workflow(
+            "A todo app", "web", "p1", workflow_type="research_only", run_id="run-1"
+        )
+        assert first.errors
+
+        fake_agents["fail"] = set()
+        fake_agents["ran"].clear()
+        resumed = await AgentOrchestrator(checkpoint_store=store).resume_workflow("run-1")
+
+        assert fake_agents["ran"] == agents[1:]
+        assert resumed.status == WorkflowStatus.COMPLETED
+        assert resumed.errors == []
+        assert resumed.successful_agents == resumed.total_agents == len(agents)
+
+    @pytest.mark.asyncio
+    async def test_resume_after_interruption(self, store, fake_agents, monkeypatch):
+        agents = get_workflow("research_only").agent_ids
+        fake_execute_agent = agent_executor_module.execute_agent
+
+        async def crashing_execute_agent(agent_id, context, on_progress=None):
+            if agent_id == agents[2]:
+                raise asyncio.CancelledError()
+            return await fake_execute_agent(agent_id, context, on_progress)
+
+        monkeypatch.setattr(agent_executor_module, "execute_agent", crashing_execute_agent)
+        interrupted = await AgentOrchestrator(checkpoint_store=store).run_workflow(
+            "A todo app", "web", "p1", workflow_type="research_only", run_id="run-1"
+        )
+        assert interrupted.status == WorkflowStatus.FAILED
+
+        checkpoint = await store.load_state("run-1")
+        assert checkpoint.status == "running"
+        assert checkpoint.completed_agents == agents[:2]
+
+        monkeypatch.setattr(agent_executor_module, "execute_agent", fake_execute_agent)
+        fake_agents["ran"].clear()
+        resumed = await AgentOrchestrator(checkpoint_store=store).resume_workflow("run-1")
+
+        assert fake_agents["ran"] == agents[2:]
+        assert resumed.status == WorkflowStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_resume_unknown_run(self, store):
+        with pytest.raises(KeyError):
+            await AgentOrchestrator(checkpoint_store=store).resume_workflow("missing")
+
+
+class TestOutputReuse:
+    """Cross-run reuse of stored outputs"""
+
+    @pytest.mark.asyncio
+    async def test_identical_inputs_reuse_outputs(self, store, fake_agents):
+        events = []
+
+        async def collect(event):
+            events.append(event)
+
+        await AgentOrchestrator(checkpoint_store=store).run_workflow(
+            "A todo app", "web", "p1", workflow_type="research_only", run_id="run-1"
+        )
+        fake_agents["ran"].clear()
+
+        result = await AgentOrchestrator(
+            event_callback=collect, checkpoint_store=store, reuse_outputs=True
+        ).run_workflow("A todo app", "web", "p2", workflow_type="research_only", run_id="run-2")
+
+        assert fake_agents["ran"] == []
+        assert result.status == WorkflowStatus.COMPLETED
+        assert all(e.data["reused"] for e in events if e.type == "agent_complete")
+
+    @pytest.mark.asyncio
+    async def test_changed_inputs_run_again(self, store, fake_agents):
+        await AgentOrchestrator(checkpoint_store=store).run_workflow(
+            "A todo app", "web", "p1", workflow_type="research_only", run_id="run-1"
+        )
+        fake_agents["ran"].clear()
+
+        await AgentOrchestrator(checkpoint_store=store, reuse_outputs=True).run_workflow(
+            "A habit tracker", "web", "p2", workflow_type="research_only", run_id="run-2"
+        )
+
+        assert fake_agents["ran"] == get_workflow("research_only").agent_ids
+
+
+class TestResumeEndpoint:
+    """POST /generate/runs/{run_id}/resume"""
+
+    @pytest.mark.asyncio
+    async def test_resumes_in_background_and_streams_events(self, store, fake_agents, monkeypatch):
+        sent = []
+
+        async def broadcast(project_id, data):
+            sent.append((project_id, data["type"]))
+            return 1
+
+        async def save(project_id, files):
+            return None
+
+        monkeypatch.setattr(workflow_checkpoints, "_store", store)
+        monkeypatch.setattr(generation_routes.manager, "broadcast_to_project", broadcast)
+        monkeypatch.setattr(generator_module, "save_project_files", save)
+        fake_agents["fail"] = {get_workflow("research_only").agent_ids[-1]}
+        await AgentOrchestrator(checkpoint_store=store).run_workflow(
+            "A todo app", "web", "p1", workflow_type="research_only", run_id="run-1"
+        )
+        fake_agents["fail"].clear()
+
+        response = await generation_routes.resume_run("run-1")
+        assert response["status"] == "resuming"
+        assert response["project_id"] == "p1"
+
+        with pytest.raises(HTTPException) as conflict:
+            await generation_routes.resume_run("run-1")
+        assert conflict.value.status_code == 409
+
+        await generation_routes._resume_tasks["run-1"]
+
+        assert (await store.load_state("run-1")).status == WorkflowStatus.COMPLETED.value
+        assert sent[-1] == ("p1", "complete")
+        assert not [t for _, t in sent if t == "error"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_run(self, store, monkeypatch):
+        monkeypatch.setattr(workflow_checkpoints, "_store", store)
+
+        with pytest.raises(HTTPException) as missing:
+            await generation_routes.resume_run("missing")
+
+        assert missing.value.status_code == 404
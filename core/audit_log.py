@@ -1,16 +1,177 @@
 """
 Audit logging for self-improvement operations.
 Append-only JSONL format for traceability and compound improvement tracking.
+
+The active log is rotated into gzip-compressed segments once it exceeds
+MAX_SEGMENT_BYTES or MAX_SEGMENT_AGE, and a small JSON sidecar holds
+per-action counters that are updated on every append (and decremented when
+old segments are pruned). Recent entries are read backwards from the end of
+the log, so neither query depends on how much history has accumulated.
+
+Appends, rotation and sidecar updates run under an exclusive lock on a
+sibling .lock file, so several worker processes can share one log.
 """
 
+import gzip
 import json
-from datetime import datetime, timezone
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+# File locking - cross-platform, as in projects_store
+try:
+    import fcntl  # Unix/Linux/Mac
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+    try:
+        import msvcrt  # Windows
+        HAS_MSVCRT = True
+    except ImportError:
+        HAS_MSVCRT = False
 
 # Log file location - relative to project root
 AUDIT_FILE = Path(__file__).parent.parent / "logs" / "self_improvement_audit.jsonl"
 
+# Rotation policy
+MAX_SEGMENT_BYTES = 10 * 1024 * 1024  # Rotate when the active log reaches 10MB
+MAX_SEGMENT_AGE = timedelta(days=7)  # ...or when its first entry is a week old
+MAX_SEGMENTS = 50  # Oldest compressed segments beyond this are deleted
+
+STATS_VERSION = 1
+
+# Serializes threads within the process; _locked() adds the cross-process file lock
+_lock = threading.Lock()
+
+
+def _stats_file() -> Path:
+    return AUDIT_FILE.with_name(f"{AUDIT_FILE.stem}.stats.json")
+
+
+def _lock_file() -> Path:
+    return AUDIT_FILE.with_name(f"{AUDIT_FILE.stem}.lock")
+
+
+@contextmanager
+def _locked() -> Iterator[None]:
+    """Hold the log exclusively against other threads and other processes."""
+    AUDIT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with _lock, open(_lock_file(), "a+b") as handle:
+        if HAS_FCNTL:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        elif HAS_MSVCRT:
+            # Windows locking - lock 1 byte at position 0 (retries for ~10s)
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if HAS_FCNTL:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            elif HAS_MSVCRT:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _segment_glob() -> str:
+    return f"{AUDIT_FILE.stem}.*.jsonl.gz"
+
+
+def _segments() -> list[Path]:
+    """Compressed segments, oldest first (names sort chronologically)."""
+    return sorted(AUDIT_FILE.parent.glob(_segment_glob()))
+
+
+def _empty_stats() -> dict:
+    return {
+        "version": STATS_VERSION,
+        "counts": {},
+        "total_entries": 0,
+        "last_timestamp": None,
+        "segment_started": None,
+    }
+
+
+def _load_stats() -> dict:
+    """Load the stats sidecar, rebuilding it from the log if missing or stale."""
+    stats_file = _stats_file()
+    if stats_file.exists():
+        try:
+            stats = json.loads(stats_file.read_text(encoding="utf-8"))
+            if stats.get("version") == STATS_VERSION:
+                return stats
+        except (json.JSONDecodeError, OSError):
+            pass
+
+    if AUDIT_FILE.exists() or _segments():
+        return _rebuild_stats()
+    return _empty_stats()
+
+
+def _save_stats(stats: dict) -> None:
+    stats_file = _stats_file()
+    tmp = stats_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(stats), encoding="utf-8")
+    os.replace(tmp, stats_file)
+
+
+def _needs_rotation(stats: dict, now: datetime) -> bool:
+    if not AUDIT_FILE.exists():
+        return False
+    if AUDIT_FILE.stat().st_size >= MAX_SEGMENT_BYTES:
+        return True
+    started = stats.get("segment_started")
+    return bool(started) and now - datetime.fromisoformat(started) >= MAX_SEGMENT_AGE
+
+
+def _count_entries(f, stats: dict, sign: int = 1) -> Optional[str]:
+    """Add (or with sign=-1, subtract) the entries of an open log to stats.
+
+    Returns the timestamp of the first entry, if any.
+    """
+    first_timestamp = None
+    for line in f:
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        action = entry.get("action")
+        count = stats["counts"].get(action, 0) + sign
+        if count > 0:
+            stats["counts"][action] = count
+        else:
+            stats["counts"].pop(action, None)
+        stats["total_entries"] = max(0, stats["total_entries"] + sign)
+        if sign > 0:
+            stats["last_timestamp"] = entry.get("timestamp")
+        if first_timestamp is None:
+            first_timestamp = entry.get("timestamp")
+    return first_timestamp
+
+
+def _rotate(now: datetime, stats: dict) -> Path:
+    """Compress the active log into a timestamped segment and start a new one.
+
+    Segments pruned beyond MAX_SEGMENTS have their entries subtracted from
+    stats, so the sidecar keeps describing exactly the retained history.
+    """
+    segment = AUDIT_FILE.with_name(f"{AUDIT_FILE.stem}.{now.strftime('%Y%m%dT%H%M%S%f')}.jsonl.gz")
+    with open(AUDIT_FILE, "rb") as src, gzip.open(segment, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    AUDIT_FILE.unlink()
+    stats["segment_started"] = None
+
+    segments = _segments()
+    for old in segments[:max(0, len(segments) - MAX_SEGMENTS)]:
+        with gzip.open(old, "rt", encoding="utf-8") as f:
+            _count_entries(f, stats, sign=-1)
+        old.unlink(missing_ok=True)
+
+    return segment
+
 
 def log_improvement(
     action: str,
@@ -30,40 +191,91 @@ def log_improvement(
     Returns:
         The logged entry
     """
-    AUDIT_FILE.parent.mkdir(parents=True, exist_ok=True)
-
+    now = datetime.now(timezone.utc)
     entry = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": now.isoformat(),
         "action": action,
         "details": details,
         "git_commit": git_commit,
         "git_branch": git_branch
     }
 
-    with open(AUDIT_FILE, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
+    with _locked():
+        stats = _load_stats()
+
+        if _needs_rotation(stats, now):
+            _rotate(now, stats)
+
+        with open(AUDIT_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+        stats["counts"][action] = stats["counts"].get(action, 0) + 1
+        stats["total_entries"] += 1
+        stats["last_timestamp"] = entry["timestamp"]
+        if not stats.get("segment_started"):
+            stats["segment_started"] = entry["timestamp"]
+        _save_stats(stats)
 
     return entry
 
 
+def _read_lines_reversed(path: Path, block_size: int = 8192) -> Iterator[str]:
+    """Yield the lines of a file from last to first, reading fixed-size blocks."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + remainder
+            lines = block.split(b"\n")
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line.decode("utf-8")
+
+        if remainder.strip():
+            yield remainder.decode("utf-8")
+
+
+def _iter_entries_newest_first() -> Iterator[dict]:
+    """Decode entries lazily from the active log, then from older segments."""
+    if AUDIT_FILE.exists():
+        for line in _read_lines_reversed(AUDIT_FILE):
+            yield json.loads(line)
+
+    for segment in reversed(_segments()):
+        with gzip.open(segment, "rt", encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+        for line in reversed(lines):
+            yield json.loads(line)
+
+
 def get_recent_improvements(limit: int = 10) -> list[dict]:
     """
     Read recent improvement events from the audit log.
 
+    Only the last `limit` lines are decoded, reading backwards from the end
+    of the active log (and into compressed segments if it holds fewer).
+
     Args:
         limit: Maximum number of entries to return (most recent first)
 
     Returns:
         List of improvement entries, newest first
     """
-    if not AUDIT_FILE.exists():
-        return []
+    entries = []
+    if limit <= 0:
+        return entries
 
-    with open(AUDIT_FILE, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    entries = [json.loads(line) for line in lines if line.strip()]
-    return entries[-limit:][::-1]  # Return newest first
+    for entry in _iter_entries_newest_first():
+        entries.append(entry)
+        if len(entries) >= limit:
+            break
+    return entries
 
 
 def get_improvement_stats() -> dict:
@@ -71,48 +283,74 @@ def get_improvement_stats() -> dict:
     Calculate statistics about self-improvement runs.
     Useful for tracking compound improvement over time.
 
+    Served from the stats sidecar maintained by log_improvement, so the
+    cost does not grow with the length of the history.
+
     Returns:
         Dictionary with stats (total runs, success rate, etc.)
     """
-    if not AUDIT_FILE.exists():
-        return {
-            "total_runs": 0,
-            "successful_runs": 0,
-            "failed_runs": 0,
-            "success_rate": 0.0,
-            "last_run": None
-        }
-
-    with open(AUDIT_FILE, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    entries = [json.loads(line) for line in lines if line.strip()]
+    with _locked():
+        stats = _load_stats()
+    counts = stats["counts"]
 
-    starts = [e for e in entries if e["action"] == "self_improve_start"]
-    completes = [e for e in entries if e["action"] == "self_improve_complete"]
-    failures = [e for e in entries if e["action"] == "self_improve_failed"]
-
-    total = len(starts)
-    successful = len(completes)
-    failed = len(failures)
+    total = counts.get("self_improve_start", 0)
+    successful = counts.get("self_improve_complete", 0)
+    failed = counts.get("self_improve_failed", 0)
 
     return {
         "total_runs": total,
         "successful_runs": successful,
         "failed_runs": failed,
         "success_rate": (successful / total * 100) if total > 0 else 0.0,
-        "last_run": entries[-1]["timestamp"] if entries else None
+        "last_run": stats["last_timestamp"]
     }
 
 
+def rebuild_stats() -> dict:
+    """
+    Recompute the stats sidecar by scanning every segment and the active log.
+
+    Only needed when the sidecar is missing or corrupt (e.g. logs written by
+    an older version); normal appends keep it up to date incrementally.
+
+    Returns:
+        The rebuilt stats
+    """
+    with _locked():
+        return _rebuild_stats()
+
+
+def _rebuild_stats() -> dict:
+    """rebuild_stats() body; the caller holds _locked()."""
+    stats = _empty_stats()
+
+    for segment in _segments():
+        with gzip.open(segment, "rt", encoding="utf-8") as f:
+            _count_entries(f, stats)
+    if AUDIT_FILE.exists():
+        with open(AUDIT_FILE, "r", encoding="utf-8") as f:
+            stats["segment_started"] = _count_entries(f, stats)
+
+    _save_stats(stats)
+    return stats
+
+
 def clear_audit_log() -> bool:
     """
     Clear the audit log. Use with caution - for testing only.
 
+    Removes the active log, its compressed segments and the stats sidecar.
+    The (empty) lock file is kept so concurrent writers stay serialized.
+
     Returns:
         True if cleared, False if file didn't exist
     """
-    if AUDIT_FILE.exists():
-        AUDIT_FILE.unlink()
-        return True
-    return False
+    with _locked():
+        existed = AUDIT_FILE.exists()
+        if existed:
+            AUDIT_FILE.unlink()
+        for segment in _segments():
+            segment.unlink(missing_ok=True)
+            existed = True
+        _stats_file().unlink(missing_ok=True)
+    return existed
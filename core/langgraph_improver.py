@@ -3,7 +3,8 @@ LangGraph-powered Iterative Self-Improvement Workflow
 
 Runs improvement cycles in a loop until quality threshold is met.
 Features:
-- State management with checkpointing
+- State management with checkpointing (persisted to SQLite when
+  langgraph-checkpoint-sqlite is installed, so runs can be resumed)
 - Conditional branching (continue if score < target)
 - Automatic retry on failures
 - Quality-driven stopping condition
@@ -13,8 +14,17 @@ from typing import TypedDict, Annotated
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 import operator
+import os
+import uuid
 from pathlib import Path
 
+# Persistent checkpoints for resumable runs (requires langgraph-checkpoint-sqlite).
+# Kept outside the source tree, next to the API's workflow checkpoints.
+CHECKPOINT_DB = Path(
+    os.environ.get("LANGGRAPH_CHECKPOINT_DB_PATH")
+    or Path(os.path.expanduser("~")) / ".codeweaver" / "langgraph_checkpoints.db"
+).expanduser()
+
 class ImprovementState(TypedDict):
     """State tracked across improvement iterations"""
 
@@ -412,12 +422,32 @@ def create_improvement_graph() -> StateGraph:
     return workflow
 
 
+def create_checkpointer():
+    """
+    Create the checkpointer for improvement runs
+
+    Uses SQLite (state survives restarts, runs can be resumed) when
+    langgraph-checkpoint-sqlite is installed, in-memory otherwise.
+    """
+    try:
+        import sqlite3
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        return MemorySaver()
+
+    CHECKPOINT_DB.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(CHECKPOINT_DB), check_same_thread=False)
+    return SqliteSaver(conn)
+
+
 def run_iterative_improvement(
     mode: str = 'ui_ux',
     target_score: float = 9.0,
     initial_score: float = 5.0,
     suggest_enhancements: bool = False,
-    target_files: list = None
+    target_files: list = None,
+    run_id: str = None,
+    resume: bool = False
 ) -> dict:
     """
     Run iterative self-improvement until quality threshold is met
@@ -428,23 +458,28 @@ def run_iterative_improvement(
         initial_score: Starting score (default: 5.0/10)
         suggest_enhancements: Enable Research/Ideas agents for feature suggestions (default: False)
         target_files: Optional list of specific files to analyze (default: None = all files)
+        run_id: Checkpoint key for this run (default: new ID, returned as 'run_id')
+        resume: Continue run_id from its last checkpoint instead of starting over
 
     Returns:
         Final state with results and history
     """
+    run_id = run_id or f"improvement-{uuid.uuid4().hex[:12]}"
+
     print("=" * 80)
     print("[START] Starting Iterative Self-Improvement (LangGraph-powered)")
     print("=" * 80)
     print(f"Mode: {mode}")
     print(f"Target Score: {target_score}/10")
     print(f"Max Iterations: 10")
+    print(f"Run ID: {run_id}")
     print()
 
     # Create workflow
     workflow = create_improvement_graph()
 
     # Compile with checkpointing (enables pause/resume)
-    memory = MemorySaver()
+    memory = create_checkpointer()
 
     # FIX: Use synchronous execution to avoid Streamlit threading conflicts
     # Compile WITHOUT debug mode and use invoke instead of stream
@@ -473,7 +508,7 @@ def run_iterative_improvement(
 
     # Run workflow with increased recursion limit
     config = {
-        "configurable": {"thread_id": "improvement-session-1"},
+        "configurable": {"thread_id": run_id},
         "recursion_limit": 50  # Increased from default 25 to allow more iterations
     }
 
@@ -481,7 +516,19 @@ def run_iterative_improvement(
         # FIX: Use invoke() for synchronous execution instead of stream()
         # This prevents threading issues with Streamlit
         print("\n[INFO] Running workflow synchronously (Streamlit-compatible mode)...")
-        final_state = app.invoke(initial_state, config)
+        if resume:
+            if not app.get_state(config).values:
+                return {
+                    'error': f"No checkpoint found for run {run_id}",
+                    'success': False,
+                    'run_id': run_id
+                }
+            # Passing None continues from the last completed node
+            print(f"[INFO] Resuming run {run_id} from its last checkpoint...")
+            final_state = app.invoke(None, config)
+        else:
+            final_state = app.invoke(initial_state, config)
+        final_state['run_id'] = run_id
 
         # Print summary
         print("\n" + "=" * 80)
@@ -507,7 +554,8 @@ def run_iterative_improvement(
         traceback.print_exc()
         return {
             'error': str(e),
-            'success': False
+            'success': False,
+            'run_id': run_id
         }
 
 
@@ -519,7 +567,8 @@ if __name__ == "__main__":
     # Parse args
     args = sys.argv[1:]
     clear_cache = '--clear-cache' in args
-    args = [a for a in args if a != '--clear-cache']
+    resume_id = next((a.split('=', 1)[1] for a in args if a.startswith('--resume=')), None)
+    args = [a for a in args if a != '--clear-cache' and not a.startswith('--resume=')]
 
     mode = args[0] if len(args) > 0 else 'ui_ux'
     target = float(args[1]) if len(args) > 1 else 9.0
@@ -531,4 +580,9 @@ if __name__ == "__main__":
         cleared = cache.clear_cache()
         print(f"[CACHE] Cleared {cleared} cached entries")
 
-    result = run_iterative_improvement(mode=mode, target_score=target)
\ No newline at end of file
+    result = run_iterative_improvement(
+        mode=mode,
+        target_score=target,
+        run_id=resume_id,
+        resume=resume_id is not None
+    )
\ No newline at end of file
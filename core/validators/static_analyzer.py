@@ -7,15 +7,26 @@ Performs static code analysis including:
 - Dependency checking
 - Security scanning
 - Code quality checks
+
+Each file is read and parsed once, with every per-file check sharing the
+same AST. Files are processed in a worker pool while ruff and mypy run
+concurrently, and results are cached by (file hash, tool version, config
+hash) so unchanged files are skipped on later runs.
 """
 
 import ast
+import bisect
+import hashlib
+import importlib.metadata
+import json
+import os
 import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -64,6 +75,10 @@ class AnalysisIssue:
             "code": self.code,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AnalysisIssue":
+        return cls(**{**data, "severity": IssueSeverity(data["severity"])})
+
 
 @dataclass
 class StaticAnalysisResult:
@@ -86,37 +101,217 @@ class StaticAnalysisResult:
         }
 
 
+# Patterns for security issues
+SECURITY_PATTERNS = {
+    "hardcoded_secret": [
+        r'(?i)(password|secret|api_key|token|auth)\s*=\s*["\'][^"\']+["\']',
+        r'(?i)Bearer\s+[a-zA-Z0-9_-]+',
+    ],
+    "sql_injection": [
+        r'(?i)execute\s*\([^)]*%s',
+        r'(?i)execute\s*\([^)]*\+',
+        r'(?i)f".*SELECT.*\{',
+        r'(?i)f".*INSERT.*\{',
+        r'(?i)f".*UPDATE.*\{',
+        r'(?i)f".*DELETE.*\{',
+    ],
+    "command_injection": [
+        r'subprocess\.(call|run|Popen)\s*\([^)]*shell\s*=\s*True',
+        r'os\.system\s*\(',
+        r'eval\s*\(',
+        r'exec\s*\(',
+    ],
+}
+
+_COMPILED_SECURITY_PATTERNS = [
+    (category, re.compile(pattern))
+    for category, patterns in SECURITY_PATTERNS.items()
+    for pattern in patterns
+]
+
+# Standard library and common packages that never need resolving
+_STDLIB_MODULES = {
+    "os", "sys", "re", "json", "typing", "dataclasses", "enum",
+    "pathlib", "subprocess", "time", "datetime", "collections",
+    "functools", "itertools", "logging", "unittest", "asyncio",
+    "abc", "copy", "math", "random", "hashlib", "base64",
+    "io", "tempfile", "shutil", "glob", "contextlib",
+}
+
+
+def _verify_import(module_name: str, file_path: str, line: int) -> Optional[AnalysisIssue]:
+    """Verify that an import can be resolved."""
+    root_module = module_name.split(".")[0]
+
+    if root_module in _STDLIB_MODULES:
+        return None
+
+    # Skip relative imports (start with .)
+    if module_name.startswith("."):
+        return None
+
+    # For now, just note unverified imports as info
+    # In production, would actually try to import
+    return None
+
+
+def _check_python(tree: ast.AST, file_path: str) -> List[AnalysisIssue]:
+    """Python checks that run on an already-parsed module."""
+    issues = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                issue = _verify_import(alias.name, file_path, node.lineno)
+                if issue:
+                    issues.append(issue)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                issue = _verify_import(node.module, file_path, node.lineno)
+                if issue:
+                    issues.append(issue)
+    return issues
+
+
+def _check_javascript_basics(content: str, file_path: str) -> List[AnalysisIssue]:
+    """Basic JavaScript checks."""
+    issues = []
+
+    # Check for common issues
+    if "console.log" in content:
+        issues.append(AnalysisIssue(
+            severity=IssueSeverity.INFO,
+            category="code-quality",
+            message="console.log statement found",
+            file=file_path,
+        ))
+
+    # Check for debugger statements
+    if "debugger" in content:
+        issues.append(AnalysisIssue(
+            severity=IssueSeverity.WARNING,
+            category="code-quality",
+            message="debugger statement found",
+            file=file_path,
+        ))
+
+    return issues
+
+
+def _scan_for_security(content: str, file_path: str) -> List[AnalysisIssue]:
+    """Scan file content for security issues."""
+    issues = []
+    line_starts = None
+
+    for category, pattern in _COMPILED_SECURITY_PATTERNS:
+        for match in pattern.finditer(content):
+            if line_starts is None:
+                line_starts = [m.start() for m in re.finditer("\n", content)]
+            # Find line number
+            line_num = bisect.bisect_left(line_starts, match.start()) + 1
+
+            issues.append(AnalysisIssue(
+                severity=IssueSeverity.WARNING,
+                category="security",
+                message=f"Potential {category.replace('_', ' ')}: {match.group()[:50]}...",
+                file=file_path,
+                line=line_num,
+            ))
+
+    return issues
+
+
+def _analyze_file(file_path: str, content: str, checks: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """
+    Run every per-file check on one file.
+
+    The file is parsed at most once and the AST is shared by all Python
+    checks. Module-level so it can run in a process pool; returns plain
+    dicts so results can be cached as JSON.
+    """
+    issues: List[AnalysisIssue] = []
+
+    if "python" in checks:
+        try:
+            tree = ast.parse(content, filename=file_path)
+        except SyntaxError as e:
+            issues.append(AnalysisIssue(
+                severity=IssueSeverity.ERROR,
+                category="syntax",
+                message=f"Syntax error: {e.msg}",
+                file=file_path,
+                line=e.lineno,
+                column=e.offset,
+            ))
+        else:
+            issues.extend(_check_python(tree, file_path))
+
+    if "javascript" in checks:
+        issues.extend(_check_javascript_basics(content, file_path))
+
+    if "security" in checks:
+        issues.extend(_scan_for_security(content, file_path))
+
+    return [issue.to_dict() for issue in issues]
+
+
+def _analyze_file_job(job: Tuple[str, str, Tuple[str, ...]]) -> List[Dict[str, Any]]:
+    return _analyze_file(*job)
+
+
 class StaticAnalyzer:
     """
     Performs static analysis on code projects.
 
     Supports Python, JavaScript/TypeScript, and HTML/CSS.
+
+    Results are cached in ``cache_dir`` (per file for the built-in checks and
+    ruff, per tree for mypy, which also keeps its incremental cache there), so
+    repeated runs over a mostly unchanged tree only re-check what changed.
     """
 
-    # Patterns for security issues
-    SECURITY_PATTERNS = {
-        "hardcoded_secret": [
-            r'(?i)(password|secret|api_key|token|auth)\s*=\s*["\'][^"\']+["\']',
-            r'(?i)Bearer\s+[a-zA-Z0-9_-]+',
-        ],
-        "sql_injection": [
-            r'(?i)execute\s*\([^)]*%s',
-            r'(?i)execute\s*\([^)]*\+',
-            r'(?i)f".*SELECT.*\{',
-            r'(?i)f".*INSERT.*\{',
-            r'(?i)f".*UPDATE.*\{',
-            r'(?i)f".*DELETE.*\{',
-        ],
-        "command_injection": [
-            r'subprocess\.(call|run|Popen)\s*\([^)]*shell\s*=\s*True',
-            r'os\.system\s*\(',
-            r'eval\s*\(',
-            r'exec\s*\(',
-        ],
-    }
-
-    def __init__(self):
+    SECURITY_PATTERNS = SECURITY_PATTERNS
+
+    PYTHON_EXCLUDE_DIRS = {"venv", "venv312", "venv314", ".venv", "env", "__pycache__",
+                           "node_modules", ".git", "dist", "build", ".tox", ".pytest_cache"}
+    JAVASCRIPT_EXCLUDE_DIRS = {"node_modules", ".git", "dist", "build", ".next", "coverage"}
+    SECURITY_EXCLUDE_DIRS = {"node_modules", "venv", ".venv", ".git", "__pycache__"}
+    SECURITY_EXTENSIONS = {".py", ".js", ".jsx", ".ts", ".tsx", ".json", ".yml", ".yaml", ".env"}
+
+    # Files whose contents change lint/type-check results
+    CONFIG_FILES = ("pyproject.toml", "ruff.toml", ".ruff.toml", "setup.cfg", "mypy.ini", ".mypy.ini")
+
+    # Below this many files, process-pool startup costs more than it saves
+    PARALLEL_MIN_FILES = 32
+
+    # Bump when per-file checks change so cached results are invalidated
+    CACHE_VERSION = 1
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        use_cache: bool = True,
+    ):
+        """
+        Initialize the analyzer.
+
+        Args:
+            cache_dir: Where results and mypy's incremental cache are kept
+                (default: ~/.cache/code-weaver/static_analysis)
+            max_workers: Worker processes for per-file checks (default: CPU count)
+            use_cache: Reuse cached results for unchanged files
+        """
         self.issues: List[AnalysisIssue] = []
+        self.cache_dir = Path(cache_dir) if cache_dir else (
+            Path.home() / ".cache" / "code-weaver" / "static_analysis"
+        )
+        self.max_workers = max_workers
+        self.use_cache = use_cache
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self._tool_versions: Dict[str, Optional[str]] = {}
+        self._rules_hash = hashlib.sha256(
+            json.dumps([self.CACHE_VERSION, SECURITY_PATTERNS, sorted(_STDLIB_MODULES)]).encode()
+        ).hexdigest()[:16]
 
     def analyze(self, project: ProjectInfo) -> StaticAnalysisResult:
         """
@@ -129,20 +324,64 @@ class StaticAnalyzer:
             StaticAnalysisResult with all findings
         """
         self.issues = []
-        files_analyzed = 0
+        self.cache_stats = {"hits": 0, "misses": 0}
+        root = Path(project.path).resolve()
+        cache = self._load_cache()
+
+        python_files: List[Path] = []
+        javascript_files: List[Path] = []
 
         # Run analysis based on project type
         if project.project_type in [ProjectType.PYTHON, ProjectType.STREAMLIT,
                                      ProjectType.FLASK, ProjectType.DJANGO,
                                      ProjectType.FASTAPI]:
-            files_analyzed += self._analyze_python(project.path)
+            python_files = self._collect_files(root, ["*.py"], self.PYTHON_EXCLUDE_DIRS)
 
         elif project.project_type in [ProjectType.REACT, ProjectType.VUE,
                                        ProjectType.NEXTJS, ProjectType.NODEJS]:
-            files_analyzed += self._analyze_javascript(project.path)
+            javascript_files = self._collect_files(
+                root, ["*.js", "*.jsx", "*.ts", "*.tsx"], self.JAVASCRIPT_EXCLUDE_DIRS
+            )
 
         # Always check for security issues
-        files_analyzed += self._security_scan(project.path)
+        security_files = self._collect_files(
+            root, [f"*{ext}" for ext in self.SECURITY_EXTENSIONS], self.SECURITY_EXCLUDE_DIRS
+        )
+
+        checks: Dict[Path, List[str]] = {}
+        for f in python_files:
+            checks.setdefault(f, []).append("python")
+        for f in javascript_files:
+            checks.setdefault(f, []).append("javascript")
+        for f in security_files:
+            checks.setdefault(f, []).append("security")
+
+        contents = {f: self._read(f) for f in checks}
+        hashes = {f: hashlib.sha256(c.encode("utf-8", errors="ignore")).hexdigest()
+                  for f, c in contents.items()}
+
+        # External tools run concurrently with the per-file checks
+        with ThreadPoolExecutor(max_workers=2) as tools:
+            tool_futures = []
+            if python_files:
+                tool_futures.append(tools.submit(self._run_ruff, root, python_files, hashes, cache))
+                tool_futures.append(tools.submit(self._run_mypy, root, python_files, hashes, cache))
+            if javascript_files:
+                tool_futures.append(tools.submit(self._run_eslint, root))
+
+            file_issues = self._run_file_checks(checks, contents, hashes, cache)
+            tool_issues = [issue for future in tool_futures for issue in future.result()]
+
+        self._prune_cache(cache, root, set(checks))
+        self._save_cache(cache)
+
+        # Keep the original ordering: file checks, tools, then security findings
+        self.issues = (
+            [i for i in file_issues if i.category != "security"]
+            + tool_issues
+            + [i for i in file_issues if i.category == "security"]
+        )
+        files_analyzed = len(python_files) + len(javascript_files) + len(security_files)
 
         # Count issues by severity
         error_count = sum(1 for i in self.issues if i.severity == IssueSeverity.ERROR)
@@ -166,207 +405,231 @@ class StaticAnalyzer:
             info_count=info_count,
         )
 
-    def _analyze_python(self, path: Path) -> int:
-        """Analyze Python files."""
-        files_analyzed = 0
-        python_files = list(path.rglob("*.py"))
-
-        # Exclude virtual environments and common non-source directories
-        exclude_dirs = {"venv", "venv312", "venv314", ".venv", "env", "__pycache__",
-                        "node_modules", ".git", "dist", "build", ".tox", ".pytest_cache"}
-        python_files = [
-            f for f in python_files
-            if not any(ex in f.parts for ex in exclude_dirs)
-        ]
-
-        for py_file in python_files:
-            files_analyzed += 1
-            self._check_python_syntax(py_file)
-            self._check_python_imports(py_file)
-
-        # Try running ruff if available
-        self._run_ruff(path)
-
-        # Try running mypy if available
-        self._run_mypy(path)
-
-        return files_analyzed
-
-    def _check_python_syntax(self, file_path: Path) -> None:
-        """Check Python syntax using AST."""
-        try:
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-            ast.parse(content, filename=str(file_path))
-        except SyntaxError as e:
-            self.issues.append(AnalysisIssue(
-                severity=IssueSeverity.ERROR,
-                category="syntax",
-                message=f"Syntax error: {e.msg}",
-                file=str(file_path),
-                line=e.lineno,
-                column=e.offset,
-            ))
-
-    def _check_python_imports(self, file_path: Path) -> None:
-        """Check if Python imports can be resolved."""
-        try:
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-            tree = ast.parse(content)
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        self._verify_import(alias.name, file_path, node.lineno)
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        self._verify_import(node.module, file_path, node.lineno)
-
-        except SyntaxError:
-            pass  # Already reported in syntax check
-
-    def _verify_import(self, module_name: str, file_path: Path, line: int) -> None:
-        """Verify that an import can be resolved."""
-        # Skip standard library and common packages
-        stdlib_modules = {
-            "os", "sys", "re", "json", "typing", "dataclasses", "enum",
-            "pathlib", "subprocess", "time", "datetime", "collections",
-            "functools", "itertools", "logging", "unittest", "asyncio",
-            "abc", "copy", "math", "random", "hashlib", "base64",
-            "io", "tempfile", "shutil", "glob", "contextlib",
-        }
-
-        root_module = module_name.split(".")[0]
-
-        if root_module in stdlib_modules:
-            return
-
-        # Skip relative imports (start with .)
-        if module_name.startswith("."):
-            return
-
-        # For now, just note unverified imports as info
-        # In production, would actually try to import
-        pass
+    @staticmethod
+    def _collect_files(root: Path, patterns: List[str], exclude_dirs: set) -> List[Path]:
+        """Find files under root, skipping excluded directories (relative to root)."""
+        files = set()
+        for pattern in patterns:
+            for file_path in root.rglob(pattern):
+                relative_parts = file_path.relative_to(root).parts
+                if any(ex in relative_parts for ex in exclude_dirs):
+                    continue
+                if file_path.is_file():
+                    files.add(file_path)
+        return sorted(files)
 
-    def _run_ruff(self, path: Path) -> None:
-        """Run ruff linter if available."""
+    @staticmethod
+    def _read(file_path: Path) -> str:
         try:
-            result = subprocess.run(
-                [sys.executable, "-m", "ruff", "check", str(path), "--output-format=json"],
-                capture_output=True,
-                text=True,
-                timeout=60,
-                cwd=path,
-            )
-
-            if result.stdout:
-                import json
-                try:
-                    issues = json.loads(result.stdout)
-                    for issue in issues:
-                        self.issues.append(AnalysisIssue(
-                            severity=IssueSeverity.WARNING,
-                            category="lint",
-                            message=issue.get("message", ""),
-                            file=issue.get("filename", ""),
-                            line=issue.get("location", {}).get("row"),
-                            column=issue.get("location", {}).get("column"),
-                            code=issue.get("code", ""),
-                        ))
-                except json.JSONDecodeError:
-                    pass
+            return file_path.read_text(encoding="utf-8", errors="ignore")
+        except IOError:
+            return ""
+
+    def _run_file_checks(
+        self,
+        checks: Dict[Path, List[str]],
+        contents: Dict[Path, str],
+        hashes: Dict[Path, str],
+        cache: Dict[str, Any],
+    ) -> List[AnalysisIssue]:
+        """Run per-file checks, reusing cached results and fanning misses out to workers."""
+        store = cache.setdefault("files", {})
+        results: Dict[Path, List[Dict[str, Any]]] = {}
+        keys: Dict[Path, str] = {}
+        jobs = []
+
+        for file_path, file_checks in checks.items():
+            key = f"{hashes[file_path]}:{','.join(file_checks)}:{self._rules_hash}"
+            keys[file_path] = key
+            entry = store.get(str(file_path))
+            if self.use_cache and entry and entry.get("key") == key:
+                results[file_path] = entry["issues"]
+                self.cache_stats["hits"] += 1
+            else:
+                jobs.append((file_path, (str(file_path), contents[file_path], tuple(file_checks))))
+                self.cache_stats["misses"] += 1
+
+        if jobs:
+            outputs = self._map_jobs([job for _, job in jobs])
+            for (file_path, _), issues in zip(jobs, outputs):
+                results[file_path] = issues
+                store[str(file_path)] = {"key": keys[file_path], "issues": issues}
+
+        return [
+            AnalysisIssue.from_dict(issue)
+            for file_path in checks
+            for issue in results[file_path]
+        ]
 
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            # Ruff not available or timed out
-            pass
+    def _map_jobs(self, jobs: List[Tuple[str, str, Tuple[str, ...]]]) -> List[List[Dict[str, Any]]]:
+        workers = self.max_workers or os.cpu_count() or 1
+        if workers > 1 and len(jobs) >= self.PARALLEL_MIN_FILES:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    chunksize = max(1, len(jobs) // (workers * 4))
+                    return list(pool.map(_analyze_file_job, jobs, chunksize=chunksize))
+            except (OSError, RuntimeError):
+                # Process pools can be unavailable (restricted environments); run inline
+                pass
+        return [_analyze_file_job(job) for job in jobs]
+
+    # ------------------------------------------------------------------
+    # External tools
+    # ------------------------------------------------------------------
+
+    def _tool_version(self, tool: str) -> Optional[str]:
+        """Installed version of a Python-module tool, or None if unavailable."""
+        if tool not in self._tool_versions:
+            try:
+                self._tool_versions[tool] = importlib.metadata.version(tool)
+            except importlib.metadata.PackageNotFoundError:
+                self._tool_versions[tool] = None
+        return self._tool_versions[tool]
+
+    def _config_hash(self, root: Path) -> str:
+        digest = hashlib.sha256()
+        for name in self.CONFIG_FILES:
+            config_file = root / name
+            if config_file.is_file():
+                digest.update(name.encode())
+                digest.update(config_file.read_bytes())
+        return digest.hexdigest()[:16]
+
+    def _run_ruff(
+        self,
+        path: Path,
+        files: List[Path],
+        hashes: Dict[Path, str],
+        cache: Dict[str, Any],
+    ) -> List[AnalysisIssue]:
+        """Run ruff linter if available, only on files whose cached result is stale."""
+        version = self._tool_version("ruff")
+        if version is None:
+            # Ruff not available
+            return []
+
+        store = cache.setdefault("ruff", {})
+        config_hash = self._config_hash(path)
+        issues: List[Dict[str, Any]] = []
+        stale: Dict[str, str] = {}
+
+        for file_path in files:
+            key = f"{hashes[file_path]}:{version}:{config_hash}"
+            entry = store.get(str(file_path))
+            if self.use_cache and entry and entry.get("key") == key:
+                issues.extend(entry["issues"])
+            else:
+                stale[str(file_path)] = key
+
+        stale_files = list(stale)
+        for start in range(0, len(stale_files), 500):
+            chunk = stale_files[start:start + 500]
+            try:
+                # Explicit paths bypass ruff's exclude settings unless --force-exclude is set
+                result = subprocess.run(
+                    [sys.executable, "-m", "ruff", "check", "--force-exclude", *chunk, "--output-format=json"],
+                    capture_output=True,
+                    text=True,
+                    timeout=60,
+                    cwd=path,
+                )
+                reported = json.loads(result.stdout) if result.stdout else []
+            except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
+                # Ruff timed out or produced unusable output; don't cache
+                continue
+            if result.returncode not in (0, 1):
+                continue
+
+            by_file: Dict[str, List[Dict[str, Any]]] = {f: [] for f in chunk}
+            for issue in reported:
+                by_file.setdefault(issue.get("filename", ""), []).append(AnalysisIssue(
+                    severity=IssueSeverity.WARNING,
+                    category="lint",
+                    message=issue.get("message", ""),
+                    file=issue.get("filename", ""),
+                    line=(issue.get("location") or {}).get("row"),
+                    column=(issue.get("location") or {}).get("column"),
+                    code=issue.get("code", ""),
+                ).to_dict())
+
+            for file_name, file_issues in by_file.items():
+                issues.extend(file_issues)
+                if file_name in stale:
+                    store[file_name] = {"key": stale[file_name], "issues": file_issues}
+
+        return [AnalysisIssue.from_dict(i) for i in issues]
+
+    def _run_mypy(
+        self,
+        path: Path,
+        files: List[Path],
+        hashes: Dict[Path, str],
+        cache: Dict[str, Any],
+    ) -> List[AnalysisIssue]:
+        """
+        Run mypy type checker if available.
 
-    def _run_mypy(self, path: Path) -> None:
-        """Run mypy type checker if available."""
+        Type errors depend on other files, so results are cached for the
+        whole tree; mypy's own incremental cache makes partial re-checks cheap.
+        """
+        version = self._tool_version("mypy")
+        if version is None:
+            # Mypy not available
+            return []
+
+        tree_hash = hashlib.sha256()
+        tree_hash.update(f"{version}:{self._config_hash(path)}".encode())
+        for file_path in files:
+            tree_hash.update(f"{file_path}:{hashes[file_path]}\n".encode())
+        key = tree_hash.hexdigest()
+
+        store = cache.setdefault("mypy", {})
+        entry = store.get(str(path))
+        if self.use_cache and entry and entry.get("key") == key:
+            return [AnalysisIssue.from_dict(i) for i in entry["issues"]]
+
+        mypy_cache = self.cache_dir / "mypy" / hashlib.sha256(str(path).encode()).hexdigest()[:16]
         try:
             result = subprocess.run(
-                [sys.executable, "-m", "mypy", str(path), "--ignore-missing-imports"],
+                [sys.executable, "-m", "mypy", str(path), "--ignore-missing-imports",
+                 "--incremental", "--cache-dir", str(mypy_cache)],
                 capture_output=True,
                 text=True,
                 timeout=120,
                 cwd=path,
             )
-
-            if result.stdout:
-                # Parse mypy output: file:line: severity: message
-                for line in result.stdout.splitlines():
-                    match = re.match(r'(.+):(\d+):\s*(error|warning|note):\s*(.+)', line)
-                    if match:
-                        file, lineno, severity, message = match.groups()
-                        severity_map = {
-                            "error": IssueSeverity.ERROR,
-                            "warning": IssueSeverity.WARNING,
-                            "note": IssueSeverity.INFO,
-                        }
-                        self.issues.append(AnalysisIssue(
-                            severity=severity_map.get(severity, IssueSeverity.INFO),
-                            category="type",
-                            message=message,
-                            file=file,
-                            line=int(lineno),
-                        ))
-
         except (subprocess.TimeoutExpired, FileNotFoundError):
             # Mypy not available or timed out
-            pass
-
-    def _analyze_javascript(self, path: Path) -> int:
-        """Analyze JavaScript/TypeScript files."""
-        files_analyzed = 0
-
-        # Find JS/TS files
-        js_files = list(path.rglob("*.js")) + list(path.rglob("*.jsx"))
-        ts_files = list(path.rglob("*.ts")) + list(path.rglob("*.tsx"))
-        all_files = js_files + ts_files
-
-        # Exclude node_modules and common non-source directories
-        exclude_dirs = {"node_modules", ".git", "dist", "build", ".next", "coverage"}
-        all_files = [
-            f for f in all_files
-            if not any(ex in f.parts for ex in exclude_dirs)
-        ]
-
-        for js_file in all_files:
-            files_analyzed += 1
-            self._check_javascript_basics(js_file)
-
-        # Try running eslint if available
-        self._run_eslint(path)
-
-        return files_analyzed
-
-    def _check_javascript_basics(self, file_path: Path) -> None:
-        """Basic JavaScript checks."""
-        try:
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-
-            # Check for common issues
-            if "console.log" in content:
-                self.issues.append(AnalysisIssue(
-                    severity=IssueSeverity.INFO,
-                    category="code-quality",
-                    message="console.log statement found",
-                    file=str(file_path),
-                ))
-
-            # Check for debugger statements
-            if "debugger" in content:
-                self.issues.append(AnalysisIssue(
-                    severity=IssueSeverity.WARNING,
-                    category="code-quality",
-                    message="debugger statement found",
-                    file=str(file_path),
-                ))
-
-        except IOError:
-            pass
-
-    def _run_eslint(self, path: Path) -> None:
+            return []
+
+        issues = []
+        if result.stdout:
+            # Parse mypy output: file:line: severity: message
+            for line in result.stdout.splitlines():
+                match = re.match(r'(.+):(\d+):\s*(error|warning|note):\s*(.+)', line)
+                if match:
+                    file, lineno, severity, message = match.groups()
+                    severity_map = {
+                        "error": IssueSeverity.ERROR,
+                        "warning": IssueSeverity.WARNING,
+                        "note": IssueSeverity.INFO,
+                    }
+                    issues.append(AnalysisIssue(
+                        severity=severity_map.get(severity, IssueSeverity.INFO),
+                        category="type",
+                        message=message,
+                        file=file,
+                        line=int(lineno),
+                    ))
+
+        # Exit code 2 means mypy itself failed; don't cache that
+        if result.returncode in (0, 1):
+            store[str(path)] = {"key": key, "issues": [i.to_dict() for i in issues]}
+        return issues
+
+    def _run_eslint(self, path: Path) -> List[AnalysisIssue]:
         """Run ESLint if available."""
+        issues = []
         try:
             result = _safe_run(
                 ["npx", "eslint", ".", "--format=json"],
@@ -377,13 +640,12 @@ class StaticAnalyzer:
             )
 
             if result.stdout:
-                import json
                 try:
                     files = json.loads(result.stdout)
                     for file_result in files:
                         for msg in file_result.get("messages", []):
                             severity_map = {1: IssueSeverity.WARNING, 2: IssueSeverity.ERROR}
-                            self.issues.append(AnalysisIssue(
+                            issues.append(AnalysisIssue(
                                 severity=severity_map.get(msg.get("severity"), IssueSeverity.WARNING),
                                 category="lint",
                                 message=msg.get("message", ""),
@@ -399,47 +661,46 @@ class StaticAnalyzer:
             # ESLint not available or timed out
             pass
 
-    def _security_scan(self, path: Path) -> int:
-        """Scan for security issues in all files."""
-        files_scanned = 0
+        return issues
 
-        # Scan all text-like files
-        extensions = {".py", ".js", ".jsx", ".ts", ".tsx", ".json", ".yml", ".yaml", ".env"}
-        exclude_dirs = {"node_modules", "venv", ".venv", ".git", "__pycache__"}
+    # ------------------------------------------------------------------
+    # Result cache
+    # ------------------------------------------------------------------
 
-        for ext in extensions:
-            for file_path in path.rglob(f"*{ext}"):
-                if any(ex in file_path.parts for ex in exclude_dirs):
-                    continue
+    @property
+    def _cache_file(self) -> Path:
+        return self.cache_dir / "results.json"
 
-                files_scanned += 1
-                self._scan_file_for_security(file_path)
-
-        return files_scanned
-
-    def _scan_file_for_security(self, file_path: Path) -> None:
-        """Scan a single file for security issues."""
+    def _load_cache(self) -> Dict[str, Any]:
+        if not self.use_cache or not self._cache_file.exists():
+            return {}
         try:
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-
-            for category, patterns in self.SECURITY_PATTERNS.items():
-                for pattern in patterns:
-                    matches = re.finditer(pattern, content)
-                    for match in matches:
-                        # Find line number
-                        line_num = content[:match.start()].count('\n') + 1
-
-                        self.issues.append(AnalysisIssue(
-                            severity=IssueSeverity.WARNING,
-                            category="security",
-                            message=f"Potential {category.replace('_', ' ')}: {match.group()[:50]}...",
-                            file=str(file_path),
-                            line=line_num,
-                        ))
+            data = json.loads(self._cache_file.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return {}
+        return data if data.get("version") == self.CACHE_VERSION else {}
 
-        except IOError:
+    def _save_cache(self, cache: Dict[str, Any]) -> None:
+        if not self.use_cache:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({**cache, "version": self.CACHE_VERSION}), encoding="utf-8")
+            os.replace(tmp, self._cache_file)
+        except OSError:
             pass
 
+    @staticmethod
+    def _prune_cache(cache: Dict[str, Any], root: Path, seen: set) -> None:
+        """Drop entries for files under root that no longer exist."""
+        seen_names = {str(f) for f in seen}
+        prefix = str(root) + os.sep
+        for section in ("files", "ruff"):
+            store = cache.get(section, {})
+            for name in [n for n in store if n.startswith(prefix) and n not in seen_names]:
+                del store[name]
+
 
 # Convenience function
 def analyze_project(project: ProjectInfo) -> StaticAnalysisResult:
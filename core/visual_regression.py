@@ -8,13 +8,17 @@ Useful for:
 - Generating before/after comparison reports
 
 Dependencies:
-    pip install pillow imagehash
+    pip install pillow imagehash numpy
+    pip install scipy  # optional, pixel-accurate changed regions
 """
 
+import hashlib
 import json
+import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -30,6 +34,18 @@ try:
 except ImportError:
     IMAGEHASH_AVAILABLE = False
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from scipy import ndimage
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 
 @dataclass
 class ComparisonResult:
@@ -81,29 +97,309 @@ class RegressionReport:
         }
 
 
+class BKTree:
+    """
+    Burkhard-Keller tree over integer hashes using Hamming distance.
+
+    Range and nearest-neighbour queries only descend into children whose edge
+    distance is within the triangle-inequality bound, so lookups touch a small
+    fraction of the stored hashes.
+    """
+
+    def __init__(self):
+        self._root: Optional[list] = None  # [hash, values, {distance: child}]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def distance(a: int, b: int) -> int:
+        return bin(a ^ b).count("1")
+
+    def add(self, key: int, value: Any):
+        """Insert a value under a hash (values sharing a hash are grouped)."""
+        self._size += 1
+        if self._root is None:
+            self._root = [key, [value], {}]
+            return
+
+        node = self._root
+        while True:
+            dist = self.distance(key, node[0])
+            if dist == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(dist)
+            if child is None:
+                node[2][dist] = [key, [value], {}]
+                return
+            node = child
+
+    def search(self, key: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """All (distance, value) pairs within max_distance, closest first."""
+        results: List[Tuple[int, Any]] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            dist = self.distance(key, node[0])
+            if dist <= max_distance:
+                results.extend((dist, value) for value in node[1])
+            for edge, child in node[2].items():
+                if dist - max_distance <= edge <= dist + max_distance:
+                    stack.append(child)
+        results.sort(key=lambda r: r[0])
+        return results
+
+    def nearest(self, key: int, max_distance: Optional[int] = None) -> Optional[Tuple[int, Any]]:
+        """Closest (distance, value) pair, optionally bounded by max_distance."""
+        best: Optional[Tuple[int, Any]] = None
+        bound = max_distance if max_distance is not None else float("inf")
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            dist = self.distance(key, node[0])
+            if dist <= bound and (best is None or dist < best[0]):
+                best = (dist, node[1][0])
+                bound = dist
+                if dist == 0:
+                    break
+            for edge, child in node[2].items():
+                if dist - bound <= edge <= dist + bound:
+                    stack.append(child)
+        return best
+
+
+def image_fingerprint(img: "Image.Image") -> int:
+    """
+    Perceptual fingerprint of an image as an integer.
+
+    A 64-bit difference hash (dHash) is always computed with PIL; when
+    imagehash is installed a 64-bit pHash is prepended, giving a 128-bit
+    fingerprint. Hamming distance between fingerprints is a metric, so it
+    can be indexed with a BKTree.
+    """
+    gray = img.convert('L').resize((9, 8), Image.LANCZOS)
+    pixels = list(gray.getdata())
+    dhash = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            dhash = (dhash << 1) | (1 if left > right else 0)
+
+    if IMAGEHASH_AVAILABLE:
+        phash = int(str(imagehash.phash(img)), 16)
+        return (phash << 64) | dhash
+    return dhash
+
+
+def fingerprint_bits() -> int:
+    """Width of image_fingerprint() in bits (64 per hash combined)."""
+    return 128 if IMAGEHASH_AVAILABLE else 64
+
+
+def pixel_digest(img: "Image.Image") -> str:
+    """Digest of an image's decoded pixels; equal digests mean identical images."""
+    img = img.convert("RGBA")
+    digest = hashlib.sha256(f"{img.size[0]}x{img.size[1]}".encode())
+    digest.update(img.tobytes())
+    return digest.hexdigest()
+
+
+class BaselineIndex:
+    """
+    Persistent perceptual-hash index over stored baseline screenshots.
+
+    Fingerprints are stored in ``baseline_index.json`` next to the baselines
+    (keyed by file name, with size/mtime so only changed files are rehashed)
+    and loaded into a BKTree for sub-linear nearest-baseline lookups.
+    """
+
+    INDEX_FILE = "baseline_index.json"
+
+    def __init__(self, baseline_dir: Path):
+        self.baseline_dir = Path(baseline_dir)
+        self.index_path = self.baseline_dir / self.INDEX_FILE
+        self.algorithm = "phash+dhash" if IMAGEHASH_AVAILABLE else "dhash"
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._tree: Optional[BKTree] = None
+        self._load()
+
+    def _load(self):
+        if not self.index_path.exists():
+            return
+        try:
+            data = json.loads(self.index_path.read_text())
+        except (json.JSONDecodeError, OSError):
+            return
+        # Fingerprints from a different algorithm are not comparable
+        if data.get("algorithm") == self.algorithm:
+            self._entries = data.get("entries", {})
+
+    def save(self):
+        """Persist fingerprints to disk."""
+        self.index_path.write_text(json.dumps({
+            "algorithm": self.algorithm,
+            "updated": datetime.now().isoformat(),
+            "entries": self._entries
+        }))
+
+    def refresh(self) -> int:
+        """
+        Sync the index with the baseline files on disk.
+
+        Returns:
+            Number of files (re)hashed
+        """
+        on_disk = {p.name: p for p in self.baseline_dir.glob("*.png")}
+        rehashed = 0
+
+        for name in list(self._entries):
+            if name not in on_disk:
+                del self._entries[name]
+
+        for name, path in on_disk.items():
+            stat = path.stat()
+            entry = self._entries.get(name)
+            if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                continue
+            try:
+                with Image.open(path) as img:
+                    fingerprint = image_fingerprint(img)
+            except Exception:
+                continue
+            self._entries[name] = {
+                "hash": format(fingerprint, "x"),
+                "size": stat.st_size,
+                "mtime": stat.st_mtime
+            }
+            rehashed += 1
+
+        self._tree = None
+        if rehashed or len(self._entries) != len(on_disk):
+            self.save()
+        return rehashed
+
+    def add(self, path: Path):
+        """Index (or re-index) a single baseline file."""
+        path = Path(path)
+        stat = path.stat()
+        with Image.open(path) as img:
+            fingerprint = image_fingerprint(img)
+        self._entries[path.name] = {
+            "hash": format(fingerprint, "x"),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime
+        }
+        self._tree = None
+
+    @property
+    def tree(self) -> BKTree:
+        if self._tree is None:
+            tree = BKTree()
+            for name, entry in self._entries.items():
+                tree.add(int(entry["hash"], 16), name)
+            self._tree = tree
+        return self._tree
+
+    def nearest(
+        self,
+        image_path: str | Path,
+        max_distance: Optional[int] = None
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Find the stored baseline closest to an image.
+
+        Returns:
+            (baseline file name, Hamming distance) or None if nothing is in range
+        """
+        with Image.open(image_path) as img:
+            fingerprint = image_fingerprint(img)
+        match = self.tree.nearest(fingerprint, max_distance)
+        if match is None:
+            return None
+        distance, name = match
+        return name, distance
+
+    def find_duplicates(self, max_distance: int = 0) -> List[List[str]]:
+        """
+        Group baselines whose fingerprints are within max_distance of each other.
+
+        Fingerprints are coarse, so these are candidates only: pages that
+        differ in a few characters of text usually hash the same.
+        """
+        groups: List[List[str]] = []
+        grouped: set = set()
+        for name in sorted(self._entries):
+            if name in grouped:
+                continue
+            key = int(self._entries[name]["hash"], 16)
+            group = [n for _, n in self.tree.search(key, max_distance) if n not in grouped]
+            if len(group) > 1:
+                group.sort()
+                groups.append(group)
+                grouped.update(group)
+        return groups
+
+
 class VisualRegression:
     """
     Visual regression testing for screenshot comparison.
 
     Compares current screenshots against a baseline to detect changes.
     Generates diff images and reports for visual inspection.
+
+    When NumPy is installed the pixel diff is vectorized; otherwise the
+    original PIL-only path is used. Stored baselines are indexed by
+    perceptual hash (see BaselineIndex) so screenshots without an exact
+    baseline name can be paired with their nearest baseline.
     """
 
     # Thresholds for change detection
     CHANGE_THRESHOLD_PERCENT = 1.0  # Pixel diff threshold (%)
     HASH_DIFF_THRESHOLD = 5  # Perceptual hash difference threshold
+    CHANNEL_THRESHOLD = 10  # Per-channel difference (0-255) counted as changed
+    ANTI_ALIASING_TOLERANCE = 1  # Pixel shift (px) tolerated for anti-aliased edges
+    MAX_REGIONS = 50  # Cap on changed-region bounding boxes per comparison
+    REGION_TILE_SIZE = 16  # Tile size (px) for region grouping without scipy
 
-    def __init__(self, baseline_dir: Path):
+    def __init__(
+        self,
+        baseline_dir: Path,
+        channel_threshold: int = CHANNEL_THRESHOLD,
+        anti_aliasing_tolerance: int = ANTI_ALIASING_TOLERANCE,
+        hash_precheck: bool = True,
+        auto_pair: bool = False
+    ):
         """
         Initialize visual regression tester.
 
         Args:
             baseline_dir: Directory to store baseline screenshots
+            channel_threshold: Minimum per-channel difference counted as a change
+            anti_aliasing_tolerance: Max pixel shift treated as anti-aliasing (0 disables)
+            hash_precheck: Skip the full pixel diff when perceptual hashes match exactly
+            auto_pair: Compare screenshots without a named baseline against the
+                perceptually nearest stored baseline
         """
         self.baseline_dir = Path(baseline_dir)
         self.baseline_dir.mkdir(parents=True, exist_ok=True)
         self.diff_dir = self.baseline_dir / "diffs"
         self.diff_dir.mkdir(exist_ok=True)
+        self.channel_threshold = channel_threshold
+        self.anti_aliasing_tolerance = anti_aliasing_tolerance
+        self.hash_precheck = hash_precheck
+        self.auto_pair = auto_pair
+        self._index: Optional[BaselineIndex] = None
+
+    @property
+    def index(self) -> BaselineIndex:
+        """Perceptual-hash index over stored baselines (synced on first use)."""
+        if self._index is None:
+            self._index = BaselineIndex(self.baseline_dir)
+            self._index.refresh()
+        return self._index
 
     def set_baseline(self, screenshots: List[Dict]) -> int:
         """
@@ -121,16 +417,17 @@ class VisualRegression:
             if not src_path or not Path(src_path).exists():
                 continue
 
-            # Use page name + viewport as baseline name
-            page = screenshot.get("page", screenshot.get("name", "unknown"))
-            viewport = screenshot.get("viewport", {})
-            width = viewport.get("width", "unknown")
-            state = screenshot.get("state", "default")
+            baseline_path = self.baseline_dir / f"{self._baseline_key(screenshot)}.png"
 
-            baseline_name = f"{page}_{width}_{state}.png"
-            baseline_path = self.baseline_dir / baseline_name
-
-            shutil.copy(src_path, baseline_path)
+            # Copy beside the baseline and swap it in, so a baseline that
+            # deduplicate_baselines hard-linked to others gets a new inode
+            # instead of rewriting every linked sibling.
+            tmp = baseline_path.with_suffix(".tmp")
+            try:
+                shutil.copy(src_path, tmp)
+                os.replace(tmp, baseline_path)
+            finally:
+                tmp.unlink(missing_ok=True)
             count += 1
 
         # Save metadata
@@ -150,9 +447,87 @@ class VisualRegression:
         (self.baseline_dir / "baseline_metadata.json").write_text(
             json.dumps(metadata, indent=2)
         )
+        if PIL_AVAILABLE:
+            self.index.refresh()
 
         return count
 
+    def find_nearest_baseline(
+        self,
+        screenshot_path: str | Path,
+        max_distance: Optional[int] = None
+    ) -> Optional[Tuple[Path, int]]:
+        """
+        Find the stored baseline perceptually closest to a screenshot.
+
+        Args:
+            screenshot_path: Path of the screenshot to match
+            max_distance: Maximum Hamming distance between fingerprints
+                (defaults to HASH_DIFF_THRESHOLD per 64-bit hash in the fingerprint)
+
+        Returns:
+            (baseline path, hash distance) or None if no baseline is close enough
+        """
+        if not PIL_AVAILABLE:
+            return None
+        if max_distance is None:
+            max_distance = self.HASH_DIFF_THRESHOLD * fingerprint_bits() // 64
+        match = self.index.nearest(screenshot_path, max_distance)
+        if match is None:
+            return None
+        name, distance = match
+        return self.baseline_dir / name, distance
+
+    def deduplicate_baselines(self, max_distance: int = 0) -> List[List[str]]:
+        """
+        Deduplicate identical baselines on disk.
+
+        Baselines whose fingerprints are within max_distance are candidates;
+        only those whose decoded pixels are identical are replaced by hard
+        links to the first file of their group, so every baseline name still
+        resolves but the image data is stored once.
+
+        Returns:
+            Groups of baseline file names that were linked together
+        """
+        if not PIL_AVAILABLE:
+            return []
+        groups: List[List[str]] = []
+        for candidates in self.index.find_duplicates(max_distance):
+            by_digest: Dict[str, List[str]] = {}
+            for name in candidates:
+                try:
+                    with Image.open(self.baseline_dir / name) as img:
+                        digest = pixel_digest(img)
+                except Exception:
+                    continue
+                by_digest.setdefault(digest, []).append(name)
+            groups.extend(g for g in by_digest.values() if len(g) > 1)
+
+        for group in groups:
+            keeper = self.baseline_dir / group[0]
+            for name in group[1:]:
+                duplicate = self.baseline_dir / name
+                if duplicate.samefile(keeper):
+                    continue
+                tmp = duplicate.with_suffix(".dedup")
+                try:
+                    os.link(keeper, tmp)
+                    os.replace(tmp, duplicate)
+                except OSError:
+                    tmp.unlink(missing_ok=True)
+        self.index.refresh()
+        return groups
+
+    @staticmethod
+    def _baseline_key(screenshot: Dict) -> str:
+        """Build the page/viewport/state key used to name baselines."""
+        page = screenshot.get("page", screenshot.get("name", "unknown"))
+        viewport = screenshot.get("viewport", {})
+        width = viewport.get("width", "unknown")
+        state = screenshot.get("state", "default")
+        return f"{page}_{width}_{state}"
+
     def compare(self, current_screenshots: List[Dict]) -> RegressionReport:
         """
         Compare current screenshots against baseline.
@@ -164,41 +539,85 @@ class VisualRegression:
             RegressionReport with comparison results
         """
         if not PIL_AVAILABLE:
-            return RegressionReport(
-                timestamp=datetime.now().isoformat(),
-                total_pages=len(current_screenshots),
-                changed_count=0,
-                unchanged_count=0,
-                new_count=len(current_screenshots),
-                missing_count=0,
-                comparisons=[],
-                summary_score=100.0
-            )
+            return self._empty_report(current_screenshots)
+
+        comparisons = [self._compare_single(s) for s in current_screenshots]
+        return self._build_report(current_screenshots, comparisons)
+
+    def compare_batch(
+        self,
+        current_screenshots: List[Dict],
+        max_workers: Optional[int] = None
+    ) -> RegressionReport:
+        """
+        Compare a whole screenshot set across a process pool.
+
+        Each screenshot is diffed in a worker process, so large full-page
+        captures are compared in parallel instead of one after another.
+
+        Args:
+            current_screenshots: List of current screenshot dictionaries
+            max_workers: Worker process count (defaults to CPU count)
+
+        Returns:
+            RegressionReport with comparison results
+        """
+        if not PIL_AVAILABLE:
+            return self._empty_report(current_screenshots)
+
+        workers = min(max_workers or os.cpu_count() or 1, len(current_screenshots))
+        if workers <= 1:
+            return self.compare(current_screenshots)
+
+        if self.auto_pair:
+            # Workers load the persisted index; make sure it is current
+            self.index.refresh()
+
+        settings = {
+            "baseline_dir": str(self.baseline_dir),
+            "channel_threshold": self.channel_threshold,
+            "anti_aliasing_tolerance": self.anti_aliasing_tolerance,
+            "hash_precheck": self.hash_precheck,
+            "auto_pair": self.auto_pair,
+        }
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            comparisons = list(pool.map(
+                _compare_in_worker,
+                [settings] * len(current_screenshots),
+                current_screenshots
+            ))
 
-        comparisons = []
-        changed_count = 0
-        unchanged_count = 0
-        new_count = 0
+        return self._build_report(current_screenshots, comparisons)
 
-        for screenshot in current_screenshots:
-            result = self._compare_single(screenshot)
-            comparisons.append(result)
+    def _empty_report(self, current_screenshots: List[Dict]) -> RegressionReport:
+        """Report used when image support is unavailable."""
+        return RegressionReport(
+            timestamp=datetime.now().isoformat(),
+            total_pages=len(current_screenshots),
+            changed_count=0,
+            unchanged_count=0,
+            new_count=len(current_screenshots),
+            missing_count=0,
+            comparisons=[],
+            summary_score=100.0
+        )
 
-            if result.status == "changed":
-                changed_count += 1
-            elif result.status == "unchanged":
-                unchanged_count += 1
-            elif result.status == "new":
-                new_count += 1
+    def _build_report(
+        self,
+        current_screenshots: List[Dict],
+        comparisons: List[ComparisonResult]
+    ) -> RegressionReport:
+        """Aggregate per-screenshot comparisons into a RegressionReport."""
+        comparisons = list(comparisons)
+        changed_count = sum(1 for c in comparisons if c.status == "changed")
+        unchanged_count = sum(1 for c in comparisons if c.status == "unchanged")
+        new_count = sum(1 for c in comparisons if c.status == "new")
 
         # Check for missing baselines (baselines that weren't matched)
-        current_names = set()
-        for s in current_screenshots:
-            page = s.get("page", s.get("name", "unknown"))
-            viewport = s.get("viewport", {})
-            width = viewport.get("width", "unknown")
-            state = s.get("state", "default")
-            current_names.add(f"{page}_{width}_{state}")
+        current_names = {self._baseline_key(s) for s in current_screenshots}
+        current_names.update(
+            Path(c.baseline_path).stem for c in comparisons if c.baseline_path
+        )
 
         missing_count = 0
         for baseline_file in self.baseline_dir.glob("*.png"):
@@ -236,18 +655,22 @@ class VisualRegression:
     def _compare_single(self, screenshot: Dict) -> ComparisonResult:
         """Compare a single screenshot against its baseline."""
         current_path = screenshot.get("path", "")
-        page = screenshot.get("page", screenshot.get("name", "unknown"))
-        viewport = screenshot.get("viewport", {})
-        width = viewport.get("width", "unknown")
-        state = screenshot.get("state", "default")
-
-        baseline_name = f"{page}_{width}_{state}.png"
+        page_name = self._baseline_key(screenshot)
+        baseline_name = f"{page_name}.png"
         baseline_path = self.baseline_dir / baseline_name
+        pair_details: Dict[str, Any] = {}
+
+        if not baseline_path.exists() and self.auto_pair and Path(current_path).exists():
+            nearest = self.find_nearest_baseline(current_path)
+            if nearest is not None:
+                baseline_path, distance = nearest
+                baseline_name = baseline_path.name
+                pair_details = {"paired_with": baseline_path.stem, "pair_distance": distance}
 
         if not baseline_path.exists():
             # No baseline - this is a new screenshot
             return ComparisonResult(
-                page_name=f"{page}_{width}_{state}",
+                page_name=page_name,
                 status="new",
                 diff_percent=0,
                 hash_diff=0,
@@ -258,7 +681,7 @@ class VisualRegression:
 
         if not Path(current_path).exists():
             return ComparisonResult(
-                page_name=f"{page}_{width}_{state}",
+                page_name=page_name,
                 status="missing",
                 diff_percent=100,
                 hash_diff=100,
@@ -270,6 +693,7 @@ class VisualRegression:
         try:
             current_img = Image.open(current_path)
             baseline_img = Image.open(baseline_path)
+            details: Dict[str, Any] = dict(pair_details)
 
             # Calculate perceptual hash difference
             hash_diff = 0
@@ -278,31 +702,56 @@ class VisualRegression:
                 baseline_hash = imagehash.phash(baseline_img)
                 hash_diff = current_hash - baseline_hash
 
+                # Identical hashes on identical sizes: skip the full diff
+                if (
+                    self.hash_precheck
+                    and hash_diff == 0
+                    and current_img.size == baseline_img.size
+                ):
+                    return ComparisonResult(
+                        page_name=page_name,
+                        status="unchanged",
+                        diff_percent=0.0,
+                        hash_diff=0,
+                        current_path=current_path,
+                        baseline_path=str(baseline_path),
+                        details={**pair_details, "hash_precheck": True}
+                    )
+
             # Calculate pixel difference
             diff_percent = 0.0
             diff_path = None
 
             if current_img.size == baseline_img.size:
                 # Same size - can do pixel comparison
-                diff = ImageChops.difference(
-                    current_img.convert('RGB'),
-                    baseline_img.convert('RGB')
-                )
-
-                # Count different pixels (threshold to ignore minor variations)
-                diff_data = diff.convert('L').point(lambda x: 255 if x > 10 else 0)
-                diff_pixels = sum(1 for p in diff_data.getdata() if p > 0)
-                total_pixels = current_img.size[0] * current_img.size[1]
-                diff_percent = (diff_pixels / total_pixels) * 100
-
-                # Generate diff image if there are changes
-                if diff_percent > self.CHANGE_THRESHOLD_PERCENT:
-                    diff_path = str(self.diff_dir / f"diff_{baseline_name}")
-                    self._generate_diff_image(current_img, baseline_img, diff, diff_path)
+                if NUMPY_AVAILABLE:
+                    diff_percent, mask, regions = self._pixel_diff(current_img, baseline_img)
+                    details["regions"] = regions
+                    if diff_percent > self.CHANGE_THRESHOLD_PERCENT:
+                        diff_path = str(self.diff_dir / f"diff_{baseline_name}")
+                        self._generate_diff_image_fast(current_img, baseline_img, mask, diff_path)
+                else:
+                    diff = ImageChops.difference(
+                        current_img.convert('RGB'),
+                        baseline_img.convert('RGB')
+                    )
+
+                    # Count different pixels (threshold to ignore minor variations)
+                    threshold = self.channel_threshold
+                    diff_data = diff.convert('L').point(lambda x: 255 if x > threshold else 0)
+                    diff_pixels = sum(1 for p in diff_data.getdata() if p > 0)
+                    total_pixels = current_img.size[0] * current_img.size[1]
+                    diff_percent = (diff_pixels / total_pixels) * 100
+
+                    # Generate diff image if there are changes
+                    if diff_percent > self.CHANGE_THRESHOLD_PERCENT:
+                        diff_path = str(self.diff_dir / f"diff_{baseline_name}")
+                        self._generate_diff_image(current_img, baseline_img, diff, diff_path)
             else:
                 # Different sizes - significant change
                 diff_percent = 100.0
                 details = {
+                    **pair_details,
                     "reason": "Size changed",
                     "current_size": current_img.size,
                     "baseline_size": baseline_img.size
@@ -315,18 +764,19 @@ class VisualRegression:
             )
 
             return ComparisonResult(
-                page_name=f"{page}_{width}_{state}",
+                page_name=page_name,
                 status="changed" if is_changed else "unchanged",
                 diff_percent=round(diff_percent, 2),
-                hash_diff=hash_diff,
+                hash_diff=int(hash_diff),
                 current_path=current_path,
                 baseline_path=str(baseline_path),
-                diff_path=diff_path
+                diff_path=diff_path,
+                details=details
             )
 
         except Exception as e:
             return ComparisonResult(
-                page_name=f"{page}_{width}_{state}",
+                page_name=page_name,
                 status="changed",
                 diff_percent=100,
                 hash_diff=100,
@@ -335,6 +785,124 @@ class VisualRegression:
                 details={"error": str(e)}
             )
 
+    def _pixel_diff(
+        self,
+        current: "Image.Image",
+        baseline: "Image.Image"
+    ) -> Tuple[float, "np.ndarray", List[List[int]]]:
+        """
+        Vectorized pixel diff.
+
+        A pixel counts as changed when any channel differs by more than
+        ``channel_threshold``. Changed pixels whose current color appears in
+        the baseline within ``anti_aliasing_tolerance`` pixels are treated as
+        anti-aliasing/sub-pixel shifts and ignored.
+
+        Returns:
+            (diff_percent, boolean change mask, changed-region bounding boxes)
+        """
+        cur = np.asarray(current.convert('RGB'), dtype=np.int16)
+        base = np.asarray(baseline.convert('RGB'), dtype=np.int16)
+        threshold = self.channel_threshold
+
+        mask = (np.abs(cur - base) > threshold).any(axis=2)
+
+        radius = self.anti_aliasing_tolerance
+        if radius > 0 and mask.any():
+            # Only the changed pixels are re-checked against shifted baselines
+            ys, xs = np.nonzero(mask)
+            changed = cur[ys, xs]
+            padded = np.pad(base, ((radius, radius), (radius, radius), (0, 0)), mode="edge")
+            matched = np.zeros(len(ys), dtype=bool)
+            for dy in range(-radius, radius + 1):
+                for dx in range(-radius, radius + 1):
+                    if dy == 0 and dx == 0:
+                        continue
+                    neighbour = padded[ys + radius + dy, xs + radius + dx]
+                    matched |= (np.abs(changed - neighbour) <= threshold).all(axis=1)
+            mask[ys[matched], xs[matched]] = False
+
+        diff_pixels = int(mask.sum())
+        diff_percent = (diff_pixels / mask.size) * 100 if mask.size else 0.0
+        regions = self._find_regions(mask) if diff_pixels else []
+        return diff_percent, mask, regions
+
+    def _find_regions(self, mask: "np.ndarray") -> List[List[int]]:
+        """
+        Bounding boxes ``[x0, y0, x1, y1]`` of connected changed regions.
+
+        Uses scipy's connected-component labelling when available; otherwise
+        groups changed pixels into tiles and labels the (much smaller) tile grid.
+        """
+        boxes: List[List[int]] = []
+
+        if SCIPY_AVAILABLE:
+            labels, _ = ndimage.label(mask, structure=np.ones((3, 3), dtype=bool))
+            for slc in ndimage.find_objects(labels):
+                if slc is None:
+                    continue
+                ys, xs = slc
+                boxes.append([xs.start, ys.start, xs.stop, ys.stop])
+        else:
+            tile = self.REGION_TILE_SIZE
+            height, width = mask.shape
+            rows, cols = -(-height // tile), -(-width // tile)
+            padded = np.zeros((rows * tile, cols * tile), dtype=bool)
+            padded[:height, :width] = mask
+            tiles = padded.reshape(rows, tile, cols, tile).any(axis=(1, 3))
+
+            seen = np.zeros_like(tiles)
+            for r, c in zip(*np.nonzero(tiles)):
+                if seen[r, c]:
+                    continue
+                stack = [(r, c)]
+                seen[r, c] = True
+                r0, c0, r1, c1 = r, c, r, c
+                while stack:
+                    y, x = stack.pop()
+                    r0, c0, r1, c1 = min(r0, y), min(c0, x), max(r1, y), max(c1, x)
+                    for ny in range(max(y - 1, 0), min(y + 2, rows)):
+                        for nx in range(max(x - 1, 0), min(x + 2, cols)):
+                            if tiles[ny, nx] and not seen[ny, nx]:
+                                seen[ny, nx] = True
+                                stack.append((ny, nx))
+                boxes.append([
+                    int(c0 * tile), int(r0 * tile),
+                    int(min((c1 + 1) * tile, width)), int(min((r1 + 1) * tile, height))
+                ])
+
+        # Largest regions first
+        boxes.sort(key=lambda b: (b[2] - b[0]) * (b[3] - b[1]), reverse=True)
+        return [[int(v) for v in b] for b in boxes[:self.MAX_REGIONS]]
+
+    def _generate_diff_image_fast(
+        self,
+        current: "Image.Image",
+        baseline: "Image.Image",
+        mask: "np.ndarray",
+        output_path: str
+    ):
+        """Vectorized variant of ``_generate_diff_image`` driven by a change mask."""
+        try:
+            width = current.width
+            height = current.height
+            comparison = Image.new('RGB', (width * 3, height))
+
+            # Paste: baseline | current | diff (changed pixels in red)
+            current_rgb = current.convert('RGB')
+            comparison.paste(baseline.convert('RGB'), (0, 0))
+            comparison.paste(current_rgb, (width, 0))
+
+            enhanced = np.array(current_rgb, dtype=np.uint8)
+            enhanced[mask] = (255, 0, 0)
+            comparison.paste(Image.fromarray(enhanced), (width * 2, 0))
+
+            self._draw_labels(comparison, width)
+            comparison.save(output_path)
+
+        except Exception:
+            Image.fromarray((mask * 255).astype(np.uint8)).save(output_path)
+
     def _generate_diff_image(
         self,
         current: Image.Image,
@@ -359,7 +927,7 @@ class VisualRegression:
             for x in range(width):
                 for y in range(height):
                     pixel = diff_gray.getpixel((x, y))
-                    if pixel > 10:
+                    if pixel > self.channel_threshold:
                         diff_enhanced.putpixel((x, y), (255, 0, 0))
                     else:
                         # Show original content in unchanged areas
@@ -367,23 +935,26 @@ class VisualRegression:
 
             comparison.paste(diff_enhanced, (width * 2, 0))
 
-            # Add labels
-            draw = ImageDraw.Draw(comparison)
-            try:
-                font = ImageFont.truetype("arial.ttf", 20)
-            except:
-                font = ImageFont.load_default()
-
-            draw.text((10, 10), "BASELINE", fill=(255, 255, 255), font=font)
-            draw.text((width + 10, 10), "CURRENT", fill=(255, 255, 255), font=font)
-            draw.text((width * 2 + 10, 10), "DIFF (red=changed)", fill=(255, 0, 0), font=font)
-
+            self._draw_labels(comparison, width)
             comparison.save(output_path)
 
         except Exception:
             # If diff generation fails, just save the diff as-is
             diff.save(output_path)
 
+    @staticmethod
+    def _draw_labels(comparison: "Image.Image", width: int):
+        """Label the baseline | current | diff panels."""
+        draw = ImageDraw.Draw(comparison)
+        try:
+            font = ImageFont.truetype("arial.ttf", 20)
+        except:
+            font = ImageFont.load_default()
+
+        draw.text((10, 10), "BASELINE", fill=(255, 255, 255), font=font)
+        draw.text((width + 10, 10), "CURRENT", fill=(255, 255, 255), font=font)
+        draw.text((width * 2 + 10, 10), "DIFF (red=changed)", fill=(255, 0, 0), font=font)
+
     def generate_html_report(self, report: RegressionReport, output_path: Path) -> str:
         """Generate an HTML report from regression results."""
         html = f"""
@@ -481,6 +1052,18 @@ class VisualRegression:
         return str(output_path)
 
 
+def _compare_in_worker(settings: Dict[str, Any], screenshot: Dict) -> ComparisonResult:
+    """Process-pool entry point for ``VisualRegression.compare_batch``."""
+    regression = VisualRegression(
+        Path(settings["baseline_dir"]),
+        channel_threshold=settings["channel_threshold"],
+        anti_aliasing_tolerance=settings["anti_aliasing_tolerance"],
+        hash_precheck=settings["hash_precheck"],
+        auto_pair=settings["auto_pair"]
+    )
+    return regression._compare_single(screenshot)
+
+
 # Convenience functions
 def compare_screenshots(
     current_screenshots: List[Dict],
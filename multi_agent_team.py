@@ -332,16 +332,48 @@ def generate_mermaid_workflow(selected_agents, execution_priority=None):
 # Claude models have 200K token context windows
 CONTEXT_LIMIT = 200000  # 200K tokens for Claude Opus/Sonnet/Haiku
 
+# Same vocab file and split pattern as apps/api/src/llm/tokenizer.py (cl100k_base),
+# fetched by apps/api/scripts/fetch_tokenizers.py; never downloaded here
+TOKENIZER_DIR = Path(os.getenv("TOKENIZER_DIR") or Path(__file__).parent / "apps" / "api" / "tokenizers")
+CL100K_PAT_STR = r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s"""
+
+_token_encoding = None  # tiktoken Encoding, False once loading has failed
+
+def _get_token_encoding():
+    """Load the cl100k_base BPE encoding from the local vocab file once (None if unavailable)"""
+    global _token_encoding
+    if _token_encoding is None:
+        _token_encoding = False
+        vocab_path = TOKENIZER_DIR / "cl100k_base.tiktoken"
+        if vocab_path.exists():
+            try:
+                import tiktoken
+                from tiktoken.load import load_tiktoken_bpe
+                _token_encoding = tiktoken.Encoding(
+                    name="cl100k_base",
+                    pat_str=CL100K_PAT_STR,
+                    mergeable_ranks=load_tiktoken_bpe(str(vocab_path)),
+                    special_tokens={"<|endoftext|>": 100257},
+                )
+            except ImportError:
+                pass  # tiktoken not installed
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] Failed to load tokenizer {vocab_path}: {e}")
+    return _token_encoding or None
+
 def estimate_tokens(text):
     """
     Estimate token count for text.
-    Uses rough approximation: ~4 characters per token.
+    Uses the cl100k_base BPE vocab from apps/api/tokenizers when it has been
+    fetched and tiktoken is installed, or ~4 characters per token otherwise.
 
     This is faster than API calls and good enough for warnings.
-    Actual token count may vary ±20%.
     """
     if not text:
         return 0
+    encoding = _get_token_encoding()
+    if encoding:
+        return len(encoding.encode(str(text), disallowed_special=()))
     # Rough estimate: 4 chars ≈ 1 token
     return len(str(text)) // 4
 
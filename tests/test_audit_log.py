@@ -0,0 +1,201 @@
+"""
+Tests for the Self-Improvement Audit Log (core/audit_log.py)
+"""
+
+import gzip
+import json
+import multiprocessing
+import pytest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import audit_log
+
+
+@pytest.fixture
+def audit_file(temp_dir):
+    """Point the audit log at a temporary directory."""
+    path = temp_dir / "logs" / "self_improvement_audit.jsonl"
+    with patch.object(audit_log, "AUDIT_FILE", path):
+        yield path
+
+
+def _log_run(outcome: str):
+    audit_log.log_improvement("self_improve_start", {})
+    audit_log.log_improvement(outcome, {})
+
+
+class TestRecentImprovements:
+    """Tests for the reverse tail reader."""
+
+    @pytest.mark.unit
+    def test_newest_first(self, audit_file):
+        """Entries come back newest first and limited."""
+        for n in range(5):
+            audit_log.log_improvement("step", {"n": n})
+
+        recent = audit_log.get_recent_improvements(limit=3)
+
+        assert [e["details"]["n"] for e in recent] == [4, 3, 2]
+
+    @pytest.mark.unit
+    def test_reads_across_block_boundaries(self, audit_file):
+        """Lines longer than the read block are reassembled intact."""
+        audit_log.log_improvement("big", {"payload": "x" * 20000})
+        audit_log.log_improvement("small", {})
+
+        recent = audit_log.get_recent_improvements(limit=5)
+
+        assert [e["action"] for e in recent] == ["small", "big"]
+        assert len(recent[1]["details"]["payload"]) == 20000
+
+    @pytest.mark.unit
+    def test_missing_log(self, audit_file):
+        """An absent log yields no entries and zeroed stats."""
+        assert audit_log.get_recent_improvements() == []
+        assert audit_log.get_improvement_stats()["total_runs"] == 0
+
+
+class TestRotation:
+    """Tests for size/age-based rotation into compressed segments."""
+
+    @pytest.mark.unit
+    def test_rotates_on_size(self, audit_file):
+        """Exceeding MAX_SEGMENT_BYTES moves the log into a gzip segment."""
+        with patch.object(audit_log, "MAX_SEGMENT_BYTES", 200):
+            for n in range(10):
+                audit_log.log_improvement("step", {"n": n})
+
+        segments = audit_log._segments()
+        assert segments
+        with gzip.open(segments[0], "rt") as f:
+            assert json.loads(f.readline())["details"]["n"] == 0
+
+        # Reads span the active log and the segments
+        recent = audit_log.get_recent_improvements(limit=10)
+        assert [e["details"]["n"] for e in recent] == list(range(9, -1, -1))
+
+    @pytest.mark.unit
+    def test_rotates_on_age(self, audit_file):
+        """A log whose first entry is older than MAX_SEGMENT_AGE is rotated."""
+        audit_log.log_improvement("old", {})
+        stats_file = audit_log._stats_file()
+        stats = json.loads(stats_file.read_text())
+        stats["segment_started"] = (datetime.now(timezone.utc) - timedelta(days=8)).isoformat()
+        stats_file.write_text(json.dumps(stats))
+
+        audit_log.log_improvement("new", {})
+
+        assert len(audit_log._segments()) == 1
+        assert [e["action"] for e in audit_log.get_recent_improvements()] == ["new", "old"]
+
+    @pytest.mark.unit
+    def test_prunes_old_segments(self, audit_file):
+        """Only MAX_SEGMENTS compressed segments are retained."""
+        with patch.object(audit_log, "MAX_SEGMENT_BYTES", 1), \
+                patch.object(audit_log, "MAX_SEGMENTS", 2):
+            for n in range(6):
+                audit_log.log_improvement("step", {"n": n})
+
+        assert len(audit_log._segments()) == 2
+
+    @pytest.mark.unit
+    def test_pruned_entries_leave_stats(self, audit_file):
+        """Counts drop with pruned segments and match a full rescan."""
+        with patch.object(audit_log, "MAX_SEGMENT_BYTES", 1), \
+                patch.object(audit_log, "MAX_SEGMENTS", 2):
+            for _ in range(4):
+                _log_run("self_improve_complete")
+
+        stats = json.loads(audit_log._stats_file().read_text())
+        rebuilt = audit_log.rebuild_stats()
+
+        assert stats["counts"] == rebuilt["counts"]
+        assert stats["total_entries"] == rebuilt["total_entries"] == 3
+        assert audit_log.get_improvement_stats()["total_runs"] == 1
+
+
+def _append_from_worker(count: int):
+    with patch.object(audit_log, "MAX_SEGMENT_BYTES", 400):
+        for n in range(count):
+            audit_log.log_improvement("step", {"n": n})
+
+
+class TestConcurrentWriters:
+    """Tests for the cross-process file lock."""
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="needs fork to share the patched AUDIT_FILE",
+    )
+    def test_workers_share_log(self, audit_file):
+        """Appends and rotations from several processes lose no entries."""
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_append_from_worker, args=(25,)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        stats = json.loads(audit_log._stats_file().read_text())
+        assert stats["counts"] == {"step": 100}
+        assert len(audit_log.get_recent_improvements(limit=200)) == 100
+        assert audit_log.rebuild_stats()["total_entries"] == 100
+
+
+class TestImprovementStats:
+    """Tests for the incrementally maintained stats sidecar."""
+
+    @pytest.mark.unit
+    def test_counts_maintained_on_append(self, audit_file):
+        """Stats reflect appended runs without rescanning the log."""
+        _log_run("self_improve_complete")
+        _log_run("self_improve_complete")
+        _log_run("self_improve_failed")
+
+        with patch.object(audit_log, "_rebuild_stats", side_effect=AssertionError):
+            stats = audit_log.get_improvement_stats()
+
+        assert stats["total_runs"] == 3
+        assert stats["successful_runs"] == 2
+        assert stats["failed_runs"] == 1
+        assert stats["success_rate"] == pytest.approx(200 / 3)
+        assert stats["last_run"] == audit_log.get_recent_improvements(1)[0]["timestamp"]
+
+    @pytest.mark.unit
+    def test_counts_survive_rotation(self, audit_file):
+        """Rotated history still counts towards the totals."""
+        with patch.object(audit_log, "MAX_SEGMENT_BYTES", 1):
+            for _ in range(3):
+                _log_run("self_improve_complete")
+
+        assert audit_log.get_improvement_stats()["successful_runs"] == 3
+
+    @pytest.mark.unit
+    def test_rebuilt_when_sidecar_missing(self, audit_file):
+        """A log written without a sidecar is rescanned once."""
+        with patch.object(audit_log, "MAX_SEGMENT_BYTES", 300):
+            for _ in range(4):
+                _log_run("self_improve_complete")
+        audit_log._stats_file().unlink()
+
+        stats = audit_log.get_improvement_stats()
+
+        assert stats["total_runs"] == 4
+        assert audit_log._stats_file().exists()
+
+    @pytest.mark.unit
+    def test_clear_removes_everything(self, audit_file):
+        """clear_audit_log drops the log, segments and sidecar."""
+        with patch.object(audit_log, "MAX_SEGMENT_BYTES", 1):
+            for _ in range(3):
+                _log_run("self_improve_complete")
+
+        assert audit_log.clear_audit_log() is True
+        assert [p.name for p in audit_file.parent.iterdir()] == [audit_log._lock_file().name]
+        assert audit_log.clear_audit_log() is False
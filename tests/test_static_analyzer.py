@@ -0,0 +1,114 @@
+"""
+Tests for the Static Analysis Module (core/validators/static_analyzer.py)
+"""
+
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.validators.project_detector import ProjectInfo, ProjectType
+from core.validators.static_analyzer import StaticAnalyzer, _analyze_file
+
+
+@pytest.fixture
+def python_project(temp_dir):
+    """A small Python project with one syntax error and one security smell."""
+    project_dir = temp_dir / "project"
+    project_dir.mkdir()
+    (project_dir / "good.py").write_text("import os\n\nprint(os.getcwd())\n")
+    (project_dir / "broken.py").write_text("def broken(:\n    pass\n")
+    (project_dir / "secrets.py").write_text('x = 1\napi_key = "sk-test-123"\n')
+    (project_dir / "venv").mkdir()
+    (project_dir / "venv" / "ignored.py").write_text("def also_broken(:\n")
+    return ProjectInfo(
+        project_type=ProjectType.PYTHON,
+        path=project_dir,
+        name="project",
+    )
+
+
+@pytest.fixture
+def analyzer(temp_dir):
+    """Analyzer with an isolated cache and external tools disabled."""
+    analyzer = StaticAnalyzer(cache_dir=temp_dir / "cache", max_workers=1)
+    with patch.object(StaticAnalyzer, "_tool_version", return_value=None):
+        yield analyzer
+
+
+class TestPerFileChecks:
+    """Tests for the single-parse per-file checks."""
+
+    @pytest.mark.unit
+    def test_syntax_error_reported(self):
+        """A syntax error is reported once with its location."""
+        issues = _analyze_file("bad.py", "def f(:\n", ("python",))
+
+        assert len(issues) == 1
+        assert issues[0]["category"] == "syntax"
+        assert issues[0]["line"] == 1
+
+    @pytest.mark.unit
+    def test_security_line_numbers(self):
+        """Security findings report the line of the match."""
+        issues = _analyze_file("a.py", "x = 1\n\nos.system('ls')\n", ("security",))
+
+        assert [i["line"] for i in issues] == [3]
+
+
+class TestAnalyze:
+    """Tests for StaticAnalyzer.analyze."""
+
+    @pytest.mark.unit
+    def test_findings(self, analyzer, python_project):
+        """Syntax and security issues are found; excluded dirs are skipped."""
+        result = analyzer.analyze(python_project)
+
+        categories = sorted(i.category for i in result.issues)
+        assert categories == ["security", "syntax"]
+        assert result.status == "fail"
+        # 3 Python files + the same 3 files security-scanned
+        assert result.files_analyzed == 6
+
+    @pytest.mark.unit
+    def test_unchanged_files_served_from_cache(self, analyzer, python_project):
+        """A second run re-checks only files that changed."""
+        first = analyzer.analyze(python_project)
+        assert analyzer.cache_stats == {"hits": 0, "misses": 3}
+
+        (python_project.path / "good.py").write_text("print('changed')\n")
+        second = analyzer.analyze(python_project)
+
+        assert analyzer.cache_stats == {"hits": 2, "misses": 1}
+        assert [i.to_dict() for i in second.issues] == [i.to_dict() for i in first.issues]
+
+    @pytest.mark.unit
+    def test_parallel_matches_serial(self, temp_dir, python_project):
+        """The worker pool produces the same findings as inline processing."""
+        for n in range(StaticAnalyzer.PARALLEL_MIN_FILES):
+            (python_project.path / f"mod_{n}.py").write_text(f"value_{n} = {n}\n")
+
+        with patch.object(StaticAnalyzer, "_tool_version", return_value=None):
+            serial = StaticAnalyzer(max_workers=1, use_cache=False).analyze(python_project)
+            parallel = StaticAnalyzer(max_workers=2, use_cache=False).analyze(python_project)
+
+        assert [i.to_dict() for i in parallel.issues] == [i.to_dict() for i in serial.issues]
+
+    @pytest.mark.unit
+    def test_ruff_respects_exclude_settings(self, temp_dir):
+        """Files excluded in the project's ruff config are not linted."""
+        pytest.importorskip("ruff")
+        project_dir = temp_dir / "ruff_project"
+        (project_dir / "generated").mkdir(parents=True)
+        (project_dir / "pyproject.toml").write_text('[tool.ruff]\nextend-exclude = ["generated"]\n')
+        (project_dir / "generated" / "models.py").write_text("import os\n")
+        (project_dir / "app.py").write_text("import sys\n")
+        files = [project_dir / "generated" / "models.py", project_dir / "app.py"]
+
+        issues = StaticAnalyzer(cache_dir=temp_dir / "cache", use_cache=False)._run_ruff(
+            project_dir, files, {f: f.name for f in files}, {}
+        )
+
+        assert {Path(i.file).name for i in issues} == {"app.py"}
@@ -0,0 +1,235 @@
+"""
+Tests for Visual Regression Testing (core/visual_regression.py)
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+pytest.importorskip("numpy")
+
+from core.visual_regression import BKTree, VisualRegression
+
+
+def _save(img, path: Path) -> str:
+    img.save(path)
+    return str(path)
+
+
+def _screenshot(path: str, page: str = "home", width: int = 400) -> dict:
+    return {"path": path, "page": page, "viewport": {"width": width}}
+
+
+@pytest.fixture
+def blank(temp_dir):
+    """A plain white page saved as the baseline for page 'home'."""
+    img = Image.new("RGB", (400, 300), (255, 255, 255))
+    path = _save(img, temp_dir / "blank.png")
+    regression = VisualRegression(temp_dir / "baselines", hash_precheck=False)
+    regression.set_baseline([_screenshot(path)])
+    return regression, img
+
+
+class TestPixelDiff:
+    """Tests for the vectorized pixel diff."""
+
+    @pytest.mark.unit
+    def test_identical_images_unchanged(self, blank, temp_dir):
+        """Identical screenshots report no diff and no regions."""
+        regression, img = blank
+        path = _save(img, temp_dir / "same.png")
+
+        result = regression._compare_single(_screenshot(path))
+
+        assert result.status == "unchanged"
+        assert result.diff_percent == 0
+        assert result.details["regions"] == []
+
+    @pytest.mark.unit
+    def test_changed_regions_bounding_boxes(self, blank, temp_dir):
+        """Separate changed areas are reported as separate regions."""
+        regression, img = blank
+        changed = img.copy()
+        draw = ImageDraw.Draw(changed)
+        draw.rectangle([20, 20, 79, 79], fill=(0, 0, 255))
+        draw.rectangle([300, 200, 359, 259], fill=(0, 200, 0))
+        path = _save(changed, temp_dir / "changed.png")
+
+        result = regression._compare_single(_screenshot(path))
+
+        assert result.status == "changed"
+        assert result.diff_path is not None
+        regions = result.details["regions"]
+        assert len(regions) == 2
+        for x0, y0, x1, y1 in regions:
+            assert x1 > x0 and y1 > y0
+
+    @pytest.mark.unit
+    def test_one_pixel_shift_tolerated(self, temp_dir):
+        """A line shifted by one pixel is treated as anti-aliasing."""
+        base = Image.new("RGB", (200, 200), "white")
+        ImageDraw.Draw(base).line([0, 50, 200, 50], fill="black")
+        shifted = Image.new("RGB", (200, 200), "white")
+        ImageDraw.Draw(shifted).line([0, 51, 200, 51], fill="black")
+
+        strict = VisualRegression(temp_dir / "b1", anti_aliasing_tolerance=0)
+        tolerant = VisualRegression(temp_dir / "b2", anti_aliasing_tolerance=1)
+
+        assert strict._pixel_diff(shifted, base)[0] > 0
+        assert tolerant._pixel_diff(shifted, base)[0] == 0
+
+    @pytest.mark.unit
+    def test_channel_threshold(self, temp_dir):
+        """Differences at or below the channel threshold are ignored."""
+        base = Image.new("RGB", (50, 50), (100, 100, 100))
+        close = Image.new("RGB", (50, 50), (108, 100, 100))
+        regression = VisualRegression(temp_dir / "b", channel_threshold=10)
+
+        assert regression._pixel_diff(close, base)[0] == 0
+
+
+class TestCompareBatch:
+    """Tests for the process-pool batch API."""
+
+    @pytest.mark.unit
+    def test_batch_matches_serial(self, blank, temp_dir):
+        """compare_batch produces the same statuses as compare."""
+        regression, img = blank
+        changed = img.copy()
+        ImageDraw.Draw(changed).rectangle([0, 0, 200, 150], fill=(255, 0, 0))
+        screenshots = [
+            _screenshot(_save(changed, temp_dir / "c.png")),
+            _screenshot(_save(img, temp_dir / "n.png"), page="new_page"),
+        ]
+
+        serial = regression.compare(screenshots)
+        batch = regression.compare_batch(screenshots, max_workers=2)
+
+        assert [c.status for c in batch.comparisons] == [c.status for c in serial.comparisons]
+        assert batch.changed_count == 1
+        assert batch.new_count == 1
+
+
+class TestBKTree:
+    """Tests for the Hamming-distance BK-tree."""
+
+    @pytest.mark.unit
+    def test_search_and_nearest(self):
+        """Range search and nearest lookup agree with brute force."""
+        tree = BKTree()
+        keys = [0b0000, 0b0001, 0b0011, 0b0111, 0b1111, 0b1010]
+        for key in keys:
+            tree.add(key, key)
+
+        within_one = sorted(v for _, v in tree.search(0b0010, 1))
+        expected = sorted(k for k in keys if BKTree.distance(k, 0b0010) <= 1)
+        assert within_one == expected
+        assert tree.nearest(0b1110) == (1, 0b1111)
+        assert tree.nearest(0b1110, max_distance=0) is None
+        assert len(tree) == len(keys)
+
+
+class TestBaselineIndex:
+    """Tests for nearest-baseline pairing and deduplication."""
+
+    def _pages(self, temp_dir):
+        home = Image.new("RGB", (400, 300), "white")
+        ImageDraw.Draw(home).rectangle([0, 0, 400, 60], fill=(30, 30, 120))
+        pricing = Image.new("RGB", (400, 300), "white")
+        ImageDraw.Draw(pricing).rectangle([50, 80, 350, 280], fill=(200, 40, 40))
+        return home, pricing
+
+    @pytest.mark.unit
+    def test_find_nearest_baseline(self, temp_dir):
+        """A renamed screenshot is matched to its visually closest baseline."""
+        home, pricing = self._pages(temp_dir)
+        regression = VisualRegression(temp_dir / "baselines")
+        regression.set_baseline([
+            _screenshot(_save(home, temp_dir / "home.png"), page="home"),
+            _screenshot(_save(pricing, temp_dir / "pricing.png"), page="pricing"),
+        ])
+
+        match = regression.find_nearest_baseline(_save(pricing, temp_dir / "renamed.png"))
+
+        assert match is not None
+        assert match[0].stem == "pricing_400_default"
+        assert (temp_dir / "baselines" / "baseline_index.json").exists()
+
+    @pytest.mark.unit
+    def test_auto_pair_compares_against_nearest(self, temp_dir):
+        """With auto_pair, an unknown page name is compared, not reported as new."""
+        home, _ = self._pages(temp_dir)
+        regression = VisualRegression(temp_dir / "baselines", auto_pair=True)
+        regression.set_baseline([_screenshot(_save(home, temp_dir / "home.png"), page="home")])
+
+        report = regression.compare([
+            _screenshot(_save(home, temp_dir / "landing.png"), page="landing")
+        ])
+
+        assert report.new_count == 0
+        assert report.missing_count == 0
+        assert report.comparisons[0].status == "unchanged"
+        assert report.comparisons[0].details["paired_with"] == "home_400_default"
+
+    @pytest.mark.unit
+    def test_deduplicate_baselines(self, temp_dir):
+        """Identical baselines are hard-linked together on disk."""
+        home, pricing = self._pages(temp_dir)
+        regression = VisualRegression(temp_dir / "baselines")
+        regression.set_baseline([
+            _screenshot(_save(home, temp_dir / "a.png"), page="home"),
+            _screenshot(_save(home, temp_dir / "b.png"), page="home_copy"),
+            _screenshot(_save(pricing, temp_dir / "c.png"), page="pricing"),
+        ])
+
+        groups = regression.deduplicate_baselines()
+
+        assert groups == [["home_400_default.png", "home_copy_400_default.png"]]
+        base = temp_dir / "baselines"
+        assert (base / "home_400_default.png").samefile(base / "home_copy_400_default.png")
+
+    @pytest.mark.unit
+    def test_rebaseline_after_dedup_leaves_duplicate(self, temp_dir):
+        """Re-baselining a deduplicated page does not write through the link."""
+        home, pricing = self._pages(temp_dir)
+        regression = VisualRegression(temp_dir / "baselines")
+        regression.set_baseline([
+            _screenshot(_save(home, temp_dir / "a.png"), page="home"),
+            _screenshot(_save(home, temp_dir / "b.png"), page="home_copy"),
+        ])
+        regression.deduplicate_baselines()
+
+        regression.set_baseline([_screenshot(_save(pricing, temp_dir / "c.png"), page="home")])
+
+        base = temp_dir / "baselines"
+        assert not (base / "home_400_default.png").samefile(base / "home_copy_400_default.png")
+        with Image.open(base / "home_copy_400_default.png") as img:
+            assert img.tobytes() == home.tobytes()
+        with Image.open(base / "home_400_default.png") as img:
+            assert img.tobytes() == pricing.tobytes()
+
+    @pytest.mark.unit
+    def test_deduplicate_keeps_pages_that_only_hash_alike(self, temp_dir):
+        """Pages differing in a few characters share a fingerprint but are not linked."""
+        cheap = Image.new("RGB", (1440, 2000), "white")
+        ImageDraw.Draw(cheap).text((700, 1000), "$10", fill="black")
+        dear = Image.new("RGB", (1440, 2000), "white")
+        ImageDraw.Draw(dear).text((700, 1000), "$99", fill="black")
+        regression = VisualRegression(temp_dir / "baselines")
+        regression.set_baseline([
+            _screenshot(_save(cheap, temp_dir / "a.png"), page="basic"),
+            _screenshot(_save(dear, temp_dir / "b.png"), page="pro"),
+        ])
+        assert regression.index.find_duplicates()
+
+        groups = regression.deduplicate_baselines()
+
+        assert groups == []
+        base = temp_dir / "baselines"
+        assert not (base / "basic_400_default.png").samefile(base / "pro_400_default.png")
+        with Image.open(base / "pro_400_default.png") as img:
+            assert img.tobytes() == dear.tobytes()